@@ -0,0 +1,7 @@
+"""
+Paquete con las pruebas de rendimiento de la aplicación de punto de equilibrio.
+
+Se ejecutan desde la línea de comandos con:
+
+    python -m benchmarks [--filtro TEXTO] [--repeticiones N] [--salida resultados.json]
+"""
\ No newline at end of file
@@ -0,0 +1,218 @@
+"""
+Punto de entrada de las pruebas de rendimiento.
+
+Ejemplos:
+
+    python -m benchmarks                          # Todos los casos, resultados JSON en pantalla
+    python -m benchmarks --salida resultados.json
+    python -m benchmarks --filtro multiproducto --filtro exportar --repeticiones 10
+    python -m benchmarks --listar
+    python -m benchmarks --comparar referencia.json --umbral 0.15   # Sale con código 1 si hay regresiones
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+import tempfile
+
+import matplotlib
+matplotlib.use("Agg")  # Sin ventanas: las pruebas pueden ejecutarse sin pantalla
+
+import numpy as np
+
+from benchmarks.casos import seleccionar_casos
+from benchmarks.medicion import medir, medir_memoria, formatear_tiempo
+from benchmarks.comparacion import (
+    cargar_referencia, comparar, hay_regresiones, formatear_comparacion,
+    UMBRAL_TIEMPO, UMBRAL_MEMORIA, NIVEL_CONFIANZA
+)
+from utils.instrumentacion import formatear_bytes
+
+
+def crear_parser():
+    """
+    Crea el analizador de argumentos de la línea de comandos.
+    
+    Returns:
+        argparse.ArgumentParser: Analizador de argumentos
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Pruebas de rendimiento del analizador de punto de equilibrio."
+    )
+    parser.add_argument("-f", "--filtro", action="append",
+                        help="Ejecutar sólo los casos cuyo nombre contiene el texto o cuyo grupo "
+                             "coincide (se puede repetir)")
+    parser.add_argument("-r", "--repeticiones", type=int, default=5,
+                        help="Repeticiones registradas por caso (default: 5)")
+    parser.add_argument("-c", "--calentamiento", type=int, default=1,
+                        help="Llamadas de calentamiento no registradas (default: 1)")
+    parser.add_argument("-o", "--salida",
+                        help="Archivo JSON donde guardar los resultados (default: pantalla)")
+    parser.add_argument("-l", "--listar", action="store_true",
+                        help="Mostrar los casos disponibles y salir")
+    parser.add_argument("--sin-memoria", action="store_true",
+                        help="No medir el pico de memoria con tracemalloc")
+    
+    # Comparación con una ejecución de referencia
+    parser.add_argument("--comparar", metavar="REFERENCIA",
+                        help="Comparar con los resultados JSON de referencia y salir con código 1 "
+                             "si hay regresiones")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_TIEMPO,
+                        help=f"Aumento de tiempo tolerado como fracción (default: {UMBRAL_TIEMPO})")
+    parser.add_argument("--umbral-memoria", type=float, default=UMBRAL_MEMORIA,
+                        help=f"Aumento del pico de memoria tolerado (default: {UMBRAL_MEMORIA})")
+    parser.add_argument("--nivel-confianza", type=float, default=NIVEL_CONFIANZA,
+                        help=f"Nivel de confianza de los intervalos (default: {NIVEL_CONFIANZA})")
+    return parser
+
+
+def metadatos():
+    """
+    Obtiene los datos del entorno en que se ejecutan las pruebas.
+    
+    Returns:
+        dict: Fecha, versiones de Python y bibliotecas, y plataforma
+    """
+    import pandas as pd
+    
+    return {
+        "fecha": datetime.datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "implementacion": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "matplotlib": matplotlib.__version__
+    }
+
+
+def ejecutar(casos, repeticiones, calentamiento, memoria=True, informar=None):
+    """
+    Ejecuta los casos de rendimiento indicados.
+    
+    Args:
+        casos (list): Pares (nombre, caso) a ejecutar
+        repeticiones (int): Repeticiones registradas por caso
+        calentamiento (int): Llamadas de calentamiento por caso
+        memoria (bool, optional): Si se mide el pico de memoria de cada caso. Default es True.
+        informar (callable, optional): Función llamada con (nombre, resultado) tras cada caso
+    
+    Returns:
+        dict: Resultados por nombre de caso
+    """
+    resultados = {}
+    
+    # Los archivos generados (PDF, Excel, escenarios) se escriben en un directorio temporal
+    with tempfile.TemporaryDirectory(prefix="benchmarks_") as directorio:
+        contexto = {"directorio": directorio}
+        
+        for nombre, datos in casos:
+            funcion = datos["preparar"](contexto)
+            resultado = medir(funcion, repeticiones, calentamiento, datos["numero"])
+            resultado["grupo"] = datos["grupo"]
+            
+            # Pico de memoria en una llamada aparte (tracemalloc distorsiona los tiempos)
+            if memoria:
+                resultado["memoria_pico"] = medir_memoria(funcion)
+            
+            resultados[nombre] = resultado
+            
+            if informar:
+                informar(nombre, resultado)
+    
+    return resultados
+
+
+def _informar(nombre, resultado):
+    """Muestra el resultado de un caso en la salida de errores (la salida estándar es para el JSON)."""
+    linea = (
+        f"{nombre:<45} {formatear_tiempo(resultado['mediana']):>12} "
+        f"± {formatear_tiempo(resultado['desviacion']):>12}  (x{resultado['numero']})"
+    )
+    if "memoria_pico" in resultado:
+        linea += f"  pico {formatear_bytes(resultado['memoria_pico'])}"
+    print(linea, file=sys.stderr)
+
+
+def main(argumentos=None):
+    """
+    Ejecuta las pruebas de rendimiento desde la línea de comandos.
+    
+    Args:
+        argumentos (list, optional): Argumentos de la línea de comandos. Si es None, se usa sys.argv.
+    
+    Returns:
+        int: Código de salida
+    """
+    opciones = crear_parser().parse_args(argumentos)
+    casos = seleccionar_casos(opciones.filtro)
+    
+    # Al comparar sólo se ejecutan los casos presentes en la referencia
+    referencia = None
+    if opciones.comparar:
+        try:
+            referencia = cargar_referencia(opciones.comparar)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo cargar la referencia: {e}", file=sys.stderr)
+            return 2
+        casos = [(nombre, datos) for nombre, datos in casos if nombre in referencia["resultados"]]
+    
+    if opciones.listar:
+        for nombre, datos in casos:
+            print(f"{datos['grupo']:<15} {nombre}")
+        return 0
+    
+    if not casos:
+        print("Ningún caso coincide con los filtros indicados.", file=sys.stderr)
+        return 2
+    
+    informe = {
+        "metadatos": metadatos(),
+        "configuracion": {
+            "repeticiones": opciones.repeticiones,
+            "calentamiento": opciones.calentamiento
+        },
+        "resultados": ejecutar(casos, opciones.repeticiones, opciones.calentamiento,
+                               not opciones.sin_memoria, _informar)
+    }
+    
+    codigo = 0
+    if referencia is not None:
+        resultados_referencia = {
+            nombre: resultado for nombre, resultado in referencia["resultados"].items()
+            if nombre in informe["resultados"]
+        }
+        comparaciones = comparar(
+            resultados_referencia, informe["resultados"],
+            opciones.umbral, opciones.umbral_memoria, opciones.nivel_confianza
+        )
+        informe["comparacion"] = {
+            "referencia": opciones.comparar,
+            "umbral": opciones.umbral,
+            "umbral_memoria": opciones.umbral_memoria,
+            "nivel_confianza": opciones.nivel_confianza,
+            "casos": comparaciones
+        }
+        
+        print("\n" + formatear_comparacion(comparaciones), file=sys.stderr)
+        if hay_regresiones(comparaciones):
+            print("\nSe detectaron regresiones de rendimiento.", file=sys.stderr)
+            codigo = 1
+    
+    if opciones.salida:
+        with open(opciones.salida, 'w', encoding='utf-8') as f:
+            json.dump(informe, f, indent=4, ensure_ascii=False)
+        print(f"Resultados guardados en {opciones.salida}", file=sys.stderr)
+    else:
+        json.dump(informe, sys.stdout, indent=4, ensure_ascii=False)
+        print()
+    
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
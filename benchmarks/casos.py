@@ -0,0 +1,351 @@
+"""
+Módulo con los casos de rendimiento de la aplicación.
+
+Cada caso es una función que recibe el contexto de ejecución (con un directorio temporal
+para los archivos generados), prepara sus datos fuera de la medición y devuelve la función
+sin argumentos que se mide. Los casos se registran con el decorador 'caso'.
+"""
+
+from collections import OrderedDict
+import itertools
+import os
+
+import numpy as np
+
+from core.demanda import analizar_demanda
+from core.equilibrio import AnalizadorEquilibrio, calcular_punto_equilibrio_multiproducto
+from core.estructura_costos import EstructuraCostos
+from core.modelo import ModeloEquilibrio
+from core.objetivos import tabla_objetivos
+from core.proyeccion import generar_serie, proyectar_equilibrio
+from core.sensibilidad import calcular_sensibilidad
+from core.tramos import AnalizadorTramos
+
+
+# Casos registrados: nombre -> {"grupo", "preparar", "numero"}
+CASOS = OrderedDict()
+
+# Datos base usados por todos los casos
+COSTOS_FIJOS = 10000.0
+PRECIO_VENTA = 50.0
+COSTO_VARIABLE = 30.0
+UNIDADES_ESPERADAS = 800.0
+
+# Tamaños de catálogo para el análisis multiproducto
+TAMAÑOS_MULTIPRODUCTO = (10, 1000, 100000)
+
+
+def caso(nombre, grupo, numero=None):
+    """
+    Decorador que registra un caso de rendimiento.
+    
+    Args:
+        nombre (str): Nombre único del caso (p. ej. "core.punto_equilibrio_unidades")
+        grupo (str): Grupo al que pertenece (core, sensibilidad, multiproducto, ...)
+        numero (int, optional): Llamadas por repetición. Si es None, se calibra.
+    
+    Returns:
+        callable: Decorador que registra la función de preparación
+    """
+    def registrar(preparar):
+        if nombre in CASOS:
+            raise ValueError(f"Caso de rendimiento duplicado: {nombre}")
+        
+        CASOS[nombre] = {"grupo": grupo, "preparar": preparar, "numero": numero}
+        return preparar
+    
+    return registrar
+
+
+def crear_modelo():
+    """
+    Crea un modelo con los datos base y sus valores derivados calculados.
+    
+    Returns:
+        ModeloEquilibrio: Modelo listo para exportar o guardar
+    """
+    modelo = ModeloEquilibrio()
+    modelo.establecer(
+        costos_fijos=COSTOS_FIJOS,
+        precio_venta=PRECIO_VENTA,
+        costo_variable=COSTO_VARIABLE,
+        unidades_esperadas=UNIDADES_ESPERADAS
+    )
+    return modelo
+
+
+def crear_productos(cantidad, semilla=0):
+    """
+    Genera un catálogo de productos con un mix aleatorio que suma 1.
+    
+    Args:
+        cantidad (int): Número de productos
+        semilla (int, optional): Semilla del generador aleatorio
+    
+    Returns:
+        list: Productos con nombre, precio_venta, costo_variable, mix y costos_fijos
+    """
+    generador = np.random.default_rng(semilla)
+    precios = generador.uniform(20, 100, cantidad)
+    costos = precios * generador.uniform(0.3, 0.8, cantidad)
+    mix = generador.random(cantidad)
+    mix /= mix.sum()
+    
+    return [
+        {
+            "nombre": f"Producto {i + 1}",
+            "precio_venta": float(precios[i]),
+            "costo_variable": float(costos[i]),
+            "mix": float(mix[i]),
+            "costos_fijos": COSTOS_FIJOS * float(mix[i])
+        }
+        for i in range(cantidad)
+    ]
+
+
+# Métodos del analizador con los argumentos con que se miden
+METODOS_ANALIZADOR = {
+    "punto_equilibrio_unidades": (),
+    "punto_equilibrio_valor": (),
+    "ratio_margen_contribucion": (),
+    "margen_seguridad": (UNIDADES_ESPERADAS,),
+    "utilidad_estimada": (UNIDADES_ESPERADAS,),
+    "grado_apalancamiento_operativo": (UNIDADES_ESPERADAS,),
+    "calcular_unidades_para_utilidad_objetivo": (5000.0,),
+}
+
+
+def _registrar_metodo_analizador(metodo, argumentos):
+    """Registra el caso que mide un método de AnalizadorEquilibrio."""
+    @caso(f"core.{metodo}", "core")
+    def preparar(contexto):
+        analizador = AnalizadorEquilibrio(COSTOS_FIJOS, PRECIO_VENTA, COSTO_VARIABLE)
+        funcion = getattr(analizador, metodo)
+        return lambda: funcion(*argumentos)
+
+
+for _metodo, _argumentos in METODOS_ANALIZADOR.items():
+    _registrar_metodo_analizador(_metodo, _argumentos)
+
+
+@caso("core.crear_analizador", "core")
+def _crear_analizador(contexto):
+    return lambda: AnalizadorEquilibrio(COSTOS_FIJOS, PRECIO_VENTA, COSTO_VARIABLE)
+
+
+@caso("core.generar_datos_grafico", "core")
+def _generar_datos_grafico(contexto):
+    analizador = AnalizadorEquilibrio(COSTOS_FIJOS, PRECIO_VENTA, COSTO_VARIABLE)
+    return analizador.generar_datos_grafico
+
+
+@caso("core.modelo_recalculo", "core")
+def _modelo_recalculo(contexto):
+    # Cambiar un dato de entrada y leer los derivados que usan las vistas
+    modelo = crear_modelo()
+    valores = itertools.cycle(np.linspace(COSTOS_FIJOS * 0.9, COSTOS_FIJOS * 1.1, 101).tolist())
+    
+    def recalcular():
+        modelo.establecer(costos_fijos=next(valores))
+        return modelo["resultados"], modelo["datos_grafico"]
+    
+    return recalcular
+
+
+def _registrar_multiproducto(cantidad):
+    """Registra el caso que mide el análisis multiproducto con un catálogo de cierto tamaño."""
+    @caso(f"multiproducto.calcular[{cantidad}]", "multiproducto")
+    def preparar(contexto):
+        productos = crear_productos(cantidad)
+        return lambda: calcular_punto_equilibrio_multiproducto(productos)
+
+
+for _cantidad in TAMAÑOS_MULTIPRODUCTO:
+    _registrar_multiproducto(_cantidad)
+
+
+@caso("sensibilidad.calcular[61]", "sensibilidad")
+def _sensibilidad_calcular(contexto):
+    return lambda: calcular_sensibilidad(
+        COSTOS_FIJOS, PRECIO_VENTA, COSTO_VARIABLE, "Precio de Venta", -30, 30, 1)
+
+
+@caso("sensibilidad.calcular[60001]", "sensibilidad")
+def _sensibilidad_calcular_fino(contexto):
+    return lambda: calcular_sensibilidad(
+        COSTOS_FIJOS, PRECIO_VENTA, COSTO_VARIABLE, "Precio de Venta", -30, 30, 0.001)
+
+
+@caso("proyeccion.equilibrio[10000x120]", "proyeccion")
+def _proyeccion_equilibrio(contexto):
+    # 10 000 escenarios mensuales a 10 años con crecimiento distinto y estacionalidad
+    escenarios, periodos = 10000, 120
+    crecimiento = np.linspace(-0.01, 0.03, escenarios)
+    estacionalidad = [0.8, 0.85, 0.9, 1.0, 1.05, 1.1, 1.2, 1.15, 1.0, 0.95, 0.9, 1.1]
+    
+    costos_fijos = generar_serie(COSTOS_FIJOS, periodos, 0.002)
+    precio_venta = generar_serie(PRECIO_VENTA, periodos, 0.003)
+    costo_variable = generar_serie(COSTO_VARIABLE, periodos, 0.004)
+    unidades = generar_serie(np.full(escenarios, 400.0), periodos, crecimiento, estacionalidad)
+    return lambda: proyectar_equilibrio(costos_fijos, precio_venta, costo_variable, unidades, 50000.0)
+
+
+@caso("tramos.puntos_equilibrio[1000]", "tramos")
+def _tramos_puntos_equilibrio(contexto):
+    # 1000 escalones de costos fijos con precio y costo variable en tramos intercalados
+    cortes = np.arange(1000) * 100.0
+    analizador = AnalizadorTramos(
+        list(zip(cortes, COSTOS_FIJOS + cortes * 19.5)),
+        list(zip(cortes[::3], PRECIO_VENTA - np.arange(len(cortes[::3])) * 0.001)),
+        list(zip(cortes[::7], COSTO_VARIABLE + np.arange(len(cortes[::7])) * 0.002))
+    )
+    return analizador.puntos_equilibrio
+
+
+@caso("demanda.analizar_elasticidad[100000]", "demanda")
+def _demanda_analizar(contexto):
+    # Óptimo y equilibrios de 100 000 productos con elasticidades distintas
+    generador = np.random.default_rng(0)
+    parametros = {
+        "escala": generador.uniform(1e5, 1e7, 100000),
+        "elasticidad": generador.uniform(1.2, 4.0, 100000)
+    }
+    costos_fijos = generador.uniform(0, 50000, 100000)
+    costo_variable = generador.uniform(1, 50, 100000)
+    return lambda: analizar_demanda("elasticidad", parametros, costos_fijos, costo_variable)
+
+
+@caso("objetivos.tabla_precio[1000x10000]", "objetivos")
+def _objetivos_tabla_precio(contexto):
+    # Precio necesario para 1000 utilidades objetivo en 10 000 escenarios
+    generador = np.random.default_rng(0)
+    costos_fijos = generador.uniform(1e3, 1e5, 10000)
+    costo_variable = generador.uniform(1, 40, 10000)
+    unidades = generador.uniform(100, 5000, 10000)
+    objetivos = np.linspace(0, 1e5, 1000)
+    return lambda: tabla_objetivos("precio_venta", "utilidad", objetivos, costos_fijos=costos_fijos,
+                                   costo_variable=costo_variable, unidades=unidades)
+
+
+@caso("estructura_costos.modificar_partida[10000]", "estructura_costos")
+def _estructura_costos_modificar(contexto):
+    # Editar una partida de 10 000 (en 4 niveles de categorías) y recalcular el equilibrio
+    estructura = EstructuraCostos.desde_lista([
+        {
+            "nombre": f"partida {i}",
+            "tipo": "fijo" if i % 4 else "variable",
+            "importe": 1.0 + i % 97 if i % 4 else 0.01,
+            "categoria": f"centro {i % 10}/area {i % 7}/linea {i % 5}"
+        }
+        for i in range(10000)
+    ])
+    importes = itertools.cycle([0.01, 0.02])
+    
+    def ejecutar():
+        estructura.modificar_partida("partida 4321", next(importes))
+        return estructura.crear_analizador(PRECIO_VENTA).punto_equilibrio_unidades()
+    
+    return ejecutar
+
+
+@caso("sensibilidad.preparar[61]", "sensibilidad")
+def _sensibilidad_preparar(contexto):
+    # Incluye el informe y la figura que se construyen en el hilo de trabajo; sin caché
+    # en disco, para medir el cálculo y no la lectura de un resultado guardado
+    from gui.frames.sensibilidad import preparar_sensibilidad
+    from utils.cache_resultados import CacheResultados
+    
+    valores_base = {
+        "costos_fijos": COSTOS_FIJOS,
+        "precio_venta": PRECIO_VENTA,
+        "costo_variable": COSTO_VARIABLE
+    }
+    analizador = AnalizadorEquilibrio(COSTOS_FIJOS, PRECIO_VENTA, COSTO_VARIABLE)
+    pe_base = {
+        "unidades": analizador.punto_equilibrio_unidades(),
+        "valor": analizador.punto_equilibrio_valor()
+    }
+    cache = CacheResultados(directorio=None)
+    return lambda: preparar_sensibilidad(valores_base, pe_base, "Precio de Venta", -30, 30, 1,
+                                         cache=cache)
+
+
+@caso("escenario.guardar_cargar", "escenario")
+def _escenario_guardar_cargar(contexto):
+    from utils.guardar_cargar import guardar_escenario, cargar_escenario
+    
+    modelo = crear_modelo()
+    modelo["productos_multiple"] = crear_productos(10)
+    directorio = contexto["directorio"]
+    
+    def ida_y_vuelta():
+        ruta = guardar_escenario(modelo, nombre="benchmark", directorio=directorio)
+        return cargar_escenario(ruta)
+    
+    return ida_y_vuelta
+
+
+@caso("exportar.pdf", "exportar")
+def _exportar_pdf(contexto):
+    from utils.exportar import exportar_a_pdf
+    
+    # Sin caché, para medir también el renderizado del gráfico
+    instantanea = crear_modelo().instantanea()
+    ruta = os.path.join(contexto["directorio"], "benchmark.pdf")
+    return lambda: exportar_a_pdf(instantanea, ruta, usar_cache=False)
+
+
+@caso("exportar.excel", "exportar")
+def _exportar_excel(contexto):
+    from utils.exportar import exportar_a_excel
+    
+    instantanea = crear_modelo().instantanea()
+    ruta = os.path.join(contexto["directorio"], "benchmark.xlsx")
+    return lambda: exportar_a_excel(instantanea, ruta)
+
+
+def _crear_escenarios(cantidad):
+    """Crea escenarios del servicio con variaciones de los datos base."""
+    factores = np.linspace(0.9, 1.1, cantidad).tolist()
+    return [
+        {"costos_fijos": COSTOS_FIJOS * f, "precio_venta": PRECIO_VENTA,
+         "costo_variable": COSTO_VARIABLE, "unidades_esperadas": UNIDADES_ESPERADAS}
+        for f in factores
+    ]
+
+
+@caso("servicios.escenarios_individuales[10000]", "servicios")
+def _servicios_individuales(contexto):
+    # Un analizador por escenario, como sin microlotes
+    from servicios.servidor_http import calcular_escenario
+    
+    escenarios = _crear_escenarios(10000)
+    return lambda: [calcular_escenario(datos) for datos in escenarios]
+
+
+@caso("servicios.lote[10000]", "servicios")
+def _servicios_lote(contexto):
+    # Todos los escenarios en un cálculo vectorizado, como en /lote y en los microlotes
+    from servicios.servidor_http import calcular_lote
+    
+    escenarios = _crear_escenarios(10000)
+    return lambda: calcular_lote(escenarios)
+
+
+def seleccionar_casos(filtros=None):
+    """
+    Obtiene los casos cuyo nombre o grupo contiene alguno de los filtros.
+    
+    Args:
+        filtros (list, optional): Textos a buscar. Si es None o vacío, se devuelven todos.
+    
+    Returns:
+        list: Pares (nombre, caso) en orden de registro
+    """
+    if not filtros:
+        return list(CASOS.items())
+    
+    return [
+        (nombre, datos) for nombre, datos in CASOS.items()
+        if any(filtro in nombre or filtro == datos["grupo"] for filtro in filtros)
+    ]
\ No newline at end of file
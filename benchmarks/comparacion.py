@@ -0,0 +1,195 @@
+"""
+Módulo para comparar una ejecución de las pruebas de rendimiento con una de referencia.
+
+Para cada caso se estima un intervalo de confianza de la razón entre el tiempo medio nuevo
+y el de referencia, remuestreando (bootstrap) las repeticiones de ambas ejecuciones. Sólo
+se considera una regresión si todo el intervalo supera 1 + umbral, de modo que el ruido
+entre repeticiones no produce falsas alarmas. El pico de memoria se compara aparte con
+su propio umbral.
+"""
+
+import json
+
+import numpy as np
+
+from benchmarks.medicion import formatear_tiempo
+from utils.instrumentacion import formatear_bytes
+
+
+# Umbrales por defecto (fracción de cambio tolerada)
+UMBRAL_TIEMPO = 0.10
+UMBRAL_MEMORIA = 0.20
+
+# Diferencia mínima de memoria que se considera (bytes); evita alarmas por asignaciones pequeñas
+MEMORIA_MINIMA = 64 * 1024
+
+# Parámetros del remuestreo
+NIVEL_CONFIANZA = 0.95
+REMUESTREOS = 2000
+
+
+def cargar_referencia(ruta):
+    """
+    Carga los resultados de referencia guardados con --salida.
+    
+    Args:
+        ruta (str): Ruta del archivo JSON
+    
+    Returns:
+        dict: Informe de referencia
+    
+    Raises:
+        ValueError: Si el archivo no contiene resultados de pruebas de rendimiento
+    """
+    with open(ruta, 'r', encoding='utf-8') as f:
+        informe = json.load(f)
+    
+    if "resultados" not in informe:
+        raise ValueError(f"El archivo {ruta} no contiene resultados de pruebas de rendimiento.")
+    
+    return informe
+
+
+def intervalo_razon(tiempos_base, tiempos_nuevos, nivel=NIVEL_CONFIANZA, remuestreos=REMUESTREOS,
+                    semilla=0):
+    """
+    Estima el intervalo de confianza de la razón entre tiempos medios (nuevo / referencia).
+    
+    Args:
+        tiempos_base (list): Tiempos por llamada de cada repetición de referencia
+        tiempos_nuevos (list): Tiempos por llamada de cada repetición nueva
+        nivel (float, optional): Nivel de confianza. Default es 0.95.
+        remuestreos (int, optional): Número de remuestreos bootstrap
+        semilla (int, optional): Semilla del generador (resultados reproducibles)
+    
+    Returns:
+        tuple: (razón de las medias, límite inferior, límite superior)
+    """
+    base = np.asarray(tiempos_base, dtype=float)
+    nuevos = np.asarray(tiempos_nuevos, dtype=float)
+    generador = np.random.default_rng(semilla)
+    
+    # Medias de todas las muestras remuestreadas a la vez
+    medias_base = generador.choice(base, size=(remuestreos, len(base))).mean(axis=1)
+    medias_nuevas = generador.choice(nuevos, size=(remuestreos, len(nuevos))).mean(axis=1)
+    razones = medias_nuevas / medias_base
+    
+    alfa = (1 - nivel) / 2
+    inferior, superior = np.quantile(razones, [alfa, 1 - alfa])
+    
+    return float(nuevos.mean() / base.mean()), float(inferior), float(superior)
+
+
+def comparar(referencia, nuevos, umbral=UMBRAL_TIEMPO, umbral_memoria=UMBRAL_MEMORIA,
+             nivel=NIVEL_CONFIANZA):
+    """
+    Compara los resultados de cada caso con los de referencia.
+    
+    Args:
+        referencia (dict): Resultados de referencia por nombre de caso
+        nuevos (dict): Resultados nuevos por nombre de caso
+        umbral (float, optional): Aumento de tiempo tolerado (0.10 = 10%)
+        umbral_memoria (float, optional): Aumento del pico de memoria tolerado
+        nivel (float, optional): Nivel de confianza del intervalo
+    
+    Returns:
+        list: Comparación de cada caso (nombre, estado, razón e intervalo de tiempo,
+            memoria de referencia y nueva, y si la memoria empeoró)
+    """
+    comparaciones = []
+    
+    for nombre in list(referencia) + [n for n in nuevos if n not in referencia]:
+        if nombre not in nuevos:
+            comparaciones.append({"nombre": nombre, "estado": "sin_medir"})
+            continue
+        if nombre not in referencia:
+            comparaciones.append({"nombre": nombre, "estado": "nuevo"})
+            continue
+        
+        base, nuevo = referencia[nombre], nuevos[nombre]
+        razon, inferior, superior = intervalo_razon(base["tiempos"], nuevo["tiempos"], nivel)
+        
+        # Sólo es un cambio real si todo el intervalo queda fuera de la banda de ruido
+        if inferior > 1 + umbral:
+            estado = "regresion"
+        elif superior < 1 - umbral:
+            estado = "mejora"
+        else:
+            estado = "sin_cambios"
+        
+        memoria_base = base.get("memoria_pico")
+        memoria_nueva = nuevo.get("memoria_pico")
+        regresion_memoria = (
+            memoria_base is not None and memoria_nueva is not None and
+            memoria_nueva - memoria_base > MEMORIA_MINIMA and
+            memoria_nueva > memoria_base * (1 + umbral_memoria)
+        )
+        
+        comparaciones.append({
+            "nombre": nombre,
+            "estado": estado,
+            "razon": razon,
+            "intervalo": [inferior, superior],
+            "mediana_base": base["mediana"],
+            "mediana_nueva": nuevo["mediana"],
+            "memoria_base": memoria_base,
+            "memoria_nueva": memoria_nueva,
+            "regresion_memoria": regresion_memoria
+        })
+    
+    return comparaciones
+
+
+def hay_regresiones(comparaciones):
+    """
+    Indica si alguna comparación es una regresión de tiempo o de memoria.
+    
+    Args:
+        comparaciones (list): Resultado de comparar
+    
+    Returns:
+        bool: True si hay al menos una regresión
+    """
+    return any(
+        c["estado"] == "regresion" or c.get("regresion_memoria") for c in comparaciones
+    )
+
+
+def formatear_comparacion(comparaciones):
+    """
+    Compone un informe de texto con la comparación de cada caso.
+    
+    Args:
+        comparaciones (list): Resultado de comparar
+    
+    Returns:
+        str: Informe con una línea por caso
+    """
+    etiquetas = {
+        "regresion": "REGRESIÓN",
+        "mejora": "mejora",
+        "sin_cambios": "igual",
+        "nuevo": "nuevo",
+        "sin_medir": "sin medir"
+    }
+    
+    lineas = []
+    for c in comparaciones:
+        if "razon" not in c:
+            lineas.append(f"{c['nombre']:<45} {etiquetas[c['estado']]}")
+            continue
+        
+        linea = (
+            f"{c['nombre']:<45} {etiquetas[c['estado']]:<10} "
+            f"{formatear_tiempo(c['mediana_base']):>12} -> {formatear_tiempo(c['mediana_nueva']):>12} "
+            f"x{c['razon']:.2f} [{c['intervalo'][0]:.2f}, {c['intervalo'][1]:.2f}]"
+        )
+        
+        if c["memoria_base"] is not None and c["memoria_nueva"] is not None:
+            linea += f"  mem {formatear_bytes(c['memoria_base'])} -> {formatear_bytes(c['memoria_nueva'])}"
+            if c["regresion_memoria"]:
+                linea += " REGRESIÓN DE MEMORIA"
+        
+        lineas.append(linea)
+    
+    return "\n".join(lineas)
\ No newline at end of file
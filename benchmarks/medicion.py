@@ -0,0 +1,123 @@
+"""
+Módulo con las utilidades para medir el tiempo de ejecución de una función.
+
+Cada medición hace primero unas ejecuciones de calentamiento (que no se cuentan) y luego
+varias repeticiones. En cada repetición la función se llama 'numero' veces seguidas y se
+registra el tiempo medio por llamada; si no se indica 'numero', se elige de forma que cada
+repetición dure al menos TIEMPO_MINIMO_REPETICION segundos, igual que timeit.
+"""
+
+import statistics
+import timeit
+import tracemalloc
+
+
+# Duración mínima de cada repetición cuando se calibra el número de llamadas (segundos)
+TIEMPO_MINIMO_REPETICION = 0.2
+
+
+def calibrar_numero(funcion, tiempo_minimo=TIEMPO_MINIMO_REPETICION):
+    """
+    Calcula cuántas llamadas seguidas hacen falta para que una repetición dure lo suficiente.
+    
+    Args:
+        funcion (callable): Función sin argumentos a medir
+        tiempo_minimo (float, optional): Duración mínima de cada repetición en segundos
+    
+    Returns:
+        int: Número de llamadas por repetición
+    """
+    temporizador = timeit.Timer(funcion)
+    numero = 1
+    while True:
+        duracion = temporizador.timeit(numero)
+        if duracion >= tiempo_minimo:
+            return numero
+        
+        # Estimar el número necesario a partir de la duración observada
+        if duracion > 0:
+            numero = max(numero * 2, int(numero * tiempo_minimo / duracion * 1.1))
+        else:
+            numero *= 10
+
+
+def medir(funcion, repeticiones=5, calentamiento=1, numero=None):
+    """
+    Mide el tiempo por llamada de una función.
+    
+    Args:
+        funcion (callable): Función sin argumentos a medir
+        repeticiones (int, optional): Número de repeticiones registradas. Default es 5.
+        calentamiento (int, optional): Llamadas previas que no se registran. Default es 1.
+        numero (int, optional): Llamadas por repetición. Si es None, se calibra.
+    
+    Returns:
+        dict: Tiempos por llamada de cada repetición (segundos) y sus estadísticas
+            (media, mediana, mínimo, máximo y desviación estándar)
+    """
+    # Calentamiento (cachés, importaciones diferidas, asignación de memoria)
+    for _ in range(calentamiento):
+        funcion()
+    
+    if numero is None:
+        numero = calibrar_numero(funcion)
+    
+    temporizador = timeit.Timer(funcion)
+    tiempos = [duracion / numero for duracion in temporizador.repeat(repeat=repeticiones, number=numero)]
+    
+    return {
+        "repeticiones": repeticiones,
+        "numero": numero,
+        "tiempos": tiempos,
+        "media": statistics.fmean(tiempos),
+        "mediana": statistics.median(tiempos),
+        "minimo": min(tiempos),
+        "maximo": max(tiempos),
+        "desviacion": statistics.stdev(tiempos) if len(tiempos) > 1 else 0.0
+    }
+
+
+def medir_memoria(funcion):
+    """
+    Mide el pico de memoria asignada durante una llamada a la función.
+    
+    Se mide en una llamada aparte porque tracemalloc ralentiza la ejecución y
+    distorsionaría los tiempos.
+    
+    Args:
+        funcion (callable): Función sin argumentos a medir
+    
+    Returns:
+        int: Pico de memoria asignada por encima de la memoria previa a la llamada (bytes)
+    """
+    ya_activo = tracemalloc.is_tracing()
+    if not ya_activo:
+        tracemalloc.start()
+    
+    try:
+        tracemalloc.reset_peak()
+        antes, _ = tracemalloc.get_traced_memory()
+        funcion()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        if not ya_activo:
+            tracemalloc.stop()
+    
+    return max(0, pico - antes)
+
+
+def formatear_tiempo(segundos):
+    """
+    Formatea una duración con la unidad más legible.
+    
+    Args:
+        segundos (float): Duración en segundos
+    
+    Returns:
+        str: Duración formateada (ns, µs, ms o s)
+    """
+    for unidad, escala in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if segundos >= escala:
+            return f"{segundos / escala:.3f} {unidad}"
+    
+    return f"{segundos / 1e-9:.1f} ns"
\ No newline at end of file
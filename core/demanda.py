@@ -0,0 +1,320 @@
+"""
+Módulo que contiene el análisis de equilibrio con una curva de demanda precio-cantidad.
+
+En AnalizadorEquilibrio el precio de venta es fijo. Aquí la cantidad vendida depende del
+precio según una curva de demanda (lineal o de elasticidad constante, con parámetros
+dados o ajustados a observaciones), y se buscan el precio que maximiza la utilidad y los
+precios de equilibrio. Los productos se resuelven en lote: cada iteración de Newton con
+bisección de respaldo actúa sobre arreglos de numpy con una fila por producto.
+"""
+
+import numpy as np
+
+
+# Tipos de curva de demanda disponibles
+TIPOS_DEMANDA = ("lineal", "elasticidad")
+
+# Parámetros por defecto del método numérico
+TOLERANCIA = 1e-10
+MAX_ITERACIONES = 100
+
+# Duplicaciones máximas del extremo superior al buscar un intervalo con cambio de signo
+MAX_EXPANSIONES = 200
+
+
+def ajustar_demanda(precios, cantidades, tipo="lineal"):
+    """
+    Ajusta por mínimos cuadrados una curva de demanda a precios y cantidades observados.
+    
+    La curva lineal se ajusta directamente; la de elasticidad constante se ajusta sobre
+    los logaritmos (log q = log escala - elasticidad * log p).
+    
+    Args:
+        precios (array-like): Precios observados, de forma (observaciones,) o
+            (productos, observaciones)
+        cantidades (array-like): Cantidades vendidas a esos precios (misma forma)
+        tipo (str, optional): Tipo de curva (uno de TIPOS_DEMANDA). Default es "lineal".
+    
+    Returns:
+        dict: Parámetros de la curva por producto: intercepto y pendiente (lineal) o
+            escala y elasticidad (elasticidad constante)
+    
+    Raises:
+        ValueError: Si el tipo o las observaciones no son válidos
+    """
+    if tipo not in TIPOS_DEMANDA:
+        raise ValueError(f"Tipo de curva de demanda no válido: {tipo}")
+    
+    x, y = np.broadcast_arrays(np.asarray(precios, dtype=float), np.asarray(cantidades, dtype=float))
+    if x.shape[-1] < 2:
+        raise ValueError("Se necesitan al menos dos observaciones para ajustar la curva.")
+    
+    if tipo == "elasticidad":
+        if np.any(x <= 0) or np.any(y <= 0):
+            raise ValueError("Los precios y las cantidades deben ser positivos para ajustar la elasticidad.")
+        x, y = np.log(x), np.log(y)
+    
+    # Regresión lineal de cada fila: pendiente = cov(x, y) / var(x)
+    dx = x - x.mean(axis=-1, keepdims=True)
+    dy = y - y.mean(axis=-1, keepdims=True)
+    varianza = np.sum(dx * dx, axis=-1)
+    if np.any(varianza == 0):
+        raise ValueError("Los precios observados de cada producto deben ser distintos.")
+    
+    pendiente = np.sum(dx * dy, axis=-1) / varianza
+    ordenada = y.mean(axis=-1) - pendiente * x.mean(axis=-1)
+    
+    if tipo == "lineal":
+        return {"intercepto": ordenada, "pendiente": -pendiente}
+    return {"escala": np.exp(ordenada), "elasticidad": -pendiente}
+
+
+def _curva(tipo, parametros):
+    """
+    Devuelve la cantidad demandada y sus dos primeras derivadas respecto del precio.
+    
+    Args:
+        tipo (str): Tipo de curva (uno de TIPOS_DEMANDA)
+        parametros (dict): Parámetros de la curva (arreglos por producto)
+    
+    Returns:
+        tuple: Funciones (q, dq, d2q) del precio y de los índices de los productos
+    """
+    if tipo == "lineal":
+        a = parametros["intercepto"]
+        b = parametros["pendiente"]
+        return (lambda p, i: a[i] - b[i] * p,
+                lambda p, i: -b[i],
+                lambda p, i: np.zeros_like(p))
+    
+    k = parametros["escala"]
+    e = parametros["elasticidad"]
+    return (lambda p, i: k[i] * p ** -e[i],
+            lambda p, i: -e[i] * k[i] * p ** (-e[i] - 1),
+            lambda p, i: e[i] * (e[i] + 1) * k[i] * p ** (-e[i] - 2))
+
+
+def _newton_acotado(funcion, derivada, filas, bajo, alto, tolerancia, max_iteraciones):
+    """
+    Busca una raíz por fila con Newton, recurriendo a la bisección si se sale del intervalo.
+    
+    Cada fila debe tener un cambio de signo entre bajo y alto. El intervalo se reduce en
+    cada iteración, así que el método converge aunque Newton falle. Las filas que ya
+    convergieron se retiran, de modo que las iteraciones finales sólo calculan las filas
+    difíciles.
+    
+    Args:
+        funcion (callable): Función vectorizada f(x, filas) cuya raíz se busca
+        derivada (callable): Derivada de la función, con la misma firma
+        filas (numpy.ndarray): Índices de los productos que se resuelven
+        bajo (numpy.ndarray): Extremo inferior del intervalo de cada fila
+        alto (numpy.ndarray): Extremo superior del intervalo de cada fila
+        tolerancia (float): Tolerancia relativa del paso
+        max_iteraciones (int): Número máximo de iteraciones
+    
+    Returns:
+        tuple: (raíz, iteraciones, convergido, residuo) como arreglos alineados con filas
+    """
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        signo_bajo = np.sign(funcion(bajo, filas))
+        en_alto = funcion(alto, filas) == 0
+        
+        # Si la función ya se anula en un extremo, esa es la raíz
+        raiz = np.where(signo_bajo == 0, bajo, np.where(en_alto, alto, (bajo + alto) / 2))
+        iteraciones = np.zeros(len(filas), dtype=int)
+        convergido = (signo_bajo == 0) | en_alto
+        
+        # Estado de las filas activas (posición en el resultado, x, intervalo y signo)
+        activas = np.flatnonzero(~convergido)
+        x, bajo, alto, signo_bajo = raiz[activas], bajo[activas], alto[activas], signo_bajo[activas]
+        
+        for _ in range(max_iteraciones):
+            if not len(activas):
+                break
+            
+            fx = funcion(x, filas[activas])
+            exacto = fx == 0
+            
+            # Mantener el cambio de signo dentro del intervalo
+            mismo_signo = np.sign(fx) == signo_bajo
+            bajo = np.where(mismo_signo, x, bajo)
+            alto = np.where(mismo_signo, alto, x)
+            
+            # Paso de Newton, o bisección si no es finito o sale del intervalo; un paso
+            # menor que la tolerancia indica convergencia aunque el redondeo lo saque
+            nuevo = x - fx / derivada(x, filas[activas])
+            minimo = np.abs(nuevo - x) <= tolerancia * (1 + np.abs(x))
+            fuera = ~np.isfinite(nuevo) | (nuevo <= bajo) | (nuevo >= alto)
+            nuevo = np.where(fuera, np.where(minimo, x, (bajo + alto) / 2), nuevo)
+            nuevo = np.where(exacto, x, nuevo)
+            
+            iteraciones[activas] += 1
+            raiz[activas] = nuevo
+            
+            # Retirar las filas que convergieron
+            listas = exacto | minimo | (np.abs(nuevo - x) <= tolerancia * (1 + np.abs(nuevo)))
+            convergido[activas[listas]] = True
+            
+            siguen = ~listas
+            activas, x, bajo, alto, signo_bajo = (
+                activas[siguen], nuevo[siguen], bajo[siguen], alto[siguen], signo_bajo[siguen])
+        
+        residuo = funcion(raiz, filas)
+    
+    return raiz, iteraciones, convergido, residuo
+
+
+def _expandir(funcion, filas, desde, signo):
+    """
+    Duplica el extremo superior de cada fila hasta que la función tenga el signo indicado.
+    
+    Args:
+        funcion (callable): Función vectorizada f(x, filas)
+        filas (numpy.ndarray): Índices de los productos
+        desde (numpy.ndarray): Extremo inicial de cada fila
+        signo (int): Signo buscado (-1 o 1)
+    
+    Returns:
+        tuple: (extremo, encontrado) alineados con filas
+    """
+    alto = desde.copy()
+    pendientes = np.arange(len(filas))
+    
+    with np.errstate(over='ignore', invalid='ignore', divide='ignore'):
+        for _ in range(MAX_EXPANSIONES):
+            pendientes = pendientes[np.sign(funcion(alto[pendientes], filas[pendientes])) != signo]
+            if not len(pendientes):
+                break
+            alto[pendientes] *= 2
+    
+    encontrado = np.ones(len(filas), dtype=bool)
+    encontrado[pendientes] = False
+    return alto, encontrado
+
+
+def analizar_demanda(tipo, parametros, costos_fijos, costo_variable,
+                     tolerancia=TOLERANCIA, max_iteraciones=MAX_ITERACIONES):
+    """
+    Calcula el precio óptimo y los precios de equilibrio de un lote de productos.
+    
+    La utilidad es (p - cv) * q(p) - cf. El precio óptimo anula su derivada y los
+    precios de equilibrio la anulan a ella: uno por debajo del óptimo y otro por encima
+    (con demanda lineal, o con elasticidad constante y costos fijos positivos).
+    
+    Args:
+        tipo (str): Tipo de curva (uno de TIPOS_DEMANDA)
+        parametros (dict): Parámetros de la curva por producto, como los que devuelve
+            ajustar_demanda: intercepto y pendiente (q = intercepto - pendiente * p) o
+            escala y elasticidad (q = escala * p ** -elasticidad)
+        costos_fijos (array-like): Costos fijos de cada producto
+        costo_variable (array-like): Costo variable unitario de cada producto
+        tolerancia (float, optional): Tolerancia relativa del método numérico
+        max_iteraciones (int, optional): Iteraciones máximas de cada búsqueda
+    
+    Returns:
+        dict: Arreglos por producto (NaN donde no hay solución): precio_optimo,
+            cantidad_optima, utilidad_maxima, precio_equilibrio_min,
+            precio_equilibrio_max (inf si la utilidad nunca vuelve a ser negativa),
+            cantidad_equilibrio_min, cantidad_equilibrio_max y los diagnósticos
+            iteraciones (de cada búsqueda: optimo, equilibrio_min, equilibrio_max),
+            convergido, residuo_optimo (derivada de la utilidad en el óptimo) y estado
+            ("ok", "sin_margen", "sin_optimo", "no_rentable" o "sin_convergencia")
+    
+    Raises:
+        ValueError: Si el tipo o los parámetros no son válidos
+    """
+    if tipo not in TIPOS_DEMANDA:
+        raise ValueError(f"Tipo de curva de demanda no válido: {tipo}")
+    
+    # Llevar parámetros y costos a la misma forma (una fila por producto)
+    nombres = ("intercepto", "pendiente") if tipo == "lineal" else ("escala", "elasticidad")
+    try:
+        valores = [np.asarray(parametros[nombre], dtype=float) for nombre in nombres]
+    except KeyError as e:
+        raise ValueError(f"Falta el parámetro {e.args[0]} de la curva {tipo}.")
+    
+    *valores, cf, cv = (np.atleast_1d(valor).astype(float) for valor in np.broadcast_arrays(
+        *valores, np.asarray(costos_fijos, dtype=float), np.asarray(costo_variable, dtype=float)))
+    q, dq, d2q = _curva(tipo, dict(zip(nombres, valores)))
+    productos = len(cf)
+    
+    def utilidad(p, i):
+        return (p - cv[i]) * q(p, i) - cf[i]
+    
+    def derivada_utilidad(p, i):
+        return q(p, i) + (p - cv[i]) * dq(p, i)
+    
+    def segunda_derivada(p, i):
+        return 2 * dq(p, i) + (p - cv[i]) * d2q(p, i)
+    
+    # Productos sin solución: sin demanda por encima del costo variable, o sin máximo
+    estado = np.full(productos, "ok", dtype=object)
+    if tipo == "lineal":
+        a, b = valores
+        with np.errstate(divide='ignore', invalid='ignore'):
+            precio_maximo = np.where(b > 0, a / b, np.inf)
+        estado[(a <= 0) | (b <= 0) | (precio_maximo <= cv)] = "sin_margen"
+    else:
+        k, e = valores
+        estado[k <= 0] = "sin_margen"
+        estado[(k > 0) & ((e <= 1) | (cv <= 0))] = "sin_optimo"
+    
+    resultados = {clave: np.full(productos, np.nan) for clave in (
+        "precio_optimo", "cantidad_optima", "utilidad_maxima", "precio_equilibrio_min",
+        "precio_equilibrio_max", "cantidad_equilibrio_min", "cantidad_equilibrio_max",
+        "residuo_optimo")}
+    iteraciones = {clave: np.zeros(productos, dtype=int) for clave in (
+        "optimo", "equilibrio_min", "equilibrio_max")}
+    convergido = np.zeros(productos, dtype=bool)
+    
+    # Precio óptimo: raíz de la derivada entre el costo variable y un precio donde ya es negativa
+    filas = np.flatnonzero(estado == "ok")
+    if tipo == "lineal":
+        alto = precio_maximo[filas]
+    else:
+        alto, encontrado = _expandir(derivada_utilidad, filas, 2 * cv[filas], -1)
+        estado[filas[~encontrado]] = "sin_optimo"
+        filas, alto = filas[encontrado], alto[encontrado]
+    
+    precio, iteraciones["optimo"][filas], convergido[filas], resultados["residuo_optimo"][filas] = (
+        _newton_acotado(derivada_utilidad, segunda_derivada, filas, cv[filas], alto,
+                        tolerancia, max_iteraciones))
+    maxima = utilidad(precio, filas)
+    resultados["precio_optimo"][filas] = precio
+    resultados["cantidad_optima"][filas] = q(precio, filas)
+    resultados["utilidad_maxima"][filas] = maxima
+    
+    # Los equilibrios sólo existen si la utilidad máxima no es negativa
+    estado[filas[maxima < 0]] = "no_rentable"
+    rentables = maxima >= 0
+    filas, optimo = filas[rentables], precio[rentables]
+    
+    # Equilibrio inferior: entre el costo variable (utilidad -cf) y el óptimo
+    precio, iteraciones["equilibrio_min"][filas], convergido_min, _ = _newton_acotado(
+        utilidad, derivada_utilidad, filas, cv[filas], optimo, tolerancia, max_iteraciones)
+    resultados["precio_equilibrio_min"][filas] = precio
+    resultados["cantidad_equilibrio_min"][filas] = q(precio, filas)
+    convergido[filas] &= convergido_min
+    
+    # Equilibrio superior: entre el óptimo y un precio con utilidad negativa (si existe)
+    if tipo == "lineal":
+        alto, encontrado = precio_maximo[filas], np.ones(len(filas), dtype=bool)
+    else:
+        alto, encontrado = _expandir(utilidad, filas, 2 * optimo, -1)
+    resultados["precio_equilibrio_max"][filas[~encontrado]] = np.inf
+    resultados["cantidad_equilibrio_max"][filas[~encontrado]] = 0.0
+    filas, optimo, alto = filas[encontrado], optimo[encontrado], alto[encontrado]
+    
+    precio, iteraciones["equilibrio_max"][filas], convergido_max, _ = _newton_acotado(
+        utilidad, derivada_utilidad, filas, optimo, alto, tolerancia, max_iteraciones)
+    resultados["precio_equilibrio_max"][filas] = precio
+    resultados["cantidad_equilibrio_max"][filas] = q(precio, filas)
+    convergido[filas] &= convergido_max
+    
+    # Diagnósticos por producto
+    estado[(estado == "ok") & ~convergido] = "sin_convergencia"
+    resultados["iteraciones"] = iteraciones
+    resultados["convergido"] = convergido
+    resultados["estado"] = estado
+    
+    return resultados
\ No newline at end of file
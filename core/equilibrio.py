@@ -181,6 +181,60 @@ class AnalizadorEquilibrio:
 
 # Funciones de utilidad para análisis adicionales
 
+def calcular_equilibrio_vectorizado(costos_fijos, precio_venta, costo_variable, unidades_esperadas=0):
+    """
+    Calcula los indicadores de punto de equilibrio de muchos escenarios a la vez.
+    
+    Aplica las mismas fórmulas que AnalizadorEquilibrio sobre arreglos de numpy, sin crear
+    un analizador por escenario. Los escenarios con margen de contribución no positivo se
+    marcan como no válidos y sus indicadores quedan en NaN.
+    
+    Args:
+        costos_fijos (array-like): Costos fijos de cada escenario
+        precio_venta (array-like): Precio de venta unitario de cada escenario
+        costo_variable (array-like): Costo variable unitario de cada escenario
+        unidades_esperadas (array-like, optional): Ventas esperadas en unidades. Default es 0.
+    
+    Returns:
+        dict: Arreglos por indicador: validos, pe_unidades, pe_valor, margen_contribucion,
+            ratio_mc y, para los escenarios con ventas esperadas positivas y por encima del
+            equilibrio (con_ventas), margen_seguridad_unidades, margen_seguridad_valor,
+            margen_seguridad_porcentaje, utilidad_estimada y gao
+    """
+    cf, pv, cv, ue = np.broadcast_arrays(
+        *(np.asarray(valores, dtype=float) for valores in
+          (costos_fijos, precio_venta, costo_variable, unidades_esperadas))
+    )
+    
+    margen = pv - cv
+    validos = margen > 0
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pe_unidades = np.where(validos, cf / margen, np.nan)
+        
+        # Sin ventas esperadas no hay margen de seguridad (evita dividir por cero si los
+        # costos fijos son negativos y el equilibrio queda por debajo de cero)
+        con_ventas = validos & (ue > pe_unidades) & (ue > 0)
+        
+        # Indicadores que dependen de las ventas esperadas
+        margen_unidades = np.where(con_ventas, ue - pe_unidades, np.nan)
+        contribucion_total = ue * margen
+        
+        return {
+            "validos": validos,
+            "pe_unidades": pe_unidades,
+            "pe_valor": pe_unidades * pv,
+            "margen_contribucion": margen,
+            "ratio_mc": np.where(validos, margen / pv, np.nan),
+            "con_ventas": con_ventas,
+            "margen_seguridad_unidades": margen_unidades,
+            "margen_seguridad_valor": margen_unidades * pv,
+            "margen_seguridad_porcentaje": margen_unidades / ue * 100,
+            "utilidad_estimada": np.where(con_ventas, ue * pv - ue * cv - cf, np.nan),
+            "gao": np.where(con_ventas, contribucion_total / (contribucion_total - cf), np.nan)
+        }
+
+
 def calcular_punto_equilibrio_multiproducto(productos):
     """
     Calcula el punto de equilibrio para múltiples productos.
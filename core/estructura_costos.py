@@ -0,0 +1,459 @@
+"""
+Módulo que define la estructura de costos: partidas de costo agrupadas por categorías.
+
+Los costos fijos y el costo variable unitario del análisis salen de la suma de muchas
+partidas con nombre, organizadas en categorías jerárquicas ("Producción/Planta 1").
+Cada categoría guarda los totales de su subárbol y se actualiza de forma incremental:
+modificar una partida sólo recorre las categorías de su ruta hasta la raíz, sin volver
+a sumar las demás. Los totales se acumulan con Decimal para que miles de ediciones no
+arrastren errores de redondeo.
+"""
+
+from contextlib import contextmanager
+from decimal import Decimal
+
+from core.equilibrio import AnalizadorEquilibrio
+
+
+# Tipos de partida: costo fijo total o costo variable por unidad
+TIPOS_PARTIDA = ("fijo", "variable")
+
+# Separador de los niveles de una categoría
+SEPARADOR = "/"
+
+
+def _dividir_ruta(categoria):
+    """
+    Convierte una categoría en la tupla de sus niveles.
+    
+    Args:
+        categoria (str o tuple): Ruta "A/B/C", tupla de niveles, o "" para la raíz
+    
+    Returns:
+        tuple: Niveles de la categoría, sin espacios sobrantes ni niveles vacíos
+    """
+    if isinstance(categoria, str):
+        categoria = categoria.split(SEPARADOR)
+    return tuple(nivel.strip() for nivel in categoria if nivel and nivel.strip())
+
+
+def _a_decimal(importe):
+    """Convierte un importe a Decimal sin arrastrar la representación binaria del float."""
+    try:
+        valor = Decimal(repr(float(importe)))
+    except (TypeError, ValueError):
+        raise ValueError(f"Importe no válido: {importe!r}")
+    
+    if not valor.is_finite():
+        raise ValueError(f"Importe no válido: {importe!r}")
+    return valor
+
+
+class _Categoria:
+    """
+    Nodo del árbol de categorías con los totales de su subárbol.
+    """
+    
+    def __init__(self, nombre, padre=None):
+        self.nombre = nombre
+        self.padre = padre
+        self.hijos = {}
+        self.partidas = set()
+        
+        # Totales del subárbol
+        self.fijo = Decimal(0)
+        self.variable = Decimal(0)
+        self.cantidad = 0
+    
+    def ruta(self):
+        """Devuelve la ruta de la categoría como tupla de niveles."""
+        niveles = []
+        nodo = self
+        while nodo.padre is not None:
+            niveles.append(nodo.nombre)
+            nodo = nodo.padre
+        return tuple(reversed(niveles))
+
+
+class EstructuraCostos:
+    """
+    Conjunto de partidas de costo fijas y variables organizadas por categorías.
+    """
+    
+    def __init__(self):
+        """Inicializa una estructura de costos vacía."""
+        self._raiz = _Categoria("")
+        
+        # Partidas: nombre -> {"tipo", "importe" (Decimal), "categoria" (_Categoria)}
+        self._partidas = {}
+        
+        # Suscriptores y notificaciones pendientes durante un lote
+        self._suscriptores = []
+        self._nivel_lote = 0
+        self._afectadas = set()
+    
+    # Consulta de totales
+    @property
+    def costos_fijos(self):
+        """float: Suma de las partidas de costo fijo."""
+        return float(self._raiz.fijo)
+    
+    @property
+    def costo_variable(self):
+        """float: Suma de las partidas de costo variable unitario."""
+        return float(self._raiz.variable)
+    
+    def total(self, categoria=""):
+        """
+        Obtiene los totales de una categoría (incluidas sus subcategorías).
+        
+        Args:
+            categoria (str o tuple, optional): Ruta de la categoría. Default es la raíz.
+        
+        Returns:
+            dict: Costos fijos, costo variable unitario y número de partidas
+        
+        Raises:
+            KeyError: Si la categoría no existe
+        """
+        nodo = self._buscar_categoria(categoria)
+        return {
+            "costos_fijos": float(nodo.fijo),
+            "costo_variable": float(nodo.variable),
+            "partidas": nodo.cantidad
+        }
+    
+    def crear_analizador(self, precio_venta):
+        """
+        Crea un analizador de punto de equilibrio con los totales de la estructura.
+        
+        Args:
+            precio_venta (float): Precio de venta unitario
+        
+        Returns:
+            AnalizadorEquilibrio: Analizador con los costos fijos y variables totales
+        
+        Raises:
+            ValueError: Si el margen de contribución no es positivo
+        """
+        return AnalizadorEquilibrio(self.costos_fijos, precio_venta, self.costo_variable)
+    
+    # Partidas
+    def agregar_partida(self, nombre, tipo, importe, categoria=""):
+        """
+        Agrega una partida de costo.
+        
+        Args:
+            nombre (str): Nombre único de la partida
+            tipo (str): "fijo" (costo total del período) o "variable" (costo por unidad)
+            importe (float): Importe de la partida
+            categoria (str o tuple, optional): Ruta de la categoría, que se crea si no
+                existe. Default es la raíz.
+        
+        Raises:
+            ValueError: Si el nombre ya existe, o el tipo o el importe no son válidos
+        """
+        if not nombre:
+            raise ValueError("La partida debe tener nombre.")
+        if nombre in self._partidas:
+            raise ValueError(f"Ya existe una partida llamada '{nombre}'.")
+        if tipo not in TIPOS_PARTIDA:
+            raise ValueError(f"Tipo de partida no válido: {tipo}")
+        
+        importe = _a_decimal(importe)
+        nodo = self._crear_categoria(_dividir_ruta(categoria))
+        
+        self._partidas[nombre] = {"tipo": tipo, "importe": importe, "categoria": nodo}
+        nodo.partidas.add(nombre)
+        self._propagar(nodo, tipo, importe, 1)
+        self._notificar()
+    
+    def modificar_partida(self, nombre, importe=None, tipo=None, categoria=None):
+        """
+        Modifica el importe, el tipo o la categoría de una partida.
+        
+        Args:
+            nombre (str): Nombre de la partida
+            importe (float, optional): Nuevo importe
+            tipo (str, optional): Nuevo tipo
+            categoria (str o tuple, optional): Nueva categoría
+        
+        Raises:
+            KeyError: Si la partida no existe
+            ValueError: Si el tipo o el importe no son válidos
+        """
+        partida = self._obtener_partida(nombre)
+        
+        nuevo_tipo = partida["tipo"] if tipo is None else tipo
+        if nuevo_tipo not in TIPOS_PARTIDA:
+            raise ValueError(f"Tipo de partida no válido: {nuevo_tipo}")
+        nuevo_importe = partida["importe"] if importe is None else _a_decimal(importe)
+        
+        if categoria is None:
+            nodo = partida["categoria"]
+        else:
+            nodo = self._crear_categoria(_dividir_ruta(categoria))
+        
+        # Caso habitual: sólo cambia el importe, basta con propagar la diferencia
+        if nodo is partida["categoria"] and nuevo_tipo == partida["tipo"]:
+            self._propagar(nodo, nuevo_tipo, nuevo_importe - partida["importe"], 0)
+        else:
+            self._quitar(nombre, partida)
+            nodo.partidas.add(nombre)
+            self._propagar(nodo, nuevo_tipo, nuevo_importe, 1)
+        
+        partida.update(tipo=nuevo_tipo, importe=nuevo_importe, categoria=nodo)
+        self._notificar()
+    
+    def eliminar_partida(self, nombre):
+        """
+        Elimina una partida.
+        
+        Args:
+            nombre (str): Nombre de la partida
+        
+        Raises:
+            KeyError: Si la partida no existe
+        """
+        partida = self._obtener_partida(nombre)
+        self._quitar(nombre, partida)
+        del self._partidas[nombre]
+        self._notificar()
+    
+    def partida(self, nombre):
+        """
+        Obtiene los datos de una partida.
+        
+        Args:
+            nombre (str): Nombre de la partida
+        
+        Returns:
+            dict: Nombre, tipo, importe y categoría (ruta "A/B")
+        
+        Raises:
+            KeyError: Si la partida no existe
+        """
+        return self._describir(nombre, self._obtener_partida(nombre))
+    
+    def partidas(self, categoria=""):
+        """
+        Lista las partidas de una categoría y de sus subcategorías.
+        
+        Args:
+            categoria (str o tuple, optional): Ruta de la categoría. Default es la raíz.
+        
+        Returns:
+            list: Diccionarios con nombre, tipo, importe y categoría, ordenados por categoría
+        
+        Raises:
+            KeyError: Si la categoría no existe
+        """
+        resultado = []
+        pendientes = [self._buscar_categoria(categoria)]
+        while pendientes:
+            nodo = pendientes.pop()
+            resultado.extend(self._describir(nombre, self._partidas[nombre])
+                             for nombre in sorted(nodo.partidas))
+            pendientes.extend(nodo.hijos[hijo] for hijo in sorted(nodo.hijos, reverse=True))
+        return resultado
+    
+    def categorias(self):
+        """
+        Lista todas las categorías con sus totales, en orden jerárquico.
+        
+        Returns:
+            list: Diccionarios con categoria (ruta "A/B"), nivel, costos_fijos,
+                costo_variable y partidas (incluidas las subcategorías)
+        """
+        resultado = []
+        pendientes = [self._raiz.hijos[hijo] for hijo in sorted(self._raiz.hijos, reverse=True)]
+        while pendientes:
+            nodo = pendientes.pop()
+            ruta = nodo.ruta()
+            resultado.append({
+                "categoria": SEPARADOR.join(ruta),
+                "nivel": len(ruta) - 1,
+                "costos_fijos": float(nodo.fijo),
+                "costo_variable": float(nodo.variable),
+                "partidas": nodo.cantidad
+            })
+            pendientes.extend(nodo.hijos[hijo] for hijo in sorted(nodo.hijos, reverse=True))
+        return resultado
+    
+    def recalcular(self):
+        """
+        Vuelve a sumar todos los totales desde las partidas (por ejemplo para verificarlos).
+        
+        Returns:
+            dict: Totales de la raíz tras el recálculo
+        """
+        pendientes = [self._raiz]
+        while pendientes:
+            nodo = pendientes.pop()
+            nodo.fijo = nodo.variable = Decimal(0)
+            nodo.cantidad = 0
+            pendientes.extend(nodo.hijos.values())
+        
+        for partida in self._partidas.values():
+            self._propagar(partida["categoria"], partida["tipo"], partida["importe"], 1)
+        self._notificar()
+        
+        return self.total()
+    
+    # Serialización
+    def a_lista(self):
+        """
+        Convierte la estructura en una lista de partidas (por ejemplo para guardarla).
+        
+        Returns:
+            list: Diccionarios con nombre, tipo, importe y categoría
+        """
+        return self.partidas()
+    
+    @classmethod
+    def desde_lista(cls, partidas):
+        """
+        Crea una estructura a partir de una lista de partidas.
+        
+        Args:
+            partidas (list): Diccionarios con nombre, tipo, importe y categoría (opcional)
+        
+        Returns:
+            EstructuraCostos: Estructura con las partidas indicadas
+        
+        Raises:
+            ValueError: Si alguna partida no es válida
+        """
+        estructura = cls()
+        with estructura.lote():
+            for partida in partidas:
+                try:
+                    estructura.agregar_partida(partida["nombre"], partida["tipo"], partida["importe"],
+                                               partida.get("categoria", ""))
+                except KeyError as e:
+                    raise ValueError(f"Falta el dato {e.args[0]} en una partida.")
+        return estructura
+    
+    # Notificaciones
+    def suscribir(self, callback):
+        """
+        Registra una función que se llama cuando cambian los totales.
+        
+        Args:
+            callback (callable): Función que recibe el conjunto de rutas de las categorías
+                afectadas ("" es la raíz)
+        """
+        self._suscriptores.append(callback)
+    
+    def cancelar_suscripcion(self, callback):
+        """
+        Elimina una función registrada con suscribir.
+        
+        Args:
+            callback (callable): Función a eliminar
+        """
+        self._suscriptores = [c for c in self._suscriptores if c != callback]
+    
+    def vincular_modelo(self, modelo):
+        """
+        Mantiene los costos fijos y el costo variable de un ModeloEquilibrio iguales a los totales.
+        
+        Args:
+            modelo (ModeloEquilibrio): Modelo de la aplicación
+        
+        Returns:
+            callable: Función suscrita (para cancelar la vinculación con cancelar_suscripcion)
+        """
+        def actualizar(afectadas=None):
+            modelo.establecer(costos_fijos=self.costos_fijos, costo_variable=self.costo_variable)
+        
+        actualizar()
+        self.suscribir(actualizar)
+        return actualizar
+    
+    @contextmanager
+    def lote(self):
+        """
+        Agrupa varias modificaciones para notificar una sola vez al terminar.
+        
+        Ejemplo:
+            with estructura.lote():
+                for nombre, importe in cambios:
+                    estructura.modificar_partida(nombre, importe)
+        """
+        self._nivel_lote += 1
+        try:
+            yield self
+        finally:
+            self._nivel_lote -= 1
+            self._notificar()
+    
+    # Métodos internos
+    def _obtener_partida(self, nombre):
+        """Devuelve una partida o lanza KeyError con un mensaje claro."""
+        try:
+            return self._partidas[nombre]
+        except KeyError:
+            raise KeyError(f"No existe la partida '{nombre}'.")
+    
+    def _describir(self, nombre, partida):
+        """Devuelve los datos públicos de una partida."""
+        return {
+            "nombre": nombre,
+            "tipo": partida["tipo"],
+            "importe": float(partida["importe"]),
+            "categoria": SEPARADOR.join(partida["categoria"].ruta())
+        }
+    
+    def _buscar_categoria(self, categoria):
+        """Devuelve el nodo de una categoría existente."""
+        nodo = self._raiz
+        for nivel in _dividir_ruta(categoria):
+            if nivel not in nodo.hijos:
+                raise KeyError(f"No existe la categoría '{SEPARADOR.join(_dividir_ruta(categoria))}'.")
+            nodo = nodo.hijos[nivel]
+        return nodo
+    
+    def _crear_categoria(self, niveles):
+        """Devuelve el nodo de una categoría, creando los niveles que falten."""
+        nodo = self._raiz
+        for nivel in niveles:
+            if nivel not in nodo.hijos:
+                nodo.hijos[nivel] = _Categoria(nivel, nodo)
+            nodo = nodo.hijos[nivel]
+        return nodo
+    
+    def _quitar(self, nombre, partida):
+        """Resta una partida de los totales de su ruta y la retira de su categoría."""
+        nodo = partida["categoria"]
+        nodo.partidas.discard(nombre)
+        self._propagar(nodo, partida["tipo"], -partida["importe"], -1)
+    
+    def _propagar(self, nodo, tipo, diferencia, cantidad):
+        """
+        Suma una diferencia a los totales de un nodo y de todos sus antecesores.
+        
+        Args:
+            nodo (_Categoria): Categoría de la partida
+            tipo (str): Tipo de la partida
+            diferencia (Decimal): Importe a sumar (negativo para restar)
+            cantidad (int): Variación del número de partidas
+        """
+        while nodo is not None:
+            if tipo == "fijo":
+                nodo.fijo += diferencia
+            else:
+                nodo.variable += diferencia
+            nodo.cantidad += cantidad
+            self._afectadas.add(nodo)
+            nodo = nodo.padre
+    
+    def _notificar(self):
+        """Llama a los suscriptores con las categorías afectadas, salvo dentro de un lote."""
+        if self._nivel_lote or not self._afectadas:
+            return
+        
+        afectadas = {SEPARADOR.join(nodo.ruta()) for nodo in self._afectadas}
+        self._afectadas = set()
+        for callback in list(self._suscriptores):
+            callback(afectadas)
\ No newline at end of file
@@ -0,0 +1,363 @@
+"""
+Módulo que define el almacén observable del modelo de la aplicación.
+
+El modelo guarda los datos de entrada como campos tipados, notifica a los suscriptores
+qué campos cambiaron y calcula los valores derivados (analizador, resultados y datos del
+gráfico) sólo cuando cambian sus entradas.
+"""
+
+from collections import Counter
+
+from core.equilibrio import AnalizadorEquilibrio
+
+
+class Campo:
+    """
+    Descripción de un campo del modelo: su tipo y su valor por defecto.
+    """
+    
+    def __init__(self, tipo, defecto=None, admite_nulo=False):
+        """
+        Inicializa la descripción del campo.
+        
+        Args:
+            tipo (type): Tipo al que se convierten los valores asignados (None para no convertir)
+            defecto (optional): Valor por defecto del campo
+            admite_nulo (bool, optional): Si el campo acepta None. Default es False.
+        """
+        self.tipo = tipo
+        self.defecto = defecto
+        self.admite_nulo = admite_nulo
+    
+    def convertir(self, valor):
+        """
+        Convierte un valor al tipo del campo.
+        
+        Args:
+            valor: Valor a convertir
+        
+        Returns:
+            El valor convertido
+        
+        Raises:
+            ValueError: Si el valor no se puede convertir al tipo del campo
+        """
+        if valor is None:
+            if self.admite_nulo:
+                return None
+            raise ValueError("El campo no admite valores nulos.")
+        
+        if self.tipo is None:
+            return valor
+        
+        try:
+            return self.tipo(valor)
+        except (TypeError, ValueError):
+            raise ValueError(f"No se puede convertir {valor!r} a {self.tipo.__name__}.")
+    
+    def valor_inicial(self):
+        """Devuelve una copia del valor por defecto (para no compartir listas)."""
+        if isinstance(self.defecto, list):
+            return list(self.defecto)
+        return self.defecto
+
+
+def _calcular_analizador(costos_fijos, precio_venta, costo_variable):
+    """Crea el analizador, o devuelve None si todavía no hay datos."""
+    if costos_fijos == 0 and precio_venta == 0 and costo_variable == 0:
+        return None
+    
+    return AnalizadorEquilibrio(
+        costos_fijos=costos_fijos,
+        precio_venta=precio_venta,
+        costo_variable_unitario=costo_variable
+    )
+
+
+def _calcular_resultados(analizador, unidades_esperadas):
+    """Calcula los indicadores del análisis para las unidades esperadas."""
+    if analizador is None:
+        return {}
+    
+    pe_unidades = analizador.punto_equilibrio_unidades()
+    
+    # Calcular margen de seguridad si las unidades esperadas son mayores al punto de equilibrio
+    if unidades_esperadas > pe_unidades:
+        margen_seguridad = analizador.margen_seguridad(unidades_esperadas)
+        utilidad_estimada = analizador.utilidad_estimada(unidades_esperadas)
+        gao = analizador.grado_apalancamiento_operativo(unidades_esperadas)
+    else:
+        margen_seguridad = {"unidades": 0, "valor": 0, "porcentaje": 0}
+        utilidad_estimada = 0
+        gao = 0
+    
+    return {
+        "pe_unidades": pe_unidades,
+        "pe_valor": analizador.punto_equilibrio_valor(),
+        "ratio_mc": analizador.ratio_margen_contribucion(),
+        "margen_seguridad": margen_seguridad,
+        "utilidad_estimada": utilidad_estimada,
+        "gao": gao
+    }
+
+
+def _calcular_unidades_max_grafico(analizador, unidades_esperadas, rango_grafico):
+    """Calcula el máximo de unidades del gráfico (None para el rango automático)."""
+    if rango_grafico is not None:
+        return rango_grafico
+    
+    if analizador is None or unidades_esperadas <= 0:
+        return None
+    
+    return max(analizador.punto_equilibrio_unidades() * 2, unidades_esperadas * 1.2)
+
+
+def _calcular_datos_grafico(analizador, unidades_max_grafico):
+    """Genera los datos del gráfico de punto de equilibrio."""
+    if analizador is None:
+        return None
+    
+    return analizador.generar_datos_grafico(unidades_max=unidades_max_grafico)
+
+
+class ModeloEquilibrio:
+    """
+    Almacén observable con los datos compartidos por las vistas de la aplicación.
+    
+    Se accede como a un diccionario (modelo["costos_fijos"]) tanto a los campos
+    como a los valores derivados; éstos últimos son de sólo lectura.
+    """
+    
+    # Campos editables del modelo
+    CAMPOS = {
+        "costos_fijos": Campo(float, 0.0),
+        "precio_venta": Campo(float, 0.0),
+        "costo_variable": Campo(float, 0.0),
+        "unidades_esperadas": Campo(float, 0.0),
+        "rango_grafico": Campo(float, None, admite_nulo=True),  # None = rango automático
+        "productos_multiple": Campo(list, []),  # Para análisis multiproducto
+        "analisis_sensibilidad": Campo(None, None, admite_nulo=True),
+    }
+    
+    # Valores derivados: nombre -> (entradas, función que los calcula)
+    DERIVADOS = {
+        "analizador": (("costos_fijos", "precio_venta", "costo_variable"), _calcular_analizador),
+        "resultados": (("analizador", "unidades_esperadas"), _calcular_resultados),
+        "unidades_max_grafico": (
+            ("analizador", "unidades_esperadas", "rango_grafico"), _calcular_unidades_max_grafico),
+        "datos_grafico": (("analizador", "unidades_max_grafico"), _calcular_datos_grafico),
+    }
+    
+    def __init__(self):
+        """Inicializa el modelo con los valores por defecto."""
+        self._valores = {nombre: campo.valor_inicial() for nombre, campo in self.CAMPOS.items()}
+        
+        # Caché de derivados: nombre -> (valores de entrada, valor calculado)
+        self._cache = {}
+        self._errores = {}
+        
+        # Suscriptores: lista de (callback, conjunto de nombres o None para todos)
+        self._suscriptores = []
+        
+        # Número de veces que se calculó cada derivado (para diagnóstico)
+        self.recalculos = Counter()
+        
+        # Derivados que son entrada de otros derivados (se comparan al cambiar sus entradas)
+        self._intermedios = {
+            entrada for entradas, _ in self.DERIVADOS.values() for entrada in entradas
+            if entrada in self.DERIVADOS
+        }
+    
+    # Acceso tipo diccionario
+    def __getitem__(self, nombre):
+        if nombre in self._valores:
+            return self._valores[nombre]
+        if nombre in self.DERIVADOS:
+            return self._obtener_derivado(nombre)
+        raise KeyError(nombre)
+    
+    def __setitem__(self, nombre, valor):
+        self.establecer(**{nombre: valor})
+    
+    def __contains__(self, nombre):
+        return nombre in self.CAMPOS or nombre in self.DERIVADOS
+    
+    def get(self, nombre, defecto=None):
+        """
+        Obtiene un campo o valor derivado, o el valor por defecto si no existe.
+        
+        Args:
+            nombre (str): Nombre del campo o del valor derivado
+            defecto (optional): Valor a devolver si el nombre no existe
+        
+        Returns:
+            El valor solicitado
+        """
+        if nombre not in self:
+            return defecto
+        valor = self[nombre]
+        return defecto if valor is None else valor
+    
+    def keys(self):
+        """Devuelve los nombres de los campos y de los valores derivados."""
+        return list(self.CAMPOS) + list(self.DERIVADOS)
+    
+    def es_campo(self, nombre):
+        """
+        Indica si un nombre corresponde a un campo editable.
+        
+        Args:
+            nombre (str): Nombre a comprobar
+        
+        Returns:
+            bool: True si es un campo editable
+        """
+        return nombre in self.CAMPOS
+    
+    # Modificación y notificaciones
+    def establecer(self, **valores):
+        """
+        Asigna uno o varios campos y notifica una sola vez los cambios.
+        
+        Args:
+            **valores: Valores de los campos a asignar
+        
+        Returns:
+            set: Nombres de los campos y derivados afectados (vacío si nada cambió)
+        
+        Raises:
+            KeyError: Si algún nombre no es un campo editable
+            ValueError: Si algún valor no se puede convertir al tipo del campo
+        """
+        # Convertir todos los valores antes de modificar nada
+        convertidos = {}
+        for nombre, valor in valores.items():
+            if nombre not in self.CAMPOS:
+                raise KeyError(f"'{nombre}' no es un campo editable del modelo.")
+            convertidos[nombre] = self.CAMPOS[nombre].convertir(valor)
+        
+        cambios = set()
+        for nombre, valor in convertidos.items():
+            if not _mismo_valor(self._valores[nombre], valor):
+                self._valores[nombre] = valor
+                cambios.add(nombre)
+        
+        if cambios:
+            cambios.update(self._derivados_cambiados(cambios))
+            self._notificar(cambios)
+        
+        return cambios
+    
+    def reiniciar(self):
+        """Restablece todos los campos a sus valores por defecto."""
+        self.establecer(**{nombre: campo.valor_inicial() for nombre, campo in self.CAMPOS.items()})
+    
+    def suscribir(self, callback, nombres=None):
+        """
+        Registra una función que se llama cuando cambian los campos o derivados indicados.
+        
+        Args:
+            callback (callable): Función que recibe el conjunto de nombres afectados
+            nombres (iterable, optional): Nombres de interés. Si es None, cualquier cambio.
+        """
+        self._suscriptores.append((callback, set(nombres) if nombres is not None else None))
+    
+    def cancelar_suscripcion(self, callback):
+        """
+        Elimina una función registrada con suscribir.
+        
+        Args:
+            callback (callable): Función a eliminar
+        """
+        self._suscriptores = [(c, n) for c, n in self._suscriptores if c != callback]
+    
+    def error(self, nombre):
+        """
+        Obtiene el error producido al calcular un valor derivado.
+        
+        Args:
+            nombre (str): Nombre del valor derivado
+        
+        Returns:
+            Exception: El error del último cálculo, o None si no hubo error
+        """
+        self._obtener_derivado(nombre)
+        return self._errores.get(nombre)
+    
+    def instantanea(self):
+        """
+        Obtiene una copia del modelo como diccionario (p. ej. para exportar en otro hilo).
+        
+        Returns:
+            dict: Campos y valores derivados actuales
+        """
+        return {nombre: self[nombre] for nombre in self.keys()}
+    
+    def _notificar(self, cambios):
+        """Llama a los suscriptores interesados en alguno de los cambios."""
+        for callback, nombres in list(self._suscriptores):
+            if nombres is None or nombres & cambios:
+                callback(cambios)
+    
+    def _obtener_derivado(self, nombre):
+        """Devuelve un derivado, recalculándolo sólo si cambiaron sus entradas."""
+        entradas, funcion = self.DERIVADOS[nombre]
+        valores_entrada = tuple(self[entrada] for entrada in entradas)
+        
+        en_cache = self._cache.get(nombre)
+        if en_cache is not None and all(
+                _mismo_valor(a, b) for a, b in zip(en_cache[0], valores_entrada)):
+            return en_cache[1]
+        
+        self.recalculos[nombre] += 1
+        try:
+            valor = funcion(*valores_entrada)
+            self._errores.pop(nombre, None)
+        except ValueError as e:
+            valor = None
+            self._errores[nombre] = e
+        
+        self._cache[nombre] = (valores_entrada, valor)
+        return valor
+    
+    def _derivados_cambiados(self, campos):
+        """
+        Devuelve los derivados cuyo valor puede haber cambiado al cambiar unos campos.
+        
+        Los derivados intermedios ya calculados se recalculan y sólo cuentan como
+        cambiados si su valor es distinto, de modo que, por ejemplo, cambiar las unidades
+        esperadas con un rango de gráfico fijo no afecta a los datos del gráfico. Los
+        demás derivados se siguen calculando sólo cuando se leen.
+        
+        Args:
+            campos (set): Campos que cambiaron
+        
+        Returns:
+            set: Nombres de los derivados afectados
+        """
+        cambiados = set(campos)
+        
+        # DERIVADOS está ordenado de forma que las entradas preceden a sus dependientes
+        for nombre, (entradas, _) in self.DERIVADOS.items():
+            if cambiados.isdisjoint(entradas):
+                continue
+            
+            if nombre in self._intermedios and nombre in self._cache:
+                anterior = self._cache[nombre][1]
+                if _mismo_valor(self._obtener_derivado(nombre), anterior):
+                    continue
+            
+            cambiados.add(nombre)
+        
+        return cambiados - set(campos)
+
+
+def _mismo_valor(a, b):
+    """Compara valores: por igualdad los simples y por identidad los objetos."""
+    if a is b:
+        return True
+    if isinstance(a, (int, float, str)) and isinstance(b, (int, float, str)):
+        return a == b
+    if isinstance(a, list) and isinstance(b, list):
+        return a == b
+    return False
\ No newline at end of file
@@ -0,0 +1,176 @@
+"""
+Módulo que contiene la búsqueda de objetivos (goal seek) del análisis de equilibrio.
+
+AnalizadorEquilibrio.calcular_unidades_para_utilidad_objetivo resuelve las unidades para
+una utilidad objetivo de un escenario. Aquí se despeja cualquiera de las variables del
+modelo (unidades, precio de venta, costo variable o costos fijos) para alcanzar una
+utilidad, un margen de seguridad o un grado de apalancamiento operativo, sobre arreglos
+de escenarios y de objetivos a la vez.
+
+Los tres objetivos equivalen a exigir una contribución total
+u * (p - cv) = alfa * cf + beta:
+
+    utilidad U:               alfa = 1,             beta = U
+    margen de seguridad M %:  alfa = 1 / (1 - M/100), beta = 0
+    GAO G:                    alfa = G / (G - 1),   beta = 0
+
+que es lineal en cada variable, por lo que todas las soluciones son explícitas.
+"""
+
+import numpy as np
+
+
+# Variables que se pueden despejar y objetivos disponibles
+INCOGNITAS = ("unidades", "precio_venta", "costo_variable", "costos_fijos")
+OBJETIVOS = ("utilidad", "margen_seguridad", "gao")
+
+
+def _coeficientes(objetivo, valor_objetivo):
+    """
+    Traduce un objetivo a los coeficientes de la contribución total exigida.
+    
+    Args:
+        objetivo (str): Uno de OBJETIVOS
+        valor_objetivo (numpy.ndarray): Valores objetivo
+    
+    Returns:
+        tuple: (alfa, beta, validos) como arreglos; los objetivos no alcanzables
+            (margen de seguridad fuera de [0, 100) o GAO no mayor que 1) no son válidos
+    """
+    if objetivo == "utilidad":
+        return np.ones_like(valor_objetivo), valor_objetivo, np.isfinite(valor_objetivo)
+    
+    if objetivo == "margen_seguridad":
+        validos = (valor_objetivo >= 0) & (valor_objetivo < 100)
+        fraccion = np.where(validos, valor_objetivo / 100, 0.0)
+        return 1 / (1 - fraccion), np.zeros_like(valor_objetivo), validos
+    
+    validos = valor_objetivo > 1
+    gao = np.where(validos, valor_objetivo, 2.0)
+    return gao / (gao - 1), np.zeros_like(valor_objetivo), validos
+
+
+def resolver_objetivo(incognita, objetivo, valor_objetivo, costos_fijos=None, precio_venta=None,
+                      costo_variable=None, unidades=None):
+    """
+    Despeja una variable para alcanzar un objetivo en muchos escenarios a la vez.
+    
+    Los valores objetivo y las variables conocidas se combinan con las reglas de
+    difusión de numpy: por ejemplo, objetivos de forma (T, 1) y escenarios de forma (S,)
+    dan resultados de forma (T, S).
+    
+    Args:
+        incognita (str): Variable a despejar (uno de INCOGNITAS); no se indica su valor
+        objetivo (str): Objetivo a alcanzar (uno de OBJETIVOS)
+        valor_objetivo (array-like): Utilidad, margen de seguridad en porcentaje o GAO
+        costos_fijos (array-like, optional): Costos fijos
+        precio_venta (array-like, optional): Precio de venta unitario
+        costo_variable (array-like, optional): Costo variable unitario
+        unidades (array-like, optional): Unidades vendidas
+    
+    Returns:
+        dict: Arreglos valor (la variable despejada, NaN si no hay solución) y factible
+            (True si el escenario resultante tiene margen de contribución positivo,
+            unidades positivas y costos y precio no negativos)
+    
+    Raises:
+        ValueError: Si la incógnita o el objetivo no son válidos o falta alguna variable
+    """
+    if incognita not in INCOGNITAS:
+        raise ValueError(f"Variable a despejar no válida: {incognita}")
+    
+    if objetivo not in OBJETIVOS:
+        raise ValueError(f"Objetivo no válido: {objetivo}")
+    
+    conocidas = {
+        "costos_fijos": costos_fijos,
+        "precio_venta": precio_venta,
+        "costo_variable": costo_variable,
+        "unidades": unidades
+    }
+    del conocidas[incognita]
+    
+    faltantes = [nombre for nombre, valor in conocidas.items() if valor is None]
+    if faltantes:
+        raise ValueError(f"Faltan las variables conocidas: {', '.join(faltantes)}")
+    
+    # Los arreglos se combinan por difusión sin copiarlos a la forma del resultado
+    objetivo_valores = np.asarray(valor_objetivo, dtype=float)
+    variables = {nombre: np.asarray(valor, dtype=float) for nombre, valor in conocidas.items()}
+    alfa, beta, validos = _coeficientes(objetivo, objetivo_valores)
+    
+    # Condiciones de viabilidad que sólo dependen de los datos (arreglos pequeños)
+    condiciones = [validos]
+    for nombre, valor in variables.items():
+        condiciones.append(valor > 0 if nombre in ("precio_venta", "unidades") else valor >= 0)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Despejar de u * (p - cv) = alfa * cf + beta
+        if incognita == "costos_fijos":
+            pv, cv, u = variables["precio_venta"], variables["costo_variable"], variables["unidades"]
+            condiciones.append(pv > cv)
+            valor = (u * (pv - cv) - beta) / alfa
+            viable = (valor >= 0) & (valor < np.inf)
+        else:
+            contribucion = alfa * variables["costos_fijos"] + beta
+            
+            if incognita == "unidades":
+                pv, cv = variables["precio_venta"], variables["costo_variable"]
+                condiciones.append(pv > cv)
+                valor = contribucion / (pv - cv)
+                viable = (valor > 0) & (valor < np.inf)
+            elif incognita == "precio_venta":
+                cv, u = variables["costo_variable"], variables["unidades"]
+                valor = contribucion / u + cv
+                viable = (valor > cv) & (valor < np.inf)
+            else:  # Costo variable unitario
+                pv, u = variables["precio_venta"], variables["unidades"]
+                valor = pv - contribucion / u
+                viable = (valor >= 0) & (valor < pv)
+    
+    # El escenario resultante debe ser viable: margen de contribución positivo, unidades
+    # positivas y costos y precio no negativos
+    factible = np.asarray(viable)
+    for condicion in condiciones:
+        factible = factible & condicion
+    valor = np.asarray(valor)
+    valor[~factible] = np.nan
+    
+    return {
+        "valor": valor,
+        "factible": factible
+    }
+
+
+def tabla_objetivos(incognita, objetivo, valores_objetivo, costos_fijos=None, precio_venta=None,
+                    costo_variable=None, unidades=None):
+    """
+    Genera la tabla de una variable despejada para cada objetivo y cada escenario.
+    
+    Args:
+        incognita (str): Variable a despejar (uno de INCOGNITAS)
+        objetivo (str): Objetivo a alcanzar (uno de OBJETIVOS)
+        valores_objetivo (array-like): Lista de T valores objetivo
+        costos_fijos (array-like, optional): Costos fijos de los S escenarios
+        precio_venta (array-like, optional): Precio de venta de los S escenarios
+        costo_variable (array-like, optional): Costo variable de los S escenarios
+        unidades (array-like, optional): Unidades vendidas de los S escenarios
+    
+    Returns:
+        dict: Objetivos (T,), valor y factible de forma (T, S)
+    
+    Raises:
+        ValueError: Si la incógnita o el objetivo no son válidos o falta alguna variable
+    """
+    objetivos = np.ravel(np.asarray(valores_objetivo, dtype=float))
+    
+    # Cada objetivo es una fila; las variables de los escenarios se difunden como columnas
+    resultado = resolver_objetivo(
+        incognita, objetivo, objetivos[:, np.newaxis],
+        **{nombre: None if valor is None else np.ravel(np.asarray(valor, dtype=float))
+           for nombre, valor in (("costos_fijos", costos_fijos), ("precio_venta", precio_venta),
+                                 ("costo_variable", costo_variable), ("unidades", unidades))}
+    )
+    resultado["objetivos"] = objetivos
+    
+    return resultado
\ No newline at end of file
@@ -0,0 +1,160 @@
+"""
+Módulo que contiene la proyección del punto de equilibrio en varios períodos.
+
+A diferencia de AnalizadorEquilibrio, que analiza un único período, aquí los costos
+fijos, el precio, el costo variable y el volumen de cada período siguen una serie
+temporal con crecimiento y estacionalidad. Los cálculos se hacen con arreglos de numpy
+de forma (escenarios, períodos), de modo que muchos escenarios se proyectan a la vez.
+"""
+
+import numpy as np
+
+
+def generar_serie(valor_inicial, periodos, crecimiento=0.0, estacionalidad=None):
+    """
+    Genera la serie temporal de una variable con crecimiento compuesto y estacionalidad.
+    
+    Args:
+        valor_inicial (float o array-like): Valor del primer período (uno por escenario)
+        periodos (int): Número de períodos de la serie
+        crecimiento (float o array-like, optional): Tasa de crecimiento por período en
+            decimal (0.01 = 1 %), una por escenario. Default es 0.
+        estacionalidad (array-like, optional): Factores multiplicativos de un ciclo (por
+            ejemplo 12 valores mensuales) que se repiten a lo largo de la serie
+    
+    Returns:
+        numpy.ndarray: Serie de forma (períodos,) o (escenarios, períodos)
+    
+    Raises:
+        ValueError: Si el número de períodos o la estacionalidad no son válidos
+    """
+    if periodos < 1:
+        raise ValueError("El número de períodos debe ser al menos 1.")
+    
+    valor_inicial = np.asarray(valor_inicial, dtype=float)
+    crecimiento = np.asarray(crecimiento, dtype=float)
+    
+    # Factor de crecimiento compuesto de cada período: (1 + g) ** t
+    t = np.arange(periodos)
+    serie = valor_inicial[..., np.newaxis] * (1 + crecimiento[..., np.newaxis]) ** t
+    
+    if estacionalidad is not None:
+        estacionalidad = np.asarray(estacionalidad, dtype=float)
+        if estacionalidad.ndim != 1 or estacionalidad.size == 0:
+            raise ValueError("La estacionalidad debe ser una lista no vacía de factores.")
+        
+        # Repetir el ciclo hasta cubrir todos los períodos
+        serie = serie * np.resize(estacionalidad, periodos)
+    
+    return serie
+
+
+def _primer_periodo(alcanzado):
+    """
+    Busca, por fila, el primer período en que se cumple una condición monótona.
+    
+    Args:
+        alcanzado (numpy.ndarray): Booleanos (escenarios, períodos) que, una vez True,
+            siguen siendo True en los períodos siguientes
+    
+    Returns:
+        numpy.ndarray: Índice del primer período True de cada fila (períodos si no hay)
+    """
+    escenarios, periodos = alcanzado.shape
+    
+    # Cada fila es 0...0 1...1; sumando 2 * fila la matriz aplanada queda ordenada y
+    # un único searchsorted encuentra el primer 1 de todas las filas
+    desplazamiento = 2 * np.arange(escenarios)
+    claves = (alcanzado.astype(np.int64) + desplazamiento[:, np.newaxis]).ravel()
+    posiciones = np.searchsorted(claves, desplazamiento + 1)
+    
+    return posiciones - np.arange(escenarios) * periodos
+
+
+def proyectar_equilibrio(costos_fijos, precio_venta, costo_variable, unidades,
+                         inversion_inicial=0.0):
+    """
+    Proyecta la utilidad por período y el punto de equilibrio acumulado.
+    
+    Los argumentos se combinan con las reglas de difusión de numpy hasta la forma
+    (períodos,) o (escenarios, períodos). El equilibrio acumulado es el primer momento
+    en que la utilidad acumulada, descontada la inversión inicial, deja de ser negativa;
+    dentro de ese período se supone que la utilidad se genera de forma uniforme.
+    
+    Args:
+        costos_fijos (array-like): Costos fijos de cada período
+        precio_venta (array-like): Precio de venta unitario de cada período
+        costo_variable (array-like): Costo variable unitario de cada período
+        unidades (array-like): Unidades vendidas en cada período
+        inversion_inicial (float o array-like, optional): Inversión a recuperar antes del
+            primer período (una por escenario). Default es 0.
+    
+    Returns:
+        dict: Arreglos por período (ingresos, costos_totales, margen_contribucion,
+            utilidad, utilidad_acumulada y pe_unidades, NaN si el margen no es positivo)
+            y por escenario: alcanzado, periodo (índice desde 0 del período en que se
+            alcanza el equilibrio acumulado, -1 si no se alcanza), fraccion (parte de ese
+            período necesaria) y periodo_exacto (periodo + fraccion, NaN si no se alcanza)
+    
+    Raises:
+        ValueError: Si las series no tienen al menos un período
+    """
+    cf, pv, cv, u = np.broadcast_arrays(
+        *(np.asarray(valores, dtype=float) for valores in
+          (costos_fijos, precio_venta, costo_variable, unidades))
+    )
+    if cf.ndim == 0 or cf.shape[-1] == 0:
+        raise ValueError("Las series deben tener al menos un período.")
+    
+    # Trabajar siempre con dos dimensiones y devolver la forma original al final
+    una_serie = cf.ndim == 1
+    cf, pv, cv, u = (np.atleast_2d(serie) for serie in (cf, pv, cv, u))
+    escenarios, periodos = cf.shape
+    inversion = np.broadcast_to(np.asarray(inversion_inicial, dtype=float), (escenarios,))
+    
+    # Resultados de cada período
+    margen = pv - cv
+    ingresos = u * pv
+    costos_totales = cf + u * cv
+    utilidad = ingresos - costos_totales
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pe_unidades = np.where(margen > 0, cf / margen, np.nan)
+    
+    # Utilidad acumulada, partiendo de la inversión inicial
+    acumulada = np.cumsum(utilidad, axis=1) - inversion[:, np.newaxis]
+    
+    # El máximo acumulado es monótono, así que el primer período con máximo >= 0 es el
+    # primero en que la utilidad acumulada deja de ser negativa
+    maximo = np.maximum.accumulate(acumulada, axis=1)
+    periodo = _primer_periodo(maximo >= 0)
+    alcanzado = periodo < periodos
+    
+    # Fracción del período: lo que faltaba al empezarlo entre la utilidad del período
+    filas = np.arange(escenarios)
+    indice = np.minimum(periodo, periodos - 1)
+    anterior = np.where(indice > 0, acumulada[filas, np.maximum(indice - 1, 0)], -inversion)
+    utilidad_periodo = utilidad[filas, indice]
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fraccion = np.where(anterior < 0, -anterior / utilidad_periodo, 0.0)
+    fraccion = np.where(alcanzado, np.clip(fraccion, 0.0, 1.0), np.nan)
+    periodo = np.where(alcanzado, periodo, -1)
+    
+    resultados = {
+        "ingresos": ingresos,
+        "costos_totales": costos_totales,
+        "margen_contribucion": margen,
+        "utilidad": utilidad,
+        "utilidad_acumulada": acumulada,
+        "pe_unidades": pe_unidades,
+        "alcanzado": alcanzado,
+        "periodo": periodo,
+        "fraccion": fraccion,
+        "periodo_exacto": np.where(alcanzado, periodo + fraccion, np.nan)
+    }
+    
+    if una_serie:
+        resultados = {clave: valor[0] for clave, valor in resultados.items()}
+    
+    return resultados
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Módulo que contiene los cálculos del análisis de sensibilidad del punto de equilibrio.
+
+Las funciones de este módulo no dependen de la interfaz gráfica, por lo que pueden
+ejecutarse en un hilo de trabajo.
+"""
+
+import numpy as np
+
+
+# Variables que se pueden analizar
+VARIABLES_SENSIBILIDAD = ["Costos Fijos", "Precio de Venta", "Costo Variable Unitario"]
+
+
+def calcular_sensibilidad(costos_fijos, precio_venta, costo_variable, variable,
+                          porcentaje_min, porcentaje_max, incrementos, progreso=None):
+    """
+    Calcula el punto de equilibrio al variar una de las variables en un rango de porcentajes.
+    
+    Args:
+        costos_fijos (float): Costos fijos base
+        precio_venta (float): Precio de venta unitario base
+        costo_variable (float): Costo variable unitario base
+        variable (str): Variable a analizar (uno de VARIABLES_SENSIBILIDAD)
+        porcentaje_min (float): Porcentaje mínimo de cambio
+        porcentaje_max (float): Porcentaje máximo de cambio
+        incrementos (float): Separación entre los porcentajes evaluados
+        progreso (callable, optional): Función llamada con (fraccion, mensaje)
+    
+    Returns:
+        dict: Variable analizada, tabla de resultados por columnas (arreglos de numpy con
+            porcentaje, variable_ajustada, pe_unidades, pe_valor y variacion_pe) y valores base
+    
+    Raises:
+        ValueError: Si los parámetros del análisis no son válidos
+    """
+    # Validar parámetros
+    if variable not in VARIABLES_SENSIBILIDAD:
+        raise ValueError(f"Variable de análisis no válida: {variable}")
+    
+    if porcentaje_min >= porcentaje_max:
+        raise ValueError("El porcentaje mínimo debe ser menor que el máximo.")
+    
+    if incrementos <= 0:
+        raise ValueError("El incremento debe ser mayor que cero.")
+    
+    if progreso:
+        progreso(0.1, "Calculando puntos de equilibrio")
+    
+    # Generar los porcentajes a evaluar y los factores de ajuste
+    porcentajes = np.arange(porcentaje_min, porcentaje_max + incrementos, incrementos)
+    factores = 1 + porcentajes / 100
+    
+    # Ajustar la variable seleccionada para todos los porcentajes a la vez
+    cf = np.full_like(factores, costos_fijos)
+    pv = np.full_like(factores, precio_venta)
+    cv = np.full_like(factores, costo_variable)
+    
+    if variable == "Costos Fijos":
+        cf = cf * factores
+        variable_ajustada = cf
+    elif variable == "Precio de Venta":
+        pv = pv * factores
+        variable_ajustada = pv
+    else:  # Costo Variable Unitario
+        cv = cv * factores
+        variable_ajustada = cv
+    
+    # Descartar los casos inviables (margen de contribución no positivo)
+    margen = pv - cv
+    validos = margen > 0
+    
+    pe_unidades = cf[validos] / margen[validos]
+    pe_valor = pe_unidades * pv[validos]
+    
+    # Variación porcentual respecto al punto de equilibrio base
+    pe_base = costos_fijos / (precio_venta - costo_variable)
+    variacion_pe = (pe_unidades - pe_base) / pe_base * 100 if pe_base else np.zeros_like(pe_unidades)
+    
+    return {
+        "variable": variable,
+        "tabla": {
+            "porcentaje": porcentajes[validos],
+            "variable_ajustada": variable_ajustada[validos],
+            "pe_unidades": pe_unidades,
+            "pe_valor": pe_valor,
+            "variacion_pe": variacion_pe
+        },
+        "valor_base": {
+            "costos_fijos": costos_fijos,
+            "precio_venta": precio_venta,
+            "costo_variable": costo_variable
+        }
+    }
+
+
+def tabla_a_listas(tabla):
+    """
+    Convierte una tabla de resultados por columnas en listas de Python.
+    
+    Útil para guardar el análisis en JSON o exportarlo a Excel.
+    
+    Args:
+        tabla (dict): Arreglos de numpy por columna
+        
+    Returns:
+        dict: Listas de valores por columna
+    """
+    return {clave: np.asarray(valores).tolist() for clave, valores in tabla.items()}
\ No newline at end of file
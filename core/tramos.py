@@ -0,0 +1,227 @@
+"""
+Módulo que contiene el análisis costo-volumen-utilidad por tramos.
+
+AnalizadorEquilibrio supone un único margen de contribución. Aquí los costos fijos
+pueden subir por escalones (por ejemplo un turno adicional por encima de 10 000
+unidades) y el precio y el costo variable pueden cambiar por tramos de volumen. Las
+curvas son lineales entre los cortes, por lo que la utilidad puede cruzar el cero
+varias veces y hay que buscar todos los puntos de equilibrio.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _normalizar_tramos(tramos, nombre):
+    """
+    Convierte la definición de una variable por tramos en dos arreglos ordenados.
+    
+    Args:
+        tramos (float o list): Valor único, o lista de pares (desde_unidades, valor)
+        nombre (str): Nombre de la variable (para los mensajes de error)
+    
+    Returns:
+        tuple: (inicios, valores) como arreglos de numpy
+    
+    Raises:
+        ValueError: Si los tramos no son válidos
+    """
+    if np.isscalar(tramos):
+        tramos = [(0.0, tramos)]
+    
+    if not tramos:
+        raise ValueError(f"Debe indicar al menos un tramo de {nombre}.")
+    
+    inicios, valores = (np.asarray(columna, dtype=float) for columna in zip(*tramos))
+    
+    # Validar los tramos
+    if inicios[0] != 0:
+        raise ValueError(f"El primer tramo de {nombre} debe empezar en 0 unidades.")
+    
+    if np.any(np.diff(inicios) <= 0):
+        raise ValueError(f"Los tramos de {nombre} deben estar ordenados y no repetirse.")
+    
+    if np.any(valores < 0):
+        raise ValueError(f"Los valores de {nombre} no pueden ser negativos.")
+    
+    return inicios, valores
+
+
+class AnalizadorTramos:
+    """
+    Clase para el análisis de punto de equilibrio con costos y precios por tramos.
+    
+    Los costos fijos son escalonados: en cada tramo se paga el costo fijo total de ese
+    tramo. El precio y el costo variable son incrementales: las unidades de cada tramo
+    se venden y se producen al valor de su tramo, de modo que ingresos y costos
+    variables son continuos y sólo los costos fijos dan saltos.
+    """
+    
+    def __init__(self, costos_fijos, precio_venta, costo_variable_unitario):
+        """
+        Inicializa el analizador por tramos.
+        
+        Args:
+            costos_fijos (float o list): Costos fijos, o escalones (desde_unidades, costo_fijo)
+            precio_venta (float o list): Precio de venta, o tramos (desde_unidades, precio)
+            costo_variable_unitario (float o list): Costo variable unitario, o tramos
+                (desde_unidades, costo)
+        
+        Raises:
+            ValueError: Si algún tramo no es válido
+        """
+        variables = {
+            "costos fijos": _normalizar_tramos(costos_fijos, "costos fijos"),
+            "precio de venta": _normalizar_tramos(precio_venta, "precio de venta"),
+            "costo variable": _normalizar_tramos(costo_variable_unitario, "costo variable")
+        }
+        
+        # Cortes de todos los tramos juntos, ordenados
+        self.cortes = np.unique(np.concatenate([inicios for inicios, _ in variables.values()]))
+        
+        # Valor de cada variable en cada segmento entre cortes consecutivos
+        fijos, precios, costos = (
+            valores[np.searchsorted(inicios, self.cortes, side='right') - 1]
+            for inicios, valores in variables.values()
+        )
+        self.costos_fijos = fijos
+        self.precio_venta = precios
+        self.costo_variable_unitario = costos
+        self.margen_contribucion = precios - costos
+        
+        # Ingresos y costos variables acumulados al inicio de cada segmento
+        anchos = np.diff(self.cortes)
+        self._ingresos_inicio = np.concatenate(([0.0], np.cumsum(precios[:-1] * anchos)))
+        self._costos_variables_inicio = np.concatenate(([0.0], np.cumsum(costos[:-1] * anchos)))
+    
+    def _segmentos(self, unidades):
+        """Devuelve el índice del segmento de cada volumen (búsqueda binaria en los cortes)."""
+        return np.searchsorted(self.cortes, unidades, side='right') - 1
+    
+    def evaluar(self, unidades):
+        """
+        Calcula ingresos, costos y utilidad para uno o varios volúmenes.
+        
+        Args:
+            unidades (float o array-like): Unidades vendidas (no negativas)
+        
+        Returns:
+            dict: Arreglos costos_fijos, costos_variables, costos_totales, ingresos y utilidades
+        """
+        unidades = np.asarray(unidades, dtype=float)
+        segmento = self._segmentos(unidades)
+        desde_corte = unidades - self.cortes[segmento]
+        
+        costos_fijos = self.costos_fijos[segmento]
+        costos_variables = self._costos_variables_inicio[segmento] + desde_corte * self.costo_variable_unitario[segmento]
+        ingresos = self._ingresos_inicio[segmento] + desde_corte * self.precio_venta[segmento]
+        costos_totales = costos_fijos + costos_variables
+        
+        return {
+            "costos_fijos": costos_fijos,
+            "costos_variables": costos_variables,
+            "costos_totales": costos_totales,
+            "ingresos": ingresos,
+            "utilidades": ingresos - costos_totales
+        }
+    
+    def puntos_equilibrio(self):
+        """
+        Calcula todos los puntos en que la utilidad cruza el cero.
+        
+        La utilidad es lineal dentro de cada segmento, así que cada segmento tiene como
+        mucho un cruce; además, un escalón de costos fijos puede pasar la utilidad de
+        positiva a negativa (o al revés) en un corte.
+        
+        Returns:
+            list: Diccionarios con unidades, valor (ingresos), tipo ("entrada" si a partir
+                de ahí hay utilidad, "salida" si hay pérdida) y por_salto (True si el cruce
+                se debe a un escalón de costos fijos), ordenados por unidades
+        """
+        utilidad_inicio = self._ingresos_inicio - self._costos_variables_inicio - self.costos_fijos
+        margen = self.margen_contribucion
+        finales = np.append(self.cortes[1:], np.inf)
+        
+        # Cruce dentro de cada segmento (todos los segmentos a la vez)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            raices = self.cortes - utilidad_inicio / margen
+        en_segmento = (margen != 0) & (raices >= self.cortes) & (raices < finales)
+        
+        # Cruces por escalón: la utilidad justo antes del corte tiene el signo contrario
+        utilidad_antes = utilidad_inicio[1:] + (self.costos_fijos[1:] - self.costos_fijos[:-1])
+        saltos = np.flatnonzero(np.sign(utilidad_antes) * np.sign(utilidad_inicio[1:]) < 0) + 1
+        
+        indices = np.flatnonzero(en_segmento)
+        unidades = np.concatenate((raices[indices], self.cortes[saltos]))
+        entradas = np.concatenate((margen[indices] > 0, utilidad_inicio[saltos] > 0))
+        por_salto = np.concatenate((np.zeros(len(indices), dtype=bool), np.ones(len(saltos), dtype=bool)))
+        
+        orden = np.argsort(unidades, kind='stable')
+        ingresos = self.evaluar(unidades[orden])["ingresos"]
+        
+        return [
+            {
+                "unidades": float(u),
+                "valor": float(valor),
+                "tipo": "entrada" if entrada else "salida",
+                "por_salto": bool(salto)
+            }
+            for u, valor, entrada, salto in zip(unidades[orden], ingresos, entradas[orden], por_salto[orden])
+        ]
+    
+    def punto_equilibrio_unidades(self):
+        """
+        Calcula el primer volumen a partir del cual hay utilidad.
+        
+        Returns:
+            float: Unidades del primer punto de equilibrio de entrada, o None si nunca hay utilidad
+        """
+        for punto in self.puntos_equilibrio():
+            if punto["tipo"] == "entrada":
+                return punto["unidades"]
+        return None
+    
+    def generar_datos_grafico(self, unidades_min=0, unidades_max=None, puntos=100):
+        """
+        Genera los datos para graficar el análisis por tramos.
+        
+        Tiene las mismas columnas que AnalizadorEquilibrio.generar_datos_grafico, por lo
+        que FrameGraficos puede dibujarlo sin cambios. Incluye los cortes y los puntos de
+        equilibrio, y en cada escalón de costos fijos repite el corte con el valor de
+        antes del salto para que las líneas lo dibujen vertical.
+        
+        Args:
+            unidades_min (float, optional): Unidades mínimas para el gráfico. Default es 0.
+            unidades_max (float, optional): Unidades máximas para el gráfico. Si es None,
+                se usa 1.5 veces el último corte o punto de equilibrio.
+            puntos (int, optional): Número de puntos equiespaciados. Default es 100.
+        
+        Returns:
+            pandas.DataFrame: DataFrame con los datos para graficar
+        """
+        equilibrios = [punto["unidades"] for punto in self.puntos_equilibrio()]
+        
+        if unidades_max is None:
+            unidades_max = max([self.cortes[-1]] + equilibrios) * 1.5 or 1.0
+        
+        # Puntos equiespaciados más los cortes y los equilibrios dentro del rango
+        especiales = np.concatenate((self.cortes, equilibrios))
+        especiales = especiales[(especiales >= unidades_min) & (especiales <= unidades_max)]
+        unidades = np.unique(np.concatenate((np.linspace(unidades_min, unidades_max, puntos), especiales)))
+        
+        datos = pd.DataFrame({"unidades": unidades, **self.evaluar(unidades)})
+        
+        # Valores justo antes de cada escalón de costos fijos
+        escalones = np.flatnonzero(np.diff(self.costos_fijos) != 0) + 1
+        escalones = escalones[(self.cortes[escalones] > unidades_min) & (self.cortes[escalones] <= unidades_max)]
+        if len(escalones):
+            antes = pd.DataFrame({"unidades": self.cortes[escalones], **self.evaluar(self.cortes[escalones])})
+            antes["costos_fijos"] = self.costos_fijos[escalones - 1]
+            antes["costos_totales"] = antes["costos_fijos"] + antes["costos_variables"]
+            antes["utilidades"] = antes["ingresos"] - antes["costos_totales"]
+            
+            # Orden estable: el valor de antes del salto queda delante del de después
+            datos = pd.concat([antes, datos], ignore_index=True)
+            datos = datos.sort_values("unidades", kind="stable", ignore_index=True)
+        
+        return datos[["unidades", "costos_fijos", "costos_variables", "costos_totales", "ingresos", "utilidades"]]
\ No newline at end of file
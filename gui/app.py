@@ -23,9 +23,16 @@ from gui.frames.resultados import FrameResultados
 from gui.frames.graficos import FrameGraficos
 from gui.frames.sensibilidad import FrameSensibilidad
 from gui.frames.multiproducto import FrameMultiProducto
+from gui.utils.exportaciones import GestorExportaciones, BarraEstado
+from gui.utils.calculos import EjecutorCalculos
+from gui.utils.ventanas_detalle import GestorVentanasDetalle
+from gui.utils.diagnostico import VentanaDiagnostico
+from gui.utils.monitor_respuesta import MonitorRespuesta
+from utils.instrumentacion import instrumentar, obtener_registro
+from utils.trazas import obtener_trazador
 
 # Importar funcionalidades del core (modelo)
-from core.equilibrio import AnalizadorEquilibrio
+from core.modelo import ModeloEquilibrio
 
 
 class AplicacionPuntoEquilibrio:
@@ -53,6 +60,27 @@ class AplicacionPuntoEquilibrio:
         self.contenedor_principal = ttk.Frame(self.root)
         self.contenedor_principal.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
+        # Barra de estado para las tareas en segundo plano
+        self.barra_estado = BarraEstado(self.contenedor_principal)
+        self.barra_estado.pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0))
+        
+        # Gestor de exportaciones en segundo plano
+        self.gestor_exportaciones = GestorExportaciones(self.root, self.barra_estado)
+        
+        # Ejecutor de los análisis costosos (sensibilidad, multiproducto) en segundo plano
+        self.ejecutor_calculos = EjecutorCalculos(self.root)
+        
+        # Ventanas de gráficos detallados (una ventana y una figura por tipo de análisis)
+        self.ventanas_detalle = GestorVentanasDetalle(self.root)
+        
+        # Monitor de bloqueos de la interfaz (activo junto con la instrumentación)
+        self.monitor_respuesta = MonitorRespuesta(self.root)
+        if obtener_registro().activo:
+            self.monitor_respuesta.iniciar()
+        
+        # Ventana de diagnóstico de rendimiento (Ayuda > Diagnóstico)
+        self.ventana_diagnostico = VentanaDiagnostico(self)
+        
         # Crear sistema de pestañas
         self.notebook = ttk.Notebook(self.contenedor_principal)
         self.notebook.pack(fill=tk.BOTH, expand=True)
@@ -74,25 +102,34 @@ class AplicacionPuntoEquilibrio:
         self.notebook.add(self.frame_sensibilidad, text="Análisis de Sensibilidad")
         self.notebook.add(self.frame_multiproducto, text="Análisis Multiproducto")
         
+        # Vistas que dependen del modelo: (método de refresco, valores del modelo que muestran)
+        self.vistas = {
+            self.frame_resultados: (self.frame_resultados.actualizar_resultados, {"resultados"}),
+            self.frame_graficos: (self.frame_graficos.actualizar_grafico, {"analizador", "datos_grafico"}),
+            self.frame_sensibilidad: (self.frame_sensibilidad.actualizar_datos, {"analizador"}),
+        }
+        
+        # Vistas que deben refrescarse la próxima vez que se muestren
+        self.vistas_pendientes = set()
+        
+        # Marcar las vistas afectadas cada vez que cambia el modelo
+        self.modelo.suscribir(self.al_cambiar_modelo)
+        
         # Crear barra de menú
         self.crear_menu()
         
         # Vincular eventos (parte del controlador)
         self.notebook.bind("<<NotebookTabChanged>>", self.cambio_pestaña)
         
+        # Cerrar la ventana con la X pasa por salir, igual que Archivo > Salir
+        self.root.protocol("WM_DELETE_WINDOW", self.salir)
+        
     def inicializar_modelo(self):
         """Inicializa el modelo de datos de la aplicación."""
-        # Datos básicos para el análisis
-        self.modelo = {
-            "costos_fijos": 0.0,
-            "precio_venta": 0.0,
-            "costo_variable": 0.0,
-            "analizador": None,  # Instancia de AnalizadorEquilibrio
-            "datos_grafico": None,  # DataFrame para gráficos
-            "resultados": {},  # Resultados del análisis
-            "unidades_esperadas": 0.0,
-            "productos_multiple": []  # Para análisis multiproducto
-        }
+        # Almacén observable con los datos básicos y los valores derivados
+        # (analizador, resultados y datos del gráfico), que se recalculan sólo
+        # cuando cambian sus entradas
+        self.modelo = ModeloEquilibrio()
     
     def configurar_estilo(self):
         """Configura el estilo visual de la aplicación."""
@@ -125,21 +162,26 @@ class AplicacionPuntoEquilibrio:
         self.menu_archivo.add_command(label="Guardar escenario", command=self.guardar_escenario)
         self.menu_archivo.add_command(label="Cargar escenario", command=self.cargar_escenario)
         self.menu_archivo.add_separator()
-        self.menu_archivo.add_command(label="Salir", command=self.root.quit)
+        self.menu_archivo.add_command(label="Salir", command=self.salir)
         
         # Menú Exportar
         self.menu_exportar = tk.Menu(self.menu_principal, tearoff=0)
         self.menu_principal.add_cascade(label="Exportar", menu=self.menu_exportar)
         self.menu_exportar.add_command(label="Exportar a PDF", command=self.exportar_pdf)
         self.menu_exportar.add_command(label="Exportar a Excel", command=self.exportar_excel)
+        self.menu_exportar.add_separator()
+        self.menu_exportar.add_command(label="Cancelar exportaciones", command=self.cancelar_exportaciones)
         
         # Menú Ayuda
         self.menu_ayuda = tk.Menu(self.menu_principal, tearoff=0)
         self.menu_principal.add_cascade(label="Ayuda", menu=self.menu_ayuda)
         self.menu_ayuda.add_command(label="Acerca de", command=self.mostrar_acerca_de)
         self.menu_ayuda.add_command(label="Manual de uso", command=self.mostrar_manual)
+        self.menu_ayuda.add_separator()
+        self.menu_ayuda.add_command(label="Diagnóstico", command=self.mostrar_diagnostico)
     
     # Métodos del controlador
+    @instrumentar("app.calcular_punto_equilibrio")
     def calcular_punto_equilibrio(self):
         """
         Calcula el punto de equilibrio utilizando los datos actuales.
@@ -152,52 +194,11 @@ class AplicacionPuntoEquilibrio:
             costo_variable = self.frame_datos.obtener_costo_variable()
             unidades_esperadas = self.frame_datos.obtener_unidades_esperadas()
             
-            # Actualizar el modelo
-            self.modelo["costos_fijos"] = costos_fijos
-            self.modelo["precio_venta"] = precio_venta
-            self.modelo["costo_variable"] = costo_variable
-            self.modelo["unidades_esperadas"] = unidades_esperadas
-            
-            # Crear instancia del analizador (parte del modelo)
-            self.modelo["analizador"] = AnalizadorEquilibrio(
-                costos_fijos=costos_fijos,
-                precio_venta=precio_venta,
-                costo_variable_unitario=costo_variable
-            )
-            
-            # Realizar cálculos
-            analizador = self.modelo["analizador"]
-            pe_unidades = analizador.punto_equilibrio_unidades()
-            pe_valor = analizador.punto_equilibrio_valor()
-            ratio_mc = analizador.ratio_margen_contribucion()
-            
-            # Calcular margen de seguridad si las unidades esperadas son mayores al punto de equilibrio
-            if unidades_esperadas > pe_unidades:
-                margen_seguridad = analizador.margen_seguridad(unidades_esperadas)
-                utilidad_estimada = analizador.utilidad_estimada(unidades_esperadas)
-                gao = analizador.grado_apalancamiento_operativo(unidades_esperadas)
-            else:
-                margen_seguridad = {"unidades": 0, "valor": 0, "porcentaje": 0}
-                utilidad_estimada = 0
-                gao = 0
-            
-            # Generar datos para el gráfico
-            self.modelo["datos_grafico"] = analizador.generar_datos_grafico(
-                unidades_max=max(pe_unidades * 2, unidades_esperadas * 1.2) if unidades_esperadas > 0 else None
-            )
-            
-            # Almacenar resultados en el modelo
-            self.modelo["resultados"] = {
-                "pe_unidades": pe_unidades,
-                "pe_valor": pe_valor,
-                "ratio_mc": ratio_mc,
-                "margen_seguridad": margen_seguridad,
-                "utilidad_estimada": utilidad_estimada,
-                "gao": gao
-            }
+            # Actualizar el modelo y realizar los cálculos
+            self._calcular_modelo(costos_fijos, precio_venta, costo_variable, unidades_esperadas)
             
-            # Actualizar vistas
-            self.actualizar_vistas()
+            # Reiniciar la simulación con los nuevos datos
+            self.frame_graficos.reiniciar_simulacion()
             
             # Cambiar a la pestaña de resultados
             self.notebook.select(1)  # Índice 1 corresponde a la pestaña de resultados
@@ -211,12 +212,109 @@ class AplicacionPuntoEquilibrio:
             messagebox.showerror("Error", f"Ocurrió un error al calcular: {str(e)}")
             return False
     
+    @instrumentar("app.simular")
+    def simular(self, costos_fijos, precio_venta, costo_variable, unidades_esperadas):
+        """
+        Recalcula el punto de equilibrio con los valores de los controles de simulación.
+        
+        A diferencia de calcular_punto_equilibrio, no muestra mensajes ni cambia de pestaña,
+        y mantiene estable el rango del gráfico para que pueda actualizarse con blitting.
+        
+        Args:
+            costos_fijos (float): Costos fijos
+            precio_venta (float): Precio de venta unitario
+            costo_variable (float): Costo variable unitario
+            unidades_esperadas (float): Unidades esperadas de venta
+            
+        Returns:
+            bool: True si los valores son válidos y se actualizaron las vistas
+        """
+        if precio_venta <= costo_variable:
+            return False
+        
+        # El rango del gráfico sólo cambia si los datos salen de él o quedan muy pequeños
+        pe_unidades = costos_fijos / (precio_venta - costo_variable)
+        rango_necesario = max(pe_unidades * 2, unidades_esperadas * 1.2, 1.0)
+        rango = self.modelo["rango_grafico"]
+        if rango is None or rango_necesario > rango or rango_necesario < rango / 4:
+            rango = rango_necesario * 1.5
+        
+        # Las vistas se refrescan al recibir la notificación de cambio del modelo
+        self._calcular_modelo(costos_fijos, precio_venta, costo_variable, unidades_esperadas,
+                              unidades_max=rango)
+        
+        # Reflejar los valores en los campos de entrada
+        self.frame_datos.establecer_valores(costos_fijos, precio_venta, costo_variable, unidades_esperadas)
+        
+        return True
+    
+    def _calcular_modelo(self, costos_fijos, precio_venta, costo_variable, unidades_esperadas,
+                         unidades_max=None):
+        """
+        Actualiza el modelo con los datos indicados y realiza los cálculos del análisis.
+        
+        Args:
+            costos_fijos (float): Costos fijos
+            precio_venta (float): Precio de venta unitario
+            costo_variable (float): Costo variable unitario
+            unidades_esperadas (float): Unidades esperadas de venta
+            unidades_max (float, optional): Unidades máximas del gráfico. Si es None, se
+                calculan a partir del punto de equilibrio y las unidades esperadas.
+                
+        Raises:
+            ValueError: Si el margen de contribución no es positivo
+        """
+        # Actualizar el modelo; los valores derivados se calculan al consultarlos
+        self.modelo.establecer(
+            costos_fijos=costos_fijos,
+            precio_venta=precio_venta,
+            costo_variable=costo_variable,
+            unidades_esperadas=unidades_esperadas,
+            rango_grafico=unidades_max
+        )
+        
+        # Comprobar que los datos permiten realizar el análisis
+        if self.modelo["analizador"] is None:
+            raise self.modelo.error("analizador") or ValueError(
+                "Debe ingresar los datos para calcular el punto de equilibrio.")
+    
+    def al_cambiar_modelo(self, cambios):
+        """
+        Marca como desactualizadas las vistas afectadas por un cambio del modelo
+        y refresca la visible.
+        
+        Args:
+            cambios (set): Nombres de los campos y valores derivados que cambiaron
+        """
+        obtener_registro().contar("modelo.cambios")
+        
+        for frame, (_, dependencias) in self.vistas.items():
+            if dependencias & cambios:
+                self.vistas_pendientes.add(frame)
+        
+        self.refrescar_vista_visible()
+    
+    @instrumentar("app.actualizar_vistas")
     def actualizar_vistas(self):
-        """Actualiza todas las vistas con los datos actuales del modelo."""
-        # Actualizar cada frame con los datos actualizados
-        self.frame_resultados.actualizar_resultados()
-        self.frame_graficos.actualizar_grafico()
-        self.frame_sensibilidad.actualizar_datos()
+        """
+        Marca todas las vistas como desactualizadas y refresca sólo la visible.
+        
+        Las demás vistas se refrescan cuando el usuario cambia a su pestaña.
+        """
+        self.vistas_pendientes = set(self.vistas)
+        self.refrescar_vista_visible()
+    
+    def refrescar_vista_visible(self):
+        """Refresca la vista de la pestaña seleccionada si está desactualizada."""
+        seleccion = self.notebook.select()
+        if not seleccion:
+            return
+        
+        frame = self.root.nametowidget(seleccion)
+        if frame in self.vistas_pendientes:
+            self.vistas_pendientes.discard(frame)
+            metodo, _ = self.vistas[frame]
+            metodo()
         
     def cambio_pestaña(self, event):
         """Maneja el evento de cambio de pestaña."""
@@ -233,12 +331,40 @@ class AplicacionPuntoEquilibrio:
                 "Primero debe ingresar los datos y calcular el punto de equilibrio."
             )
             self.notebook.select(0)  # Volver a la pestaña de datos de entrada
+            return
+        
+        # Refrescar la vista si el modelo cambió mientras estaba oculta
+        self.refrescar_vista_visible()
     
     # Métodos para el menú
+    def salir(self):
+        """
+        Cierra la aplicación cancelando las tareas en segundo plano.
+        
+        Se llama desde Archivo > Salir y al cerrar la ventana principal. La traza de la
+        sesión se guarda y el bucle principal termina aunque falle alguno de los cierres.
+        """
+        try:
+            self.gestor_exportaciones.cerrar()
+            self.ejecutor_calculos.cerrar()
+            self.ventanas_detalle.cerrar_todas()
+            self.ventana_diagnostico.cerrar()
+            self.monitor_respuesta.detener()
+        finally:
+            # Guardar la traza de la sesión si se pidió con la variable de entorno
+            trazador = obtener_trazador()
+            if trazador.ruta_salida:
+                try:
+                    trazador.guardar(trazador.ruta_salida)
+                except OSError as e:
+                    print(f"No se pudo guardar la traza en {trazador.ruta_salida}: {e}", file=sys.stderr)
+            
+            self.root.quit()
+    
     def nuevo_analisis(self):
         """Reinicia el análisis actual."""
         if messagebox.askyesno("Nuevo análisis", "¿Desea iniciar un nuevo análisis? Los datos no guardados se perderán."):
-            self.inicializar_modelo()
+            self.modelo.reiniciar()
             self.frame_datos.limpiar_campos()
             self.actualizar_vistas()
             self.notebook.select(0)  # Volver a la pestaña de datos de entrada
@@ -282,28 +408,15 @@ class AplicacionPuntoEquilibrio:
         modelo_cargado = cargar(ruta_archivo)
 
         if modelo_cargado:
-            # Actualizar el modelo con los datos cargados
-            self.modelo.update(modelo_cargado)
-
-            # Recrear el analizador si los datos básicos están disponibles
-            if (self.modelo["costos_fijos"] > 0 and self.modelo["precio_venta"] > 0 and 
-                self.modelo["costo_variable"] > 0):
-                from core.equilibrio import AnalizadorEquilibrio
-                self.modelo["analizador"] = AnalizadorEquilibrio(
-                    costos_fijos=self.modelo["costos_fijos"],
-                    precio_venta=self.modelo["precio_venta"],
-                    costo_variable_unitario=self.modelo["costo_variable"]
-                )
-
-                # Regenerar datos para gráficos si no existen
-                if self.modelo["datos_grafico"] is None and self.modelo["analizador"] is not None:
-                    self.modelo["datos_grafico"] = self.modelo["analizador"].generar_datos_grafico(
-                        unidades_max=self.modelo["unidades_esperadas"] * 1.2 
-                        if self.modelo["unidades_esperadas"] > 0 else None
-                    )
+            # Actualizar el modelo con los datos cargados (los valores derivados,
+            # como el analizador y los datos del gráfico, se recalculan a partir de ellos)
+            datos = {clave: valor for clave, valor in modelo_cargado.items() if self.modelo.es_campo(clave)}
+            datos["rango_grafico"] = None
+            self.modelo.establecer(**datos)
 
             # Actualizar la interfaz con los datos cargados
             self.frame_datos.actualizar_campos_desde_modelo()
+            self.frame_graficos.reiniciar_simulacion()
             self.actualizar_vistas()
 
             messagebox.showinfo("Cargar escenario", "Escenario cargado correctamente.")
@@ -326,14 +439,17 @@ class AplicacionPuntoEquilibrio:
         if not ruta_archivo:
             return  # El usuario canceló
 
-        # Exportar a PDF utilizando la función de utilidad
-        try:
-            ruta_exportada = exportar_a_pdf(self.modelo, ruta_archivo)
-            messagebox.showinfo("Exportar a PDF", 
-                               f"Informe exportado correctamente a:\n{ruta_exportada}")
-        except Exception as e:
-            messagebox.showerror("Error al exportar", 
-                                f"Ocurrió un error al exportar a PDF: {str(e)}")
+        # Exportar a PDF en segundo plano (se usa una copia del modelo actual)
+        self.gestor_exportaciones.enviar(
+            "Exportar a PDF",
+            exportar_a_pdf,
+            self.modelo.instantanea(),
+            ruta_archivo,
+            al_terminar=lambda ruta_exportada: messagebox.showinfo(
+                "Exportar a PDF", f"Informe exportado correctamente a:\n{ruta_exportada}"),
+            al_error=lambda e: messagebox.showerror(
+                "Error al exportar", f"Ocurrió un error al exportar a PDF: {str(e)}")
+        )
 
     def exportar_excel(self):
         """Exporta los resultados a Excel."""
@@ -353,14 +469,25 @@ class AplicacionPuntoEquilibrio:
         if not ruta_archivo:
             return  # El usuario canceló
 
-        # Exportar a Excel utilizando la función de utilidad
-        try:
-            ruta_exportada = exportar_a_excel(self.modelo, ruta_archivo)
-            messagebox.showinfo("Exportar a Excel", 
-                               f"Datos exportados correctamente a:\n{ruta_exportada}")
-        except Exception as e:
-            messagebox.showerror("Error al exportar", 
-                                f"Ocurrió un error al exportar a Excel: {str(e)}")
+        # Exportar a Excel en segundo plano (se usa una copia del modelo actual)
+        self.gestor_exportaciones.enviar(
+            "Exportar a Excel",
+            exportar_a_excel,
+            self.modelo.instantanea(),
+            ruta_archivo,
+            al_terminar=lambda ruta_exportada: messagebox.showinfo(
+                "Exportar a Excel", f"Datos exportados correctamente a:\n{ruta_exportada}"),
+            al_error=lambda e: messagebox.showerror(
+                "Error al exportar", f"Ocurrió un error al exportar a Excel: {str(e)}")
+        )
+    
+    def cancelar_exportaciones(self):
+        """Cancela las exportaciones que se están ejecutando en segundo plano."""
+        if not self.gestor_exportaciones.trabajos_activos():
+            messagebox.showinfo("Información", "No hay exportaciones en curso.")
+            return
+        
+        self.gestor_exportaciones.cancelar()
     
     def mostrar_acerca_de(self):
         """Muestra información sobre la aplicación."""
@@ -371,6 +498,10 @@ class AplicacionPuntoEquilibrio:
             "© 2025 - Todos los derechos reservados"
         )
     
+    def mostrar_diagnostico(self):
+        """Muestra la ventana de diagnóstico de rendimiento."""
+        self.ventana_diagnostico.mostrar()
+    
     def mostrar_manual(self):
         """Muestra el manual de uso."""
         # Crear una nueva ventana para el manual
@@ -191,6 +191,21 @@ class FrameDatosEntrada(ttk.Frame):
         self.costo_variable_var.set("")
         self.unidades_esperadas_var.set("")
 
+    def establecer_valores(self, costos_fijos, precio_venta, costo_variable, unidades_esperadas):
+        """
+        Establece los valores de los campos de entrada (por ejemplo, desde la simulación).
+        
+        Args:
+            costos_fijos (float): Costos fijos
+            precio_venta (float): Precio de venta unitario
+            costo_variable (float): Costo variable unitario
+            unidades_esperadas (float): Unidades esperadas de venta
+        """
+        self.costos_fijos_var.set(f"{costos_fijos:.2f}")
+        self.precio_venta_var.set(f"{precio_venta:.2f}")
+        self.costo_variable_var.set(f"{costo_variable:.2f}")
+        self.unidades_esperadas_var.set(f"{unidades_esperadas:.2f}")
+    
     def actualizar_campos_desde_modelo(self):
         """Actualiza los campos de entrada con los datos del modelo actual."""
         modelo = self.controlador.modelo
@@ -4,10 +4,68 @@ Módulo que define el frame para la visualización gráfica del análisis de pun
 
 import tkinter as tk
 from tkinter import ttk
+from collections import OrderedDict
 import matplotlib.pyplot as plt
+from matplotlib import ticker
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import numpy as np
 
+from gui.frames.simulacion import PanelSimulacion
+from utils.submuestreo import submuestrear, puntos_para_ejes
+from utils.instrumentacion import instrumentar, medir
+
+
+# Número máximo de fondos guardados para el blitting
+MAX_FONDOS = 8
+
+
+def _limite_redondeado(valor):
+    """
+    Redondea un límite de eje alejándolo de cero hasta un valor "redondo" (p. ej. 1.2, 2.5 o 5 x 10^n).
+    
+    Usar límites redondeados hace que pequeños cambios en los datos no modifiquen los
+    ejes, lo que permite reutilizar el fondo del gráfico.
+    
+    Args:
+        valor (float): Valor a redondear
+        
+    Returns:
+        float: Valor redondeado
+    """
+    if valor == 0 or not np.isfinite(valor):
+        return 0.0
+    
+    magnitud = 10 ** np.floor(np.log10(abs(valor)))
+    for paso in (1, 1.2, 1.5, 2, 2.5, 3, 4, 5, 6, 8, 10):
+        if paso * magnitud >= abs(valor):
+            break
+    
+    return float(np.copysign(paso * magnitud, valor))
+
+
+def _calcular_limites(x, *series):
+    """
+    Calcula los límites de los ejes para los datos indicados, con un margen del 5%.
+    
+    Args:
+        x (array): Valores del eje X
+        *series: Series de valores del eje Y
+        
+    Returns:
+        tuple: Límites (xmin, xmax, ymin, ymax)
+    """
+    valores_y = np.concatenate([np.ravel(serie) for serie in series])
+    ymin = min(0.0, float(np.min(valores_y)))
+    ymax = max(0.0, float(np.max(valores_y)))
+    
+    return (
+        min(0.0, float(np.min(x))),
+        float(np.max(x)),
+        _limite_redondeado(ymin * 1.05),
+        _limite_redondeado(ymax * 1.05)
+    )
+
+
 class FrameGraficos(ttk.Frame):
     """
     Frame para mostrar visualizaciones gráficas del análisis de punto de equilibrio.
@@ -65,9 +123,13 @@ class FrameGraficos(ttk.Frame):
         # Inicializar el gráfico vacío
         self.inicializar_grafico()
         
+        # Panel de simulación con controles deslizantes
+        self.panel_simulacion = PanelSimulacion(self, self.controlador)
+        self.panel_simulacion.grid(row=3, column=0, padx=20, pady=5, sticky="ew")
+        
         # Frame para leyenda e interpretación
         frame_leyenda = ttk.LabelFrame(self, text="Interpretación del Gráfico")
-        frame_leyenda.grid(row=3, column=0, padx=20, pady=10, sticky="ew")
+        frame_leyenda.grid(row=4, column=0, padx=20, pady=10, sticky="ew")
         
         self.lbl_leyenda = ttk.Label(
             frame_leyenda, 
@@ -90,8 +152,18 @@ class FrameGraficos(ttk.Frame):
         self.canvas = FigureCanvasTkAgg(self.figure, self.frame_grafico)
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
+        # Artistas persistentes de cada tipo de gráfico (se crean la primera vez que se usan)
+        self.artistas = {}
+        self.tipo_actual = None
+        self.limites_actuales = None
+        self.leyenda = None
+        
+        # Fondos capturados para el blitting (por tipo de gráfico, límites y tamaño)
+        self.fondos = OrderedDict()
+        self.canvas.mpl_connect('draw_event', self._al_dibujar)
+        
         # Mostrar mensaje inicial
-        self.ax.text(
+        self.texto_vacio = self.ax.text(
             0.5, 0.5, 
             "No hay datos para mostrar.\nCalcule el punto de equilibrio primero.", 
             ha='center', va='center', 
@@ -103,8 +175,15 @@ class FrameGraficos(ttk.Frame):
         # Actualizar el canvas
         self.canvas.draw()
     
+    @instrumentar("graficos.actualizar_grafico")
     def actualizar_grafico(self):
-        """Actualiza el gráfico con los datos actuales del modelo."""
+        """
+        Actualiza el gráfico con los datos actuales del modelo.
+        
+        Los artistas de cada tipo de gráfico se crean una sola vez y se actualizan con
+        set_data. El resto de la figura (ejes, rejilla y títulos) se guarda como fondo
+        y sólo se vuelve a dibujar cuando cambian los límites, el tipo o el tamaño.
+        """
         # Verificar si hay datos para graficar
         if not self.controlador.modelo["datos_grafico"] is not None:
             return
@@ -112,57 +191,59 @@ class FrameGraficos(ttk.Frame):
         # Obtener el tipo de gráfico seleccionado
         tipo_grafico = self.combo_tipo_grafico.get()
         
-        # Limpiar el gráfico actual
-        self.ax.clear()
+        # Quitar el mensaje inicial la primera vez que hay datos
+        if self.texto_vacio is not None:
+            self._preparar_ejes()
+        
+        # Mostrar los artistas del tipo seleccionado
+        if tipo_grafico != self.tipo_actual:
+            self._mostrar_tipo(tipo_grafico)
         
-        # Mostrar el gráfico según el tipo seleccionado
+        # Actualizar los datos según el tipo seleccionado
         if tipo_grafico == "Punto de Equilibrio (Costos e Ingresos)":
-            self.graficar_punto_equilibrio()
+            limites = self.graficar_punto_equilibrio()
         elif tipo_grafico == "Utilidad vs. Volumen":
-            self.graficar_utilidad()
+            limites = self.graficar_utilidad()
         elif tipo_grafico == "Margen de Contribución":
-            self.graficar_margen_contribucion()
+            limites = self.graficar_margen_contribucion()
+        
+        self._actualizar_leyenda()
         
         # Actualizar el canvas
-        self.canvas.draw()
+        self._presentar(limites)
     
     def graficar_punto_equilibrio(self):
-        """Genera el gráfico de punto de equilibrio (costos e ingresos)."""
+        """
+        Actualiza el gráfico de punto de equilibrio (costos e ingresos).
+        
+        Returns:
+            tuple: Límites de los ejes (xmin, xmax, ymin, ymax)
+        """
         # Obtener datos del modelo
         datos = self.controlador.modelo["datos_grafico"]
         pe_unidades = self.controlador.modelo["resultados"]["pe_unidades"]
         pe_valor = self.controlador.modelo["resultados"]["pe_valor"]
+        artistas = self.artistas["Punto de Equilibrio (Costos e Ingresos)"]
         
-        # Graficar costos fijos
-        self.ax.plot(datos['unidades'], datos['costos_fijos'], 
-                    label='Costos Fijos', color='blue', linestyle='--')
-        
-        # Graficar costos variables
-        self.ax.plot(datos['unidades'], datos['costos_variables'], 
-                    label='Costos Variables', color='green', linestyle='--')
+        columnas = ('costos_fijos', 'costos_variables', 'costos_totales', 'ingresos')
+        unidades = datos['unidades'].values
         
-        # Graficar costos totales
-        self.ax.plot(datos['unidades'], datos['costos_totales'], 
-                    label='Costos Totales', color='red')
+        # Reducir las series al ancho de los ejes conservando el punto de equilibrio
+        x, series = submuestrear(
+            unidades, [datos[columna].values for columna in columnas],
+            puntos_para_ejes(self.ax), conservar=[pe_unidades])
         
-        # Graficar ingresos
-        self.ax.plot(datos['unidades'], datos['ingresos'], 
-                    label='Ingresos', color='purple')
+        # Actualizar costos fijos, variables, totales e ingresos
+        for columna, serie in zip(columnas, series):
+            artistas[columna].set_data(x, serie)
         
         # Marcar el punto de equilibrio
-        self.ax.plot([pe_unidades], [pe_valor], 'ro', markersize=8, 
-                    label=f'Punto de Equilibrio: {pe_unidades:.2f} unidades')
+        artistas['punto'].set_data([pe_unidades], [pe_valor])
+        artistas['punto'].set_label(f'Punto de Equilibrio: {pe_unidades:.2f} unidades')
         
         # Líneas punteadas para el punto de equilibrio
-        self.ax.axvline(x=pe_unidades, color='gray', linestyle=':', alpha=0.7)
-        self.ax.axhline(y=pe_valor, color='gray', linestyle=':', alpha=0.7)
-        
-        # Configurar ejes y leyenda
-        self.ax.set_xlabel('Unidades')
-        self.ax.set_ylabel('Valor ($)')
-        self.ax.set_title('Análisis de Punto de Equilibrio')
-        self.ax.legend()
-        self.ax.grid(True, linestyle='--', alpha=0.7)
+        artistas['linea_vertical'].set_xdata([pe_unidades, pe_unidades])
+        artistas['linea_horizontal'].set_ydata([pe_valor, pe_valor])
         
         # Actualizar la leyenda
         self.lbl_leyenda.config(
@@ -174,39 +255,42 @@ class FrameGraficos(ttk.Frame):
                 "resultando en una utilidad de cero."
             )
         )
+        
+        return _calcular_limites(
+            unidades, datos['costos_totales'].values, datos['ingresos'].values, [pe_valor])
     
     def graficar_utilidad(self):
-        """Genera el gráfico de utilidad vs. volumen."""
+        """
+        Actualiza el gráfico de utilidad vs. volumen.
+        
+        Returns:
+            tuple: Límites de los ejes (xmin, xmax, ymin, ymax)
+        """
         # Obtener datos del modelo
         datos = self.controlador.modelo["datos_grafico"]
         pe_unidades = self.controlador.modelo["resultados"]["pe_unidades"]
+        tipo = "Utilidad vs. Volumen"
+        artistas = self.artistas[tipo]
+        
+        unidades = datos['unidades'].values
+        utilidades = datos['utilidades'].values
         
-        # Graficar utilidad
-        self.ax.plot(datos['unidades'], datos['utilidades'], 
-                    label='Utilidad', color='green')
+        # Reducir la serie al ancho de los ejes conservando el punto de equilibrio
+        x, (y,) = submuestrear(unidades, [utilidades], puntos_para_ejes(self.ax), conservar=[pe_unidades])
         
-        # Línea de utilidad cero
-        self.ax.axhline(y=0, color='red', linestyle='-', alpha=0.5)
+        # Actualizar utilidad
+        artistas['utilidad'].set_data(x, y)
         
         # Marcar el punto de equilibrio
-        self.ax.plot([pe_unidades], [0], 'ro', markersize=8, 
-                    label=f'Punto de Equilibrio: {pe_unidades:.2f} unidades')
+        artistas['punto'].set_data([pe_unidades], [0])
+        artistas['punto'].set_label(f'Punto de Equilibrio: {pe_unidades:.2f} unidades')
         
         # Línea vertical en el punto de equilibrio
-        self.ax.axvline(x=pe_unidades, color='gray', linestyle=':', alpha=0.7)
+        artistas['linea_vertical'].set_xdata([pe_unidades, pe_unidades])
         
         # Áreas de utilidad y pérdida
-        x = datos['unidades'].values
-        y = datos['utilidades'].values
-        self.ax.fill_between(x, y, 0, where=(y > 0), color='green', alpha=0.3, label='Área de Utilidad')
-        self.ax.fill_between(x, y, 0, where=(y < 0), color='red', alpha=0.3, label='Área de Pérdida')
-        
-        # Configurar ejes y leyenda
-        self.ax.set_xlabel('Unidades')
-        self.ax.set_ylabel('Utilidad ($)')
-        self.ax.set_title('Utilidad vs. Volumen')
-        self.ax.legend()
-        self.ax.grid(True, linestyle='--', alpha=0.7)
+        self._rellenar(tipo, 'area_utilidad', x, y, 0, where=(y > 0), color='green', label='Área de Utilidad')
+        self._rellenar(tipo, 'area_perdida', x, y, 0, where=(y < 0), color='red', label='Área de Pérdida')
         
         # Actualizar la leyenda
         self.lbl_leyenda.config(
@@ -217,51 +301,52 @@ class FrameGraficos(ttk.Frame):
                 "el área roja representa la zona de pérdida (<0)."
             )
         )
+        
+        return _calcular_limites(unidades, utilidades, [0])
     
     def graficar_margen_contribucion(self):
-        """Genera el gráfico de margen de contribución."""
+        """
+        Actualiza el gráfico de margen de contribución.
+        
+        Returns:
+            tuple: Límites de los ejes (xmin, xmax, ymin, ymax)
+        """
         # Obtener datos del modelo
         datos = self.controlador.modelo["datos_grafico"]
         costos_fijos = self.controlador.modelo["costos_fijos"]
-        margen_contribucion = (
-            self.controlador.modelo["precio_venta"] - 
-            self.controlador.modelo["costo_variable"]
-        )
         pe_unidades = self.controlador.modelo["resultados"]["pe_unidades"]
+        tipo = "Margen de Contribución"
+        artistas = self.artistas[tipo]
         
-        # Crear serie de unidades y calcular margen de contribución total
+        # Margen de contribución total y costos fijos de los datos (admite datos por tramos)
         unidades = datos['unidades'].values
-        margen_contribucion_total = unidades * margen_contribucion
+        margen_contribucion_total = datos['ingresos'].values - datos['costos_variables'].values
+        serie_costos_fijos = datos['costos_fijos'].values
         
-        # Graficar margen de contribución total
-        self.ax.plot(unidades, margen_contribucion_total, 
-                    label='Margen de Contribución Total', color='blue')
+        # Reducir las series al ancho de los ejes conservando el punto de equilibrio
+        x, (margen_total, fijos) = submuestrear(
+            unidades, [margen_contribucion_total, serie_costos_fijos], puntos_para_ejes(self.ax),
+            conservar=[pe_unidades])
         
-        # Graficar línea de costos fijos
-        self.ax.axhline(y=costos_fijos, color='red', linestyle='-', 
-                       label=f'Costos Fijos: ${costos_fijos:.2f}')
+        # Actualizar margen de contribución total
+        artistas['margen'].set_data(x, margen_total)
+        
+        # Actualizar línea de costos fijos
+        artistas['costos_fijos'].set_data(x, fijos)
+        artistas['costos_fijos'].set_label(f'Costos Fijos: ${costos_fijos:.2f}')
         
         # Marcar el punto de equilibrio
-        self.ax.plot([pe_unidades], [costos_fijos], 'ro', markersize=8, 
-                    label=f'Punto de Equilibrio: {pe_unidades:.2f} unidades')
+        artistas['punto'].set_data([pe_unidades], [np.interp(pe_unidades, unidades, serie_costos_fijos)])
+        artistas['punto'].set_label(f'Punto de Equilibrio: {pe_unidades:.2f} unidades')
         
         # Línea vertical en el punto de equilibrio
-        self.ax.axvline(x=pe_unidades, color='gray', linestyle=':', alpha=0.7)
+        artistas['linea_vertical'].set_xdata([pe_unidades, pe_unidades])
         
         # Áreas de utilidad y pérdida
-        self.ax.fill_between(unidades, margen_contribucion_total, costos_fijos, 
-                           where=(margen_contribucion_total > costos_fijos), 
-                           color='green', alpha=0.3, label='Área de Utilidad')
-        self.ax.fill_between(unidades, margen_contribucion_total, costos_fijos, 
-                           where=(margen_contribucion_total < costos_fijos), 
-                           color='red', alpha=0.3, label='Área de Pérdida')
-        
-        # Configurar ejes y leyenda
-        self.ax.set_xlabel('Unidades')
-        self.ax.set_ylabel('Valor ($)')
-        self.ax.set_title('Análisis de Margen de Contribución')
-        self.ax.legend()
-        self.ax.grid(True, linestyle='--', alpha=0.7)
+        self._rellenar(tipo, 'area_utilidad', x, margen_total, fijos,
+                       where=(margen_total > fijos), color='green', label='Área de Utilidad')
+        self._rellenar(tipo, 'area_perdida', x, margen_total, fijos,
+                       where=(margen_total < fijos), color='red', label='Área de Pérdida')
         
         # Actualizar la leyenda
         self.lbl_leyenda.config(
@@ -273,6 +358,185 @@ class FrameGraficos(ttk.Frame):
                 "mientras que el área roja representa la zona de pérdida."
             )
         )
+        
+        return _calcular_limites(unidades, margen_contribucion_total, serie_costos_fijos)
+    
+    def _preparar_ejes(self):
+        """Quita el mensaje inicial y restablece las marcas de los ejes."""
+        self.texto_vacio.remove()
+        self.texto_vacio = None
+        
+        self.ax.xaxis.set_major_locator(ticker.AutoLocator())
+        self.ax.yaxis.set_major_locator(ticker.AutoLocator())
+        self.ax.grid(True, linestyle='--', alpha=0.7)
+    
+    def _crear_artistas(self, tipo_grafico):
+        """
+        Crea los artistas persistentes de un tipo de gráfico (sin datos).
+        
+        Los artistas se marcan como animados para que no formen parte del fondo y
+        puedan redibujarse con blitting.
+        
+        Args:
+            tipo_grafico (str): Tipo de gráfico
+            
+        Returns:
+            dict: Artistas del tipo de gráfico, más la lista 'orden_leyenda'
+        """
+        ax = self.ax
+        artistas = {}
+        
+        if tipo_grafico == "Punto de Equilibrio (Costos e Ingresos)":
+            artistas['costos_fijos'], = ax.plot([], [], label='Costos Fijos', color='blue', 
+                                                linestyle='--', animated=True)
+            artistas['costos_variables'], = ax.plot([], [], label='Costos Variables', color='green', 
+                                                    linestyle='--', animated=True)
+            artistas['costos_totales'], = ax.plot([], [], label='Costos Totales', color='red', animated=True)
+            artistas['ingresos'], = ax.plot([], [], label='Ingresos', color='purple', animated=True)
+            artistas['punto'], = ax.plot([], [], 'ro', markersize=8, animated=True)
+            artistas['linea_vertical'] = ax.axvline(x=0, color='gray', linestyle=':', alpha=0.7, animated=True)
+            artistas['linea_horizontal'] = ax.axhline(y=0, color='gray', linestyle=':', alpha=0.7, animated=True)
+            artistas['orden_leyenda'] = ['costos_fijos', 'costos_variables', 'costos_totales', 'ingresos', 'punto']
+        elif tipo_grafico == "Utilidad vs. Volumen":
+            artistas['utilidad'], = ax.plot([], [], label='Utilidad', color='green', animated=True)
+            artistas['linea_cero'] = ax.axhline(y=0, color='red', linestyle='-', alpha=0.5, animated=True)
+            artistas['punto'], = ax.plot([], [], 'ro', markersize=8, animated=True)
+            artistas['linea_vertical'] = ax.axvline(x=0, color='gray', linestyle=':', alpha=0.7, animated=True)
+            artistas['orden_leyenda'] = ['utilidad', 'punto', 'area_utilidad', 'area_perdida']
+        elif tipo_grafico == "Margen de Contribución":
+            artistas['margen'], = ax.plot([], [], label='Margen de Contribución Total', color='blue', animated=True)
+            artistas['costos_fijos'], = ax.plot([], [], color='red', linestyle='-', animated=True)
+            artistas['punto'], = ax.plot([], [], 'ro', markersize=8, animated=True)
+            artistas['linea_vertical'] = ax.axvline(x=0, color='gray', linestyle=':', alpha=0.7, animated=True)
+            artistas['orden_leyenda'] = ['margen', 'costos_fijos', 'punto', 'area_utilidad', 'area_perdida']
+        
+        self.artistas[tipo_grafico] = artistas
+        
+        # Las áreas se crean vacías para poder construir la leyenda
+        if 'area_utilidad' in artistas['orden_leyenda']:
+            self._rellenar(tipo_grafico, 'area_utilidad', [], [], 0, where=None, 
+                           color='green', label='Área de Utilidad')
+            self._rellenar(tipo_grafico, 'area_perdida', [], [], 0, where=None, 
+                           color='red', label='Área de Pérdida')
+        
+        return artistas
+    
+    def _rellenar(self, tipo_grafico, nombre, x, y1, y2, where, color, label):
+        """
+        Reemplaza un área rellena (fill_between) de un tipo de gráfico.
+        
+        Las áreas no admiten set_data, por lo que se vuelven a crear; al ser animadas
+        no obligan a redibujar el resto de la figura.
+        """
+        artistas = self.artistas[tipo_grafico]
+        if nombre in artistas:
+            artistas[nombre].remove()
+        
+        artistas[nombre] = self.ax.fill_between(
+            x, y1, y2, where=where, color=color, alpha=0.3, label=label, animated=True)
+        artistas[nombre].set_visible(tipo_grafico == self.tipo_actual)
+    
+    def _mostrar_tipo(self, tipo_grafico):
+        """
+        Muestra sólo los artistas del tipo de gráfico indicado y configura los ejes.
+        
+        Args:
+            tipo_grafico (str): Tipo de gráfico a mostrar
+        """
+        self.tipo_actual = tipo_grafico
+        
+        if tipo_grafico not in self.artistas:
+            self._crear_artistas(tipo_grafico)
+        
+        for tipo, artistas in self.artistas.items():
+            for nombre, artista in artistas.items():
+                if nombre != 'orden_leyenda':
+                    artista.set_visible(tipo == tipo_grafico)
+        
+        # Títulos de los ejes según el tipo de gráfico
+        titulos = {
+            "Punto de Equilibrio (Costos e Ingresos)": ('Valor ($)', 'Análisis de Punto de Equilibrio'),
+            "Utilidad vs. Volumen": ('Utilidad ($)', 'Utilidad vs. Volumen'),
+            "Margen de Contribución": ('Valor ($)', 'Análisis de Margen de Contribución'),
+        }
+        etiqueta_y, titulo = titulos[tipo_grafico]
+        self.ax.set_xlabel('Unidades')
+        self.ax.set_ylabel(etiqueta_y)
+        self.ax.set_title(titulo)
+        
+        # Crear la leyenda con los artistas del tipo seleccionado
+        artistas = self.artistas[tipo_grafico]
+        self.leyenda = self.ax.legend(handles=[artistas[n] for n in artistas['orden_leyenda']])
+        self.leyenda.set_animated(True)
+    
+    def _actualizar_leyenda(self):
+        """Actualiza los textos de la leyenda con las etiquetas actuales de los artistas."""
+        artistas = self.artistas[self.tipo_actual]
+        for texto, nombre in zip(self.leyenda.get_texts(), artistas['orden_leyenda']):
+            texto.set_text(artistas[nombre].get_label())
+    
+    def _artistas_visibles(self):
+        """Devuelve los artistas animados del tipo de gráfico actual, con la leyenda al final."""
+        artistas = self.artistas[self.tipo_actual]
+        visibles = [a for nombre, a in artistas.items() if nombre != 'orden_leyenda']
+        visibles.append(self.leyenda)
+        return visibles
+    
+    def _clave_fondo(self):
+        """Devuelve la clave del fondo correspondiente al estado actual de la figura."""
+        return (self.tipo_actual, self.limites_actuales,
+                int(self.figure.bbox.width), int(self.figure.bbox.height))
+    
+    @instrumentar("graficos.presentar")
+    def _presentar(self, limites):
+        """
+        Muestra los artistas actualizados, usando blitting si ya existe un fondo válido.
+        
+        Args:
+            limites (tuple): Límites de los ejes (xmin, xmax, ymin, ymax)
+        """
+        if limites != self.limites_actuales:
+            self.ax.set_xlim(limites[0], limites[1])
+            self.ax.set_ylim(limites[2], limites[3])
+            self.limites_actuales = limites
+        
+        fondo = self.fondos.get(self._clave_fondo())
+        if fondo is None:
+            # Dibujo completo; _al_dibujar captura el fondo y dibuja los artistas
+            with medir("graficos.dibujo_completo"):
+                self.canvas.draw()
+            return
+        
+        imagen, posicion = fondo
+        self.fondos.move_to_end(self._clave_fondo())
+        
+        # Restaurar la posición de los ejes con la que se capturó el fondo
+        self.ax.set_position(posicion)
+        
+        self.canvas.restore_region(imagen)
+        for artista in self._artistas_visibles():
+            self.ax.draw_artist(artista)
+        self.canvas.blit(self.figure.bbox)
+    
+    def _al_dibujar(self, event):
+        """Captura el fondo tras un dibujo completo y dibuja encima los artistas animados."""
+        # Al guardar la figura matplotlib ya incluye los artistas animados
+        if self.tipo_actual is None or self.canvas.is_saving():
+            return
+        
+        self.fondos[self._clave_fondo()] = (
+            self.canvas.copy_from_bbox(self.figure.bbox),
+            self.ax.get_position()
+        )
+        while len(self.fondos) > MAX_FONDOS:
+            self.fondos.popitem(last=False)
+        
+        for artista in self._artistas_visibles():
+            self.ax.draw_artist(artista)
+    
+    def reiniciar_simulacion(self):
+        """Ajusta los controles de simulación a los datos calculados en el modelo."""
+        self.panel_simulacion.configurar_desde_modelo()
     
     def cambiar_tipo_grafico(self, event=None):
         """Maneja el evento de cambio de tipo de gráfico."""
@@ -6,12 +6,23 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib import cm
+from matplotlib.figure import Figure
 import pandas as pd
 
 # Importar la funcionalidad de cálculo multiproducto
 from core.equilibrio import calcular_punto_equilibrio_multiproducto
+from gui.utils.tabla_virtual import TablaVirtual
+from utils.submuestreo import submuestrear, puntos_para_ejes
+from utils.instrumentacion import instrumentar
+from utils.cache_resultados import obtener_cache_resultados
+
+
+# Vistas disponibles para el gráfico detallado
+VISTAS_GRAFICO = ["Barras y Pastel", "Pareto"]
+
+# Número de productos que se muestran individualmente; el resto se agrupa en "Otros"
+MAX_PRODUCTOS_GRAFICO = 10
 
 
 class FrameMultiProducto(ttk.Frame):
@@ -88,31 +99,14 @@ class FrameMultiProducto(ttk.Frame):
         frame_lista = ttk.Frame(frame_productos)
         frame_lista.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
         
-        # Crear tabla para mostrar productos
-        columns = ('nombre', 'precio', 'costo', 'mix')
-        self.tabla_productos = ttk.Treeview(
-            frame_lista, columns=columns, show='headings', height=5)
-        
-        # Definir encabezados
-        self.tabla_productos.heading('nombre', text='Nombre')
-        self.tabla_productos.heading('precio', text='Precio Venta')
-        self.tabla_productos.heading('costo', text='Costo Variable')
-        self.tabla_productos.heading('mix', text='Mix (%)')
-        
-        # Definir anchos de columna
-        self.tabla_productos.column('nombre', width=150)
-        self.tabla_productos.column('precio', width=100)
-        self.tabla_productos.column('costo', width=100)
-        self.tabla_productos.column('mix', width=80)
-        
-        # Scrollbar para la tabla
-        scrollbar = ttk.Scrollbar(
-            frame_lista, orient=tk.VERTICAL, command=self.tabla_productos.yview)
-        self.tabla_productos.configure(yscroll=scrollbar.set)
-        
-        # Colocar tabla y scrollbar
-        self.tabla_productos.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Tabla virtual para mostrar productos (sólo dibuja las filas visibles)
+        self.tabla_productos = TablaVirtual(frame_lista, columnas=[
+            ("nombre", "Nombre", 180, None),
+            ("precio_venta", "Precio Venta", 110, "${:,.2f}"),
+            ("costo_variable", "Costo Variable", 110, "${:,.2f}"),
+            ("mix", "Mix (%)", 80, lambda mix: f"{mix * 100:.1f}%"),
+        ], filas_visibles=5)
+        self.tabla_productos.pack(fill=tk.BOTH, expand=True)
         
         # Frame para botones de acción sobre productos
         frame_acciones = ttk.Frame(frame_productos)
@@ -140,18 +134,47 @@ class FrameMultiProducto(ttk.Frame):
         ttk.Button(frame_parametros, text="Ver Gráfico Detallado", 
                   command=self.mostrar_grafico_detallado).pack(side=tk.LEFT, padx=5)
         
+        # Selector de vista del gráfico detallado
+        ttk.Label(frame_parametros, text="Vista:").pack(side=tk.LEFT, padx=(10, 5))
+        self.vista_var = tk.StringVar(value=VISTAS_GRAFICO[0])
+        combo_vista = ttk.Combobox(frame_parametros, textvariable=self.vista_var,
+                                   values=VISTAS_GRAFICO, state="readonly", width=15)
+        combo_vista.pack(side=tk.LEFT, padx=5)
+        combo_vista.bind("<<ComboboxSelected>>", self.cambiar_vista)
+        
+        # Progreso del cálculo en segundo plano
+        self.barra_progreso = ttk.Progressbar(frame_parametros, mode="determinate", maximum=100, length=120)
+        self.barra_progreso.pack(side=tk.LEFT, padx=(20, 5))
+        
+        self.lbl_progreso = ttk.Label(frame_parametros, text="")
+        self.lbl_progreso.pack(side=tk.LEFT, padx=5)
+        
         # Frame para resultados de texto completo (sin gráfico en este frame)
         frame_resultados = ttk.LabelFrame(self, text="Resultados Multiproducto")
         frame_resultados.grid(row=2, column=0, padx=20, pady=10, sticky="nsew")
         
-        # Área para texto de resultados que ocupa todo el ancho
-        self.texto_resultados = tk.Text(frame_resultados, width=80, height=20)
+        # Área para el resumen de resultados
+        frame_texto = ttk.Frame(frame_resultados)
+        frame_texto.pack(side=tk.TOP, fill=tk.X)
+        
+        self.texto_resultados = tk.Text(frame_texto, width=80, height=6)
         scrollbar_resultados = ttk.Scrollbar(
-            frame_resultados, orient=tk.VERTICAL, command=self.texto_resultados.yview)
+            frame_texto, orient=tk.VERTICAL, command=self.texto_resultados.yview)
         self.texto_resultados.configure(yscroll=scrollbar_resultados.set)
         
         scrollbar_resultados.pack(side=tk.RIGHT, fill=tk.Y)
         self.texto_resultados.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        # Tabla virtual con el detalle por producto
+        self.tabla_resultados = TablaVirtual(frame_resultados, columnas=[
+            ("nombre", "Producto", 160, None),
+            ("pe_unidades", "PE Unid.", 110, "{:,.2f}"),
+            ("pe_valor", "PE Valor", 120, "${:,.2f}"),
+            ("porcentaje_valor", "% del Total", 90, "{:.2f}%"),
+            ("margen", "Margen Unit.", 110, "${:,.2f}"),
+            ("porcentaje_margen", "% del Precio", 90, "{:.2f}%"),
+        ])
+        self.tabla_resultados.pack(side=tk.TOP, fill=tk.BOTH, expand=True, pady=(5, 0))
     
     def agregar_producto(self):
         """Agrega un nuevo producto a la lista."""
@@ -196,8 +219,7 @@ class FrameMultiProducto(ttk.Frame):
             
             # Agregar a la lista y a la tabla
             self.productos.append(producto)
-            self.tabla_productos.insert('', 'end', values=(
-                nombre, f"${precio:.2f}", f"${costo:.2f}", f"{mix:.1f}%"))
+            self.actualizar_tabla_productos()
             
             # Limpiar campos
             self.nombre_var.set("")
@@ -213,28 +235,37 @@ class FrameMultiProducto(ttk.Frame):
     
     def eliminar_producto(self):
         """Elimina el producto seleccionado de la lista."""
-        seleccion = self.tabla_productos.selection()
-        if not seleccion:
+        # Obtener el índice del producto seleccionado en la lista
+        indice = self.tabla_productos.seleccion()
+        if indice is None:
             messagebox.showinfo("Información", "Seleccione un producto para eliminar.")
             return
         
-        # Obtener el índice del elemento seleccionado
-        indice = self.tabla_productos.index(seleccion[0])
-        
         # Eliminar de la lista y de la tabla
         if 0 <= indice < len(self.productos):
             self.productos.pop(indice)
-            self.tabla_productos.delete(seleccion[0])
+            self.actualizar_tabla_productos()
     
     def limpiar_lista(self):
         """Elimina todos los productos de la lista."""
         if messagebox.askyesno("Confirmar", "¿Está seguro de que desea eliminar todos los productos?"):
             self.productos = []
-            for item in self.tabla_productos.get_children():
-                self.tabla_productos.delete(item)
+            self.actualizar_tabla_productos()
     
+    def actualizar_tabla_productos(self):
+        """Muestra la lista de productos en la tabla."""
+        self.tabla_productos.establecer_datos({
+            clave: [producto[clave] for producto in self.productos]
+            for clave in ("nombre", "precio_venta", "costo_variable", "mix")
+        })
+    
+    @instrumentar("multiproducto.calcular_multiproducto")
     def calcular_multiproducto(self):
-        """Calcula el punto de equilibrio multiproducto."""
+        """
+        Inicia el cálculo del punto de equilibrio multiproducto en segundo plano.
+        
+        Si se vuelve a calcular antes de que termine, el cálculo anterior se descarta.
+        """
         try:
             # Validar que haya productos
             if not self.productos:
@@ -246,6 +277,7 @@ class FrameMultiProducto(ttk.Frame):
                 raise ValueError(f"La suma de los porcentajes de mix debe ser 100%. Actual: {suma_mix * 100:.1f}%")
             
             # Obtener costos fijos totales
+            costos_fijos_texto = self.costos_fijos_var.get().strip()
             try:
                 costos_fijos = float(costos_fijos_texto)
             except ValueError:
@@ -254,88 +286,100 @@ class FrameMultiProducto(ttk.Frame):
             if costos_fijos <= 0:
                 raise ValueError("Los costos fijos deben ser mayores que cero.")
             
-            # Agregar costos fijos a los productos (asumiendo distribución igual)
-            productos_con_cf = self.productos.copy()
-            for producto in productos_con_cf:
-                producto["costos_fijos"] = costos_fijos * producto["mix"]
-            
-            # Calcular punto de equilibrio
-            resultados = calcular_punto_equilibrio_multiproducto(productos_con_cf)
-            
-            # Guardar resultados para uso posterior
-            self.resultados_calculados = resultados
-            
-            # Mostrar resultados
-            self.mostrar_resultados_multiproducto(resultados)
-            
-            # Mostrar gráfico detallado en una ventana separada
-            self.mostrar_grafico_detallado()
-            
-            return True
-            
         except ValueError as e:
             messagebox.showerror("Error de validación", str(e))
             return False
-        except Exception as e:
-            messagebox.showerror("Error", f"Ocurrió un error: {str(e)}")
-            return False
+        
+        # Enviar una copia de los productos (el hilo de trabajo no debe modificar la lista)
+        self._mostrar_progreso(0.0, "Calculando...")
+        self.controlador.ejecutor_calculos.enviar(
+            "multiproducto",
+            preparar_multiproducto,
+            [dict(producto) for producto in self.productos],
+            costos_fijos,
+            self.vista_var.get(),
+            al_terminar=self._al_terminar_calculo,
+            al_error=self._al_error_calculo,
+            al_progreso=self._mostrar_progreso
+        )
+        
+        return True
     
-    def mostrar_resultados_multiproducto(self, resultados):
+    @instrumentar("multiproducto.mostrar_resultados")
+    def _al_terminar_calculo(self, preparado):
         """
-        Muestra los resultados del análisis multiproducto.
+        Muestra los resultados preparados en el hilo de trabajo.
         
         Args:
-            resultados (dict): Diccionario con los resultados del análisis
+            preparado (dict): Resultado de preparar_multiproducto
         """
-        # Limpiar el área de resultados
-        self.texto_resultados.delete(1.0, tk.END)
+        self._mostrar_progreso(1.0, "Completado")
         
-        # Mostrar resultado general
-        texto = "PUNTO DE EQUILIBRIO MULTIPRODUCTO\n"
-        texto += "=" * 40 + "\n\n"
-        texto += f"Punto de Equilibrio Total: {resultados['pe_unidades_total']:.2f} unidades\n"
-        texto += f"Valor de Ventas en PE: ${resultados['pe_valor_total']:.2f}\n\n"
-        
-        # Tabla de resultados por producto
-        texto += "DETALLE POR PRODUCTO\n"
-        texto += "=" * 40 + "\n\n"
-        texto += f"{'Producto':<20} {'PE Unid.':<15} {'PE Valor':<15} {'% del Total':<15}\n"
-        texto += "-" * 65 + "\n"
-        
-        for producto in resultados['productos']:
-            nombre = producto['nombre']
-            if len(nombre) > 19:
-                nombre = nombre[:16] + "..."
-            
-            unidades = producto['pe_unidades']
-            valor = producto['pe_valor']
-            porcentaje_valor = (valor / resultados['pe_valor_total']) * 100
-            
-            texto += f"{nombre:<20} {unidades:<15.2f} ${valor:<14.2f} {porcentaje_valor:<14.2f}%\n"
+        # Guardar resultados para uso posterior (y los productos en el modelo, para guardarlos)
+        self.resultados_calculados = preparado["resultados"]
+        self.controlador.modelo["productos_multiple"] = preparado["productos"]
         
-        # Añadir análisis adicional
-        texto += "\n\nANÁLISIS ADICIONAL\n"
-        texto += "=" * 40 + "\n\n"
+        # Mostrar resultados
+        self.mostrar_resultados_multiproducto(preparado["texto"], preparado["tabla"])
         
-        # Calcular márgenes de contribución
-        texto += "MÁRGENES DE CONTRIBUCIÓN\n"
-        texto += "-" * 40 + "\n"
+        # Mostrar gráfico detallado en una ventana separada
+        self.mostrar_grafico_detallado(preparado["figura"])
+    
+    def _al_error_calculo(self, error):
+        """
+        Muestra el error producido durante el cálculo.
         
-        for producto in self.productos:
-            nombre = producto['nombre']
-            if len(nombre) > 19:
-                nombre = nombre[:16] + "..."
-            
-            margen = producto['precio_venta'] - producto['costo_variable']
-            porcentaje = (margen / producto['precio_venta']) * 100
-            
-            texto += f"{nombre:<20} ${margen:<15.2f} ({porcentaje:<5.2f}% del precio)\n"
+        Args:
+            error (Exception): Error lanzado en el hilo de trabajo
+        """
+        self._mostrar_progreso(0.0, "")
+        if isinstance(error, ValueError):
+            messagebox.showerror("Error de validación", str(error))
+        else:
+            messagebox.showerror("Error", f"Ocurrió un error: {str(error)}")
+    
+    def _mostrar_progreso(self, fraccion, mensaje):
+        """
+        Muestra el avance del cálculo en segundo plano.
+        
+        Args:
+            fraccion (float): Fracción completada (entre 0 y 1)
+            mensaje (str): Descripción de la etapa actual
+        """
+        self.barra_progreso["value"] = fraccion * 100
+        self.lbl_progreso.config(text=mensaje)
+    
+    def mostrar_resultados_multiproducto(self, texto, tabla):
+        """
+        Muestra los resultados del análisis multiproducto.
+        
+        Args:
+            texto (str): Resumen generado con componer_resultados_multiproducto
+            tabla (dict): Detalle por producto en columnas, generado con tabla_multiproducto
+        """
+        # Mostrar el detalle por producto
+        self.tabla_resultados.establecer_datos(tabla)
+        
+        # Limpiar el área de resultados
+        self.texto_resultados.delete(1.0, tk.END)
         
         # Insertar texto en el widget
         self.texto_resultados.insert(tk.END, texto)
     
-    def mostrar_grafico_detallado(self):
-        """Muestra el gráfico de resultados en una ventana separada con más detalle."""
+    def cambiar_vista(self, event=None):
+        """Vuelve a mostrar el gráfico detallado con la vista seleccionada."""
+        if self.resultados_calculados:
+            self.mostrar_grafico_detallado()
+    
+    @instrumentar("multiproducto.mostrar_grafico_detallado")
+    def mostrar_grafico_detallado(self, figura=None):
+        """
+        Muestra el gráfico de resultados en una ventana separada con más detalle.
+        
+        Args:
+            figura (Figure, optional): Figura ya construida en el hilo de trabajo. Si es None,
+                se construye a partir de los últimos resultados calculados.
+        """
         if not self.resultados_calculados:
             messagebox.showinfo(
                 "Información", 
@@ -343,147 +387,350 @@ class FrameMultiProducto(ttk.Frame):
             )
             return
         
-        # Crear una nueva ventana para el gráfico detallado
-        ventana_grafico = tk.Toplevel(self.master)
-        ventana_grafico.title("Gráfico Detallado - Punto de Equilibrio Multiproducto")
-        ventana_grafico.geometry("900x600")
-        ventana_grafico.minsize(800, 600)
-        
-        # Crear frame contenedor
-        frame_principal = ttk.Frame(ventana_grafico, padding=10)
-        frame_principal.pack(fill=tk.BOTH, expand=True)
-        
-        # Título
-        ttk.Label(
-            frame_principal, 
-            text="Análisis Gráfico del Punto de Equilibrio Multiproducto",
-            font=("Arial", 11, "bold")
-        ).pack(pady=(0, 20))
-        
-        # Crear frame para el gráfico
-        frame_grafico = ttk.Frame(frame_principal)
-        frame_grafico.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Crear gráfico detallado
-        self.crear_grafico_detallado(frame_grafico)
-        
-        # Botón para cerrar
-        ttk.Button(
-            frame_principal, 
-            text="Cerrar", 
-            command=ventana_grafico.destroy
-        ).pack(pady=10)
-        
-        # Centrar la ventana
-        ventana_grafico.update_idletasks()
-        ancho = ventana_grafico.winfo_width()
-        alto = ventana_grafico.winfo_height()
-        x = (ventana_grafico.winfo_screenwidth() // 2) - (ancho // 2)
-        y = (ventana_grafico.winfo_screenheight() // 2) - (alto // 2)
-        ventana_grafico.geometry(f"{ancho}x{alto}+{x}+{y}")
-    
-    def crear_grafico_detallado(self, frame_contenedor):
-        """
-        Crea un gráfico detallado para mostrar en la ventana separada.
-        
-        Args:
-            frame_contenedor: Frame donde se mostrará el gráfico
-        """
-        resultados = self.resultados_calculados
-        
-        # Crear figura con dos subplots
-        fig = plt.figure(figsize=(12, 8))
-        
-        # Primer subplot: gráfico de barras de PE por producto
-        ax1 = fig.add_subplot(2, 1, 1)
-        
-        # Preparar datos para el gráfico
-        nombres = [p['nombre'] for p in resultados['productos']]
-        valores = [p['pe_valor'] for p in resultados['productos']]
-        unidades = [p['pe_unidades'] for p in resultados['productos']]
-        
-        # Acortar nombres muy largos
-        nombres = [n[:10] + "..." if len(n) > 10 else n for n in nombres]
-        
-        # Crear un gráfico de barras para valores
-        x = np.arange(len(nombres))
-        width = 0.35
-        
-        ax1.bar(x - width/2, valores, width, label='Valor de Ventas ($)', color='steelblue')
-        
-        # Crear un segundo eje Y para las unidades
-        ax2 = ax1.twinx()
-        ax2.bar(x + width/2, unidades, width, color='orange', label='Unidades')
-        
-        # Configurar etiquetas y leyenda
-        ax1.set_title('Punto de Equilibrio por Producto', fontsize=14)
-        ax1.set_xlabel('Productos', fontsize=12)
-        ax1.set_xticks(x)
-        ax1.set_xticklabels(nombres, rotation=45, ha='right')
-        ax1.set_ylabel('Valor de Ventas ($)', fontsize=12, color='steelblue')
-        ax2.set_ylabel('Unidades', fontsize=12, color='orange')
-        
-        # Añadir valores encima de las barras
-        for i, v in enumerate(valores):
-            ax1.text(i - width/2, v + 0.01 * max(valores), f"${v:.0f}", 
-                    ha='center', va='bottom', fontsize=9, color='black', fontweight='bold')
-        
-        for i, u in enumerate(unidades):
-            ax2.text(i + width/2, u + 0.01 * max(unidades), f"{u:.1f}", 
-                    ha='center', va='bottom', fontsize=9, color='black', fontweight='bold')
-        
-        # Combinar leyendas
-        lines1, labels1 = ax1.get_legend_handles_labels()
-        lines2, labels2 = ax2.get_legend_handles_labels()
-        ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
-        
-        # Segundo subplot: gráfico de pastel para la distribución del valor total
-        ax3 = fig.add_subplot(2, 1, 2)
-        
-        # Preparar datos para el gráfico de pastel
-        etiquetas = [p['nombre'] for p in resultados['productos']]
-        valores_pastel = [p['pe_valor'] for p in resultados['productos']]
-        
-        # Acortar nombres muy largos
-        etiquetas = [n[:15] + "..." if len(n) > 15 else n for n in etiquetas]
-        
-        # Crear colores para cada porción
-        colores = plt.cm.viridis(np.linspace(0, 0.9, len(etiquetas)))
-        
-        # Calcular porcentajes para mostrar en las etiquetas
-        total = sum(valores_pastel)
-        porcentajes = [100 * v / total for v in valores_pastel]
-        
-        # Crear etiquetas con porcentajes
-        etiquetas_con_pct = [f"{e} ({p:.1f}%)" for e, p in zip(etiquetas, porcentajes)]
-        
-        # Crear gráfico de pastel
-        wedges, texts, autotexts = ax3.pie(
-            valores_pastel, 
-            labels=etiquetas_con_pct, 
-            autopct='%1.1f%%',
-            startangle=90,
-            colors=colores,
-            wedgeprops={'width': 0.5, 'edgecolor': 'w'},
-            textprops={'fontsize': 10}
+        if figura is None:
+            figura = construir_figura_multiproducto(self.resultados_calculados, self.vista_var.get())
+        
+        # Reutilizar la ventana de detalle del análisis (la figura anterior se libera)
+        self.controlador.ventanas_detalle.mostrar(
+            "multiproducto",
+            "Gráfico Detallado - Punto de Equilibrio Multiproducto",
+            figura,
+            titulo_grafico="Análisis Gráfico del Punto de Equilibrio Multiproducto",
+            geometria="900x600",
+            barra_herramientas=True
         )
+
+
+@instrumentar("multiproducto.preparar")
+def preparar_multiproducto(productos, costos_fijos, vista=VISTAS_GRAFICO[0], progreso=None,
+                           cache=None):
+    """
+    Calcula el punto de equilibrio multiproducto y prepara su informe y su gráfico.
+    
+    Se ejecuta en un hilo de trabajo, por lo que no accede a widgets ni al modelo.
+    
+    Args:
+        productos (list): Copia de la lista de productos
+        costos_fijos (float): Costos fijos totales
+        vista (str, optional): Vista del gráfico (uno de VISTAS_GRAFICO)
+        progreso (callable, optional): Función llamada con (fraccion, mensaje)
+        cache (CacheResultados, optional): Caché de resultados. Default es la compartida.
+        
+    Returns:
+        dict: Productos, resultados del análisis, resumen, detalle por producto y figura del gráfico
+    """
+    if progreso:
+        progreso(0.1, "Calculando punto de equilibrio")
+    
+    # Agregar costos fijos a los productos (asumiendo distribución según el mix)
+    productos_con_cf = [dict(producto) for producto in productos]
+    for producto in productos_con_cf:
+        producto["costos_fijos"] = costos_fijos * producto["mix"]
+    
+    # Calcular punto de equilibrio (o reutilizarlo si ya se calculó con los mismos productos)
+    cache = cache or obtener_cache_resultados()
+    resultados = cache.obtener_o_calcular(
+        "multiproducto",
+        {"productos": productos_con_cf},
+        lambda: calcular_punto_equilibrio_multiproducto(productos_con_cf)
+    )
+    
+    if progreso:
+        progreso(0.4, "Preparando informe")
+    texto = componer_resultados_multiproducto(resultados, productos)
+    tabla = tabla_multiproducto(resultados, productos)
+    
+    if progreso:
+        progreso(0.7, "Preparando gráfico")
+    figura = construir_figura_multiproducto(resultados, vista)
+    
+    return {
+        "productos": productos,
+        "resultados": resultados,
+        "texto": texto,
+        "tabla": tabla,
+        "figura": figura
+    }
+
+
+def componer_resultados_multiproducto(resultados, productos):
+    """
+    Compone el resumen de resultados del análisis multiproducto.
+    
+    El detalle por producto se muestra en la tabla (ver tabla_multiproducto).
+    
+    Args:
+        resultados (dict): Diccionario con los resultados del análisis
+        productos (list): Lista de productos analizados
         
-        # Configurar título
-        ax3.set_title('Distribución del Valor de Ventas en Punto de Equilibrio', fontsize=12)
+    Returns:
+        str: Texto del resumen
+    """
+    # Mostrar resultado general
+    texto = "PUNTO DE EQUILIBRIO MULTIPRODUCTO\n"
+    texto += "=" * 40 + "\n\n"
+    texto += f"Punto de Equilibrio Total: {resultados['pe_unidades_total']:.2f} unidades\n"
+    texto += f"Valor de Ventas en PE: ${resultados['pe_valor_total']:.2f}\n"
+    texto += f"Productos analizados: {len(productos)} (detalle y márgenes de contribución en la tabla)\n"
+    
+    return texto
+
+
+def tabla_multiproducto(resultados, productos):
+    """
+    Arma el detalle por producto en columnas para la tabla virtual.
+    
+    Args:
+        resultados (dict): Diccionario con los resultados del análisis
+        productos (list): Lista de productos analizados (en el mismo orden)
         
-        # Añadir leyenda
-        ax3.legend(wedges, etiquetas_con_pct, title="Productos", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
+    Returns:
+        dict: Arreglos de numpy por columna
+    """
+    pe_valor = np.array([p['pe_valor'] for p in resultados['productos']], dtype=float)
+    precio = np.array([p['precio_venta'] for p in productos], dtype=float)
+    costo = np.array([p['costo_variable'] for p in productos], dtype=float)
+    margen = precio - costo
+    
+    return {
+        "nombre": np.array([p['nombre'] for p in resultados['productos']], dtype=str),
+        "pe_unidades": np.array([p['pe_unidades'] for p in resultados['productos']], dtype=float),
+        "pe_valor": pe_valor,
+        "porcentaje_valor": pe_valor / resultados['pe_valor_total'] * 100,
+        "margen": margen,
+        "porcentaje_margen": margen / precio * 100
+    }
+
+
+def _acortar_nombres(nombres, largo):
+    """
+    Acorta los nombres que superan un largo máximo añadiendo puntos suspensivos.
+    
+    Args:
+        nombres (array): Nombres de los productos
+        largo (int): Largo máximo antes de acortar
         
-        # Ajustar layout
-        plt.tight_layout()
+    Returns:
+        numpy.ndarray: Nombres acortados
+    """
+    nombres = np.asarray(nombres, dtype=str)
+    largos = np.char.str_len(nombres)
+    
+    return np.where(largos > largo, np.char.add(nombres.astype(f"<U{largo}"), "..."), nombres)
+
+
+def agrupar_principales(resultados, n=MAX_PRODUCTOS_GRAFICO):
+    """
+    Selecciona los n productos con mayor valor de ventas en el PE y agrupa el resto en "Otros".
+    
+    Args:
+        resultados (dict): Diccionario con los resultados del análisis
+        n (int, optional): Número de productos a mostrar individualmente
         
-        # Crear canvas para mostrar la figura
-        canvas = FigureCanvasTkAgg(fig, frame_contenedor)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    Returns:
+        dict: Nombres, valores de ventas y unidades (arreglos de numpy ordenados de mayor
+            a menor valor, con "Otros" al final si corresponde) y número de productos agrupados
+    """
+    productos = resultados['productos']
+    nombres = np.array([p['nombre'] for p in productos], dtype=str)
+    valores = np.array([p['pe_valor'] for p in productos], dtype=float)
+    unidades = np.array([p['pe_unidades'] for p in productos], dtype=float)
+    
+    if len(valores) <= n:
+        orden = np.argsort(-valores, kind="stable")
+        return {
+            "nombres": nombres[orden],
+            "valores": valores[orden],
+            "unidades": unidades[orden],
+            "agrupados": 0
+        }
+    
+    # Seleccionar los n mayores sin ordenar todo el catálogo
+    principales = np.argpartition(-valores, n - 1)[:n]
+    principales = principales[np.argsort(-valores[principales], kind="stable")]
+    
+    resto = np.ones(len(valores), dtype=bool)
+    resto[principales] = False
+    agrupados = int(resto.sum())
+    
+    return {
+        "nombres": np.append(nombres[principales], f"Otros ({agrupados})"),
+        "valores": np.append(valores[principales], valores[resto].sum()),
+        "unidades": np.append(unidades[principales], unidades[resto].sum()),
+        "agrupados": agrupados
+    }
+
+
+def construir_figura_multiproducto(resultados, vista=VISTAS_GRAFICO[0]):
+    """
+    Construye la figura del gráfico detallado del análisis multiproducto.
+    
+    Usa Figure directamente (sin pyplot) para poder construirla fuera del hilo de Tkinter.
+    El número de elementos dibujados no depende del tamaño del catálogo: la vista de barras
+    muestra los principales productos y agrupa el resto, y la vista de Pareto reduce la
+    curva al ancho de los ejes.
+    
+    Args:
+        resultados (dict): Diccionario con los resultados del análisis
+        vista (str, optional): Vista del gráfico (uno de VISTAS_GRAFICO)
         
-        # Añadir barra de herramientas de navegación
-        from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
-        toolbar = NavigationToolbar2Tk(canvas, frame_contenedor)
-        toolbar.update()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
\ No newline at end of file
+    Returns:
+        Figure: Figura con el gráfico
+    """
+    if vista == "Pareto":
+        return construir_figura_pareto(resultados)
+    
+    # Crear figura con dos subplots
+    fig = Figure(figsize=(12, 8))
+    
+    # Primer subplot: gráfico de barras de PE por producto
+    ax1 = fig.add_subplot(2, 1, 1)
+    
+    # Preparar datos para el gráfico (principales productos y el resto agrupado)
+    grupos = agrupar_principales(resultados)
+    valores = grupos["valores"]
+    unidades = grupos["unidades"]
+    
+    # Acortar nombres muy largos (sin acortar la etiqueta de "Otros")
+    nombres = _acortar_nombres(grupos["nombres"], 10)
+    if grupos["agrupados"]:
+        nombres[-1] = grupos["nombres"][-1]
+    
+    # Crear un gráfico de barras para valores
+    x = np.arange(len(nombres))
+    width = 0.35
+    
+    barras_valor = ax1.bar(x - width/2, valores, width, label='Valor de Ventas ($)', color='steelblue')
+    
+    # Crear un segundo eje Y para las unidades
+    ax2 = ax1.twinx()
+    barras_unidades = ax2.bar(x + width/2, unidades, width, color='orange', label='Unidades')
+    
+    # Configurar etiquetas y leyenda
+    titulo = 'Punto de Equilibrio por Producto'
+    if grupos["agrupados"]:
+        titulo += f' ({MAX_PRODUCTOS_GRAFICO} principales y {grupos["agrupados"]} agrupados)'
+    ax1.set_title(titulo, fontsize=14)
+    ax1.set_xlabel('Productos', fontsize=12)
+    ax1.set_xticks(x)
+    ax1.set_xticklabels(nombres, rotation=45, ha='right')
+    ax1.set_ylabel('Valor de Ventas ($)', fontsize=12, color='steelblue')
+    ax2.set_ylabel('Unidades', fontsize=12, color='orange')
+    
+    # Añadir valores encima de las barras
+    etiqueta = dict(fontsize=9, color='black', fontweight='bold', padding=2)
+    ax1.bar_label(barras_valor, labels=np.char.mod("$%.0f", valores), **etiqueta)
+    ax2.bar_label(barras_unidades, labels=np.char.mod("%.1f", unidades), **etiqueta)
+    
+    # Combinar leyendas
+    lines1, labels1 = ax1.get_legend_handles_labels()
+    lines2, labels2 = ax2.get_legend_handles_labels()
+    ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper right')
+    
+    # Segundo subplot: gráfico de pastel para la distribución del valor total
+    ax3 = fig.add_subplot(2, 1, 2)
+    
+    # Acortar nombres muy largos
+    etiquetas = _acortar_nombres(grupos["nombres"], 15)
+    if grupos["agrupados"]:
+        etiquetas[-1] = grupos["nombres"][-1]
+    
+    # Crear colores para cada porción ("Otros" en gris)
+    colores = cm.viridis(np.linspace(0, 0.9, len(etiquetas)))
+    if grupos["agrupados"]:
+        colores[-1] = (0.75, 0.75, 0.75, 1.0)
+    
+    # Calcular porcentajes y crear etiquetas con porcentajes
+    porcentajes = 100 * valores / valores.sum()
+    etiquetas_con_pct = np.char.add(etiquetas, np.char.mod(" (%.1f%%)", porcentajes))
+    
+    # Crear gráfico de pastel
+    wedges, texts, autotexts = ax3.pie(
+        valores, 
+        labels=etiquetas_con_pct, 
+        autopct='%1.1f%%',
+        startangle=90,
+        colors=colores,
+        wedgeprops={'width': 0.5, 'edgecolor': 'w'},
+        textprops={'fontsize': 10}
+    )
+    
+    # Configurar título
+    ax3.set_title('Distribución del Valor de Ventas en Punto de Equilibrio', fontsize=12)
+    
+    # Añadir leyenda
+    ax3.legend(wedges, etiquetas_con_pct, title="Productos", loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
+    
+    # Ajustar layout
+    fig.tight_layout()
+    
+    return fig
+
+
+def construir_figura_pareto(resultados):
+    """
+    Construye un gráfico de Pareto del valor de ventas en el PE de todos los productos.
+    
+    Los productos se ordenan de mayor a menor valor y se muestra el porcentaje acumulado,
+    junto con el número de productos que reúnen el 80% del valor total.
+    
+    Args:
+        resultados (dict): Diccionario con los resultados del análisis
+        
+    Returns:
+        Figure: Figura con el gráfico
+    """
+    fig = Figure(figsize=(12, 8))
+    ax = fig.add_subplot(1, 1, 1)
+    
+    # Ordenar los productos de mayor a menor valor de ventas
+    nombres = np.array([p['nombre'] for p in resultados['productos']], dtype=str)
+    valores = np.array([p['pe_valor'] for p in resultados['productos']], dtype=float)
+    orden = np.argsort(-valores, kind="stable")
+    nombres = nombres[orden]
+    valores = valores[orden]
+    acumulado = np.cumsum(valores) / valores.sum() * 100
+    
+    # Número de productos que reúnen el 80% del valor
+    productos_80 = int(np.searchsorted(acumulado, 80 - 1e-9)) + 1
+    
+    posiciones = np.arange(len(valores))
+    if len(valores) <= MAX_PRODUCTOS_GRAFICO * 3:
+        # Pocos productos: una barra por producto con su nombre
+        ax.bar(posiciones, valores, color='steelblue', label='Valor de Ventas ($)')
+        ax.set_xticks(posiciones)
+        ax.set_xticklabels(_acortar_nombres(nombres, 10), rotation=45, ha='right')
+        x, (valores_curva, acumulado_curva) = posiciones, (valores, acumulado)
+    else:
+        # Muchos productos: área escalonada y curva reducidas al ancho de los ejes
+        x, (valores_curva, acumulado_curva) = submuestrear(
+            posiciones, [valores, acumulado], puntos_para_ejes(ax), conservar=[productos_80 - 1])
+        ax.fill_between(x, valores_curva, step='post', color='steelblue', alpha=0.8,
+                        label='Valor de Ventas ($)')
+        ax.set_xlim(0, len(valores))
+    
+    ax.set_xlabel('Productos (ordenados por valor de ventas)', fontsize=12)
+    ax.set_ylabel('Valor de Ventas ($)', fontsize=12, color='steelblue')
+    
+    # Porcentaje acumulado en un segundo eje Y
+    ax_acumulado = ax.twinx()
+    ax_acumulado.plot(x, acumulado_curva, color='darkred', linewidth=2, label='% Acumulado')
+    ax_acumulado.axhline(y=80, color='gray', linestyle='--', alpha=0.7)
+    ax_acumulado.axvline(x=productos_80 - 1, color='gray', linestyle=':', alpha=0.7)
+    ax_acumulado.set_ylim(0, 105)
+    ax_acumulado.set_ylabel('Porcentaje Acumulado (%)', fontsize=12, color='darkred')
+    
+    ax.set_title(
+        f'Pareto del Valor de Ventas en PE: {productos_80} de {len(valores)} productos '
+        f'reúnen el 80% del valor', fontsize=14)
+    ax.grid(True, linestyle='--', alpha=0.6)
+    
+    # Combinar leyendas
+    lines1, labels1 = ax.get_legend_handles_labels()
+    lines2, labels2 = ax_acumulado.get_legend_handles_labels()
+    ax.legend(lines1 + lines2, labels1 + labels2, loc='center right')
+    
+    # Ajustar layout
+    fig.tight_layout()
+    
+    return fig
\ No newline at end of file
@@ -6,6 +6,9 @@ from tkinter import ttk
 import datetime
 from tkinter import scrolledtext, messagebox
 
+from utils.instrumentacion import instrumentar
+
+
 class FrameResultados(ttk.Frame):
     """
     Frame para mostrar los resultados del análisis de punto de equilibrio.
@@ -106,6 +109,7 @@ class FrameResultados(ttk.Frame):
         """Exporta los resultados actuales a un archivo PDF."""
         self.controlador.exportar_pdf()
     
+    @instrumentar("resultados.actualizar_resultados")
     def actualizar_resultados(self):
         """Actualiza los resultados mostrados con los datos actuales del modelo."""
         # Verificar si hay resultados para mostrar
@@ -6,8 +6,18 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+from core.sensibilidad import calcular_sensibilidad, tabla_a_listas, VARIABLES_SENSIBILIDAD
+from gui.utils.tabla_virtual import TablaVirtual
+from utils.submuestreo import submuestrear, puntos_para_ejes
+from utils.instrumentacion import instrumentar
+from utils.cache_resultados import obtener_cache_resultados
+
+
+# Número máximo de marcadores por línea en el gráfico detallado
+MAX_MARCADORES = 50
+
 
 class FrameSensibilidad(ttk.Frame):
     """
@@ -65,7 +75,7 @@ class FrameSensibilidad(ttk.Frame):
         combo_variables = ttk.Combobox(
             frame_izquierdo, 
             textvariable=self.variable_analisis,
-            values=["Costos Fijos", "Precio de Venta", "Costo Variable Unitario"],
+            values=VARIABLES_SENSIBILIDAD,
             state="readonly",
             width=25
         )
@@ -100,6 +110,13 @@ class FrameSensibilidad(ttk.Frame):
             frame_izquierdo, text="Ver Gráfico Detallado", command=self.mostrar_grafico_detallado)
         btn_grafico.grid(row=5, column=0, columnspan=2, padx=10, pady=5)
         
+        # Progreso del cálculo en segundo plano
+        self.barra_progreso = ttk.Progressbar(frame_izquierdo, mode="determinate", maximum=100)
+        self.barra_progreso.grid(row=6, column=0, columnspan=2, padx=10, pady=(10, 0), sticky="ew")
+        
+        self.lbl_progreso = ttk.Label(frame_izquierdo, text="")
+        self.lbl_progreso.grid(row=7, column=0, columnspan=2, padx=10, sticky="w")
+        
         # Crear un frame para la explicación/información
         frame_derecho = ttk.LabelFrame(frame_controles, text="Información del Análisis de Sensibilidad")
         frame_derecho.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -133,22 +150,42 @@ class FrameSensibilidad(ttk.Frame):
         frame_resultados = ttk.LabelFrame(self, text="Resultados del Análisis de Sensibilidad")
         frame_resultados.grid(row=2, column=0, padx=20, pady=10, sticky="nsew")
         
-        # ScrolledText para mostrar resultados en formato tabular con mejores detalles
-        self.texto_resultados = tk.Text(frame_resultados, height=15, wrap=tk.WORD)
-        scrollbar = ttk.Scrollbar(frame_resultados, command=self.texto_resultados.yview)
+        # Tabla virtual con una fila por escenario (sólo dibuja las filas visibles)
+        self.tabla_resultados = TablaVirtual(frame_resultados, columnas=[
+            ("porcentaje", "% Cambio", 90, "{:+.1f}%"),
+            ("variable_ajustada", "Valor Ajustado", 140, "${:,.2f}"),
+            ("pe_unidades", "PE Unidades", 140, "{:,.2f}"),
+            ("pe_valor", "PE Valor", 140, "${:,.2f}"),
+            ("variacion_pe", "Var. PE %", 100, "{:+.2f}%"),
+        ])
+        self.tabla_resultados.pack(side=tk.TOP, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Área de texto para el resumen y la interpretación del análisis
+        frame_texto = ttk.Frame(frame_resultados)
+        frame_texto.pack(side=tk.TOP, fill=tk.BOTH, expand=True)
+        
+        self.texto_resultados = tk.Text(frame_texto, height=10, wrap=tk.WORD)
+        scrollbar = ttk.Scrollbar(frame_texto, command=self.texto_resultados.yview)
         self.texto_resultados.config(yscrollcommand=scrollbar.set)
         
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.texto_resultados.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
     
+    @instrumentar("sensibilidad.actualizar_datos")
     def actualizar_datos(self):
         """Actualiza los datos del frame cuando cambia el modelo."""
         # Este método puede ser llamado cuando se actualiza el modelo,
         # pero no necesitamos hacer nada especial aquí
         pass
     
+    @instrumentar("sensibilidad.calcular_sensibilidad")
     def calcular_sensibilidad(self):
-        """Calcula y muestra el análisis de sensibilidad."""
+        """
+        Inicia el análisis de sensibilidad en segundo plano.
+        
+        El cálculo, el informe y el gráfico se preparan en un hilo de trabajo; si se
+        vuelve a calcular antes de que termine, el cálculo anterior se descarta.
+        """
         # Verificar si hay un análisis activo
         if self.controlador.modelo["analizador"] is None:
             messagebox.showinfo(
@@ -163,214 +200,97 @@ class FrameSensibilidad(ttk.Frame):
             porcentaje_min = float(self.porcentaje_min.get())
             porcentaje_max = float(self.porcentaje_max.get())
             incrementos = float(self.incrementos.get())
-            
-            # Validar parámetros
-            if porcentaje_min >= porcentaje_max:
-                raise ValueError("El porcentaje mínimo debe ser menor que el máximo.")
-            
-            if incrementos <= 0:
-                raise ValueError("El incremento debe ser mayor que cero.")
-            
-            # Obtener los valores base del modelo
-            costos_fijos = self.controlador.modelo["costos_fijos"]
-            precio_venta = self.controlador.modelo["precio_venta"]
-            costo_variable = self.controlador.modelo["costo_variable"]
-            
-            # Generar los porcentajes a evaluar
-            porcentajes = np.arange(porcentaje_min, porcentaje_max + incrementos, incrementos)
-            
-            # Calcular puntos de equilibrio para cada porcentaje
-            resultados = []
-            
-            for porcentaje in porcentajes:
-                # Calcular el valor ajustado según la variable seleccionada
-                factor = 1 + (porcentaje / 100)
-                
-                if variable == "Costos Fijos":
-                    costos_fijos_ajustados = costos_fijos * factor
-                    pe_unidades = costos_fijos_ajustados / (precio_venta - costo_variable)
-                    variable_ajustada = costos_fijos_ajustados
-                elif variable == "Precio de Venta":
-                    precio_venta_ajustado = precio_venta * factor
-                    # Verificar que el precio ajustado sea mayor que el costo variable
-                    if precio_venta_ajustado <= costo_variable:
-                        continue
-                    pe_unidades = costos_fijos / (precio_venta_ajustado - costo_variable)
-                    variable_ajustada = precio_venta_ajustado
-                else:  # Costo Variable Unitario
-                    costo_variable_ajustado = costo_variable * factor
-                    # Verificar que el costo variable ajustado sea menor que el precio de venta
-                    if costo_variable_ajustado >= precio_venta:
-                        continue
-                    pe_unidades = costos_fijos / (precio_venta - costo_variable_ajustado)
-                    variable_ajustada = costo_variable_ajustado
-                
-                # Calcular el valor monetario
-                pe_valor = pe_unidades * precio_venta
-                
-                # Almacenar resultados
-                resultados.append({
-                    "porcentaje": porcentaje,
-                    "variable_ajustada": variable_ajustada,
-                    "pe_unidades": pe_unidades,
-                    "pe_valor": pe_valor
-                })
-            
-            # Guardar resultados para uso posterior
-            self.resultados_calculados = {
-                "variable": variable,
-                "resultados": resultados,
-                "valor_base": {
-                    "costos_fijos": costos_fijos,
-                    "precio_venta": precio_venta,
-                    "costo_variable": costo_variable
-                }
-            }
-            
-            # Mostrar resultados en la tabla
-            self.mostrar_tabla_resultados(variable, resultados)
-            
-            # Mostrar gráfico detallado en ventana separada
-            self.mostrar_grafico_detallado()
-            
-            return True
-            
-        except ValueError as e:
-            messagebox.showerror("Error de validación", str(e))
-            return False
-        except Exception as e:
-            messagebox.showerror("Error", f"Ocurrió un error: {str(e)}")
+        except ValueError:
+            messagebox.showerror("Error de validación", "Los porcentajes deben ser números válidos.")
             return False
+        
+        # Copiar los valores base del modelo (el hilo de trabajo no accede al modelo)
+        modelo = self.controlador.modelo
+        valores_base = {
+            "costos_fijos": modelo["costos_fijos"],
+            "precio_venta": modelo["precio_venta"],
+            "costo_variable": modelo["costo_variable"]
+        }
+        pe_base = {
+            "unidades": modelo["resultados"]["pe_unidades"],
+            "valor": modelo["resultados"]["pe_valor"]
+        }
+        
+        self._mostrar_progreso(0.0, "Calculando...")
+        self.controlador.ejecutor_calculos.enviar(
+            "sensibilidad",
+            preparar_sensibilidad,
+            valores_base, pe_base, variable, porcentaje_min, porcentaje_max, incrementos,
+            al_terminar=self._al_terminar_calculo,
+            al_error=self._al_error_calculo,
+            al_progreso=self._mostrar_progreso
+        )
+        
+        return True
     
-    def mostrar_tabla_resultados(self, variable, resultados):
+    @instrumentar("sensibilidad.mostrar_resultados")
+    def _al_terminar_calculo(self, preparado):
         """
-        Muestra los resultados del análisis en formato de tabla con interpretación detallada.
+        Muestra los resultados preparados en el hilo de trabajo.
         
         Args:
-            variable (str): Nombre de la variable analizada
-            resultados (list): Lista de diccionarios con los resultados
+            preparado (dict): Resultado de preparar_sensibilidad
         """
-        # Limpiar contenido previo
-        self.texto_resultados.delete(1.0, tk.END)
+        self._mostrar_progreso(1.0, "Completado")
         
-        if not resultados:
-            self.texto_resultados.insert(tk.END, "No hay resultados válidos para mostrar.\n"
-                                       "Esto puede ocurrir si los cambios en las variables generan situaciones inviables,\n"
-                                       "como un precio de venta menor al costo variable.")
-            return
+        # Guardar resultados para uso posterior (también en el modelo, para guardarlos y exportarlos)
+        self.resultados_calculados = preparado["analisis"]
+        self.controlador.modelo["analisis_sensibilidad"] = preparado["filas"]
         
-        # Cabecera con título
-        titulo = f"ANÁLISIS DE SENSIBILIDAD: IMPACTO DE CAMBIOS EN {variable.upper()}\n"
-        self.texto_resultados.insert(tk.END, titulo, "titulo")
-        self.texto_resultados.insert(tk.END, "=" * 80 + "\n\n")
-        
-        # Resumen de datos base
-        base_info = (
-            f"DATOS BASE DEL ANÁLISIS:\n"
-            f"- Costos Fijos: ${self.controlador.modelo['costos_fijos']:.2f}\n"
-            f"- Precio de Venta: ${self.controlador.modelo['precio_venta']:.2f}\n"
-            f"- Costo Variable Unitario: ${self.controlador.modelo['costo_variable']:.2f}\n"
-            f"- Punto de Equilibrio Base: {self.controlador.modelo['resultados']['pe_unidades']:.2f} unidades "
-            f"(${self.controlador.modelo['resultados']['pe_valor']:.2f})\n\n"
-        )
-        self.texto_resultados.insert(tk.END, base_info)
-        
-        # Crear encabezado según la variable
-        self.texto_resultados.insert(tk.END, "RESULTADOS DEL ANÁLISIS:\n")
-        if variable == "Costos Fijos":
-            encabezado = f"{'% Cambio':<10} | {'Costos Fijos':<15} | {'PE Unidades':<15} | {'PE Valor':<15} | {'Var. PE %':<10}\n"
-        elif variable == "Precio de Venta":
-            encabezado = f"{'% Cambio':<10} | {'Precio Venta':<15} | {'PE Unidades':<15} | {'PE Valor':<15} | {'Var. PE %':<10}\n"
-        else:  # Costo Variable Unitario
-            encabezado = f"{'% Cambio':<10} | {'Costo Var.':<15} | {'PE Unidades':<15} | {'PE Valor':<15} | {'Var. PE %':<10}\n"
-        
-        self.texto_resultados.insert(tk.END, encabezado)
-        self.texto_resultados.insert(tk.END, "-" * 80 + "\n")
-        
-        # Obtener PE base para calcular variaciones porcentuales
-        pe_base = self.controlador.modelo['resultados']['pe_unidades']
-        
-        # Insertar cada fila de resultados
-        for r in resultados:
-            # Calcular variación porcentual del PE respecto al base
-            var_pe_pct = ((r['pe_unidades'] - pe_base) / pe_base) * 100
-            
-            fila = f"{r['porcentaje']:+6.1f}% | "
-            fila += f"${r['variable_ajustada']:<14.2f} | "
-            fila += f"{r['pe_unidades']:<14.2f} | "
-            fila += f"${r['pe_valor']:<14.2f} | "
-            fila += f"{var_pe_pct:+8.2f}%\n"
-            
-            self.texto_resultados.insert(tk.END, fila)
+        # Mostrar resultados en la tabla y el resumen
+        self.mostrar_tabla_resultados(preparado["analisis"], preparado["titulo"], preparado["texto"])
         
-        # Añadir interpretación
-        self.texto_resultados.insert(tk.END, "\nINTERPRETACIÓN DEL ANÁLISIS:\n")
-        self.texto_resultados.insert(tk.END, "-" * 80 + "\n")
+        # Mostrar gráfico detallado en ventana separada
+        self.mostrar_grafico_detallado(preparado["figura"])
+    
+    def _al_error_calculo(self, error):
+        """
+        Muestra el error producido durante el cálculo.
         
-        # Calcular elasticidad (sensibilidad promedio)
-        if len(resultados) > 1:
-            # Buscar resultados para cambios de +10% y -10% para calcular elasticidad
-            r_mas10 = next((r for r in resultados if abs(r['porcentaje'] - 10) < 0.001), None)
-            r_menos10 = next((r for r in resultados if abs(r['porcentaje'] + 10) < 0.001), None)
-            
-            if r_mas10 and r_menos10:
-                # Calcular elasticidad como la proporción del cambio en PE dividido por el cambio en la variable
-                var_pe_mas = (r_mas10['pe_unidades'] - pe_base) / pe_base * 100
-                var_pe_menos = (r_menos10['pe_unidades'] - pe_base) / pe_base * 100
-                elasticidad_mas = var_pe_mas / 10  # El cambio fue de 10%
-                elasticidad_menos = var_pe_menos / -10  # El cambio fue de -10%
-                elasticidad_promedio = (abs(elasticidad_mas) + abs(elasticidad_menos)) / 2
-                
-                interpretacion = (
-                    f"El análisis muestra la sensibilidad del punto de equilibrio ante cambios en {variable.lower()}.\n\n"
-                    f"La elasticidad promedio es aproximadamente {elasticidad_promedio:.2f}, lo que significa que "
-                    f"por cada 1% de cambio en {variable.lower()}, el punto de equilibrio cambia aproximadamente "
-                    f"en un {elasticidad_promedio:.2f}%.\n\n"
-                )
-                
-                # Añadir interpretación según la variable
-                if variable == "Costos Fijos":
-                    interpretacion += (
-                        f"Un aumento del 10% en los costos fijos incrementa el punto de equilibrio "
-                        f"en un {var_pe_mas:.2f}% (a {r_mas10['pe_unidades']:.2f} unidades).\n\n"
-                        f"Una reducción del 10% en los costos fijos disminuye el punto de equilibrio "
-                        f"en un {abs(var_pe_menos):.2f}% (a {r_menos10['pe_unidades']:.2f} unidades).\n\n"
-                        f"{'→ Recomendación: ' if abs(elasticidad_promedio) > 0.8 else ''}"
-                        f"{'Este análisis indica que el punto de equilibrio es altamente sensible a cambios en los costos fijos. ' if abs(elasticidad_promedio) > 0.8 else ''}"
-                        f"{'Se recomienda explorar estrategias para reducir los costos fijos o convertirlos en variables.' if abs(elasticidad_promedio) > 0.8 else ''}"
-                    )
-                elif variable == "Precio de Venta":
-                    interpretacion += (
-                        f"Un aumento del 10% en el precio de venta reduce el punto de equilibrio "
-                        f"en un {abs(var_pe_mas):.2f}% (a {r_mas10['pe_unidades']:.2f} unidades).\n\n"
-                        f"Una reducción del 10% en el precio de venta aumenta el punto de equilibrio "
-                        f"en un {var_pe_menos:.2f}% (a {r_menos10['pe_unidades']:.2f} unidades).\n\n"
-                        f"{'→ Recomendación: ' if abs(elasticidad_promedio) > 0.8 else ''}"
-                        f"{'Este análisis indica que el punto de equilibrio es altamente sensible a cambios en el precio de venta. ' if abs(elasticidad_promedio) > 0.8 else ''}"
-                        f"{'Se recomienda evaluar cuidadosamente la estrategia de precios y el impacto en la demanda antes de modificarlos.' if abs(elasticidad_promedio) > 0.8 else ''}"
-                    )
-                else:  # Costo Variable
-                    interpretacion += (
-                        f"Un aumento del 10% en el costo variable aumenta el punto de equilibrio "
-                        f"en un {var_pe_mas:.2f}% (a {r_mas10['pe_unidades']:.2f} unidades).\n\n"
-                        f"Una reducción del 10% en el costo variable disminuye el punto de equilibrio "
-                        f"en un {abs(var_pe_menos):.2f}% (a {r_menos10['pe_unidades']:.2f} unidades).\n\n"
-                        f"{'→ Recomendación: ' if abs(elasticidad_promedio) > 0.8 else ''}"
-                        f"{'Este análisis indica que el punto de equilibrio es altamente sensible a cambios en los costos variables. ' if abs(elasticidad_promedio) > 0.8 else ''}"
-                        f"{'Se recomienda buscar eficiencias en la producción o negociar mejores condiciones con proveedores.' if abs(elasticidad_promedio) > 0.8 else ''}"
-                    )
-            else:
-                interpretacion = (
-                    f"El análisis muestra cómo el punto de equilibrio cambia cuando se modifica {variable.lower()}.\n\n"
-                    f"Para una interpretación más detallada, se recomienda utilizar incrementos que incluyan +/-10%."
-                )
+        Args:
+            error (Exception): Error lanzado en el hilo de trabajo
+        """
+        self._mostrar_progreso(0.0, "")
+        if isinstance(error, ValueError):
+            messagebox.showerror("Error de validación", str(error))
         else:
-            interpretacion = (
-                f"No hay suficientes datos para realizar un análisis completo de sensibilidad.\n"
-                f"Se recomienda ajustar los parámetros para obtener más puntos de análisis."
-            )
+            messagebox.showerror("Error", f"Ocurrió un error: {str(error)}")
+    
+    def _mostrar_progreso(self, fraccion, mensaje):
+        """
+        Muestra el avance del cálculo en segundo plano.
         
-        self.texto_resultados.insert(tk.END, interpretacion)
+        Args:
+            fraccion (float): Fracción completada (entre 0 y 1)
+            mensaje (str): Descripción de la etapa actual
+        """
+        self.barra_progreso["value"] = fraccion * 100
+        self.lbl_progreso.config(text=mensaje)
+    
+    def mostrar_tabla_resultados(self, analisis, titulo, texto):
+        """
+        Muestra los resultados en la tabla virtual y el informe en el área de texto.
+        
+        Args:
+            analisis (dict): Resultado de calcular_sensibilidad
+            titulo (str): Título del informe (vacío si no hay resultados)
+            texto (str): Contenido del informe, generado con componer_informe_sensibilidad
+        """
+        # Mostrar las filas en la tabla, con el nombre de la variable analizada
+        self.tabla_resultados.cambiar_titulo("variable_ajustada", analisis["variable"])
+        self.tabla_resultados.establecer_datos(analisis["tabla"])
+        
+        # Limpiar contenido previo
+        self.texto_resultados.delete(1.0, tk.END)
+        
+        if titulo:
+            self.texto_resultados.insert(tk.END, titulo, "titulo")
+        self.texto_resultados.insert(tk.END, texto)
         
         # Configurar estilos de texto si es posible
         try:
@@ -378,8 +298,15 @@ class FrameSensibilidad(ttk.Frame):
         except:
             pass  # Ignorar si falla la configuración de tags
     
-    def mostrar_grafico_detallado(self):
-        """Muestra el gráfico de resultados en una ventana separada con más detalle."""
+    @instrumentar("sensibilidad.mostrar_grafico_detallado")
+    def mostrar_grafico_detallado(self, figura=None):
+        """
+        Muestra el gráfico de resultados en una ventana separada con más detalle.
+        
+        Args:
+            figura (Figure, optional): Figura ya construida en el hilo de trabajo. Si es None,
+                se construye a partir de los últimos resultados calculados.
+        """
         if not self.resultados_calculados:
             messagebox.showinfo(
                 "Información", 
@@ -387,147 +314,327 @@ class FrameSensibilidad(ttk.Frame):
             )
             return
         
-        # Crear una nueva ventana para el gráfico detallado
-        ventana_grafico = tk.Toplevel(self.master)
-        ventana_grafico.title("Gráfico Detallado - Análisis de Sensibilidad")
-        ventana_grafico.geometry("900x700")
-        ventana_grafico.minsize(800, 600)
-        
-        # Crear frame contenedor
-        frame_principal = ttk.Frame(ventana_grafico, padding=10)
-        frame_principal.pack(fill=tk.BOTH, expand=True)
+        if figura is None:
+            figura = construir_figura_sensibilidad(self.resultados_calculados)
         
-        # Título
+        # Reutilizar la ventana de detalle del análisis (la figura anterior se libera)
         variable = self.resultados_calculados["variable"]
-        ttk.Label(
-            frame_principal, 
-            text=f"Análisis de Sensibilidad: Impacto de Cambios en {variable}",
-            font=("Arial", 12, "bold")
-        ).pack(pady=(0, 20))
-        
-        # Crear frame para el gráfico
-        frame_grafico = ttk.Frame(frame_principal)
-        frame_grafico.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
-        
-        # Crear gráfico detallado
-        self.crear_grafico_detallado(frame_grafico)
-        
-        # Botón para cerrar
-        ttk.Button(
-            frame_principal, 
-            text="Cerrar", 
-            command=ventana_grafico.destroy
-        ).pack(pady=10)
-        
-        # Centrar la ventana
-        ventana_grafico.update_idletasks()
-        ancho = ventana_grafico.winfo_width()
-        alto = ventana_grafico.winfo_height()
-        x = (ventana_grafico.winfo_screenwidth() // 2) - (ancho // 2)
-        y = (ventana_grafico.winfo_screenheight() // 2) - (alto // 2)
-        ventana_grafico.geometry(f"{ancho}x{alto}+{x}+{y}")
-    
-    def crear_grafico_detallado(self, frame_contenedor):
-        """
-        Crea un gráfico detallado para mostrar en la ventana separada.
-        
-        Args:
-            frame_contenedor: Frame donde se mostrará el gráfico
-        """
-        datos = self.resultados_calculados
-        variable = datos["variable"]
-        resultados = datos["resultados"]
-        valores_base = datos["valor_base"]
-        
-        if not resultados:
-            # Si no hay resultados válidos, mostrar mensaje
-            fig, ax = plt.subplots(figsize=(10, 6))
-            ax.text(0.5, 0.5, "No hay datos válidos para graficar.\nVerifique los parámetros del análisis.", 
-                    ha='center', va='center', fontsize=14)
-            ax.set_xticks([])
-            ax.set_yticks([])
+        self.controlador.ventanas_detalle.mostrar(
+            "sensibilidad",
+            "Gráfico Detallado - Análisis de Sensibilidad",
+            figura,
+            titulo_grafico=f"Análisis de Sensibilidad: Impacto de Cambios en {variable}",
+            geometria="900x700"
+        )
+
+
+@instrumentar("sensibilidad.preparar")
+def preparar_sensibilidad(valores_base, pe_base, variable, porcentaje_min, porcentaje_max,
+                          incrementos, progreso=None, cache=None):
+    """
+    Calcula el análisis de sensibilidad y prepara su informe y su gráfico.
+    
+    Se ejecuta en un hilo de trabajo, por lo que no accede a widgets ni al modelo.
+    
+    Args:
+        valores_base (dict): Costos fijos, precio de venta y costo variable base
+        pe_base (dict): Punto de equilibrio base en unidades y valor
+        variable (str): Variable a analizar
+        porcentaje_min (float): Porcentaje mínimo de cambio
+        porcentaje_max (float): Porcentaje máximo de cambio
+        incrementos (float): Separación entre los porcentajes evaluados
+        progreso (callable, optional): Función llamada con (fraccion, mensaje)
+        cache (CacheResultados, optional): Caché de resultados. Default es la compartida.
+        
+    Returns:
+        dict: Análisis calculado, sus filas como listas (para el modelo), título y texto
+            del informe, y figura del gráfico
+    """
+    # Reutilizar el análisis si ya se calculó con los mismos valores (en esta u otra sesión)
+    cache = cache or obtener_cache_resultados()
+    analisis = cache.obtener_o_calcular(
+        "sensibilidad",
+        {
+            "valores_base": valores_base,
+            "variable": variable,
+            "porcentajes": [porcentaje_min, porcentaje_max, incrementos]
+        },
+        lambda: calcular_sensibilidad(
+            valores_base["costos_fijos"], valores_base["precio_venta"], valores_base["costo_variable"],
+            variable, porcentaje_min, porcentaje_max, incrementos, progreso=progreso
+        )
+    )
+    analisis["pe_base"] = pe_base
+    
+    if progreso:
+        progreso(0.4, "Preparando informe")
+    titulo, texto = componer_informe_sensibilidad(variable, analisis["tabla"], valores_base, pe_base)
+    
+    if progreso:
+        progreso(0.7, "Preparando gráfico")
+    figura = construir_figura_sensibilidad(analisis)
+    
+    return {
+        "analisis": analisis,
+        "filas": tabla_a_listas(analisis["tabla"]),
+        "titulo": titulo,
+        "texto": texto,
+        "figura": figura
+    }
+
+
+def componer_informe_sensibilidad(variable, tabla, valores_base, pe_base):
+    """
+    Compone el resumen del análisis con su interpretación detallada.
+    
+    Args:
+        variable (str): Nombre de la variable analizada
+        tabla (dict): Resultados por columnas (arreglos de numpy)
+        valores_base (dict): Costos fijos, precio de venta y costo variable base
+        pe_base (dict): Punto de equilibrio base en unidades y valor
+        
+    Returns:
+        tuple: (título, texto) del informe; el título está vacío si no hay resultados
+    """
+    porcentajes = tabla["porcentaje"]
+    
+    if len(porcentajes) == 0:
+        return "", ("No hay resultados válidos para mostrar.\n"
+                    "Esto puede ocurrir si los cambios en las variables generan situaciones inviables,\n"
+                    "como un precio de venta menor al costo variable.")
+    
+    # Cabecera con título
+    titulo = f"ANÁLISIS DE SENSIBILIDAD: IMPACTO DE CAMBIOS EN {variable.upper()}\n"
+    partes = ["=" * 80 + "\n\n"]
+    
+    # Resumen de datos base
+    base_info = (
+        f"DATOS BASE DEL ANÁLISIS:\n"
+        f"- Costos Fijos: ${valores_base['costos_fijos']:.2f}\n"
+        f"- Precio de Venta: ${valores_base['precio_venta']:.2f}\n"
+        f"- Costo Variable Unitario: ${valores_base['costo_variable']:.2f}\n"
+        f"- Punto de Equilibrio Base: {pe_base['unidades']:.2f} unidades "
+        f"(${pe_base['valor']:.2f})\n\n"
+    )
+    partes.append(base_info)
+    
+    # Las filas se muestran en la tabla de resultados
+    partes.append(f"RESULTADOS DEL ANÁLISIS: {len(porcentajes)} escenarios evaluados (ver tabla).\n")
+    
+    # Obtener PE base para calcular variaciones porcentuales
+    pe_base_unidades = pe_base['unidades']
+    
+    # Añadir interpretación
+    partes.append("\nINTERPRETACIÓN DEL ANÁLISIS:\n")
+    partes.append("-" * 80 + "\n")
+    
+    # Calcular elasticidad (sensibilidad promedio)
+    if len(porcentajes) > 1:
+        # Buscar resultados para cambios de +10% y -10% para calcular elasticidad
+        r_mas10 = _fila_con_porcentaje(tabla, 10)
+        r_menos10 = _fila_con_porcentaje(tabla, -10)
+        
+        if r_mas10 and r_menos10:
+            # Calcular elasticidad como la proporción del cambio en PE dividido por el cambio en la variable
+            var_pe_mas = (r_mas10['pe_unidades'] - pe_base_unidades) / pe_base_unidades * 100
+            var_pe_menos = (r_menos10['pe_unidades'] - pe_base_unidades) / pe_base_unidades * 100
+            elasticidad_mas = var_pe_mas / 10  # El cambio fue de 10%
+            elasticidad_menos = var_pe_menos / -10  # El cambio fue de -10%
+            elasticidad_promedio = (abs(elasticidad_mas) + abs(elasticidad_menos)) / 2
             
-            canvas = FigureCanvasTkAgg(fig, frame_contenedor)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-            return
+            interpretacion = (
+                f"El análisis muestra la sensibilidad del punto de equilibrio ante cambios en {variable.lower()}.\n\n"
+                f"La elasticidad promedio es aproximadamente {elasticidad_promedio:.2f}, lo que significa que "
+                f"por cada 1% de cambio en {variable.lower()}, el punto de equilibrio cambia aproximadamente "
+                f"en un {elasticidad_promedio:.2f}%.\n\n"
+            )
+            
+            # Añadir interpretación según la variable
+            if variable == "Costos Fijos":
+                interpretacion += (
+                    f"Un aumento del 10% en los costos fijos incrementa el punto de equilibrio "
+                    f"en un {var_pe_mas:.2f}% (a {r_mas10['pe_unidades']:.2f} unidades).\n\n"
+                    f"Una reducción del 10% en los costos fijos disminuye el punto de equilibrio "
+                    f"en un {abs(var_pe_menos):.2f}% (a {r_menos10['pe_unidades']:.2f} unidades).\n\n"
+                    f"{'→ Recomendación: ' if abs(elasticidad_promedio) > 0.8 else ''}"
+                    f"{'Este análisis indica que el punto de equilibrio es altamente sensible a cambios en los costos fijos. ' if abs(elasticidad_promedio) > 0.8 else ''}"
+                    f"{'Se recomienda explorar estrategias para reducir los costos fijos o convertirlos en variables.' if abs(elasticidad_promedio) > 0.8 else ''}"
+                )
+            elif variable == "Precio de Venta":
+                interpretacion += (
+                    f"Un aumento del 10% en el precio de venta reduce el punto de equilibrio "
+                    f"en un {abs(var_pe_mas):.2f}% (a {r_mas10['pe_unidades']:.2f} unidades).\n\n"
+                    f"Una reducción del 10% en el precio de venta aumenta el punto de equilibrio "
+                    f"en un {var_pe_menos:.2f}% (a {r_menos10['pe_unidades']:.2f} unidades).\n\n"
+                    f"{'→ Recomendación: ' if abs(elasticidad_promedio) > 0.8 else ''}"
+                    f"{'Este análisis indica que el punto de equilibrio es altamente sensible a cambios en el precio de venta. ' if abs(elasticidad_promedio) > 0.8 else ''}"
+                    f"{'Se recomienda evaluar cuidadosamente la estrategia de precios y el impacto en la demanda antes de modificarlos.' if abs(elasticidad_promedio) > 0.8 else ''}"
+                )
+            else:  # Costo Variable
+                interpretacion += (
+                    f"Un aumento del 10% en el costo variable aumenta el punto de equilibrio "
+                    f"en un {var_pe_mas:.2f}% (a {r_mas10['pe_unidades']:.2f} unidades).\n\n"
+                    f"Una reducción del 10% en el costo variable disminuye el punto de equilibrio "
+                    f"en un {abs(var_pe_menos):.2f}% (a {r_menos10['pe_unidades']:.2f} unidades).\n\n"
+                    f"{'→ Recomendación: ' if abs(elasticidad_promedio) > 0.8 else ''}"
+                    f"{'Este análisis indica que el punto de equilibrio es altamente sensible a cambios en los costos variables. ' if abs(elasticidad_promedio) > 0.8 else ''}"
+                    f"{'Se recomienda buscar eficiencias en la producción o negociar mejores condiciones con proveedores.' if abs(elasticidad_promedio) > 0.8 else ''}"
+                )
+        else:
+            interpretacion = (
+                f"El análisis muestra cómo el punto de equilibrio cambia cuando se modifica {variable.lower()}.\n\n"
+                f"Para una interpretación más detallada, se recomienda utilizar incrementos que incluyan +/-10%."
+            )
+    else:
+        interpretacion = (
+            f"No hay suficientes datos para realizar un análisis completo de sensibilidad.\n"
+            f"Se recomienda ajustar los parámetros para obtener más puntos de análisis."
+        )
+    
+    partes.append(interpretacion)
+    
+    return titulo, "".join(partes)
+
+
+def _fila_con_porcentaje(tabla, porcentaje):
+    """Devuelve la fila de la tabla evaluada en un porcentaje, o None si no existe."""
+    coincidencias = np.flatnonzero(np.abs(tabla["porcentaje"] - porcentaje) < 0.001)
+    if len(coincidencias) == 0:
+        return None
+    
+    return {clave: valores[coincidencias[0]] for clave, valores in tabla.items()}
+
+
+def construir_figura_sensibilidad(analisis):
+    """
+    Construye la figura del gráfico detallado del análisis de sensibilidad.
+    
+    Usa Figure directamente (sin pyplot) para poder construirla fuera del hilo de Tkinter.
+    
+    Args:
+        analisis (dict): Resultado de calcular_sensibilidad con el punto de equilibrio base
         
-        # Crear figura con dos subplots
-        fig = plt.figure(figsize=(12, 9))
-        
-        # Extraer datos para graficar
-        porcentajes = [r["porcentaje"] for r in resultados]
-        pe_unidades = [r["pe_unidades"] for r in resultados]
-        pe_valor = [r["pe_valor"] for r in resultados]
-        valores_ajustados = [r["variable_ajustada"] for r in resultados]
-        
-        # Obtener PE base para referencia
-        pe_base_unidades = self.controlador.modelo['resultados']['pe_unidades']
-        pe_base_valor = self.controlador.modelo['resultados']['pe_valor']
-        
-        # Primer subplot: PE Unidades vs Porcentaje de cambio
-        ax1 = fig.add_subplot(2, 1, 1)
-        
-        # Graficar línea de PE Unidades
-        line_unidades = ax1.plot(porcentajes, pe_unidades, marker='o', color='blue', 
-                                label='PE Unidades', linewidth=2)
-        
-        # Línea horizontal en el valor base
-        ax1.axhline(y=pe_base_unidades, color='blue', linestyle='--', alpha=0.5, 
-                   label=f'PE Base: {pe_base_unidades:.2f} unidades')
-        
-        # Línea vertical en 0% (sin cambio)
-        ax1.axvline(x=0, color='gray', linestyle='--', alpha=0.5)
-        
-        # Etiquetas y leyenda
-        ax1.set_xlabel('Cambio Porcentual (%)', fontsize=12)
-        ax1.set_ylabel('Punto de Equilibrio (Unidades)', color='blue', fontsize=12)
-        ax1.tick_params(axis='y', labelcolor='blue')
-        
-        # Configurar grid
-        ax1.grid(True, linestyle='--', alpha=0.6)
-        
-        # Segundo eje Y para mostrar los valores de la variable
-        ax1_twin = ax1.twinx()
-        
-        # Etiqueta según la variable
-        if variable == "Costos Fijos":
-            var_label = "Costos Fijos ($)"
-            base_value = valores_base["costos_fijos"]
-        elif variable == "Precio de Venta":
-            var_label = "Precio de Venta ($)"
-            base_value = valores_base["precio_venta"]
-        else:  # Costo Variable
-            var_label = "Costo Variable ($)"
-            base_value = valores_base["costo_variable"]
-        
-        # Graficar línea de valor variable
-        line_variable = ax1_twin.plot(porcentajes, valores_ajustados, marker='s', 
-                                     color='green', label=var_label, linestyle='--', linewidth=1.5)
-        
-        # Línea horizontal en el valor base de la variable
-        ax1_twin.axhline(y=base_value, color='green', linestyle='--', alpha=0.5, 
-                        label=f'{var_label} Base: ${base_value:.2f}')
-        
-        ax1_twin.set_ylabel(var_label, color='green', fontsize=12)
-        ax1_twin.tick_params(axis='y', labelcolor='green')
-        
-        # Combinar leyendas
-        lines1 = line_unidades + line_variable
-        labels1 = [l.get_label() for l in lines1]
-        ax1.legend(lines1, labels1, loc='upper center', bbox_to_anchor=(0.5, -0.15), 
-                  ncol=2, fontsize=10)
-        
-        # Añadir título
-        ax1.set_title(f'Impacto de Cambios en {variable} sobre el Punto de Equilibrio (Unidades)', 
-                     fontsize=14, pad=10)
-        
-        # Segundo subplot: PE Valor vs Porcentaje de cambio
-        ax2 = fig.add_subplot(2, 1, 2)
-        
-        # Graficar línea de PE Valor
-        ax2.plot(porcentajes, pe_valor, marker='o', color='red', 
-                label='PE Valor ($)', linewidth=2)
-        
-        # Línea horizontal en el valor base
-        ax2.axhline(y=pe_base_valor, color='red', linestyle='--', alpha=0.5,
\ No newline at end of file
+    Returns:
+        Figure: Figura con el gráfico
+    """
+    datos = analisis
+    variable = datos["variable"]
+    tabla = datos["tabla"]
+    valores_base = datos["valor_base"]
+    
+    if len(tabla["porcentaje"]) == 0:
+        # Si no hay resultados válidos, mostrar mensaje
+        fig = Figure(figsize=(10, 6))
+        ax = fig.add_subplot(1, 1, 1)
+        ax.text(0.5, 0.5, "No hay datos válidos para graficar.\nVerifique los parámetros del análisis.", 
+                ha='center', va='center', fontsize=14)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        return fig
+    
+    # Crear figura con dos subplots
+    fig = Figure(figsize=(12, 9))
+    
+    # Extraer datos para graficar
+    porcentajes = tabla["porcentaje"]
+    pe_unidades = tabla["pe_unidades"]
+    pe_valor = tabla["pe_valor"]
+    valores_ajustados = tabla["variable_ajustada"]
+    
+    # Obtener PE base para referencia
+    pe_base_unidades = datos["pe_base"]["unidades"]
+    pe_base_valor = datos["pe_base"]["valor"]
+    
+    # Primer subplot: PE Unidades vs Porcentaje de cambio
+    ax1 = fig.add_subplot(2, 1, 1)
+    
+    # Reducir las series al ancho de los ejes conservando el caso base (0%)
+    porcentajes, (pe_unidades, pe_valor, valores_ajustados) = submuestrear(
+        porcentajes, [pe_unidades, pe_valor, valores_ajustados], puntos_para_ejes(ax1), conservar=[0.0])
+    
+    # Espaciar los marcadores cuando hay muchos puntos
+    cada = max(1, len(porcentajes) // MAX_MARCADORES)
+    
+    # Graficar línea de PE Unidades
+    line_unidades = ax1.plot(porcentajes, pe_unidades, marker='o', markevery=cada, color='blue', 
+                            label='PE Unidades', linewidth=2)
+    
+    # Línea horizontal en el valor base
+    ax1.axhline(y=pe_base_unidades, color='blue', linestyle='--', alpha=0.5, 
+               label=f'PE Base: {pe_base_unidades:.2f} unidades')
+    
+    # Línea vertical en 0% (sin cambio)
+    ax1.axvline(x=0, color='gray', linestyle='--', alpha=0.5)
+    
+    # Etiquetas y leyenda
+    ax1.set_xlabel('Cambio Porcentual (%)', fontsize=12)
+    ax1.set_ylabel('Punto de Equilibrio (Unidades)', color='blue', fontsize=12)
+    ax1.tick_params(axis='y', labelcolor='blue')
+    
+    # Configurar grid
+    ax1.grid(True, linestyle='--', alpha=0.6)
+    
+    # Segundo eje Y para mostrar los valores de la variable
+    ax1_twin = ax1.twinx()
+    
+    # Etiqueta según la variable
+    if variable == "Costos Fijos":
+        var_label = "Costos Fijos ($)"
+        base_value = valores_base["costos_fijos"]
+    elif variable == "Precio de Venta":
+        var_label = "Precio de Venta ($)"
+        base_value = valores_base["precio_venta"]
+    else:  # Costo Variable
+        var_label = "Costo Variable ($)"
+        base_value = valores_base["costo_variable"]
+    
+    # Graficar línea de valor variable
+    line_variable = ax1_twin.plot(porcentajes, valores_ajustados, marker='s', markevery=cada, 
+                                 color='green', label=var_label, linestyle='--', linewidth=1.5)
+    
+    # Línea horizontal en el valor base de la variable
+    ax1_twin.axhline(y=base_value, color='green', linestyle='--', alpha=0.5, 
+                    label=f'{var_label} Base: ${base_value:.2f}')
+    
+    ax1_twin.set_ylabel(var_label, color='green', fontsize=12)
+    ax1_twin.tick_params(axis='y', labelcolor='green')
+    
+    # Combinar leyendas
+    lines1 = line_unidades + line_variable
+    labels1 = [l.get_label() for l in lines1]
+    ax1.legend(lines1, labels1, loc='upper center', bbox_to_anchor=(0.5, -0.15), 
+              ncol=2, fontsize=10)
+    
+    # Añadir título
+    ax1.set_title(f'Impacto de Cambios en {variable} sobre el Punto de Equilibrio (Unidades)', 
+                 fontsize=14, pad=10)
+    
+    # Segundo subplot: PE Valor vs Porcentaje de cambio
+    ax2 = fig.add_subplot(2, 1, 2)
+    
+    # Graficar línea de PE Valor
+    ax2.plot(porcentajes, pe_valor, marker='o', markevery=cada, color='red', 
+            label='PE Valor ($)', linewidth=2)
+    
+    # Línea horizontal en el valor base
+    ax2.axhline(y=pe_base_valor, color='red', linestyle='--', alpha=0.5,
+               label=f'PE Base: ${pe_base_valor:.2f}')
+    
+    # Línea vertical en 0% (sin cambio)
+    ax2.axvline(x=0, color='gray', linestyle='--', alpha=0.5)
+    
+    # Etiquetas y leyenda
+    ax2.set_xlabel('Cambio Porcentual (%)', fontsize=12)
+    ax2.set_ylabel('Punto de Equilibrio ($)', color='red', fontsize=12)
+    ax2.tick_params(axis='y', labelcolor='red')
+    ax2.grid(True, linestyle='--', alpha=0.6)
+    ax2.legend(loc='best', fontsize=10)
+    
+    # Añadir título
+    ax2.set_title(f'Impacto de Cambios en {variable} sobre el Punto de Equilibrio (Valor)', 
+                 fontsize=14, pad=10)
+    
+    # Ajustar layout
+    fig.tight_layout()
+    
+    return fig
\ No newline at end of file
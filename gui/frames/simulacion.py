@@ -0,0 +1,137 @@
+"""
+Módulo que define el panel de simulación interactiva (¿qué pasaría si?) del punto de equilibrio.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from utils.instrumentacion import instrumentar
+
+
+# Intervalo mínimo entre recálculos mientras se mueven los controles (milisegundos)
+INTERVALO_SIMULACION_MS = 30
+
+
+class PanelSimulacion(ttk.LabelFrame):
+    """
+    Panel con controles deslizantes para modificar los datos de entrada y ver
+    el efecto en los resultados y el gráfico en tiempo real.
+    """
+    
+    # Variables del panel: (clave del modelo, etiqueta, formato del valor)
+    VARIABLES = [
+        ("costos_fijos", "Costos Fijos:", "${:,.2f}"),
+        ("precio_venta", "Precio de Venta:", "${:,.2f}"),
+        ("costo_variable", "Costo Variable:", "${:,.2f}"),
+        ("unidades_esperadas", "Unidades Esperadas:", "{:,.0f}"),
+    ]
+    
+    def __init__(self, parent, controlador):
+        """
+        Inicializa el panel de simulación.
+        
+        Args:
+            parent: El widget padre
+            controlador: Instancia de la clase principal de la aplicación
+        """
+        super().__init__(parent, text="Simulación (¿qué pasaría si?)")
+        self.controlador = controlador
+        
+        # Identificador del recálculo programado (None si no hay ninguno pendiente)
+        self._recalculo_programado = None
+        
+        # Evita recalcular mientras se configuran los controles desde el modelo
+        self._configurando = False
+        
+        self.columnconfigure(1, weight=1)
+        
+        # Crear widgets
+        self.crear_widgets()
+    
+    def crear_widgets(self):
+        """Crea los widgets del panel."""
+        self.escalas = {}
+        self.etiquetas_valor = {}
+        
+        for fila, (clave, texto, _) in enumerate(self.VARIABLES):
+            ttk.Label(self, text=texto).grid(row=fila, column=0, padx=5, pady=2, sticky="w")
+            
+            escala = ttk.Scale(
+                self, from_=0, to=1, orient=tk.HORIZONTAL, state=tk.DISABLED,
+                command=lambda valor, clave=clave: self.al_mover(clave)
+            )
+            escala.grid(row=fila, column=1, padx=5, pady=2, sticky="ew")
+            self.escalas[clave] = escala
+            
+            etiqueta = ttk.Label(self, text="-", width=16, anchor="e")
+            etiqueta.grid(row=fila, column=2, padx=5, pady=2, sticky="e")
+            self.etiquetas_valor[clave] = etiqueta
+        
+        self.lbl_estado = ttk.Label(
+            self, text="Calcule el punto de equilibrio para habilitar la simulación.")
+        self.lbl_estado.grid(row=len(self.VARIABLES), column=0, columnspan=3, padx=5, pady=2, sticky="w")
+    
+    def configurar_desde_modelo(self):
+        """
+        Ajusta los rangos y valores de los controles a partir del modelo actual.
+        
+        Cada control abarca desde cero hasta el doble del valor actual.
+        """
+        modelo = self.controlador.modelo
+        if modelo["analizador"] is None:
+            return
+        
+        pe_unidades = modelo["resultados"]["pe_unidades"]
+        maximos = {
+            "costos_fijos": modelo["costos_fijos"] * 2,
+            "precio_venta": modelo["precio_venta"] * 2,
+            "costo_variable": modelo["costo_variable"] * 2,
+            "unidades_esperadas": max(modelo["unidades_esperadas"], pe_unidades) * 2,
+        }
+        
+        self._configurando = True
+        try:
+            for clave, _, _ in self.VARIABLES:
+                escala = self.escalas[clave]
+                escala.config(from_=0, to=max(maximos[clave], 1.0), state=tk.NORMAL)
+                escala.set(modelo[clave])
+                self._mostrar_valor(clave)
+        finally:
+            self._configurando = False
+        
+        self.lbl_estado.config(text="Mueva los controles para ver el efecto en tiempo real.")
+    
+    def al_mover(self, clave):
+        """
+        Maneja el movimiento de un control deslizante.
+        
+        Los movimientos rápidos se agrupan: sólo se programa un recálculo a la vez y
+        éste usa los valores más recientes de todos los controles.
+        
+        Args:
+            clave (str): Clave del modelo asociada al control movido
+        """
+        self._mostrar_valor(clave)
+        
+        if self._configurando or self._recalculo_programado is not None:
+            return
+        
+        self._recalculo_programado = self.after(INTERVALO_SIMULACION_MS, self._recalcular)
+    
+    @instrumentar("simulacion.recalcular")
+    def _recalcular(self):
+        """Recalcula el modelo con los valores actuales de los controles."""
+        self._recalculo_programado = None
+        
+        valores = {clave: float(self.escalas[clave].get()) for clave, _, _ in self.VARIABLES}
+        
+        if self.controlador.simular(**valores):
+            self.lbl_estado.config(text="Mueva los controles para ver el efecto en tiempo real.")
+        else:
+            self.lbl_estado.config(
+                text="El precio de venta debe ser mayor que el costo variable unitario.")
+    
+    def _mostrar_valor(self, clave):
+        """Muestra el valor actual de un control junto a él."""
+        formato = next(f for c, _, f in self.VARIABLES if c == clave)
+        self.etiquetas_valor[clave].config(text=formato.format(float(self.escalas[clave].get())))
\ No newline at end of file
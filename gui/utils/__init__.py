@@ -0,0 +1,3 @@
+"""
+Paquete para las utilidades de la interfaz gráfica de la aplicación de punto de equilibrio.
+"""
\ No newline at end of file
@@ -0,0 +1,208 @@
+"""
+Módulo para ejecutar los análisis costosos en segundo plano sin bloquear la interfaz.
+
+Cada cálculo se identifica con una clave (por ejemplo, "sensibilidad"). Si se envía un
+nuevo cálculo con la misma clave mientras otro está en curso, el anterior se cancela y
+su resultado se descarta. Los resultados y el avance se entregan en el hilo de Tkinter
+mediante root.after, por lo que las funciones de aviso pueden modificar los widgets.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.instrumentacion import obtener_registro
+
+
+class CalculoCancelado(Exception):
+    """Excepción lanzada en el hilo de trabajo cuando se cancela un cálculo."""
+    pass
+
+
+class TrabajoCalculo:
+    """
+    Representa un cálculo enviado al ejecutor y su estado de avance.
+    """
+    
+    def __init__(self, clave, al_terminar=None, al_error=None, al_progreso=None):
+        """
+        Inicializa el trabajo de cálculo.
+        
+        Args:
+            clave (str): Identificador del tipo de cálculo
+            al_terminar (callable, optional): Función llamada con el resultado al terminar
+            al_error (callable, optional): Función llamada con la excepción si falla
+            al_progreso (callable, optional): Función llamada con (fraccion, mensaje) mientras avanza
+        """
+        self.clave = clave
+        self.al_terminar = al_terminar
+        self.al_error = al_error
+        self.al_progreso = al_progreso
+        
+        self.progreso = 0.0
+        self.mensaje = "En espera"
+        self.futuro = None
+        
+        self._cancelacion = threading.Event()
+        self._lock = threading.Lock()
+    
+    def reportar_progreso(self, fraccion, mensaje):
+        """
+        Registra el avance del cálculo (llamado desde el hilo de trabajo).
+        
+        Args:
+            fraccion (float): Fracción completada (entre 0 y 1)
+            mensaje (str): Descripción de la etapa actual
+        
+        Raises:
+            CalculoCancelado: Si el cálculo fue cancelado o reemplazado por otro
+        """
+        if self._cancelacion.is_set():
+            raise CalculoCancelado(f"Se canceló el cálculo '{self.clave}'.")
+        
+        with self._lock:
+            self.progreso = max(0.0, min(1.0, fraccion))
+            self.mensaje = mensaje
+    
+    def cancelar(self):
+        """Solicita la cancelación del cálculo."""
+        self._cancelacion.set()
+        if self.futuro is not None:
+            self.futuro.cancel()
+    
+    @property
+    def cancelado(self):
+        """bool: True si se solicitó la cancelación del cálculo."""
+        return self._cancelacion.is_set()
+    
+    def instantanea(self):
+        """
+        Obtiene una copia consistente del avance del cálculo.
+        
+        Returns:
+            tuple: (progreso, mensaje)
+        """
+        with self._lock:
+            return self.progreso, self.mensaje
+
+
+class EjecutorCalculos:
+    """
+    Ejecutor de cálculos en segundo plano donde cada nuevo cálculo reemplaza
+    al anterior de la misma clave.
+    """
+    
+    def __init__(self, root, max_trabajos=2, intervalo_ms=50):
+        """
+        Inicializa el ejecutor de cálculos.
+        
+        Args:
+            root (tk.Tk): La ventana raíz de la aplicación
+            max_trabajos (int, optional): Número de cálculos simultáneos. Default es 2.
+            intervalo_ms (int, optional): Intervalo de consulta del progreso en milisegundos
+        """
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        
+        self._ejecutor = ThreadPoolExecutor(max_workers=max_trabajos, thread_name_prefix="calculo")
+        self._trabajos = {}  # Trabajo vigente por clave
+        self._sondeo_programado = None
+    
+    def enviar(self, clave, funcion, *args, al_terminar=None, al_error=None, al_progreso=None, **kwargs):
+        """
+        Envía un cálculo para ejecutarse en segundo plano.
+        
+        La función recibe el argumento adicional 'progreso' para informar su avance;
+        éste lanza CalculoCancelado si el cálculo fue reemplazado, lo que permite
+        abandonar pronto el trabajo obsoleto.
+        
+        Args:
+            clave (str): Identificador del tipo de cálculo
+            funcion (callable): Función a ejecutar (no debe tocar widgets)
+            *args: Argumentos posicionales para la función
+            al_terminar (callable, optional): Función llamada con el resultado al terminar
+            al_error (callable, optional): Función llamada con la excepción si falla
+            al_progreso (callable, optional): Función llamada con (fraccion, mensaje) mientras avanza
+            **kwargs: Argumentos con nombre para la función
+        
+        Returns:
+            TrabajoCalculo: El trabajo creado
+        """
+        # Un cálculo nuevo reemplaza al anterior con la misma clave
+        self.cancelar(clave)
+        
+        trabajo = TrabajoCalculo(clave, al_terminar, al_error, al_progreso)
+        kwargs["progreso"] = trabajo.reportar_progreso
+        
+        trabajo.futuro = self._ejecutor.submit(funcion, *args, **kwargs)
+        self._trabajos[clave] = trabajo
+        
+        self._programar_sondeo()
+        
+        return trabajo
+    
+    def cancelar(self, clave=None):
+        """
+        Cancela el cálculo de una clave o, si no se indica ninguna, todos.
+        
+        Los cálculos cancelados no llaman a sus funciones de aviso.
+        
+        Args:
+            clave (str, optional): Clave del cálculo a cancelar
+        """
+        claves = [clave] if clave is not None else list(self._trabajos)
+        for c in claves:
+            trabajo = self._trabajos.pop(c, None)
+            if trabajo is not None:
+                trabajo.cancelar()
+                obtener_registro().contar(f"calculos.cancelados.{c}")
+    
+    def ocupado(self, clave):
+        """
+        Indica si hay un cálculo en curso para una clave.
+        
+        Args:
+            clave (str): Clave del cálculo
+        
+        Returns:
+            bool: True si el cálculo todavía no terminó
+        """
+        return clave in self._trabajos
+    
+    def cerrar(self):
+        """Cancela los cálculos en curso y libera el grupo de hilos."""
+        self.cancelar()
+        self._ejecutor.shutdown(wait=False)
+    
+    def _programar_sondeo(self):
+        """Programa la consulta del progreso si no hay una pendiente."""
+        if self._sondeo_programado is None:
+            self._sondeo_programado = self.root.after(self.intervalo_ms, self._sondear)
+    
+    def _sondear(self):
+        """Entrega el avance y los resultados de los cálculos vigentes (hilo de Tkinter)."""
+        self._sondeo_programado = None
+        
+        for clave, trabajo in list(self._trabajos.items()):
+            if trabajo.futuro.done():
+                del self._trabajos[clave]
+                self._finalizar(trabajo)
+            elif trabajo.al_progreso:
+                trabajo.al_progreso(*trabajo.instantanea())
+        
+        if self._trabajos:
+            self._programar_sondeo()
+    
+    def _finalizar(self, trabajo):
+        """Llama a las funciones de aviso de un cálculo terminado."""
+        if trabajo.cancelado or trabajo.futuro.cancelled():
+            return
+        
+        error = trabajo.futuro.exception()
+        if isinstance(error, CalculoCancelado):
+            return
+        
+        if error is not None:
+            if trabajo.al_error:
+                trabajo.al_error(error)
+        elif trabajo.al_terminar:
+            trabajo.al_terminar(trabajo.futuro.result())
\ No newline at end of file
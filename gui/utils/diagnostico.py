@@ -0,0 +1,324 @@
+"""
+Módulo que define la ventana de diagnóstico de rendimiento (Ayuda > Diagnóstico).
+
+Muestra las mediciones del registro de instrumentación (llamadas, latencias p50/p95/máx
+y operaciones lentas recientes), sus contadores, los bloqueos de la interfaz medidos por
+el monitor de respuesta y el estado de las cachés y figuras, y permite grabar una traza
+de la sesión en formato Chrome trace-event.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from tkinter import filedialog, messagebox
+
+from utils.instrumentacion import obtener_registro, formatear_bytes
+from utils.cache_graficos import obtener_cache_graficos
+from utils.cache_resultados import obtener_cache_resultados
+from utils.trazas import obtener_trazador
+
+
+# Intervalo de actualización de la ventana (milisegundos)
+INTERVALO_ACTUALIZACION_MS = 1000
+
+
+class VentanaDiagnostico:
+    """
+    Ventana única que muestra las mediciones de rendimiento de la sesión.
+    """
+    
+    def __init__(self, controlador):
+        """
+        Inicializa la ventana de diagnóstico (se crea al mostrarla).
+        
+        Args:
+            controlador: Instancia de la clase principal de la aplicación
+        """
+        self.controlador = controlador
+        self.registro = obtener_registro()
+        self.trazador = obtener_trazador()
+        self.ventana = None
+        self._actualizacion = None
+    
+    def mostrar(self):
+        """Muestra la ventana, creándola si no existe."""
+        if self.ventana is not None and self.ventana.winfo_exists():
+            self.ventana.deiconify()
+            self.ventana.lift()
+            return
+        
+        self._crear_ventana()
+        self.actualizar()
+    
+    def cerrar(self):
+        """Cierra la ventana y detiene su actualización periódica."""
+        if self._actualizacion is not None:
+            self.controlador.root.after_cancel(self._actualizacion)
+            self._actualizacion = None
+        
+        if self.ventana is not None and self.ventana.winfo_exists():
+            self.ventana.destroy()
+        self.ventana = None
+    
+    def _crear_ventana(self):
+        """Crea los widgets de la ventana."""
+        self.ventana = tk.Toplevel(self.controlador.root)
+        self.ventana.title("Diagnóstico de rendimiento")
+        self.ventana.geometry("860x820")
+        self.ventana.protocol("WM_DELETE_WINDOW", self.cerrar)
+        
+        frame_principal = ttk.Frame(self.ventana, padding=10)
+        frame_principal.pack(fill=tk.BOTH, expand=True)
+        
+        # Controles de la instrumentación
+        frame_controles = ttk.Frame(frame_principal)
+        frame_controles.pack(fill=tk.X, pady=(0, 10))
+        
+        self.activo_var = tk.BooleanVar(value=self.registro.activo)
+        ttk.Checkbutton(frame_controles, text="Instrumentación activa", variable=self.activo_var,
+                        command=self._cambiar_activo).pack(side=tk.LEFT)
+        ttk.Button(frame_controles, text="Reiniciar mediciones",
+                   command=self._reiniciar).pack(side=tk.LEFT, padx=10)
+        
+        # Grabación de la traza temporal
+        self.traza_var = tk.BooleanVar(value=self.trazador.activo)
+        ttk.Checkbutton(frame_controles, text="Grabar traza", variable=self.traza_var,
+                        command=self._cambiar_traza).pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Button(frame_controles, text="Guardar traza...",
+                   command=self._guardar_traza).pack(side=tk.LEFT, padx=10)
+        ttk.Button(frame_controles, text="Cerrar", command=self.cerrar).pack(side=tk.RIGHT)
+        
+        # Latencias por operación
+        frame_operaciones = ttk.LabelFrame(frame_principal, text="Operaciones")
+        frame_operaciones.pack(fill=tk.BOTH, expand=True)
+        
+        self.tabla_operaciones = self._crear_tabla(frame_operaciones, [
+            ("nombre", "Operación", 260),
+            ("llamadas", "Llamadas", 80),
+            ("p50", "p50 (ms)", 90),
+            ("p95", "p95 (ms)", 90),
+            ("maximo", "Máx. (ms)", 90),
+            ("total", "Total (ms)", 100),
+        ], alto=8)
+        
+        # Operaciones lentas recientes
+        frame_lentas = ttk.LabelFrame(
+            frame_principal,
+            text=f"Operaciones lentas recientes (más de {self.registro.umbral_lento * 1000:.0f} ms)"
+        )
+        frame_lentas.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        
+        self.tabla_lentas = self._crear_tabla(frame_lentas, [
+            ("hora", "Hora", 90),
+            ("nombre", "Operación", 260),
+            ("duracion", "Duración (ms)", 110),
+            ("hilo", "Hilo", 160),
+        ], alto=5)
+        
+        # Bloqueos del hilo de la interfaz
+        frame_respuesta = ttk.LabelFrame(frame_principal, text="Respuesta de la interfaz")
+        frame_respuesta.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        
+        frame_resumen = ttk.Frame(frame_respuesta)
+        frame_resumen.pack(side=tk.TOP, fill=tk.X, padx=5, pady=5)
+        
+        self.lbl_respuesta = ttk.Label(frame_resumen, justify=tk.LEFT)
+        self.lbl_respuesta.pack(side=tk.LEFT)
+        ttk.Button(frame_resumen, text="Copiar informe",
+                   command=self._copiar_informe).pack(side=tk.RIGHT)
+        
+        self.tabla_bloqueos = self._crear_tabla(frame_respuesta, [
+            ("hora", "Hora", 90),
+            ("duracion", "Duración (ms)", 110),
+            ("nombre", "Función", 300),
+            ("ubicacion", "Ubicación", 260),
+        ], alto=5)
+        
+        # Contadores, cachés y memoria
+        frame_estado = ttk.LabelFrame(frame_principal, text="Contadores y memoria")
+        frame_estado.pack(fill=tk.X, pady=(10, 0))
+        
+        self.lbl_estado = ttk.Label(frame_estado, justify=tk.LEFT)
+        self.lbl_estado.pack(fill=tk.X, padx=10, pady=5)
+    
+    def _crear_tabla(self, parent, columnas, alto):
+        """Crea un Treeview con barra de desplazamiento para las columnas indicadas."""
+        tabla = ttk.Treeview(parent, columns=[clave for clave, _, _ in columnas],
+                             show="headings", height=alto)
+        for clave, titulo, ancho in columnas:
+            tabla.heading(clave, text=titulo)
+            tabla.column(clave, width=ancho, anchor=tk.W if clave in ("nombre", "hilo", "ubicacion") else tk.E)
+        
+        barra = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=tabla.yview)
+        tabla.configure(yscroll=barra.set)
+        
+        barra.pack(side=tk.RIGHT, fill=tk.Y)
+        tabla.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        return tabla
+    
+    def actualizar(self):
+        """Vuelve a mostrar las mediciones y programa la próxima actualización."""
+        self._actualizacion = None
+        if self.ventana is None or not self.ventana.winfo_exists():
+            return
+        
+        # Latencias por operación
+        self.tabla_operaciones.delete(*self.tabla_operaciones.get_children())
+        for fila in self.registro.estadisticas():
+            self.tabla_operaciones.insert("", tk.END, values=(
+                fila["nombre"],
+                fila["llamadas"],
+                f"{fila['p50'] * 1000:.2f}",
+                f"{fila['p95'] * 1000:.2f}",
+                f"{fila['maximo'] * 1000:.2f}",
+                f"{fila['total'] * 1000:.1f}"
+            ))
+        
+        # Operaciones lentas
+        self.tabla_lentas.delete(*self.tabla_lentas.get_children())
+        for operacion in self.registro.operaciones_lentas():
+            self.tabla_lentas.insert("", tk.END, values=(
+                operacion["hora"],
+                operacion["nombre"],
+                f"{operacion['duracion'] * 1000:.1f}",
+                operacion["hilo"]
+            ))
+        
+        # Bloqueos de la interfaz
+        monitor = self.controlador.monitor_respuesta
+        resumen = monitor.resumen()
+        self.tabla_bloqueos.delete(*self.tabla_bloqueos.get_children())
+        for bloqueo in resumen["recientes"]:
+            self.tabla_bloqueos.insert("", tk.END, values=(
+                bloqueo["hora"],
+                f"{bloqueo['duracion'] * 1000:.0f}",
+                bloqueo["funcion"],
+                bloqueo["ubicacion"]
+            ))
+        
+        if monitor.activo or resumen["latidos"]:
+            self.lbl_respuesta.config(text=(
+                f"Retraso del bucle de eventos: p50 {resumen['p50'] * 1000:.1f} ms, "
+                f"p95 {resumen['p95'] * 1000:.1f} ms, máx. {resumen['maximo'] * 1000:.0f} ms; "
+                f"{resumen['bloqueos']} bloqueos de más de {monitor.umbral * 1000:.0f} ms "
+                f"({resumen['tiempo_bloqueado']:.2f} s)"
+            ))
+        else:
+            self.lbl_respuesta.config(text="El monitor se activa junto con la instrumentación.")
+        
+        self.lbl_estado.config(text=self._texto_estado())
+        
+        self._actualizacion = self.controlador.root.after(INTERVALO_ACTUALIZACION_MS, self.actualizar)
+    
+    def _texto_estado(self):
+        """Compone el texto con los contadores, las cachés y las figuras abiertas."""
+        lineas = []
+        
+        contadores = self.registro.contadores()
+        if contadores:
+            lineas.append("Contadores: " + ", ".join(
+                f"{nombre} = {valor}" for nombre, valor in sorted(contadores.items())))
+        
+        recalculos = self.controlador.modelo.recalculos
+        if recalculos:
+            lineas.append("Recálculos del modelo: " + ", ".join(
+                f"{nombre} = {valor}" for nombre, valor in sorted(recalculos.items())))
+        
+        cache = obtener_cache_graficos().estadisticas()
+        lineas.append(
+            f"Caché de gráficos: {cache['aciertos']} aciertos, {cache['fallos']} fallos, "
+            f"{cache['entradas_memoria']} imágenes ({formatear_bytes(cache['bytes_memoria'])})"
+        )
+        
+        cache = obtener_cache_resultados().estadisticas()
+        lineas.append(
+            f"Caché de resultados: {cache['aciertos']} aciertos, {cache['fallos']} fallos, "
+            f"{cache['entradas_disco']} resultados en disco ({formatear_bytes(cache['bytes_disco'])})"
+        )
+        
+        figuras = self.controlador.ventanas_detalle.estadisticas()
+        linea = (
+            f"Ventanas de detalle: {figuras['ventanas_abiertas']} abiertas, "
+            f"{figuras['figuras_vivas']} figuras vivas ({formatear_bytes(figuras['bytes_figuras'])})"
+        )
+        if figuras["memoria_proceso"] is not None:
+            linea += f"; memoria máxima del proceso: {formatear_bytes(figuras['memoria_proceso'])}"
+        lineas.append(linea)
+        
+        eventos = self.trazador.cantidad_eventos()
+        if self.trazador.activo or eventos:
+            linea = f"Traza: {eventos} eventos{' (grabando)' if self.trazador.activo else ''}"
+            if self.trazador.descartados:
+                linea += f", {self.trazador.descartados} descartados por el búfer circular"
+            lineas.append(linea)
+        
+        return "\n".join(lineas)
+    
+    def _cambiar_activo(self):
+        """Activa o desactiva la instrumentación según la casilla."""
+        self.registro.activar(self.activo_var.get())
+        
+        # El monitor de respuesta mide mientras la instrumentación esté activa
+        if self.activo_var.get():
+            self.controlador.monitor_respuesta.iniciar()
+        else:
+            self.controlador.monitor_respuesta.detener()
+        
+        # Sin instrumentación la traza no recibiría eventos
+        if not self.activo_var.get() and self.trazador.activo:
+            self.trazador.detener()
+            self.traza_var.set(False)
+    
+    def _cambiar_traza(self):
+        """Inicia o detiene la grabación de la traza según la casilla."""
+        if self.traza_var.get():
+            # La traza se alimenta de las mediciones, así que requiere la instrumentación
+            self.activo_var.set(True)
+            self._cambiar_activo()
+            self.trazador.iniciar()
+        else:
+            self.trazador.detener()
+        self.actualizar_ahora()
+    
+    def _guardar_traza(self):
+        """Guarda la traza grabada en un archivo JSON elegido por el usuario."""
+        if not self.trazador.cantidad_eventos():
+            messagebox.showinfo("Traza vacía", "No hay eventos grabados. Active 'Grabar traza' "
+                                "y use la aplicación antes de guardar.", parent=self.ventana)
+            return
+        
+        ruta = filedialog.asksaveasfilename(
+            parent=self.ventana,
+            defaultextension=".json",
+            filetypes=[("Traza Chrome (JSON)", "*.json"), ("Todos los archivos", "*.*")],
+            title="Guardar traza"
+        )
+        if not ruta:
+            return
+        
+        try:
+            cantidad = self.trazador.guardar(ruta)
+        except OSError as e:
+            messagebox.showerror("Error", f"No se pudo guardar la traza:\n{e}", parent=self.ventana)
+            return
+        
+        messagebox.showinfo("Traza guardada", f"Se guardaron {cantidad} eventos en:\n{ruta}\n\n"
+                            "Ábrala en chrome://tracing o en https://ui.perfetto.dev",
+                            parent=self.ventana)
+    
+    def _copiar_informe(self):
+        """Copia al portapapeles el informe de respuesta de la interfaz."""
+        self.ventana.clipboard_clear()
+        self.ventana.clipboard_append(self.controlador.monitor_respuesta.informe())
+    
+    def _reiniciar(self):
+        """Borra las mediciones y los contadores."""
+        self.registro.reiniciar()
+        self.controlador.monitor_respuesta.reiniciar()
+        self.controlador.modelo.recalculos.clear()
+        self.actualizar_ahora()
+    
+    def actualizar_ahora(self):
+        """Actualiza la ventana de inmediato, sin esperar al próximo intervalo."""
+        if self._actualizacion is not None:
+            self.controlador.root.after_cancel(self._actualizacion)
+        self.actualizar()
\ No newline at end of file
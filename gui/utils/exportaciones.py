@@ -0,0 +1,307 @@
+"""
+Módulo para ejecutar las exportaciones en segundo plano sin bloquear la interfaz.
+
+Las exportaciones se ejecutan en un grupo de hilos de trabajo. El avance se consulta
+periódicamente desde el hilo de Tkinter mediante root.after, que también se encarga
+de notificar la finalización, de modo que los widgets sólo se tocan desde ese hilo.
+"""
+
+import itertools
+import threading
+import tkinter as tk
+from tkinter import ttk
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.exportar import ExportacionCancelada
+
+
+class TrabajoExportacion:
+    """
+    Representa una exportación enviada al gestor y su estado de avance.
+    """
+    
+    _contador = itertools.count(1)
+    
+    def __init__(self, nombre, al_terminar=None, al_error=None):
+        """
+        Inicializa el trabajo de exportación.
+        
+        Args:
+            nombre (str): Nombre descriptivo de la exportación
+            al_terminar (callable, optional): Función llamada con el resultado al terminar
+            al_error (callable, optional): Función llamada con la excepción si falla
+        """
+        self.id = next(self._contador)
+        self.nombre = nombre
+        self.al_terminar = al_terminar
+        self.al_error = al_error
+        
+        self.estado = "pendiente"  # pendiente, en_curso, completado, cancelado, error
+        self.progreso = 0.0
+        self.mensaje = "En espera"
+        self.resultado = None
+        self.error = None
+        self.futuro = None
+        
+        self._cancelacion = threading.Event()
+        self._lock = threading.Lock()
+    
+    def reportar_progreso(self, fraccion, mensaje):
+        """
+        Registra el avance del trabajo (llamado desde el hilo de trabajo).
+        
+        Args:
+            fraccion (float): Fracción completada (entre 0 y 1)
+            mensaje (str): Descripción de la etapa actual
+        
+        Raises:
+            ExportacionCancelada: Si se solicitó la cancelación del trabajo (salvo en la
+                notificación final, cuando el archivo ya está escrito)
+        """
+        if fraccion < 1.0 and self._cancelacion.is_set():
+            raise ExportacionCancelada(f"Se canceló la exportación '{self.nombre}'.")
+        
+        with self._lock:
+            self.estado = "en_curso"
+            self.progreso = max(0.0, min(1.0, fraccion))
+            self.mensaje = mensaje
+    
+    def cancelar(self):
+        """Solicita la cancelación del trabajo."""
+        self._cancelacion.set()
+        
+        # Si todavía no empezó, se puede cancelar directamente
+        if self.futuro is not None and self.futuro.cancel():
+            with self._lock:
+                self.estado = "cancelado"
+                self.mensaje = "Cancelado"
+    
+    @property
+    def cancelado(self):
+        """bool: True si se solicitó la cancelación del trabajo."""
+        return self._cancelacion.is_set()
+    
+    @property
+    def activo(self):
+        """bool: True si el trabajo está pendiente o en curso."""
+        return self.estado in ("pendiente", "en_curso")
+    
+    def instantanea(self):
+        """
+        Obtiene una copia consistente del estado del trabajo.
+        
+        Returns:
+            tuple: (estado, progreso, mensaje)
+        """
+        with self._lock:
+            return self.estado, self.progreso, self.mensaje
+
+
+class GestorExportaciones:
+    """
+    Gestor de exportaciones en segundo plano con progreso y cancelación.
+    """
+    
+    def __init__(self, root, barra_estado=None, max_trabajos=2, intervalo_ms=100):
+        """
+        Inicializa el gestor de exportaciones.
+        
+        Args:
+            root (tk.Tk): La ventana raíz de la aplicación
+            barra_estado (BarraEstado, optional): Barra donde mostrar el progreso
+            max_trabajos (int, optional): Número de exportaciones simultáneas. Default es 2.
+            intervalo_ms (int, optional): Intervalo de consulta del progreso en milisegundos
+        """
+        self.root = root
+        self.barra_estado = barra_estado
+        self.intervalo_ms = intervalo_ms
+        
+        self._ejecutor = ThreadPoolExecutor(max_workers=max_trabajos, thread_name_prefix="exportacion")
+        self._trabajos = []
+        self._sondeo_programado = None
+        
+        if self.barra_estado is not None:
+            self.barra_estado.configurar_cancelacion(self.cancelar)
+    
+    def enviar(self, nombre, funcion, *args, al_terminar=None, al_error=None, **kwargs):
+        """
+        Envía una exportación para ejecutarse en segundo plano.
+        
+        La función recibe el argumento adicional 'progreso' para informar su avance.
+        
+        Args:
+            nombre (str): Nombre descriptivo de la exportación
+            funcion (callable): Función de exportación a ejecutar
+            *args: Argumentos posicionales para la función
+            al_terminar (callable, optional): Función llamada con el resultado al terminar
+            al_error (callable, optional): Función llamada con la excepción si falla
+            **kwargs: Argumentos con nombre para la función
+        
+        Returns:
+            TrabajoExportacion: El trabajo creado
+        """
+        trabajo = TrabajoExportacion(nombre, al_terminar, al_error)
+        kwargs["progreso"] = trabajo.reportar_progreso
+        
+        trabajo.futuro = self._ejecutor.submit(self._ejecutar, trabajo, funcion, args, kwargs)
+        self._trabajos.append(trabajo)
+        
+        self._programar_sondeo()
+        
+        return trabajo
+    
+    def cancelar(self, trabajo=None):
+        """
+        Cancela un trabajo o, si no se indica ninguno, todos los trabajos activos.
+        
+        Args:
+            trabajo (TrabajoExportacion, optional): Trabajo a cancelar
+        """
+        trabajos = [trabajo] if trabajo is not None else self.trabajos_activos()
+        for t in trabajos:
+            t.cancelar()
+        
+        self._programar_sondeo()
+    
+    def trabajos_activos(self):
+        """
+        Obtiene los trabajos pendientes o en curso.
+        
+        Returns:
+            list: Lista de TrabajoExportacion activos
+        """
+        return [t for t in self._trabajos if t.activo]
+    
+    def cerrar(self):
+        """Cancela los trabajos activos y libera el grupo de hilos."""
+        self.cancelar()
+        self._ejecutor.shutdown(wait=False)
+    
+    def _ejecutar(self, trabajo, funcion, args, kwargs):
+        """Ejecuta la función de exportación en el hilo de trabajo."""
+        trabajo.reportar_progreso(0.0, "Iniciando")
+        return funcion(*args, **kwargs)
+    
+    def _programar_sondeo(self):
+        """Programa la consulta del progreso si no hay una pendiente."""
+        if self._sondeo_programado is None:
+            self._sondeo_programado = self.root.after(self.intervalo_ms, self._sondear)
+    
+    def _sondear(self):
+        """Consulta el estado de los trabajos y notifica los terminados (hilo de Tkinter)."""
+        self._sondeo_programado = None
+        
+        for trabajo in list(self._trabajos):
+            if trabajo.futuro.done():
+                self._finalizar(trabajo)
+        
+        if self.barra_estado is not None:
+            self.barra_estado.mostrar(self._trabajos)
+        
+        # Conservar sólo los trabajos activos
+        self._trabajos = [t for t in self._trabajos if t.activo]
+        
+        if self._trabajos:
+            self._programar_sondeo()
+    
+    def _finalizar(self, trabajo):
+        """Registra el resultado de un trabajo terminado y llama a sus funciones de aviso."""
+        if not trabajo.activo:
+            return
+        
+        if trabajo.futuro.cancelled():
+            trabajo.estado = "cancelado"
+            trabajo.mensaje = "Cancelado"
+            return
+        
+        error = trabajo.futuro.exception()
+        if isinstance(error, ExportacionCancelada):
+            trabajo.estado = "cancelado"
+            trabajo.mensaje = "Cancelado"
+        elif error is not None:
+            trabajo.estado = "error"
+            trabajo.error = error
+            trabajo.mensaje = str(error)
+            if trabajo.al_error:
+                trabajo.al_error(error)
+        else:
+            trabajo.estado = "completado"
+            trabajo.progreso = 1.0
+            trabajo.resultado = trabajo.futuro.result()
+            trabajo.mensaje = "Completado"
+            if trabajo.al_terminar:
+                trabajo.al_terminar(trabajo.resultado)
+
+
+class BarraEstado(ttk.Frame):
+    """
+    Barra de estado que muestra el progreso de las tareas en segundo plano.
+    """
+    
+    def __init__(self, parent):
+        """
+        Inicializa la barra de estado.
+        
+        Args:
+            parent: El widget padre
+        """
+        super().__init__(parent)
+        
+        self.columnconfigure(0, weight=1)
+        
+        self.lbl_estado = ttk.Label(self, text="Listo")
+        self.lbl_estado.grid(row=0, column=0, padx=5, sticky="w")
+        
+        self.barra_progreso = ttk.Progressbar(self, mode="determinate", maximum=100, length=200)
+        self.barra_progreso.grid(row=0, column=1, padx=5)
+        
+        self.btn_cancelar = ttk.Button(self, text="Cancelar", state=tk.DISABLED)
+        self.btn_cancelar.grid(row=0, column=2, padx=5)
+    
+    def configurar_cancelacion(self, comando):
+        """
+        Establece la acción del botón de cancelar.
+        
+        Args:
+            comando (callable): Función a llamar al pulsar el botón
+        """
+        self.btn_cancelar.config(command=comando)
+    
+    def mostrar(self, trabajos):
+        """
+        Muestra el estado de los trabajos indicados.
+        
+        Args:
+            trabajos (list): Lista de TrabajoExportacion a mostrar
+        """
+        activos = [t for t in trabajos if t.activo]
+        
+        if not activos:
+            # Mostrar el resultado del último trabajo terminado
+            if trabajos:
+                ultimo = trabajos[-1]
+                estado, _, mensaje = ultimo.instantanea()
+                self.lbl_estado.config(text=f"{ultimo.nombre}: {mensaje}")
+                self.barra_progreso["value"] = 100 if estado == "completado" else 0
+            self.btn_cancelar.config(state=tk.DISABLED)
+            return
+        
+        textos = []
+        total = 0.0
+        for trabajo in activos:
+            _, progreso, mensaje = trabajo.instantanea()
+            textos.append(f"{trabajo.nombre}: {mensaje} ({progreso * 100:.0f}%)")
+            total += progreso
+        
+        self.lbl_estado.config(text=" | ".join(textos))
+        self.barra_progreso["value"] = total / len(activos) * 100
+        self.btn_cancelar.config(state=tk.NORMAL)
+    
+    def mostrar_mensaje(self, texto):
+        """
+        Muestra un mensaje en la barra de estado.
+        
+        Args:
+            texto (str): Mensaje a mostrar
+        """
+        self.lbl_estado.config(text=texto)
\ No newline at end of file
@@ -0,0 +1,296 @@
+"""
+Módulo para medir la capacidad de respuesta de la interfaz (bloqueos del bucle de Tkinter).
+
+Un latido programado con root.after cada INTERVALO_MS mide cuánto se retrasa respecto a lo
+previsto: el retraso es el tiempo que el hilo de la interfaz estuvo ocupado con otra cosa.
+Mientras un latido se retrasa, un hilo vigilante toma muestras de la pila del hilo
+principal, de modo que cada bloqueo que supera el umbral queda atribuido a la función
+que lo provocó (por ejemplo FrameSensibilidad.calcular_sensibilidad o una exportación).
+"""
+
+import os
+import sys
+import time
+import datetime
+import threading
+import tkinter
+from collections import deque, Counter
+
+import numpy as np
+
+from utils.instrumentacion import obtener_registro
+
+
+# Intervalo entre latidos (milisegundos)
+INTERVALO_MS = 100
+
+# Retraso a partir del cual se registra un bloqueo (segundos)
+UMBRAL_BLOQUEO = 0.2
+
+# Retrasos guardados para los percentiles y bloqueos recientes guardados
+MAX_LATIDOS = 3000
+MAX_BLOQUEOS = 100
+
+# Directorio raíz de la aplicación: sólo sus funciones se usan para atribuir bloqueos
+_DIRECTORIO_APLICACION = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+_DIRECTORIO_TKINTER = os.path.dirname(os.path.abspath(tkinter.__file__))
+
+# Archivos propios que sólo envuelven a otras funciones y no explican un bloqueo
+_ARCHIVOS_IGNORADOS = {
+    os.path.abspath(__file__),
+    os.path.join(_DIRECTORIO_APLICACION, "utils", "instrumentacion.py"),
+}
+
+
+def _nombre_funcion(frame):
+    """Devuelve el nombre calificado de la función de un frame de la pila."""
+    codigo = frame.f_code
+    return getattr(codigo, "co_qualname", codigo.co_name)
+
+
+def _es_de_aplicacion(archivo):
+    """Indica si un archivo de código pertenece a la aplicación y explica un bloqueo."""
+    archivo = os.path.abspath(archivo)
+    return (archivo.startswith(_DIRECTORIO_APLICACION + os.sep) and
+            archivo not in _ARCHIVOS_IGNORADOS and
+            os.sep + "site-packages" + os.sep not in archivo)
+
+
+class MonitorRespuesta:
+    """
+    Mide el retraso del bucle de eventos de Tkinter y atribuye los bloqueos.
+    """
+    
+    def __init__(self, root, intervalo_ms=INTERVALO_MS, umbral=UMBRAL_BLOQUEO):
+        """
+        Inicializa el monitor (detenido).
+        
+        Args:
+            root (tk.Tk): Ventana raíz cuyo bucle de eventos se mide
+            intervalo_ms (int, optional): Intervalo entre latidos en milisegundos
+            umbral (float, optional): Retraso mínimo de un bloqueo en segundos
+        """
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self.umbral = umbral
+        
+        self._lock = threading.Lock()
+        self._latido = None
+        self._esperado = None
+        self._parar = None
+        self._hilo_principal = threading.main_thread().ident
+        
+        # Muestras de la pila tomadas durante el retraso del latido actual
+        self._muestras = []
+        
+        self._reiniciar_datos()
+    
+    def _reiniciar_datos(self):
+        """Borra las mediciones acumuladas."""
+        with self._lock:
+            self.latidos = 0
+            self.tiempo_bloqueado = 0.0
+            self._retrasos = deque(maxlen=MAX_LATIDOS)
+            self._bloqueos = deque(maxlen=MAX_BLOQUEOS)
+            self._por_funcion = {}
+    
+    @property
+    def activo(self):
+        """bool: True si el monitor está midiendo."""
+        return self._latido is not None
+    
+    def iniciar(self):
+        """Empieza a programar latidos y a vigilar el hilo de la interfaz."""
+        if self.activo:
+            return
+        
+        self._esperado = time.perf_counter() + self.intervalo_ms / 1000
+        self._latido = self.root.after(self.intervalo_ms, self._al_latir)
+        
+        # Cada vigilante tiene su propio evento de parada, por si se reinicia enseguida
+        self._parar = threading.Event()
+        threading.Thread(target=self._vigilar, args=(self._parar,), name="monitor_respuesta",
+                         daemon=True).start()
+    
+    def detener(self):
+        """Deja de medir (las mediciones se conservan)."""
+        if self._latido is not None:
+            try:
+                self.root.after_cancel(self._latido)
+            except Exception:
+                pass  # La ventana raíz ya se destruyó
+            self._latido = None
+        
+        if self._parar is not None:
+            self._parar.set()
+            self._parar = None
+    
+    def reiniciar(self):
+        """Borra las mediciones acumuladas."""
+        self._reiniciar_datos()
+    
+    def _al_latir(self):
+        """Mide el retraso del latido y programa el siguiente (hilo de Tkinter)."""
+        ahora = time.perf_counter()
+        esperado = self._esperado
+        retraso = max(0.0, ahora - esperado)
+        
+        with self._lock:
+            muestras, self._muestras = self._muestras, []
+            self.latidos += 1
+            self._retrasos.append(retraso)
+            
+            if retraso >= self.umbral:
+                self._registrar_bloqueo(retraso, muestras)
+        
+        # El bloqueo también aparece en el diagnóstico y en la traza de la sesión
+        registro = obtener_registro()
+        if retraso >= self.umbral and registro.activo:
+            registro.registrar("interfaz.bloqueo", retraso, esperado)
+        
+        self._esperado = time.perf_counter() + self.intervalo_ms / 1000
+        self._latido = self.root.after(self.intervalo_ms, self._al_latir)
+    
+    def _registrar_bloqueo(self, retraso, muestras):
+        """
+        Guarda un bloqueo atribuido a la función más frecuente en las muestras.
+        
+        Args:
+            retraso (float): Duración del bloqueo en segundos
+            muestras (list): Pares (función, ubicación) tomados durante el bloqueo
+        """
+        if muestras:
+            (funcion, ubicacion), _ = Counter(muestras).most_common(1)[0]
+        else:
+            funcion, ubicacion = "(sin muestra)", ""
+        
+        self.tiempo_bloqueado += retraso
+        self._bloqueos.append({
+            "hora": datetime.datetime.now().strftime("%H:%M:%S"),
+            "duracion": retraso,
+            "funcion": funcion,
+            "ubicacion": ubicacion
+        })
+        
+        acumulado = self._por_funcion.setdefault(funcion, {"bloqueos": 0, "total": 0.0, "maximo": 0.0})
+        acumulado["bloqueos"] += 1
+        acumulado["total"] += retraso
+        acumulado["maximo"] = max(acumulado["maximo"], retraso)
+    
+    def _vigilar(self, parar):
+        """
+        Toma muestras de la pila del hilo principal mientras el latido se retrasa.
+        
+        Args:
+            parar (threading.Event): Evento que detiene la vigilancia
+        """
+        # Se empieza a muestrear a mitad del umbral para no perder el inicio del bloqueo
+        intervalo = max(0.01, self.umbral / 4)
+        
+        while not parar.wait(intervalo):
+            esperado = self._esperado
+            if esperado is None or time.perf_counter() - esperado < self.umbral / 2:
+                continue
+            
+            muestra = self._muestrear()
+            with self._lock:
+                self._muestras.append(muestra)
+    
+    def _muestrear(self):
+        """
+        Identifica la función que ocupa el hilo principal.
+        
+        Returns:
+            tuple: (función llamada por el bucle de Tkinter, ubicación más interna de la
+                aplicación con archivo y línea)
+        """
+        frame = sys._current_frames().get(self._hilo_principal)
+        if frame is None:
+            return "(desconocido)", ""
+        
+        # Pila desde el frame más externo al más interno
+        pila = []
+        while frame is not None:
+            pila.append(frame)
+            frame = frame.f_back
+        pila.reverse()
+        
+        # La función responsable es la primera de la aplicación tras entrar en el bucle de Tkinter
+        dentro_de_tk = False
+        funcion = None
+        interna = None
+        for f in pila:
+            archivo = f.f_code.co_filename
+            if archivo.startswith(_DIRECTORIO_TKINTER):
+                dentro_de_tk = True
+            elif _es_de_aplicacion(archivo):
+                if funcion is None and dentro_de_tk:
+                    funcion = _nombre_funcion(f)
+                interna = f
+        
+        if interna is None:
+            # Sólo hay código de Tkinter o de bibliotecas: redibujado o eventos del sistema
+            return "(Tk: eventos o redibujado)", ""
+        
+        if funcion is None:
+            funcion = _nombre_funcion(interna)
+        
+        ubicacion = f"{_nombre_funcion(interna)} ({os.path.basename(interna.f_code.co_filename)}:{interna.f_lineno})"
+        return funcion, ubicacion
+    
+    def resumen(self):
+        """
+        Obtiene el resumen de la capacidad de respuesta de la interfaz.
+        
+        Returns:
+            dict: Latidos medidos, retrasos p50/p95/máximo (segundos), número de bloqueos,
+                tiempo bloqueado total, bloqueos por función (ordenados por tiempo total)
+                y bloqueos recientes (el más reciente primero)
+        """
+        with self._lock:
+            retrasos = list(self._retrasos)
+            bloqueos = list(reversed(self._bloqueos))
+            por_funcion = [dict(datos, funcion=funcion) for funcion, datos in self._por_funcion.items()]
+            latidos = self.latidos
+            tiempo_bloqueado = self.tiempo_bloqueado
+        
+        p50, p95, maximo = (np.percentile(retrasos, [50, 95, 100]) if retrasos else (0.0, 0.0, 0.0))
+        por_funcion.sort(key=lambda datos: datos["total"], reverse=True)
+        
+        return {
+            "latidos": latidos,
+            "p50": float(p50),
+            "p95": float(p95),
+            "maximo": float(maximo),
+            "bloqueos": sum(datos["bloqueos"] for datos in por_funcion),
+            "tiempo_bloqueado": tiempo_bloqueado,
+            "por_funcion": por_funcion,
+            "recientes": bloqueos
+        }
+    
+    def informe(self):
+        """
+        Compone un informe de texto con el resumen de la capacidad de respuesta.
+        
+        Returns:
+            str: Informe legible
+        """
+        datos = self.resumen()
+        lineas = [
+            f"Latidos medidos: {datos['latidos']} (cada {self.intervalo_ms} ms)",
+            f"Retraso del bucle de eventos: p50 {datos['p50'] * 1000:.1f} ms, "
+            f"p95 {datos['p95'] * 1000:.1f} ms, máx. {datos['maximo'] * 1000:.1f} ms",
+            f"Bloqueos de más de {self.umbral * 1000:.0f} ms: {datos['bloqueos']} "
+            f"({datos['tiempo_bloqueado']:.2f} s en total)"
+        ]
+        
+        if datos["por_funcion"]:
+            lineas.append("")
+            lineas.append("Bloqueos por función:")
+            for fila in datos["por_funcion"]:
+                lineas.append(
+                    f"  {fila['funcion']:<50} {fila['bloqueos']:>4} bloqueos  "
+                    f"total {fila['total']:.2f} s  máx. {fila['maximo'] * 1000:.0f} ms"
+                )
+        
+        return "\n".join(lineas)
\ No newline at end of file
@@ -0,0 +1,437 @@
+"""
+Módulo que define una tabla virtualizada para mostrar resultados con muchas filas.
+
+La tabla guarda los datos por columnas (arreglos de numpy) y sólo dibuja las filas
+visibles, reutilizando los mismos elementos del canvas al desplazarse. El orden y el
+filtro se aplican sobre los arreglos mediante un arreglo de índices, sin copiar los datos.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+
+from utils.instrumentacion import instrumentar
+
+
+# Operadores admitidos en el filtro de columnas numéricas
+OPERADORES_FILTRO = [">=", "<=", "!=", ">", "<", "="]
+
+
+class TablaVirtual(ttk.Frame):
+    """
+    Tabla que dibuja sólo la ventana visible de filas a partir de datos por columnas.
+    """
+    
+    def __init__(self, parent, columnas, alto_fila=22, filas_visibles=10, con_filtro=True,
+                 al_seleccionar=None):
+        """
+        Inicializa la tabla virtual.
+        
+        Args:
+            parent: El widget padre
+            columnas (list): Lista de tuplas (clave, título, ancho, formato). El formato es una
+                cadena como "{:,.2f}" o una función que recibe el valor y devuelve el texto.
+            alto_fila (int, optional): Alto de cada fila en píxeles. Default es 22.
+            filas_visibles (int, optional): Filas visibles con el tamaño inicial. Default es 10.
+            con_filtro (bool, optional): Si se muestra la barra de filtro. Default es True.
+            al_seleccionar (callable, optional): Función llamada con el índice de la fila
+                seleccionada en los datos originales
+        """
+        super().__init__(parent)
+        self.columnas = columnas
+        self.alto_fila = alto_fila
+        self.filas_visibles = filas_visibles
+        self.al_seleccionar = al_seleccionar
+        self.con_filtro = con_filtro
+        
+        # Datos por columna y vista actual (índices de las filas visibles en orden)
+        self._datos = {clave: np.empty(0) for clave, _, _, _ in columnas}
+        self._num_filas = 0
+        self._indices = np.arange(0)
+        
+        # Estado del orden, el filtro y la selección
+        self._orden = None  # (clave, descendente)
+        self._filtro = None  # (clave, texto)
+        self._mascara = None  # Filas que cumplen el filtro
+        self._seleccion = None  # Índice en los datos originales
+        
+        # Primera fila visible y elementos del canvas reutilizables
+        self._primera = 0
+        self._celdas = []  # Por cada fila visible: (fondo, [textos por columna])
+        self._redibujo_programado = None
+        
+        self.columnconfigure(0, weight=1)
+        self.rowconfigure(2, weight=1)
+        
+        self.crear_widgets()
+    
+    def crear_widgets(self):
+        """Crea la barra de filtro, el encabezado, el cuerpo y la barra de desplazamiento."""
+        ancho_total = sum(ancho for _, _, ancho, _ in self.columnas)
+        
+        # Barra de filtro
+        if self.con_filtro:
+            frame_filtro = ttk.Frame(self)
+            frame_filtro.grid(row=0, column=0, columnspan=2, sticky="ew", pady=(0, 2))
+            
+            ttk.Label(frame_filtro, text="Filtrar:").pack(side=tk.LEFT, padx=(0, 5))
+            
+            self.combo_filtro = ttk.Combobox(
+                frame_filtro, state="readonly", width=18,
+                values=[titulo for _, titulo, _, _ in self.columnas]
+            )
+            self.combo_filtro.current(0)
+            self.combo_filtro.pack(side=tk.LEFT, padx=5)
+            
+            self.texto_filtro = tk.StringVar()
+            entry_filtro = ttk.Entry(frame_filtro, textvariable=self.texto_filtro, width=20)
+            entry_filtro.pack(side=tk.LEFT, padx=5)
+            entry_filtro.bind("<Return>", lambda e: self._aplicar_filtro_ingresado())
+            
+            ttk.Button(frame_filtro, text="Aplicar", command=self._aplicar_filtro_ingresado).pack(
+                side=tk.LEFT, padx=5)
+            ttk.Button(frame_filtro, text="Quitar", command=self.quitar_filtro).pack(side=tk.LEFT, padx=5)
+            
+            self.lbl_filas = ttk.Label(frame_filtro, text="")
+            self.lbl_filas.pack(side=tk.RIGHT, padx=5)
+        
+        # Encabezado (clic para ordenar)
+        self.encabezado = tk.Canvas(self, height=self.alto_fila, width=ancho_total,
+                                    highlightthickness=0, background="#e6e6e6")
+        self.encabezado.grid(row=1, column=0, sticky="ew")
+        
+        self._textos_encabezado = {}
+        x = 0
+        for clave, titulo, ancho, _ in self.columnas:
+            self.encabezado.create_line(x + ancho - 1, 0, x + ancho - 1, self.alto_fila, fill="#b0b0b0")
+            self._textos_encabezado[clave] = self.encabezado.create_text(
+                x + 5, self.alto_fila // 2, text=titulo, anchor="w", font=("Arial", 9, "bold"))
+            x += ancho
+        self.encabezado.bind("<Button-1>", self._clic_encabezado)
+        
+        # Cuerpo de la tabla
+        self.cuerpo = tk.Canvas(self, width=ancho_total, height=self.filas_visibles * self.alto_fila,
+                                highlightthickness=0, background="white")
+        self.cuerpo.grid(row=2, column=0, sticky="nsew")
+        
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.grid(row=2, column=1, sticky="ns")
+        
+        self.cuerpo.bind("<Configure>", lambda e: self._programar_redibujo())
+        self.cuerpo.bind("<Button-1>", self._clic_cuerpo)
+        
+        # Rueda del ratón (Windows/macOS y Linux)
+        self.cuerpo.bind("<MouseWheel>", self._rueda)
+        self.cuerpo.bind("<Button-4>", lambda e: self.yview("scroll", -3, "units"))
+        self.cuerpo.bind("<Button-5>", lambda e: self.yview("scroll", 3, "units"))
+    
+    # Datos, orden y filtro
+    def establecer_datos(self, datos):
+        """
+        Reemplaza los datos de la tabla conservando el orden y el filtro actuales.
+        
+        Args:
+            datos (dict): Arreglo (o lista) de valores por clave de columna; todos del mismo largo
+        """
+        self._datos = {clave: np.asarray(datos[clave]) for clave, _, _, _ in self.columnas}
+        self._num_filas = len(self._datos[self.columnas[0][0]]) if self.columnas else 0
+        self._seleccion = None
+        
+        # Volver a aplicar el filtro sobre los nuevos datos
+        if self._filtro is not None:
+            try:
+                self._mascara = self._mascara_filtro(*self._filtro)
+            except ValueError:
+                self._filtro = None
+                self._mascara = None
+        
+        self._actualizar_vista()
+    
+    def ordenar(self, clave, descendente=False):
+        """
+        Ordena las filas según una columna (orden estable).
+        
+        Args:
+            clave (str): Clave de la columna
+            descendente (bool, optional): Si el orden es descendente. Default es False.
+        """
+        self._orden = (clave, descendente)
+        self._actualizar_vista()
+    
+    def filtrar(self, clave, texto):
+        """
+        Muestra sólo las filas cuyo valor en una columna cumple la condición.
+        
+        En columnas numéricas el texto puede empezar con un operador (>, <, >=, <=, =, !=)
+        seguido de un número; sin operador se busca la igualdad. En las demás columnas se
+        buscan las filas que contienen el texto (sin distinguir mayúsculas).
+        
+        Args:
+            clave (str): Clave de la columna
+            texto (str): Condición del filtro
+        
+        Raises:
+            ValueError: Si la condición no es válida para una columna numérica
+        """
+        texto = texto.strip()
+        if not texto:
+            self.quitar_filtro()
+            return
+        
+        # Calcular la máscara antes de cambiar el estado (valida la condición)
+        mascara = self._mascara_filtro(clave, texto)
+        
+        self._filtro = (clave, texto)
+        self._mascara = mascara
+        self._actualizar_vista()
+    
+    def quitar_filtro(self):
+        """Muestra todas las filas."""
+        self._filtro = None
+        self._mascara = None
+        if self.con_filtro:
+            self.texto_filtro.set("")
+        self._actualizar_vista()
+    
+    def cambiar_titulo(self, clave, titulo):
+        """
+        Cambia el título de una columna.
+        
+        Args:
+            clave (str): Clave de la columna
+            titulo (str): Nuevo título
+        """
+        self.columnas = [
+            (c, titulo if c == clave else t, ancho, formato) for c, t, ancho, formato in self.columnas
+        ]
+        
+        if self.con_filtro:
+            actual = self.combo_filtro.current()
+            self.combo_filtro.config(values=[t for _, t, _, _ in self.columnas])
+            self.combo_filtro.current(max(0, actual))
+        
+        self._actualizar_encabezado()
+    
+    def numero_filas(self):
+        """
+        Obtiene el número de filas visibles tras aplicar el filtro.
+        
+        Returns:
+            int: Número de filas
+        """
+        return len(self._indices)
+    
+    def fila(self, posicion):
+        """
+        Obtiene los valores de una fila según su posición en la vista actual.
+        
+        Args:
+            posicion (int): Posición de la fila (tras ordenar y filtrar)
+        
+        Returns:
+            dict: Valor de cada columna
+        """
+        indice = self._indices[posicion]
+        return {clave: self._datos[clave][indice] for clave, _, _, _ in self.columnas}
+    
+    def seleccion(self):
+        """
+        Obtiene la fila seleccionada.
+        
+        Returns:
+            int: Índice de la fila en los datos originales, o None si no hay selección
+        """
+        return self._seleccion
+    
+    def _actualizar_vista(self):
+        """Recalcula los índices visibles a partir del filtro y el orden."""
+        if self._mascara is not None:
+            indices = np.flatnonzero(self._mascara)
+        else:
+            indices = np.arange(self._num_filas)
+        
+        if self._orden is not None:
+            clave, descendente = self._orden
+            valores = self._datos[clave][indices]
+            if descendente:
+                # Ordenar al revés y volver a invertir: las filas empatadas conservan
+                # su orden original (sirve también para columnas de texto)
+                orden = (len(valores) - 1 - np.argsort(valores[::-1], kind="stable"))[::-1]
+            else:
+                orden = np.argsort(valores, kind="stable")
+            indices = indices[orden]
+        self._indices = indices
+        
+        # Quitar la selección si la fila quedó fuera del filtro
+        if self._seleccion is not None and not np.any(self._indices == self._seleccion):
+            self._seleccion = None
+        
+        self._primera = min(self._primera, max(0, len(self._indices) - 1))
+        self._actualizar_encabezado()
+        self._programar_redibujo()
+    
+    def _mascara_filtro(self, clave, texto):
+        """Devuelve la máscara booleana de las filas que cumplen el filtro."""
+        valores = self._datos[clave]
+        
+        if np.issubdtype(valores.dtype, np.number):
+            operador = next((op for op in OPERADORES_FILTRO if texto.startswith(op)), "=")
+            numero = texto[len(operador):] if texto.startswith(operador) else texto
+            try:
+                numero = float(numero.replace(",", "").replace("$", "").replace("%", ""))
+            except ValueError:
+                raise ValueError(f"Condición de filtro no válida: {texto}")
+            
+            comparaciones = {
+                ">=": valores >= numero, "<=": valores <= numero, "!=": valores != numero,
+                ">": valores > numero, "<": valores < numero, "=": np.isclose(valores, numero),
+            }
+            return comparaciones[operador]
+        
+        texto = texto.lower()
+        if valores.dtype.kind == "U":
+            return np.char.find(np.char.lower(valores), texto) >= 0
+        return np.fromiter((texto in str(v).lower() for v in valores), dtype=bool, count=len(valores))
+    
+    def _aplicar_filtro_ingresado(self):
+        """Aplica el filtro ingresado en la barra de filtro."""
+        clave = self.columnas[max(0, self.combo_filtro.current())][0]
+        try:
+            self.filtrar(clave, self.texto_filtro.get())
+        except ValueError as e:
+            if self.con_filtro:
+                self.lbl_filas.config(text=str(e))
+    
+    def _actualizar_encabezado(self):
+        """Muestra la flecha de orden en el encabezado y el número de filas."""
+        for clave, titulo, _, _ in self.columnas:
+            if self._orden is not None and self._orden[0] == clave:
+                titulo += " ▼" if self._orden[1] else " ▲"
+            self.encabezado.itemconfig(self._textos_encabezado[clave], text=titulo)
+        
+        if self.con_filtro:
+            if self._filtro is not None:
+                texto = f"{len(self._indices):,} de {self._num_filas:,} filas"
+            else:
+                texto = f"{self._num_filas:,} filas"
+            self.lbl_filas.config(text=texto)
+    
+    # Desplazamiento
+    def yview(self, *args):
+        """
+        Desplaza la tabla (protocolo de la barra de desplazamiento de Tkinter).
+        
+        Args:
+            *args: ("moveto", fracción) o ("scroll", cantidad, "units" | "pages")
+        """
+        total = len(self._indices)
+        visibles = self._filas_visibles()
+        
+        if args[0] == "moveto":
+            primera = int(float(args[1]) * total)
+        elif args[0] == "scroll":
+            paso = visibles if args[2] == "pages" else 1
+            primera = self._primera + int(args[1]) * paso
+        else:
+            return
+        
+        primera = max(0, min(primera, max(0, total - visibles)))
+        if primera != self._primera:
+            self._primera = primera
+            self._programar_redibujo()
+    
+    def _rueda(self, event):
+        """Desplaza la tabla con la rueda del ratón."""
+        self.yview("scroll", -3 if event.delta > 0 else 3, "units")
+    
+    def _filas_visibles(self):
+        """Devuelve cuántas filas caben en el alto actual del cuerpo."""
+        return max(1, self.cuerpo.winfo_height() // self.alto_fila)
+    
+    # Dibujo
+    def _programar_redibujo(self):
+        """Agrupa los pedidos de redibujo en uno solo por ciclo de eventos."""
+        if self._redibujo_programado is None:
+            self._redibujo_programado = self.after_idle(self._redibujar)
+    
+    @instrumentar("tabla_virtual.redibujar")
+    def _redibujar(self):
+        """Dibuja las filas visibles reutilizando los elementos del canvas."""
+        self._redibujo_programado = None
+        
+        visibles = self._filas_visibles() + 1  # Una más para la fila parcialmente visible
+        self._asegurar_celdas(visibles)
+        
+        total = len(self._indices)
+        indices = self._indices[self._primera:self._primera + visibles]
+        columnas_visibles = [self._datos[clave][indices] for clave, _, _, _ in self.columnas]
+        
+        for fila, (fondo, textos) in enumerate(self._celdas):
+            if fila >= len(indices):
+                self.cuerpo.itemconfig(fondo, state=tk.HIDDEN)
+                for texto in textos:
+                    self.cuerpo.itemconfig(texto, state=tk.HIDDEN)
+                continue
+            
+            if indices[fila] == self._seleccion:
+                color = "#cce0ff"
+            else:
+                color = "#f7f7f7" if (self._primera + fila) % 2 else "white"
+            self.cuerpo.itemconfig(fondo, fill=color, state=tk.NORMAL)
+            
+            for columna, texto in enumerate(textos):
+                valor = columnas_visibles[columna][fila]
+                self.cuerpo.itemconfig(texto, text=self._formatear(columna, valor), state=tk.NORMAL)
+        
+        # Actualizar la barra de desplazamiento
+        if total:
+            self.scrollbar.set(self._primera / total, min(1.0, (self._primera + visibles - 1) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def _asegurar_celdas(self, visibles):
+        """Crea los elementos del canvas que falten para las filas visibles."""
+        ancho_total = sum(ancho for _, _, ancho, _ in self.columnas)
+        
+        while len(self._celdas) < visibles:
+            y = len(self._celdas) * self.alto_fila
+            fondo = self.cuerpo.create_rectangle(0, y, ancho_total, y + self.alto_fila, width=0)
+            textos = []
+            x = 0
+            for _, _, ancho, _ in self.columnas:
+                textos.append(self.cuerpo.create_text(
+                    x + 5, y + self.alto_fila // 2, anchor="w", font=("Arial", 9)))
+                x += ancho
+            self._celdas.append((fondo, textos))
+    
+    def _formatear(self, columna, valor):
+        """Convierte un valor en texto según el formato de su columna."""
+        formato = self.columnas[columna][3]
+        if formato is None:
+            return str(valor)
+        if callable(formato):
+            return formato(valor)
+        return formato.format(valor)
+    
+    # Eventos de ratón
+    def _clic_encabezado(self, event):
+        """Ordena por la columna pulsada (alternando ascendente y descendente)."""
+        x = 0
+        for clave, _, ancho, _ in self.columnas:
+            if x <= event.x < x + ancho:
+                descendente = self._orden is not None and self._orden == (clave, False)
+                self.ordenar(clave, descendente)
+                return
+            x += ancho
+    
+    def _clic_cuerpo(self, event):
+        """Selecciona la fila pulsada."""
+        posicion = self._primera + event.y // self.alto_fila
+        if posicion >= len(self._indices):
+            return
+        
+        self._seleccion = int(self._indices[posicion])
+        self._programar_redibujo()
+        
+        if self.al_seleccionar:
+            self.al_seleccionar(self._seleccion)
\ No newline at end of file
@@ -0,0 +1,189 @@
+"""
+Módulo que administra las ventanas de gráficos detallados.
+
+Cada tipo de análisis (sensibilidad, multiproducto, ...) tiene a lo sumo una ventana
+y una figura vivas: al mostrar un nuevo gráfico se reutiliza la ventana existente y se
+libera la figura anterior, y al cerrar la ventana se liberan su figura y su canvas.
+"""
+
+import weakref
+import tkinter as tk
+from tkinter import ttk
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+
+from utils.instrumentacion import instrumentar, medir
+
+try:
+    import resource  # Sólo disponible en sistemas tipo Unix
+except ImportError:
+    resource = None
+
+
+class GestorVentanasDetalle:
+    """
+    Servicio que reutiliza una ventana y una figura por tipo de análisis.
+    """
+    
+    def __init__(self, root):
+        """
+        Inicializa el gestor de ventanas de detalle.
+        
+        Args:
+            root (tk.Tk): La ventana raíz de la aplicación
+        """
+        self.root = root
+        
+        # Estado de cada ventana abierta por clave:
+        # {"ventana", "etiqueta", "frame_grafico", "canvas", "toolbar", "figura"}
+        self._ventanas = {}
+        
+        # Todas las figuras mostradas; las liberadas desaparecen al recolectarse
+        self._figuras = weakref.WeakSet()
+    
+    @instrumentar("ventanas_detalle.mostrar")
+    def mostrar(self, clave, titulo, figura, titulo_grafico=None, geometria="900x700",
+                barra_herramientas=False):
+        """
+        Muestra una figura en la ventana de detalle de un tipo de análisis.
+        
+        Si la ventana ya existe se reutiliza y su figura anterior se libera.
+        
+        Args:
+            clave (str): Tipo de análisis (una ventana por clave)
+            titulo (str): Título de la ventana
+            figura (Figure): Figura a mostrar
+            titulo_grafico (str, optional): Texto que se muestra sobre el gráfico
+            geometria (str, optional): Tamaño inicial de la ventana. Default es "900x700".
+            barra_herramientas (bool, optional): Si se añade la barra de navegación de matplotlib
+        """
+        estado = self._ventanas.get(clave)
+        if estado is None or not estado["ventana"].winfo_exists():
+            estado = self._crear_ventana(clave, geometria)
+        else:
+            estado["ventana"].deiconify()
+            estado["ventana"].lift()
+        
+        estado["ventana"].title(titulo)
+        estado["etiqueta"].config(text=titulo_grafico or "")
+        
+        # Reemplazar el canvas y liberar la figura anterior
+        self._liberar_grafico(estado)
+        
+        canvas = FigureCanvasTkAgg(figura, estado["frame_grafico"])
+        with medir("ventanas_detalle.dibujar"):
+            canvas.draw()
+        
+        if barra_herramientas:
+            estado["toolbar"] = NavigationToolbar2Tk(canvas, estado["frame_grafico"])
+            estado["toolbar"].update()
+        
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        
+        estado["canvas"] = canvas
+        estado["figura"] = figura
+        self._figuras.add(figura)
+    
+    def cerrar(self, clave):
+        """
+        Cierra la ventana de un tipo de análisis y libera su figura.
+        
+        Args:
+            clave (str): Tipo de análisis
+        """
+        estado = self._ventanas.pop(clave, None)
+        if estado is None:
+            return
+        
+        self._liberar_grafico(estado)
+        if estado["ventana"].winfo_exists():
+            estado["ventana"].destroy()
+    
+    def cerrar_todas(self):
+        """Cierra todas las ventanas de detalle."""
+        for clave in list(self._ventanas):
+            self.cerrar(clave)
+    
+    def estadisticas(self):
+        """
+        Obtiene datos de diagnóstico sobre las ventanas y figuras.
+        
+        Returns:
+            dict: Ventanas abiertas, figuras vivas, memoria estimada de los búferes de las
+                figuras (bytes) y memoria máxima del proceso (bytes, None si no disponible)
+        """
+        figuras = list(self._figuras)
+        
+        # Cada figura dibujada con Agg mantiene un búfer RGBA del tamaño del canvas
+        bytes_figuras = sum(int(f.bbox.width) * int(f.bbox.height) * 4 for f in figuras)
+        
+        memoria_proceso = None
+        if resource is not None:
+            # ru_maxrss está en kilobytes en Linux
+            memoria_proceso = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        
+        return {
+            "ventanas_abiertas": len(self._ventanas),
+            "figuras_vivas": len(figuras),
+            "bytes_figuras": bytes_figuras,
+            "memoria_proceso": memoria_proceso
+        }
+    
+    def _crear_ventana(self, clave, geometria):
+        """Crea la ventana de detalle de un tipo de análisis."""
+        ventana = tk.Toplevel(self.root)
+        ventana.geometry(geometria)
+        ventana.minsize(800, 600)
+        
+        # Crear frame contenedor
+        frame_principal = ttk.Frame(ventana, padding=10)
+        frame_principal.pack(fill=tk.BOTH, expand=True)
+        
+        # Título del gráfico
+        etiqueta = ttk.Label(frame_principal, font=("Arial", 12, "bold"))
+        etiqueta.pack(pady=(0, 20))
+        
+        # Botón para cerrar (se empaqueta antes del gráfico para que siempre quede visible)
+        ttk.Button(frame_principal, text="Cerrar", command=lambda: self.cerrar(clave)).pack(
+            side=tk.BOTTOM, pady=10)
+        
+        # Frame para el gráfico
+        frame_grafico = ttk.Frame(frame_principal)
+        frame_grafico.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Liberar la figura también si la ventana se cierra desde el gestor de ventanas
+        ventana.protocol("WM_DELETE_WINDOW", lambda: self.cerrar(clave))
+        
+        # Centrar la ventana
+        ventana.update_idletasks()
+        ancho = ventana.winfo_width()
+        alto = ventana.winfo_height()
+        x = (ventana.winfo_screenwidth() // 2) - (ancho // 2)
+        y = (ventana.winfo_screenheight() // 2) - (alto // 2)
+        ventana.geometry(f"{ancho}x{alto}+{x}+{y}")
+        
+        estado = {
+            "ventana": ventana,
+            "etiqueta": etiqueta,
+            "frame_grafico": frame_grafico,
+            "canvas": None,
+            "toolbar": None,
+            "figura": None
+        }
+        self._ventanas[clave] = estado
+        return estado
+    
+    def _liberar_grafico(self, estado):
+        """Destruye el canvas de una ventana y libera su figura."""
+        if estado["toolbar"] is not None:
+            estado["toolbar"].destroy()
+            estado["toolbar"] = None
+        
+        if estado["canvas"] is not None:
+            estado["canvas"].get_tk_widget().destroy()
+            estado["canvas"] = None
+        
+        if estado["figura"] is not None:
+            # Vaciar la figura rompe las referencias a ejes y artistas y libera su memoria
+            estado["figura"].clear()
+            self._figuras.discard(estado["figura"])
+            estado["figura"] = None
\ No newline at end of file
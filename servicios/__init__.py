@@ -0,0 +1,11 @@
+"""
+Paquete con los servicios sin interfaz gráfica de la aplicación de punto de equilibrio.
+
+El servicio HTTP local se inicia desde la línea de comandos con:
+
+    python -m servicios.servidor_http [--puerto 8765] [--trabajadores N]
+
+y el procesamiento de los CSV que se depositan en una carpeta con:
+
+    python -m servicios.carpeta CARPETA [--salida RESULTADOS] [--una-vez]
+"""
\ No newline at end of file
@@ -0,0 +1,681 @@
+"""
+Servicio que procesa los archivos CSV de escenarios que se depositan en una carpeta.
+
+El servicio revisa la carpeta de entrada cada cierto intervalo. Cada archivo nuevo se
+reclama moviéndolo (de forma atómica) a la subcarpeta de la instancia dentro de
+'procesando', de modo que varias instancias pueden vigilar la misma carpeta sin procesar
+dos veces el mismo archivo. Los archivos se calculan en paralelo con un número limitado
+de hilos y, al terminar, pasan a 'procesados' o a 'errores'. Los resultados y el
+manifiesto de estado (manifiesto.json) se escriben en la carpeta de salida; el
+manifiesto se vuelve a leer y se actualiza bajo un bloqueo de archivo, así que todas las
+instancias comparten el registro y un archivo cuyo contenido (hash SHA-256) ya procesó
+cualquiera de ellas no se vuelve a calcular.
+
+Cada instancia mantiene bloqueada su subcarpeta de 'procesando' mientras se ejecuta. Al
+iniciar, los archivos que quedaron en subcarpetas sin bloquear (de instancias que se
+interrumpieron) vuelven a la carpeta de entrada para procesarse de nuevo.
+
+Se aceptan dos tipos de archivo, según sus columnas:
+
+    Escenarios:     costos_fijos, precio_venta, costo_variable [, unidades_esperadas, nombre]
+                    -> resultados.csv (punto de equilibrio de cada fila) y sensibilidad.csv
+    Multiproducto:  nombre, precio_venta, costo_variable, mix, costos_fijos
+                    -> multiproducto.csv
+
+Ejemplo:
+
+    python -m servicios.carpeta /ruta/compartida --salida /ruta/resultados --trabajadores 4
+"""
+
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import socket
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core.equilibrio import calcular_equilibrio_vectorizado, calcular_punto_equilibrio_multiproducto
+from core.sensibilidad import calcular_sensibilidad, VARIABLES_SENSIBILIDAD
+from utils.bloqueo import BloqueoArchivo
+
+
+# Intervalo entre revisiones de la carpeta (segundos) y archivos procesados a la vez
+INTERVALO = 5.0
+TRABAJADORES = 4
+
+# Extensiones de los archivos que se procesan
+EXTENSIONES = (".csv",)
+
+# Rango del análisis de sensibilidad de cada escenario (porcentaje mínimo, máximo e incremento)
+RANGO_SENSIBILIDAD = (-30, 30, 10)
+
+# Subcarpetas de la carpeta de entrada, nombre del manifiesto y archivos de bloqueo
+CARPETA_PROCESANDO = "procesando"
+CARPETA_PROCESADOS = "procesados"
+CARPETA_ERRORES = "errores"
+MANIFIESTO = "manifiesto.json"
+BLOQUEO_MANIFIESTO = ".manifiesto.bloqueo"
+BLOQUEO_INSTANCIA = ".activa"
+
+# Longitud de la marca de tiempo que se antepone al nombre de los archivos reclamados
+LONGITUD_MARCA = len("20240101_000000_000000_")
+
+# Columnas de cada tipo de archivo
+COLUMNAS_ESCENARIOS = ["costos_fijos", "precio_venta", "costo_variable"]
+COLUMNAS_MULTIPRODUCTO = ["nombre", "precio_venta", "costo_variable", "mix", "costos_fijos"]
+
+
+def calcular_hash(ruta):
+    """
+    Calcula el hash SHA-256 del contenido de un archivo.
+    
+    Args:
+        ruta (str): Ruta del archivo
+    
+    Returns:
+        str: Hash en hexadecimal
+    """
+    resumen = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b""):
+            resumen.update(bloque)
+    return resumen.hexdigest()
+
+
+def leer_csv(ruta, separador=None, decimal="."):
+    """
+    Lee un archivo CSV de escenarios o productos.
+    
+    Args:
+        ruta (str): Ruta del archivo
+        separador (str, optional): Separador de columnas. Si es None, se detecta (',' o ';').
+        decimal (str, optional): Separador decimal. Default es '.'.
+    
+    Returns:
+        pandas.DataFrame: Tabla con los nombres de columna normalizados (minúsculas y '_')
+    
+    Raises:
+        ValueError: Si el archivo está vacío o no se puede interpretar
+    """
+    try:
+        tabla = pd.read_csv(ruta, sep=separador, decimal=decimal, encoding="utf-8-sig",
+                            engine="python" if separador is None else "c")
+    except (pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        raise ValueError(f"No se pudo leer el CSV: {e}")
+    
+    if tabla.empty:
+        raise ValueError("El archivo no contiene filas.")
+    
+    tabla.columns = [str(c).strip().lower().replace(" ", "_") for c in tabla.columns]
+    return tabla
+
+
+def _verificar_columnas(tabla, columnas):
+    """
+    Comprueba que la tabla tenga todas las columnas indicadas.
+    
+    Raises:
+        ValueError: Si falta alguna columna
+    """
+    faltantes = [c for c in columnas if c not in tabla.columns]
+    if faltantes:
+        raise ValueError(f"Faltan columnas: {', '.join(faltantes)}")
+
+
+def _columnas_numericas(tabla, columnas):
+    """
+    Convierte las columnas indicadas a números.
+    
+    Todas las columnas numéricas son importes, cantidades o proporciones, así que se
+    aplican las mismas reglas que en el servicio HTTP y en la interfaz: números finitos
+    y no negativos.
+    
+    Raises:
+        ValueError: Si falta alguna columna o tiene valores no numéricos, no finitos o negativos
+    """
+    _verificar_columnas(tabla, columnas)
+    
+    for columna in columnas:
+        valores = pd.to_numeric(tabla[columna], errors="coerce").astype(float)
+        for invalidas, problema in ((valores.isna().to_numpy(), "no numérico"),
+                                    (np.isinf(valores.to_numpy()), "no finito"),
+                                    ((valores < 0).to_numpy(), "negativo")):
+            if invalidas.any():
+                fila = int(np.flatnonzero(invalidas)[0]) + 2  # Cabecera y numeración desde 1
+                raise ValueError(f"Valor {problema} en la columna '{columna}' (fila {fila}).")
+        tabla[columna] = valores
+
+
+def procesar_escenarios(tabla, rango_sensibilidad=RANGO_SENSIBILIDAD):
+    """
+    Calcula el punto de equilibrio y la sensibilidad de cada escenario de la tabla.
+    
+    Args:
+        tabla (pandas.DataFrame): Escenarios (ver COLUMNAS_ESCENARIOS)
+        rango_sensibilidad (tuple, optional): (porcentaje mínimo, máximo, incremento)
+    
+    Returns:
+        dict: Tablas "resultados" (una fila por escenario) y "sensibilidad" (una fila por
+            escenario, variable y porcentaje)
+    
+    Raises:
+        ValueError: Si faltan columnas o hay valores no numéricos o negativos
+    """
+    opcionales = ["unidades_esperadas"] if "unidades_esperadas" in tabla.columns else []
+    _columnas_numericas(tabla, COLUMNAS_ESCENARIOS + opcionales)
+    
+    nombres = (tabla["nombre"].astype(str) if "nombre" in tabla.columns
+               else pd.Series([f"Escenario {i + 1}" for i in range(len(tabla))]))
+    unidades = tabla["unidades_esperadas"] if opcionales else 0.0
+    
+    # Punto de equilibrio de todos los escenarios a la vez
+    calculo = calcular_equilibrio_vectorizado(
+        tabla["costos_fijos"], tabla["precio_venta"], tabla["costo_variable"], unidades
+    )
+    resultados = pd.DataFrame({"escenario": nombres.to_numpy()})
+    for columna in COLUMNAS_ESCENARIOS + opcionales:
+        resultados[columna] = tabla[columna].to_numpy()
+    for clave, valores in calculo.items():
+        resultados[clave] = valores
+    resultados["error"] = np.where(calculo["validos"], "", "Margen de contribución no positivo")
+    
+    # Sensibilidad de cada escenario válido a las tres variables (las columnas se
+    # acumulan como arreglos y la tabla se crea una sola vez)
+    porcentaje_min, porcentaje_max, incremento = rango_sensibilidad
+    columnas = {"escenario": [], "variable": []}
+    for fila in resultados[resultados["validos"]].itertuples(index=False):
+        for variable in VARIABLES_SENSIBILIDAD:
+            tabla_variable = calcular_sensibilidad(
+                fila.costos_fijos, fila.precio_venta, fila.costo_variable, variable,
+                porcentaje_min, porcentaje_max, incremento
+            )["tabla"]
+            filas = len(tabla_variable["porcentaje"])
+            columnas["escenario"].append(np.full(filas, fila.escenario, dtype=object))
+            columnas["variable"].append(np.full(filas, variable, dtype=object))
+            for clave, valores in tabla_variable.items():
+                columnas.setdefault(clave, []).append(valores)
+    
+    sensibilidad = pd.DataFrame({
+        clave: np.concatenate(partes) for clave, partes in columnas.items() if partes
+    })
+    
+    return {"resultados": resultados, "sensibilidad": sensibilidad}
+
+
+def procesar_multiproducto(tabla):
+    """
+    Calcula el punto de equilibrio multiproducto de la tabla de productos.
+    
+    Args:
+        tabla (pandas.DataFrame): Productos (ver COLUMNAS_MULTIPRODUCTO); los costos fijos
+            de cada producto se suman para obtener los costos fijos totales
+    
+    Returns:
+        dict: Tabla "multiproducto" con el punto de equilibrio de cada producto y los
+            totales en "resumen"
+    
+    Raises:
+        ValueError: Si faltan columnas (también la de costos fijos: sin ella el
+            equilibrio sería 0), hay valores no numéricos o negativos o el mix no suma 1
+    """
+    _verificar_columnas(tabla, COLUMNAS_MULTIPRODUCTO)
+    _columnas_numericas(tabla, COLUMNAS_MULTIPRODUCTO[1:])
+    
+    productos = tabla.assign(nombre=tabla["nombre"].astype(str)).to_dict("records")
+    resultados = calcular_punto_equilibrio_multiproducto(productos)
+    
+    multiproducto = pd.DataFrame(resultados["productos"])
+    multiproducto.insert(1, "mix", tabla["mix"].to_numpy())
+    
+    return {
+        "multiproducto": multiproducto,
+        "resumen": {
+            "pe_unidades_total": resultados["pe_unidades_total"],
+            "pe_valor_total": resultados["pe_valor_total"]
+        }
+    }
+
+
+def procesar_archivo(ruta, directorio_salida, rango_sensibilidad=RANGO_SENSIBILIDAD,
+                     separador=None, decimal="."):
+    """
+    Procesa un archivo CSV y escribe sus resultados.
+    
+    Args:
+        ruta (str): Ruta del archivo CSV
+        directorio_salida (str): Carpeta donde escribir los resultados (se crea si no existe)
+        rango_sensibilidad (tuple, optional): Rango del análisis de sensibilidad
+        separador (str, optional): Separador de columnas (None para detectarlo)
+        decimal (str, optional): Separador decimal
+    
+    Returns:
+        dict: Tipo de archivo, número de filas, archivos generados y resumen
+    
+    Raises:
+        ValueError: Si el archivo no tiene un formato reconocido o sus datos no son válidos
+    """
+    tabla = leer_csv(ruta, separador, decimal)
+    
+    if "mix" in tabla.columns:
+        tipo = "multiproducto"
+        tablas = procesar_multiproducto(tabla)
+        resumen = tablas.pop("resumen")
+    else:
+        tipo = "escenarios"
+        tablas = procesar_escenarios(tabla, rango_sensibilidad)
+        resumen = {
+            "escenarios": len(tabla),
+            "validos": int(tablas["resultados"]["validos"].sum())
+        }
+    
+    os.makedirs(directorio_salida, exist_ok=True)
+    salidas = []
+    for nombre, datos in tablas.items():
+        destino = os.path.join(directorio_salida, f"{nombre}.csv")
+        _escribir_atomico(destino, lambda f, datos=datos: datos.to_csv(f, index=False))
+        salidas.append(destino)
+    
+    return {"tipo": tipo, "filas": len(tabla), "salidas": salidas, "resumen": resumen}
+
+
+def _escribir_atomico(destino, escribir):
+    """
+    Escribe un archivo de forma atómica (archivo temporal y reemplazo).
+    
+    Args:
+        destino (str): Ruta final del archivo
+        escribir (callable): Función que recibe el archivo abierto en modo texto
+    """
+    temporal = f"{destino}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporal, 'w', encoding='utf-8', newline='') as f:
+            escribir(f)
+        os.replace(temporal, destino)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+
+
+class VigilanteCarpeta:
+    """
+    Revisa una carpeta y procesa los archivos de escenarios que aparecen en ella.
+    """
+    
+    def __init__(self, entrada, salida=None, trabajadores=TRABAJADORES,
+                 rango_sensibilidad=RANGO_SENSIBILIDAD, separador=None, decimal=".",
+                 informar=None):
+        """
+        Inicializa el vigilante, crea las subcarpetas que necesita y devuelve a la carpeta
+        de entrada los archivos que dejaron a medias otras instancias interrumpidas.
+        
+        Args:
+            entrada (str): Carpeta donde se depositan los archivos
+            salida (str, optional): Carpeta de resultados. Default es <entrada>/resultados.
+            trabajadores (int, optional): Archivos procesados a la vez
+            rango_sensibilidad (tuple, optional): Rango del análisis de sensibilidad
+            separador (str, optional): Separador de columnas de los CSV (None para detectarlo)
+            decimal (str, optional): Separador decimal de los CSV
+            informar (callable, optional): Función llamada con un mensaje por cada archivo
+        """
+        self.entrada = os.path.abspath(entrada)
+        self.salida = os.path.abspath(salida or os.path.join(entrada, "resultados"))
+        self.trabajadores = trabajadores
+        self.rango_sensibilidad = rango_sensibilidad
+        self.separador = separador
+        self.decimal = decimal
+        self.informar = informar or (lambda mensaje: None)
+        
+        self.procesando = os.path.join(self.entrada, CARPETA_PROCESANDO)
+        self.procesados = os.path.join(self.entrada, CARPETA_PROCESADOS)
+        self.errores = os.path.join(self.entrada, CARPETA_ERRORES)
+        for carpeta in (self.procesando, self.procesados, self.errores, self.salida):
+            os.makedirs(carpeta, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._bloqueo_manifiesto = BloqueoArchivo(os.path.join(self.salida, BLOQUEO_MANIFIESTO))
+        self._ejecutor = ThreadPoolExecutor(max_workers=trabajadores, thread_name_prefix="carpeta")
+        self._en_curso = set()
+        
+        # Tamaño y fecha de cada archivo en la revisión anterior (para no tomar archivos a medio copiar)
+        self._vistos = {}
+        
+        # Recuperar lo que dejaron instancias interrumpidas antes de reclamar nada
+        self.manifiesto = self._leer_manifiesto()
+        self._recuperar_interrumpidos()
+        
+        # Subcarpeta propia de 'procesando', bloqueada mientras la instancia esté activa
+        self.instancia = f"{socket.gethostname()}_{os.getpid()}"
+        self.reclamados = os.path.join(self.procesando, self.instancia)
+        os.makedirs(self.reclamados, exist_ok=True)
+        self._bloqueo_instancia = BloqueoArchivo(os.path.join(self.reclamados, BLOQUEO_INSTANCIA))
+        self._bloqueo_instancia.adquirir()
+    
+    @property
+    def ruta_manifiesto(self):
+        """str: Ruta del manifiesto de estado."""
+        return os.path.join(self.salida, MANIFIESTO)
+    
+    def _leer_manifiesto(self):
+        """Lee el manifiesto de estado, o crea uno vacío si no existe."""
+        try:
+            with open(self.ruta_manifiesto, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"archivos": {}}
+    
+    def _actualizar_manifiesto(self, cambio):
+        """
+        Aplica un cambio al manifiesto compartido con las demás instancias.
+        
+        El manifiesto se vuelve a leer del disco bajo el bloqueo de archivo, de modo que
+        no se pierden los registros que escribieron otras instancias mientras tanto.
+        
+        Args:
+            cambio (callable): Función que recibe el diccionario de archivos del manifiesto,
+                lo modifica y devuelve un resultado; si devuelve algo distinto de None o
+                modifica el manifiesto, éste se guarda
+        
+        Returns:
+            El valor devuelto por cambio
+        """
+        with self._lock, self._bloqueo_manifiesto:
+            manifiesto = self._leer_manifiesto()
+            antes = json.dumps(manifiesto["archivos"], sort_keys=True)
+            resultado = cambio(manifiesto["archivos"])
+            
+            if json.dumps(manifiesto["archivos"], sort_keys=True) != antes:
+                manifiesto["actualizado"] = datetime.datetime.now().isoformat()
+                _escribir_atomico(
+                    self.ruta_manifiesto,
+                    lambda f: json.dump(manifiesto, f, indent=4, ensure_ascii=False)
+                )
+            self.manifiesto = manifiesto
+        
+        return resultado
+    
+    def _recuperar_interrumpidos(self):
+        """
+        Devuelve a la carpeta de entrada los archivos de instancias que ya no están activas.
+        
+        Una instancia activa mantiene bloqueada su subcarpeta de 'procesando'; si el
+        bloqueo está libre, la instancia terminó sin acabar esos archivos. También se
+        quitan del manifiesto sus registros "procesando" para que no cuenten como duplicados.
+        
+        Returns:
+            int: Número de archivos devueltos a la carpeta de entrada
+        """
+        recuperados = 0
+        with os.scandir(self.procesando) as entradas:
+            carpetas = [entrada.path for entrada in entradas if entrada.is_dir()]
+        
+        for carpeta in carpetas:
+            bloqueo = BloqueoArchivo(os.path.join(carpeta, BLOQUEO_INSTANCIA))
+            if not bloqueo.adquirir(bloqueante=False):
+                continue  # Instancia activa
+            
+            try:
+                instancia = os.path.basename(carpeta)
+                for nombre in sorted(os.listdir(carpeta)):
+                    if nombre == BLOQUEO_INSTANCIA:
+                        continue
+                    
+                    # Quitar la marca de tiempo del reclamo para recuperar el nombre original
+                    original = nombre[LONGITUD_MARCA:] or nombre
+                    destino = os.path.join(self.entrada, original)
+                    if os.path.exists(destino):
+                        destino = os.path.join(self.entrada, nombre)
+                    os.rename(os.path.join(carpeta, nombre), destino)
+                    recuperados += 1
+                    self.informar(f"{original}: reencolado (instancia {instancia} interrumpida)")
+                
+                def quitar_pendientes(archivos):
+                    for huella in [h for h, r in archivos.items()
+                                   if r.get("estado") == "procesando" and r.get("instancia") == instancia]:
+                        del archivos[huella]
+                
+                self._actualizar_manifiesto(quitar_pendientes)
+            finally:
+                bloqueo.liberar()
+            
+            try:
+                os.remove(os.path.join(carpeta, BLOQUEO_INSTANCIA))
+                os.rmdir(carpeta)
+            except OSError:
+                pass  # Otra instancia la está recuperando o volvió a usarla
+        
+        return recuperados
+    
+    def revisar(self, esperar_estables=True):
+        """
+        Revisa la carpeta de entrada y envía a procesar los archivos nuevos.
+        
+        Args:
+            esperar_estables (bool, optional): Si sólo se toman los archivos cuyo tamaño y
+                fecha no cambiaron desde la revisión anterior (es decir, ya terminaron de
+                copiarse). Default es True.
+        
+        Returns:
+            int: Número de archivos reclamados en esta revisión
+        """
+        candidatos = {}
+        with os.scandir(self.entrada) as entradas:
+            for entrada in entradas:
+                if entrada.is_file() and entrada.name.lower().endswith(EXTENSIONES):
+                    estado = entrada.stat()
+                    candidatos[entrada.name] = (estado.st_size, estado.st_mtime_ns)
+        
+        vistos_antes, self._vistos = self._vistos, candidatos
+        reclamados = 0
+        
+        for nombre, firma in sorted(candidatos.items()):
+            # No reclamar más archivos de los que se pueden procesar (otras instancias pueden tomarlos)
+            with self._lock:
+                if len(self._en_curso) >= self.trabajadores:
+                    break
+            
+            if esperar_estables and vistos_antes.get(nombre) != firma:
+                continue
+            
+            ruta = self._reclamar(nombre)
+            if ruta is None:
+                continue
+            
+            with self._lock:
+                self._en_curso.add(ruta)
+            self._ejecutor.submit(self._procesar, nombre, ruta)
+            reclamados += 1
+        
+        return reclamados
+    
+    def _reclamar(self, nombre):
+        """
+        Reclama un archivo moviéndolo a la subcarpeta de la instancia en 'procesando'.
+        
+        Returns:
+            str: Nueva ruta del archivo, o None si otra instancia lo reclamó antes
+        """
+        marca = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        destino = os.path.join(self.reclamados, f"{marca}_{nombre}")
+        try:
+            os.rename(os.path.join(self.entrada, nombre), destino)
+        except FileNotFoundError:
+            return None
+        return destino
+    
+    def _procesar(self, nombre, ruta):
+        """Procesa un archivo reclamado y registra el resultado en el manifiesto."""
+        inicio = time.perf_counter()
+        registro = {
+            "archivo": nombre,
+            "instancia": self.instancia,
+            "inicio": datetime.datetime.now().isoformat()
+        }
+        
+        try:
+            huella = calcular_hash(ruta)
+            
+            # Un contenido ya procesado (o en curso en cualquier instancia) sólo se anota
+            # como duplicado
+            def registrar_inicio(archivos):
+                anterior = archivos.get(huella)
+                if anterior is not None:
+                    anterior.setdefault("duplicados", []).append(nombre)
+                else:
+                    archivos[huella] = dict(registro, estado="procesando")
+                return anterior
+            
+            anterior = self._actualizar_manifiesto(registrar_inicio)
+            if anterior is not None:
+                shutil.move(ruta, os.path.join(self.procesados, os.path.basename(ruta)))
+                self.informar(f"{nombre}: ya procesado como {anterior['archivo']} (omitido)")
+                return
+            
+            try:
+                base = os.path.splitext(nombre)[0]
+                resultado = procesar_archivo(
+                    ruta, os.path.join(self.salida, f"{base}_{huella[:8]}"),
+                    self.rango_sensibilidad, self.separador, self.decimal
+                )
+                registro.update(resultado, estado="procesado")
+                destino = self.procesados
+            except ValueError as e:
+                registro.update(estado="error", error=str(e))
+                destino = self.errores
+            except Exception as e:
+                registro.update(estado="error", error=f"{type(e).__name__}: {e}")
+                destino = self.errores
+            
+            registro["duracion"] = time.perf_counter() - inicio
+            shutil.move(ruta, os.path.join(destino, os.path.basename(ruta)))
+            
+            def registrar_fin(archivos):
+                # Conservar los duplicados que anotaron las instancias mientras se procesaba
+                duplicados = archivos.get(huella, {}).get("duplicados")
+                if duplicados:
+                    registro["duplicados"] = duplicados
+                archivos[huella] = registro
+            
+            self._actualizar_manifiesto(registrar_fin)
+            
+            if registro["estado"] == "procesado":
+                self.informar(f"{nombre}: {registro['tipo']}, {registro['filas']} filas "
+                              f"en {registro['duracion']:.2f} s")
+            else:
+                self.informar(f"{nombre}: error: {registro['error']}")
+        except OSError as e:
+            self.informar(f"{nombre}: error de archivo: {e}")
+        finally:
+            with self._lock:
+                self._en_curso.discard(ruta)
+    
+    def esperar(self):
+        """Espera a que terminen los archivos en curso."""
+        while True:
+            with self._lock:
+                if not self._en_curso:
+                    return
+            time.sleep(0.05)
+    
+    def cerrar(self):
+        """Espera a los archivos en curso y libera la subcarpeta de la instancia."""
+        self.esperar()
+        self._ejecutor.shutdown()
+        self._bloqueo_instancia.liberar()
+        
+        try:
+            os.remove(os.path.join(self.reclamados, BLOQUEO_INSTANCIA))
+            os.rmdir(self.reclamados)
+        except OSError:
+            pass  # Quedan archivos: se reencolarán al iniciar otra instancia
+    
+    def ejecutar(self, intervalo=INTERVALO, una_vez=False):
+        """
+        Revisa la carpeta periódicamente hasta que se interrumpe.
+        
+        Args:
+            intervalo (float, optional): Segundos entre revisiones
+            una_vez (bool, optional): Procesar los archivos presentes y terminar. Default es False.
+        """
+        try:
+            if una_vez:
+                # Todos los archivos presentes se consideran completos
+                while self.revisar(esperar_estables=False):
+                    self.esperar()
+                return
+            
+            while True:
+                self.revisar()
+                time.sleep(intervalo)
+        finally:
+            self.cerrar()
+
+
+def crear_parser():
+    """
+    Crea el analizador de argumentos de la línea de comandos.
+    
+    Returns:
+        argparse.ArgumentParser: Analizador de argumentos
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m servicios.carpeta",
+        description="Procesa los CSV de escenarios que se depositan en una carpeta."
+    )
+    parser.add_argument("entrada", help="Carpeta a vigilar")
+    parser.add_argument("-o", "--salida",
+                        help="Carpeta de resultados (default: <entrada>/resultados)")
+    parser.add_argument("-i", "--intervalo", type=float, default=INTERVALO,
+                        help=f"Segundos entre revisiones (default: {INTERVALO})")
+    parser.add_argument("-t", "--trabajadores", type=int, default=TRABAJADORES,
+                        help=f"Archivos procesados a la vez (default: {TRABAJADORES})")
+    parser.add_argument("--una-vez", action="store_true",
+                        help="Procesar los archivos presentes y salir")
+    parser.add_argument("--separador",
+                        help="Separador de columnas de los CSV (default: detectar ',' o ';')")
+    parser.add_argument("--decimal", default=".",
+                        help="Separador decimal de los CSV (default: '.')")
+    parser.add_argument("--sensibilidad", type=float, nargs=3, default=RANGO_SENSIBILIDAD,
+                        metavar=("MIN", "MAX", "PASO"),
+                        help="Rango de la sensibilidad en porcentaje (default: -30 30 10)")
+    return parser
+
+
+def main(argumentos=None):
+    """
+    Inicia el servicio desde la línea de comandos.
+    
+    Args:
+        argumentos (list, optional): Argumentos de la línea de comandos. Si es None, se usa sys.argv.
+    
+    Returns:
+        int: Código de salida
+    """
+    opciones = crear_parser().parse_args(argumentos)
+    if not os.path.isdir(opciones.entrada):
+        print(f"No existe la carpeta {opciones.entrada}", file=sys.stderr)
+        return 2
+    
+    vigilante = VigilanteCarpeta(
+        opciones.entrada, opciones.salida, opciones.trabajadores, tuple(opciones.sensibilidad),
+        opciones.separador, opciones.decimal,
+        informar=lambda mensaje: print(mensaje, file=sys.stderr)
+    )
+    print(f"Vigilando {vigilante.entrada} (resultados en {vigilante.salida})", file=sys.stderr)
+    
+    try:
+        vigilante.ejecutar(opciones.intervalo, opciones.una_vez)
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,191 @@
+"""
+Módulo que agrupa las peticiones individuales de cálculo en microlotes.
+
+Con muchas peticiones pequeñas por segundo, crear un AnalizadorEquilibrio por petición
+domina el coste. El agrupador reúne los escenarios que llegan casi a la vez, hasta
+TAM_LOTE escenarios o ESPERA_MS milisegundos desde el primero, los calcula juntos con
+calcular_equilibrio_vectorizado y entrega a cada petición su resultado.
+"""
+
+import asyncio
+from collections import Counter
+
+import numpy as np
+
+from core.equilibrio import calcular_equilibrio_vectorizado
+
+
+# Tamaño máximo de un microlote y espera máxima desde el primer escenario (milisegundos)
+TAM_LOTE = 256
+ESPERA_MS = 2.0
+
+# Mensaje para los escenarios sin margen de contribución positivo (igual que el analizador)
+MENSAJE_MARGEN = ("El margen de contribución debe ser positivo. "
+                  "El precio de venta debe ser mayor que el costo variable unitario.")
+
+
+def calcular_valores(valores):
+    """
+    Calcula varios escenarios a la vez.
+    
+    Args:
+        valores (list): Tuplas (costos_fijos, precio_venta, costo_variable, unidades_esperadas)
+    
+    Returns:
+        list: Por escenario, un diccionario con los mismos indicadores que devuelve el
+            servicio para un escenario individual, o un ValueError si no es válido
+    """
+    if not valores:
+        return []
+    
+    calculo = calcular_equilibrio_vectorizado(*np.array(valores, dtype=float).T)
+    
+    # Recorrer las columnas ya convertidas a listas de Python (más rápido que indexar numpy)
+    columnas = zip(*(calculo[clave].tolist() for clave in (
+        "validos", "pe_unidades", "pe_valor", "margen_contribucion", "ratio_mc", "con_ventas",
+        "margen_seguridad_unidades", "margen_seguridad_valor", "margen_seguridad_porcentaje",
+        "utilidad_estimada", "gao"
+    )))
+    
+    resultados = []
+    for (valido, pe_unidades, pe_valor, margen, ratio_mc, con_ventas,
+         ms_unidades, ms_valor, ms_porcentaje, utilidad, gao) in columnas:
+        if not valido:
+            resultados.append(ValueError(MENSAJE_MARGEN))
+            continue
+        
+        resultado = {
+            "pe_unidades": pe_unidades,
+            "pe_valor": pe_valor,
+            "margen_contribucion": margen,
+            "ratio_mc": ratio_mc
+        }
+        if con_ventas:
+            resultado["margen_seguridad"] = {
+                "unidades": ms_unidades,
+                "valor": ms_valor,
+                "porcentaje": ms_porcentaje
+            }
+            resultado["utilidad_estimada"] = utilidad
+            resultado["gao"] = gao
+        resultados.append(resultado)
+    
+    return resultados
+
+
+class AgrupadorMicrolotes:
+    """
+    Reúne los escenarios individuales concurrentes y los calcula en un solo lote.
+    
+    Debe usarse desde el bucle de eventos de asyncio (no es seguro entre hilos).
+    """
+    
+    def __init__(self, tam_lote=TAM_LOTE, espera_ms=ESPERA_MS):
+        """
+        Inicializa el agrupador.
+        
+        Args:
+            tam_lote (int, optional): Número de escenarios que cierra un lote
+            espera_ms (float, optional): Tiempo máximo que espera el primer escenario de un lote
+        
+        Raises:
+            ValueError: Si el tamaño o la espera no son válidos
+        """
+        if tam_lote < 1:
+            raise ValueError("El tamaño del lote debe ser al menos 1.")
+        if espera_ms < 0:
+            raise ValueError("La espera no puede ser negativa.")
+        
+        self.tam_lote = tam_lote
+        self.espera_ms = espera_ms
+        
+        self._pendientes = []
+        self._temporizador = None
+        
+        # Métricas
+        self.lotes = 0
+        self.escenarios = 0
+        self.tam_maximo = 0
+        self.cierres = Counter()
+    
+    async def calcular(self, costos_fijos, precio_venta, costo_variable, unidades_esperadas=0.0):
+        """
+        Calcula un escenario dentro del próximo microlote.
+        
+        Args:
+            costos_fijos (float): Costos fijos
+            precio_venta (float): Precio de venta unitario
+            costo_variable (float): Costo variable unitario
+            unidades_esperadas (float, optional): Ventas esperadas en unidades
+        
+        Returns:
+            dict: Indicadores del escenario (ver calcular_valores)
+        
+        Raises:
+            ValueError: Si el margen de contribución no es positivo
+        """
+        futuro = asyncio.get_running_loop().create_future()
+        self._pendientes.append(((costos_fijos, precio_venta, costo_variable, unidades_esperadas), futuro))
+        
+        if len(self._pendientes) >= self.tam_lote:
+            self._procesar("tamaño")
+        elif self._temporizador is None:
+            self._temporizador = asyncio.get_running_loop().call_later(
+                self.espera_ms / 1000, self._procesar, "espera"
+            )
+        
+        return await futuro
+    
+    def _procesar(self, motivo):
+        """
+        Calcula los escenarios pendientes y entrega sus resultados.
+        
+        Args:
+            motivo (str): Por qué se cierra el lote ("tamaño" o "espera")
+        """
+        if self._temporizador is not None:
+            self._temporizador.cancel()
+            self._temporizador = None
+        
+        pendientes, self._pendientes = self._pendientes, []
+        if not pendientes:
+            return
+        
+        self.lotes += 1
+        self.escenarios += len(pendientes)
+        self.tam_maximo = max(self.tam_maximo, len(pendientes))
+        self.cierres[motivo] += 1
+        
+        try:
+            resultados = calcular_valores([valores for valores, _ in pendientes])
+        except Exception as e:
+            resultados = [e] * len(pendientes)
+        
+        for (_, futuro), resultado in zip(pendientes, resultados):
+            if futuro.done():
+                continue  # La petición se canceló mientras esperaba
+            if isinstance(resultado, Exception):
+                futuro.set_exception(resultado)
+            else:
+                futuro.set_result(resultado)
+    
+    def metricas(self):
+        """
+        Obtiene las métricas de los microlotes procesados.
+        
+        Returns:
+            dict: Configuración, lotes y escenarios procesados, tamaño medio y máximo,
+                llenado medio (tamaño medio / tamaño del lote) y lotes cerrados por motivo
+        """
+        tam_medio = self.escenarios / self.lotes if self.lotes else 0.0
+        return {
+            "tam_lote": self.tam_lote,
+            "espera_ms": self.espera_ms,
+            "lotes": self.lotes,
+            "escenarios": self.escenarios,
+            "tam_medio": tam_medio,
+            "tam_maximo": self.tam_maximo,
+            "llenado_medio": tam_medio / self.tam_lote,
+            "cerrados_por_tamaño": self.cierres["tamaño"],
+            "cerrados_por_espera": self.cierres["espera"]
+        }
\ No newline at end of file
@@ -0,0 +1,557 @@
+"""
+Servicio HTTP local que expone los cálculos de punto de equilibrio en formato JSON.
+
+Permite a otras herramientas obtener los resultados sin manejar la interfaz gráfica. Usa
+sólo la biblioteca estándar (asyncio) y escucha por defecto en 127.0.0.1. Los cálculos
+individuales son baratos y se resuelven en el propio bucle de eventos (agrupados en
+microlotes si se usa --microlotes, ver servicios.microlotes); los lotes y los análisis
+multiproducto se ejecutan en un grupo de procesos para que el bucle siga atendiendo
+peticiones mientras tanto.
+
+Rutas:
+
+    GET  /salud           Estado del servicio
+    GET  /metricas        Latencia (p50/p95/máx.) por ruta, número de respuestas por código
+                          y llenado de los microlotes
+    POST /equilibrio      Un escenario: {"costos_fijos", "precio_venta", "costo_variable",
+                          "unidades_esperadas" (opcional)}
+    POST /lote            Varios escenarios: {"escenarios": [...]}
+    POST /multiproducto   {"productos": [{"nombre", "precio_venta", "costo_variable", "mix"}],
+                          "costos_fijos"}
+
+Ejemplo:
+
+    python -m servicios.servidor_http --puerto 8765
+    curl -X POST localhost:8765/equilibrio -d '{"costos_fijos": 10000, "precio_venta": 50, "costo_variable": 30}'
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+
+from core.equilibrio import AnalizadorEquilibrio, calcular_punto_equilibrio_multiproducto
+from servicios.microlotes import AgrupadorMicrolotes, calcular_valores, TAM_LOTE, ESPERA_MS
+from utils.instrumentacion import RegistroInstrumentacion
+from utils.cache_resultados import obtener_cache_resultados
+
+
+# Dirección y puerto por defecto (sólo conexiones locales)
+HOST = "127.0.0.1"
+PUERTO = 8765
+
+# Límites de las peticiones
+MAX_CUERPO = 10 * 1024 * 1024
+MAX_ESCENARIOS_LOTE = 100000
+MAX_CABECERAS = 64 * 1024
+
+
+class ErrorPeticion(Exception):
+    """Excepción para las peticiones que no se pueden atender (se responde con su código)."""
+    
+    def __init__(self, estado, mensaje):
+        """
+        Inicializa el error.
+        
+        Args:
+            estado (HTTPStatus): Código de la respuesta
+            mensaje (str): Descripción del error
+        """
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def _numero(datos, clave, defecto=None):
+    """
+    Obtiene un valor numérico de los datos de una petición.
+    
+    Args:
+        datos (dict): Datos de la petición
+        clave (str): Nombre del valor
+        defecto (float, optional): Valor si la clave no está. Si es None, la clave es obligatoria.
+    
+    Returns:
+        float: Valor convertido
+    
+    Raises:
+        ValueError: Si falta el valor o no es un número finito
+    """
+    if clave not in datos:
+        if defecto is None:
+            raise ValueError(f"Falta el valor '{clave}'.")
+        return defecto
+    
+    valor = datos[clave]
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        raise ValueError(f"El valor '{clave}' debe ser un número.")
+    
+    # json.loads acepta NaN e Infinity, que no se pueden devolver en JSON estándar
+    if not math.isfinite(valor):
+        raise ValueError(f"El valor '{clave}' debe ser un número finito.")
+    return float(valor)
+
+
+def leer_escenario(datos):
+    """
+    Obtiene los valores de un escenario de los datos de una petición.
+    
+    Args:
+        datos (dict): costos_fijos, precio_venta, costo_variable y, opcionalmente,
+            unidades_esperadas
+    
+    Returns:
+        tuple: (costos_fijos, precio_venta, costo_variable, unidades_esperadas)
+    
+    Raises:
+        ValueError: Si los datos no son válidos o algún valor es negativo
+    """
+    if not isinstance(datos, dict):
+        raise ValueError("Cada escenario debe ser un objeto JSON.")
+    
+    valores = (
+        _numero(datos, "costos_fijos"),
+        _numero(datos, "precio_venta"),
+        _numero(datos, "costo_variable"),
+        _numero(datos, "unidades_esperadas", 0.0)
+    )
+    
+    # Mismas reglas que la entrada de datos de la interfaz: ningún valor negativo
+    for clave, valor in zip(("costos_fijos", "precio_venta", "costo_variable", "unidades_esperadas"), valores):
+        if valor < 0:
+            raise ValueError(f"El valor '{clave}' no puede ser negativo.")
+    
+    return valores
+
+
+def calcular_escenario(datos):
+    """
+    Calcula los indicadores de punto de equilibrio de un escenario.
+    
+    Args:
+        datos (dict): costos_fijos, precio_venta, costo_variable y, opcionalmente,
+            unidades_esperadas
+    
+    Returns:
+        dict: Punto de equilibrio en unidades y valor, margen y ratio de contribución y,
+            si hay unidades esperadas por encima del equilibrio, margen de seguridad,
+            utilidad estimada y grado de apalancamiento operativo
+    
+    Raises:
+        ValueError: Si los datos no son válidos o el margen de contribución no es positivo
+    """
+    costos_fijos, precio_venta, costo_variable, unidades_esperadas = leer_escenario(datos)
+    
+    analizador = AnalizadorEquilibrio(
+        costos_fijos=costos_fijos,
+        precio_venta=precio_venta,
+        costo_variable_unitario=costo_variable
+    )
+    
+    resultado = {
+        "pe_unidades": analizador.punto_equilibrio_unidades(),
+        "pe_valor": analizador.punto_equilibrio_valor(),
+        "margen_contribucion": analizador.margen_contribucion,
+        "ratio_mc": analizador.ratio_margen_contribucion()
+    }
+    
+    # Indicadores que dependen de las ventas esperadas (misma condición que
+    # calcular_equilibrio_vectorizado, que usan /lote y los microlotes)
+    if unidades_esperadas > 0 and unidades_esperadas > resultado["pe_unidades"]:
+        resultado["margen_seguridad"] = analizador.margen_seguridad(unidades_esperadas)
+        resultado["utilidad_estimada"] = analizador.utilidad_estimada(unidades_esperadas)
+        resultado["gao"] = analizador.grado_apalancamiento_operativo(unidades_esperadas)
+    
+    return resultado
+
+
+def calcular_lote(escenarios):
+    """
+    Calcula varios escenarios; los errores se informan por escenario sin detener el lote.
+    
+    Los escenarios válidos se calculan juntos con operaciones vectorizadas.
+    
+    Args:
+        escenarios (list): Datos de cada escenario (ver calcular_escenario)
+    
+    Returns:
+        list: Resultado de cada escenario, o {"error": mensaje} si no es válido
+    """
+    resultados = [None] * len(escenarios)
+    
+    # Separar los escenarios con datos válidos de los que tienen errores de formato
+    posiciones, valores = [], []
+    for i, datos in enumerate(escenarios):
+        try:
+            valores.append(leer_escenario(datos))
+            posiciones.append(i)
+        except ValueError as e:
+            resultados[i] = {"error": str(e)}
+    
+    for i, resultado in zip(posiciones, calcular_valores(valores)):
+        resultados[i] = {"error": str(resultado)} if isinstance(resultado, Exception) else resultado
+    
+    return resultados
+
+
+def calcular_multiproducto(datos):
+    """
+    Calcula el punto de equilibrio multiproducto.
+    
+    Args:
+        datos (dict): Lista de productos (nombre, precio_venta, costo_variable, mix) y
+            costos fijos totales, que se reparten según el mix como en la interfaz. Si no
+            se indican, se usan los costos_fijos de cada producto.
+    
+    Returns:
+        dict: Resultados de calcular_punto_equilibrio_multiproducto
+    
+    Raises:
+        ValueError: Si los productos no son válidos
+    """
+    productos = datos.get("productos")
+    if not isinstance(productos, list) or not productos:
+        raise ValueError("Se requiere una lista 'productos' no vacía.")
+    
+    costos_fijos = _numero(datos, "costos_fijos") if "costos_fijos" in datos else None
+    
+    normalizados = []
+    for i, producto in enumerate(productos):
+        if not isinstance(producto, dict):
+            raise ValueError(f"El producto {i + 1} debe ser un objeto JSON.")
+        
+        normalizado = {
+            "nombre": str(producto.get("nombre", f"Producto {i + 1}")),
+            "precio_venta": _numero(producto, "precio_venta"),
+            "costo_variable": _numero(producto, "costo_variable"),
+            "mix": _numero(producto, "mix")
+        }
+        normalizado["costos_fijos"] = (
+            costos_fijos * normalizado["mix"] if costos_fijos is not None
+            else _numero(producto, "costos_fijos", 0.0)
+        )
+        normalizados.append(normalizado)
+    
+    # La caché en disco se comparte con la interfaz y con los demás procesos del servicio
+    return obtener_cache_resultados().obtener_o_calcular(
+        "multiproducto",
+        {"productos": normalizados},
+        lambda: calcular_punto_equilibrio_multiproducto(normalizados)
+    )
+
+
+class ServidorEquilibrio:
+    """
+    Servidor HTTP/1.1 mínimo sobre asyncio con las rutas del cálculo de punto de equilibrio.
+    """
+    
+    def __init__(self, host=HOST, puerto=PUERTO, trabajadores=None, microlotes=False,
+                 tam_lote=TAM_LOTE, espera_ms=ESPERA_MS):
+        """
+        Inicializa el servidor (sin empezar a escuchar).
+        
+        Args:
+            host (str, optional): Dirección en la que escuchar. Default es 127.0.0.1.
+            puerto (int, optional): Puerto (0 elige uno libre)
+            trabajadores (int, optional): Procesos para los lotes. Si es None, uno por CPU.
+            microlotes (bool, optional): Si se agrupan las peticiones individuales en microlotes
+            tam_lote (int, optional): Escenarios que cierran un microlote
+            espera_ms (float, optional): Espera máxima de un microlote en milisegundos
+        """
+        self.host = host
+        self.puerto = puerto
+        self.trabajadores = trabajadores
+        self.agrupador = AgrupadorMicrolotes(tam_lote, espera_ms) if microlotes else None
+        
+        self._servidor = None
+        self._ejecutor = None
+        
+        # Latencias por ruta y respuestas por código
+        self.metricas = RegistroInstrumentacion()
+        self.metricas.activar()
+        
+        self.rutas = {
+            ("GET", "/salud"): self._salud,
+            ("GET", "/metricas"): self._metricas,
+            ("POST", "/equilibrio"): self._equilibrio,
+            ("POST", "/lote"): self._lote,
+            ("POST", "/multiproducto"): self._multiproducto,
+        }
+    
+    async def iniciar(self):
+        """Empieza a escuchar conexiones."""
+        self._ejecutor = self._crear_ejecutor()
+        self._servidor = await asyncio.start_server(
+            self._atender_conexion, self.host, self.puerto, limit=MAX_CABECERAS
+        )
+        
+        # Puerto real (por si se pidió el 0)
+        self.puerto = self._servidor.sockets[0].getsockname()[1]
+    
+    def _crear_ejecutor(self):
+        """Crea el grupo de procesos para los lotes y los análisis multiproducto."""
+        # Procesos nuevos (spawn) en lugar de copias del proceso con el bucle en marcha
+        return ProcessPoolExecutor(max_workers=self.trabajadores,
+                                   mp_context=multiprocessing.get_context("spawn"))
+    
+    async def _en_procesos(self, funcion, *args):
+        """
+        Ejecuta una función en el grupo de procesos.
+        
+        Si un proceso del grupo muere (por ejemplo por falta de memoria), el grupo queda
+        inutilizable: se sustituye por uno nuevo para las peticiones siguientes.
+        
+        Raises:
+            ErrorPeticion: 503 si el grupo de procesos falló durante esta petición
+        """
+        ejecutor = self._ejecutor
+        try:
+            return await asyncio.get_running_loop().run_in_executor(ejecutor, funcion, *args)
+        except BrokenProcessPool:
+            # Sólo la primera petición afectada lo reemplaza (puede haber varias en curso)
+            if self._ejecutor is ejecutor:
+                ejecutor.shutdown(wait=False, cancel_futures=True)
+                self._ejecutor = self._crear_ejecutor()
+            raise ErrorPeticion(HTTPStatus.SERVICE_UNAVAILABLE,
+                                "Un proceso de cálculo terminó de forma inesperada; reintente la petición.")
+    
+    async def detener(self):
+        """Deja de escuchar y libera el grupo de procesos."""
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+        
+        if self._ejecutor is not None:
+            self._ejecutor.shutdown(cancel_futures=True)
+            self._ejecutor = None
+    
+    async def servir(self):
+        """Atiende peticiones hasta que se cancela la tarea (inicia el servidor si hace falta)."""
+        if self._servidor is None:
+            await self.iniciar()
+        try:
+            await self._servidor.serve_forever()
+        finally:
+            await self.detener()
+    
+    async def _atender_conexion(self, lector, escritor):
+        """Atiende las peticiones de una conexión (admite conexiones persistentes)."""
+        try:
+            while True:
+                try:
+                    peticion = await self._leer_peticion(lector)
+                except ErrorPeticion as e:
+                    await self._responder(escritor, e.estado, {"error": str(e)}, mantener=False)
+                    break
+                
+                if peticion is None:
+                    break  # El cliente cerró la conexión
+                
+                metodo, ruta, cuerpo, mantener = peticion
+                inicio = time.perf_counter()
+                estado, respuesta = await self._despachar(metodo, ruta, cuerpo)
+                
+                self.metricas.registrar(f"{metodo} {ruta}" if (metodo, ruta) in self.rutas else "otras",
+                                        time.perf_counter() - inicio)
+                self.metricas.contar(f"respuestas.{estado.value}")
+                
+                await self._responder(escritor, estado, respuesta, mantener)
+                if not mantener:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+    
+    async def _leer_peticion(self, lector):
+        """
+        Lee una petición HTTP de la conexión.
+        
+        Returns:
+            tuple: (método, ruta, cuerpo, mantener la conexión) o None si se cerró la conexión
+        
+        Raises:
+            ErrorPeticion: Si la petición está mal formada o es demasiado grande
+        """
+        try:
+            cabecera = await lector.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "Petición incompleta.")
+        except asyncio.LimitOverrunError:
+            raise ErrorPeticion(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Cabeceras demasiado grandes.")
+        
+        lineas = cabecera.decode("latin-1").split("\r\n")
+        try:
+            metodo, objetivo, version = lineas[0].split(" ")
+        except ValueError:
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "Línea de petición no válida.")
+        
+        cabeceras = {}
+        for linea in lineas[1:]:
+            if ":" in linea:
+                nombre, valor = linea.split(":", 1)
+                cabeceras[nombre.strip().lower()] = valor.strip()
+        
+        # Leer el cuerpo según Content-Length
+        try:
+            longitud = int(cabeceras.get("content-length", 0))
+        except ValueError:
+            raise ErrorPeticion(HTTPStatus.BAD_REQUEST, "Content-Length no válido.")
+        if longitud > MAX_CUERPO:
+            raise ErrorPeticion(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                f"El cuerpo supera el máximo de {MAX_CUERPO} bytes.")
+        cuerpo = await lector.readexactly(longitud) if longitud else b""
+        
+        # HTTP/1.1 mantiene la conexión salvo que se pida cerrarla
+        conexion = cabeceras.get("connection", "").lower()
+        mantener = conexion != "close" if version == "HTTP/1.1" else conexion == "keep-alive"
+        
+        return metodo.upper(), objetivo.split("?", 1)[0], cuerpo, mantener
+    
+    async def _despachar(self, metodo, ruta, cuerpo):
+        """
+        Ejecuta la ruta solicitada.
+        
+        Returns:
+            tuple: (código de estado, datos de la respuesta)
+        """
+        manejador = self.rutas.get((metodo, ruta))
+        if manejador is None:
+            if any(r == ruta for _, r in self.rutas):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"Método {metodo} no permitido en {ruta}."}
+            return HTTPStatus.NOT_FOUND, {"error": f"Ruta no encontrada: {ruta}"}
+        
+        try:
+            datos = json.loads(cuerpo) if cuerpo else {}
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            return HTTPStatus.BAD_REQUEST, {"error": f"JSON no válido: {e}"}
+        
+        try:
+            return HTTPStatus.OK, await manejador(datos)
+        except ErrorPeticion as e:
+            return e.estado, {"error": str(e)}
+        except ValueError as e:
+            return HTTPStatus.BAD_REQUEST, {"error": str(e)}
+        except Exception as e:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"Error interno: {e}"}
+    
+    async def _responder(self, escritor, estado, datos, mantener):
+        """Envía una respuesta JSON."""
+        try:
+            cuerpo = json.dumps(datos, ensure_ascii=False, allow_nan=False).encode("utf-8")
+        except ValueError:
+            # NaN o infinito en el resultado: no se envía JSON fuera del estándar
+            estado = HTTPStatus.INTERNAL_SERVER_ERROR
+            cuerpo = json.dumps({"error": "Error interno: resultado no finito."}).encode("utf-8")
+        cabecera = (
+            f"HTTP/1.1 {estado.value} {estado.phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            f"Connection: {'keep-alive' if mantener else 'close'}\r\n"
+            f"\r\n"
+        )
+        escritor.write(cabecera.encode("latin-1") + cuerpo)
+        await escritor.drain()
+    
+    # Rutas
+    
+    async def _salud(self, datos):
+        """GET /salud"""
+        return {"estado": "ok"}
+    
+    async def _metricas(self, datos):
+        """GET /metricas"""
+        metricas = {
+            "rutas": self.metricas.estadisticas(),
+            "contadores": self.metricas.contadores()
+        }
+        if self.agrupador is not None:
+            metricas["microlotes"] = self.agrupador.metricas()
+        return metricas
+    
+    async def _equilibrio(self, datos):
+        """POST /equilibrio (se calcula en el bucle: cuesta microsegundos)"""
+        if self.agrupador is not None:
+            return await self.agrupador.calcular(*leer_escenario(datos))
+        return calcular_escenario(datos)
+    
+    async def _lote(self, datos):
+        """POST /lote (se calcula en el grupo de procesos)"""
+        escenarios = datos.get("escenarios") if isinstance(datos, dict) else None
+        if not isinstance(escenarios, list):
+            raise ValueError("Se requiere una lista 'escenarios'.")
+        if len(escenarios) > MAX_ESCENARIOS_LOTE:
+            raise ValueError(f"El lote supera el máximo de {MAX_ESCENARIOS_LOTE} escenarios.")
+        
+        return {"resultados": await self._en_procesos(calcular_lote, escenarios)}
+    
+    async def _multiproducto(self, datos):
+        """POST /multiproducto (se calcula en el grupo de procesos)"""
+        if not isinstance(datos, dict):
+            raise ValueError("Se requiere un objeto JSON con 'productos'.")
+        
+        return await self._en_procesos(calcular_multiproducto, datos)
+
+
+def crear_parser():
+    """
+    Crea el analizador de argumentos de la línea de comandos.
+    
+    Returns:
+        argparse.ArgumentParser: Analizador de argumentos
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m servicios.servidor_http",
+        description="Servicio HTTP local con los cálculos de punto de equilibrio."
+    )
+    parser.add_argument("--host", default=HOST,
+                        help=f"Dirección en la que escuchar (default: {HOST})")
+    parser.add_argument("-p", "--puerto", type=int, default=PUERTO,
+                        help=f"Puerto (default: {PUERTO})")
+    parser.add_argument("-t", "--trabajadores", type=int,
+                        help="Procesos para los lotes (default: uno por CPU)")
+    parser.add_argument("--microlotes", action="store_true",
+                        help="Agrupar las peticiones individuales concurrentes en microlotes")
+    parser.add_argument("--tam-lote", type=int, default=TAM_LOTE,
+                        help=f"Escenarios que cierran un microlote (default: {TAM_LOTE})")
+    parser.add_argument("--espera-ms", type=float, default=ESPERA_MS,
+                        help=f"Espera máxima de un microlote en milisegundos (default: {ESPERA_MS})")
+    return parser
+
+
+def main(argumentos=None):
+    """
+    Inicia el servicio desde la línea de comandos.
+    
+    Args:
+        argumentos (list, optional): Argumentos de la línea de comandos. Si es None, se usa sys.argv.
+    
+    Returns:
+        int: Código de salida
+    """
+    opciones = crear_parser().parse_args(argumentos)
+    servidor = ServidorEquilibrio(opciones.host, opciones.puerto, opciones.trabajadores,
+                                  opciones.microlotes, opciones.tam_lote, opciones.espera_ms)
+    
+    async def ejecutar():
+        await servidor.iniciar()
+        print(f"Servicio escuchando en http://{servidor.host}:{servidor.puerto}", file=sys.stderr)
+        await servidor.servir()
+    
+    try:
+        asyncio.run(ejecutar())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,83 @@
+"""
+Módulo con un bloqueo exclusivo entre procesos basado en un archivo.
+
+Lo usan la caché de resultados en disco y el servicio de carpeta vigilada para que
+varios procesos (la interfaz, la línea de comandos y las instancias de los servicios)
+no modifiquen a la vez los mismos archivos.
+"""
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class BloqueoArchivo:
+    """
+    Bloqueo exclusivo entre procesos sobre un archivo.
+    
+    Se usa como administrador de contexto (espera hasta obtener el bloqueo) o con
+    adquirir(bloqueante=False) para comprobar si otro proceso lo tiene tomado.
+    """
+    
+    def __init__(self, ruta):
+        """
+        Inicializa el bloqueo (sin adquirirlo).
+        
+        Args:
+            ruta (str): Ruta del archivo de bloqueo (se crea si no existe)
+        """
+        self.ruta = ruta
+        self._archivo = None
+    
+    def adquirir(self, bloqueante=True):
+        """
+        Adquiere el bloqueo.
+        
+        Args:
+            bloqueante (bool, optional): Si se espera a que el bloqueo quede libre. Default es True.
+        
+        Returns:
+            bool: True si se adquirió el bloqueo, False si otro proceso lo tiene (sólo si
+                no es bloqueante)
+        """
+        archivo = open(self.ruta, "a+b")
+        try:
+            if fcntl is not None:
+                fcntl.flock(archivo.fileno(), fcntl.LOCK_EX | (0 if bloqueante else fcntl.LOCK_NB))
+            else:
+                # msvcrt bloquea por bytes: se bloquea siempre el primero (con reintentos)
+                archivo.seek(0)
+                msvcrt.locking(archivo.fileno(), msvcrt.LK_LOCK if bloqueante else msvcrt.LK_NBLCK, 1)
+        except OSError:
+            archivo.close()
+            if bloqueante:
+                raise
+            return False
+        
+        self._archivo = archivo
+        return True
+    
+    def liberar(self):
+        """Libera el bloqueo si está tomado."""
+        if self._archivo is None:
+            return
+        
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._archivo.fileno(), fcntl.LOCK_UN)
+            else:
+                self._archivo.seek(0)
+                msvcrt.locking(self._archivo.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._archivo.close()
+            self._archivo = None
+    
+    def __enter__(self):
+        self.adquirir()
+        return self
+    
+    def __exit__(self, tipo, valor, traza):
+        self.liberar()
+        return False
\ No newline at end of file
@@ -0,0 +1,290 @@
+"""
+Módulo para el almacenamiento en caché de las imágenes de gráficos renderizados.
+
+Este módulo evita volver a renderizar un gráfico cuando los parámetros del análisis,
+el tipo de gráfico, el tamaño, la resolución y la versión del motor de cálculo no han
+cambiado. Las imágenes se guardan en memoria y en disco, ambas con desalojo LRU y un
+límite de tamaño.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+from utils.bloqueo import BloqueoArchivo
+from utils.cache_resultados import VERSION_MOTOR, ARCHIVO_BLOQUEO, directorio_cache_usuario
+
+
+# Directorio por defecto para la caché en disco (en la caché del usuario, no en el
+# directorio de trabajo; se puede cambiar con PUNTO_EQUILIBRIO_CACHE)
+DIRECTORIO_CACHE = os.path.join(directorio_cache_usuario(), "graficos")
+
+# Límites por defecto (en bytes)
+MAX_BYTES_MEMORIA = 32 * 1024 * 1024
+MAX_BYTES_DISCO = 256 * 1024 * 1024
+
+
+class CacheGraficos:
+    """
+    Caché de dos niveles (memoria y disco) para imágenes de gráficos.
+    """
+    
+    def __init__(self, directorio=DIRECTORIO_CACHE, max_bytes_memoria=MAX_BYTES_MEMORIA,
+                 max_bytes_disco=MAX_BYTES_DISCO):
+        """
+        Inicializa la caché de gráficos.
+        
+        Args:
+            directorio (str, optional): Directorio para la caché en disco. Si es None,
+                sólo se usa la caché en memoria.
+            max_bytes_memoria (int, optional): Tamaño máximo de la caché en memoria.
+            max_bytes_disco (int, optional): Tamaño máximo de la caché en disco.
+        """
+        self.directorio = directorio
+        self.max_bytes_memoria = max_bytes_memoria
+        self.max_bytes_disco = max_bytes_disco
+        
+        # Caché en memoria ordenada por uso (el último es el más reciente)
+        self._memoria = OrderedDict()
+        self._bytes_memoria = 0
+        self._lock = threading.Lock()
+        
+        # Estadísticas de uso
+        self.aciertos = 0
+        self.fallos = 0
+    
+    @staticmethod
+    def generar_clave(parametros, tipo_grafico, tamaño, dpi):
+        """
+        Genera la clave de la caché a partir de las entradas del gráfico.
+        
+        Args:
+            parametros (dict): Valores de entrada que determinan el gráfico
+            tipo_grafico (str): Identificador del tipo de gráfico
+            tamaño (tuple): Tamaño de la figura en pulgadas (ancho, alto)
+            dpi (int): Resolución de la imagen
+        
+        Returns:
+            str: Hash hexadecimal que identifica la imagen
+        """
+        contenido = json.dumps({
+            "parametros": parametros,
+            "tipo": tipo_grafico,
+            "tamaño": [float(t) for t in tamaño],
+            "dpi": int(dpi),
+            "version": VERSION_MOTOR
+        }, sort_keys=True, default=float)
+        
+        return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+    
+    def obtener(self, clave):
+        """
+        Busca una imagen en la caché, primero en memoria y luego en disco.
+        
+        Args:
+            clave (str): Clave generada con generar_clave
+        
+        Returns:
+            bytes: Contenido de la imagen, o None si no está en la caché
+        """
+        with self._lock:
+            if clave in self._memoria:
+                self._memoria.move_to_end(clave)
+                self.aciertos += 1
+                return self._memoria[clave]
+        
+        imagen = self._leer_disco(clave)
+        
+        with self._lock:
+            if imagen is None:
+                self.fallos += 1
+                return None
+            
+            self.aciertos += 1
+            self._guardar_memoria(clave, imagen)
+        
+        return imagen
+    
+    def guardar(self, clave, imagen):
+        """
+        Guarda una imagen en la caché (memoria y disco).
+        
+        Args:
+            clave (str): Clave generada con generar_clave
+            imagen (bytes): Contenido de la imagen
+        """
+        with self._lock:
+            self._guardar_memoria(clave, imagen)
+        
+        self._escribir_disco(clave, imagen)
+    
+    def obtener_o_renderizar(self, parametros, tipo_grafico, tamaño, dpi, funcion_render):
+        """
+        Devuelve la imagen de la caché o la renderiza y la guarda si no existe.
+        
+        Args:
+            parametros (dict): Valores de entrada que determinan el gráfico
+            tipo_grafico (str): Identificador del tipo de gráfico
+            tamaño (tuple): Tamaño de la figura en pulgadas (ancho, alto)
+            dpi (int): Resolución de la imagen
+            funcion_render (callable): Función sin argumentos que devuelve la imagen en bytes
+        
+        Returns:
+            bytes: Contenido de la imagen
+        """
+        clave = self.generar_clave(parametros, tipo_grafico, tamaño, dpi)
+        
+        imagen = self.obtener(clave)
+        if imagen is None:
+            imagen = funcion_render()
+            self.guardar(clave, imagen)
+        
+        return imagen
+    
+    def limpiar(self):
+        """Elimina todas las imágenes de la caché en memoria y en disco."""
+        with self._lock:
+            self._memoria.clear()
+            self._bytes_memoria = 0
+        
+        if not self.directorio or not os.path.isdir(self.directorio):
+            return
+        
+        with self._bloqueo():
+            for ruta in self._archivos_disco():
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    pass
+    
+    def estadisticas(self):
+        """
+        Obtiene las estadísticas de uso de la caché.
+        
+        Returns:
+            dict: Aciertos, fallos, entradas y bytes ocupados en memoria
+        """
+        with self._lock:
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "entradas_memoria": len(self._memoria),
+                "bytes_memoria": self._bytes_memoria
+            }
+    
+    def _guardar_memoria(self, clave, imagen):
+        """Guarda una imagen en memoria y desaloja las menos usadas si se excede el límite."""
+        if len(imagen) > self.max_bytes_memoria:
+            return
+        
+        if clave in self._memoria:
+            self._bytes_memoria -= len(self._memoria.pop(clave))
+        
+        self._memoria[clave] = imagen
+        self._bytes_memoria += len(imagen)
+        
+        while self._bytes_memoria > self.max_bytes_memoria:
+            _, desalojada = self._memoria.popitem(last=False)
+            self._bytes_memoria -= len(desalojada)
+    
+    def _bloqueo(self):
+        """Devuelve el bloqueo entre procesos del directorio de la caché."""
+        os.makedirs(self.directorio, mode=0o700, exist_ok=True)
+        return BloqueoArchivo(os.path.join(self.directorio, ARCHIVO_BLOQUEO))
+    
+    def _ruta_disco(self, clave):
+        """Devuelve la ruta del archivo de caché para una clave."""
+        return os.path.join(self.directorio, f"{clave}.png")
+    
+    def _archivos_disco(self):
+        """Devuelve las rutas de los archivos de la caché en disco."""
+        if not self.directorio or not os.path.isdir(self.directorio):
+            return []
+        
+        return [
+            os.path.join(self.directorio, nombre)
+            for nombre in os.listdir(self.directorio)
+            if nombre.endswith(".png")
+        ]
+    
+    def _leer_disco(self, clave):
+        """Lee una imagen del disco y actualiza su fecha de acceso (para el orden LRU)."""
+        if not self.directorio:
+            return None
+        
+        ruta = self._ruta_disco(clave)
+        try:
+            with open(ruta, "rb") as f:
+                imagen = f.read()
+            os.utime(ruta, None)
+            return imagen
+        except OSError:
+            return None
+    
+    def _escribir_disco(self, clave, imagen):
+        """Escribe una imagen en disco de forma atómica y aplica el límite de tamaño."""
+        if not self.directorio:
+            return
+        
+        try:
+            os.makedirs(self.directorio, mode=0o700, exist_ok=True)
+            
+            # Escribir en un archivo temporal y renombrar para evitar lecturas parciales
+            ruta = self._ruta_disco(clave)
+            ruta_temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(ruta_temporal, "wb") as f:
+                f.write(imagen)
+            os.replace(ruta_temporal, ruta)
+        except OSError:
+            return  # La caché en disco es opcional; ignorar errores de escritura
+        
+        self._desalojar_disco()
+    
+    def _desalojar_disco(self):
+        """Elimina los archivos menos usados hasta respetar el tamaño máximo en disco."""
+        try:
+            with self._bloqueo():
+                archivos = []
+                total = 0
+                for ruta in self._archivos_disco():
+                    try:
+                        info = os.stat(ruta)
+                    except OSError:
+                        continue
+                    archivos.append((info.st_mtime, info.st_size, ruta))
+                    total += info.st_size
+                
+                # Eliminar primero los de acceso más antiguo
+                archivos.sort()
+                for _, tamaño, ruta in archivos:
+                    if total <= self.max_bytes_disco:
+                        break
+                    try:
+                        os.remove(ruta)
+                        total -= tamaño
+                    except OSError:
+                        pass
+        except OSError:
+            pass  # La caché en disco es opcional; ignorar errores de desalojo
+
+
+# Instancia compartida por la aplicación
+_cache_compartida = None
+_lock_compartida = threading.Lock()
+
+
+def obtener_cache_graficos():
+    """
+    Obtiene la instancia compartida de la caché de gráficos.
+    
+    Returns:
+        CacheGraficos: Caché de gráficos de la aplicación
+    """
+    global _cache_compartida
+    
+    with _lock_compartida:
+        if _cache_compartida is None:
+            _cache_compartida = CacheGraficos()
+        return _cache_compartida
\ No newline at end of file
@@ -0,0 +1,362 @@
+"""
+Módulo para el almacenamiento en disco de los resultados de análisis costosos.
+
+Los resultados (tablas de sensibilidad, análisis multiproducto, etc.) se guardan en
+archivos cuyo nombre es el hash de las entradas y de la versión del motor de cálculo,
+dentro del directorio de caché del usuario (no del directorio de trabajo), de modo que
+se reutilizan entre sesiones de la interfaz, ejecuciones de la línea de comandos y
+procesos del servicio. Las escrituras son atómicas, el desalojo LRU se hace
+bajo un bloqueo de archivo compartido entre procesos y cualquier cambio en el código
+de core/ invalida las entradas anteriores.
+"""
+
+import os
+import sys
+import json
+import pickle
+import hashlib
+import threading
+
+import numpy as np
+
+from utils.bloqueo import BloqueoArchivo
+
+
+# Nombre de la aplicación en el directorio de caché del usuario y variable de entorno
+# que permite indicar otro directorio
+NOMBRE_APLICACION = "punto_de_equilibrio"
+VARIABLE_DIRECTORIO = "PUNTO_EQUILIBRIO_CACHE"
+
+# Tamaño máximo por defecto (en bytes)
+MAX_BYTES_DISCO = 128 * 1024 * 1024
+
+# Archivo usado para el bloqueo entre procesos
+ARCHIVO_BLOQUEO = ".bloqueo"
+
+# Extensión de las entradas de la caché
+EXTENSION = ".pkl"
+
+
+def calcular_version_motor():
+    """
+    Calcula la versión del motor de cálculo a partir del código fuente de core/.
+    
+    Returns:
+        str: Hash corto del contenido de los módulos de core/
+    """
+    directorio_core = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "core")
+    resumen = hashlib.sha256()
+    
+    for nombre in sorted(os.listdir(directorio_core)):
+        if not nombre.endswith(".py"):
+            continue
+        with open(os.path.join(directorio_core, nombre), "rb") as f:
+            resumen.update(nombre.encode("utf-8"))
+            resumen.update(f.read())
+    
+    return resumen.hexdigest()[:16]
+
+
+# Versión del motor incluida en todas las claves
+VERSION_MOTOR = calcular_version_motor()
+
+
+def directorio_cache_usuario():
+    """
+    Obtiene el directorio de caché de la aplicación para el usuario actual.
+    
+    Es el mismo para la interfaz, la línea de comandos y los servicios, sin importar
+    el directorio de trabajo desde el que se inicien.
+    
+    Returns:
+        str: Ruta absoluta: $PUNTO_EQUILIBRIO_CACHE si está definida; si no,
+            %LOCALAPPDATA%\\punto_de_equilibrio en Windows, ~/Library/Caches/punto_de_equilibrio
+            en macOS y $XDG_CACHE_HOME/punto_de_equilibrio (~/.cache) en los demás sistemas
+    """
+    if os.environ.get(VARIABLE_DIRECTORIO):
+        return os.path.abspath(os.path.expanduser(os.environ[VARIABLE_DIRECTORIO]))
+    
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(os.path.join("~", "AppData", "Local"))
+    elif sys.platform == "darwin":
+        base = os.path.expanduser(os.path.join("~", "Library", "Caches"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser(os.path.join("~", ".cache"))
+    
+    return os.path.join(os.path.abspath(base), NOMBRE_APLICACION)
+
+
+# Directorio por defecto para la caché en disco
+DIRECTORIO_CACHE = os.path.join(directorio_cache_usuario(), "resultados")
+
+
+def _a_json(valor):
+    """Convierte a JSON los valores de numpy que aparecen en los parámetros."""
+    if isinstance(valor, np.ndarray):
+        return valor.tolist()
+    if isinstance(valor, np.generic):
+        return valor.item()
+    raise TypeError(f"Parámetro no serializable para la caché: {type(valor).__name__}")
+
+
+class CacheResultados:
+    """
+    Caché en disco, direccionada por contenido, para resultados de análisis.
+    """
+    
+    def __init__(self, directorio=DIRECTORIO_CACHE, max_bytes_disco=MAX_BYTES_DISCO,
+                 version=VERSION_MOTOR):
+        """
+        Inicializa la caché de resultados.
+        
+        Args:
+            directorio (str, optional): Directorio para la caché. Si es None, la caché
+                está desactivada y todos los resultados se calculan.
+            max_bytes_disco (int, optional): Tamaño máximo de la caché en disco.
+            version (str, optional): Versión del motor incluida en las claves.
+        """
+        self.directorio = directorio
+        self.max_bytes_disco = max_bytes_disco
+        self.version = version
+        
+        self._lock = threading.Lock()
+        
+        # Estadísticas de uso (de este proceso)
+        self.aciertos = 0
+        self.fallos = 0
+        self.escrituras = 0
+        self.desalojos = 0
+    
+    def generar_clave(self, tipo, parametros):
+        """
+        Genera la clave de la caché a partir de las entradas del análisis.
+        
+        Args:
+            tipo (str): Identificador del análisis (por ejemplo "sensibilidad")
+            parametros (dict): Valores de entrada que determinan el resultado
+        
+        Returns:
+            str: Hash hexadecimal que identifica el resultado
+        
+        Raises:
+            TypeError: Si algún parámetro no se puede representar en JSON
+        """
+        contenido = json.dumps({
+            "tipo": tipo,
+            "version": self.version,
+            "parametros": parametros
+        }, sort_keys=True, default=_a_json)
+        
+        return hashlib.sha256(contenido.encode("utf-8")).hexdigest()
+    
+    def obtener(self, clave):
+        """
+        Busca un resultado en la caché.
+        
+        Args:
+            clave (str): Clave generada con generar_clave
+        
+        Returns:
+            object: Resultado guardado, o None si no está en la caché
+        """
+        resultado = self._leer_disco(clave)
+        
+        with self._lock:
+            if resultado is None:
+                self.fallos += 1
+            else:
+                self.aciertos += 1
+        
+        return resultado
+    
+    def guardar(self, clave, resultado):
+        """
+        Guarda un resultado en la caché y aplica el límite de tamaño.
+        
+        Args:
+            clave (str): Clave generada con generar_clave
+            resultado (object): Resultado serializable con pickle (no None)
+        """
+        if not self.directorio or resultado is None:
+            return
+        
+        try:
+            contenido = pickle.dumps(resultado, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return  # Resultado no serializable: simplemente no se guarda
+        
+        if len(contenido) > self.max_bytes_disco:
+            return
+        
+        try:
+            # Sólo el usuario puede escribir las entradas que después se cargan con pickle
+            os.makedirs(self.directorio, mode=0o700, exist_ok=True)
+            ruta = self._ruta_disco(clave)
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            
+            # Escribir en un archivo temporal y renombrar para evitar lecturas parciales
+            ruta_temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(ruta_temporal, "wb") as f:
+                f.write(contenido)
+            os.replace(ruta_temporal, ruta)
+        except OSError:
+            return  # La caché es opcional; ignorar errores de escritura
+        
+        with self._lock:
+            self.escrituras += 1
+        
+        self._desalojar_disco()
+    
+    def obtener_o_calcular(self, tipo, parametros, funcion_calculo):
+        """
+        Devuelve el resultado de la caché o lo calcula y lo guarda si no existe.
+        
+        Args:
+            tipo (str): Identificador del análisis
+            parametros (dict): Valores de entrada que determinan el resultado
+            funcion_calculo (callable): Función sin argumentos que calcula el resultado
+        
+        Returns:
+            object: Resultado del análisis
+        """
+        if not self.directorio:
+            return funcion_calculo()
+        
+        clave = self.generar_clave(tipo, parametros)
+        
+        resultado = self.obtener(clave)
+        if resultado is None:
+            resultado = funcion_calculo()
+            self.guardar(clave, resultado)
+        
+        return resultado
+    
+    def limpiar(self):
+        """Elimina todos los resultados de la caché en disco."""
+        if not self.directorio or not os.path.isdir(self.directorio):
+            return
+        
+        with self._bloqueo():
+            for ruta, _ in self._archivos_disco():
+                try:
+                    os.remove(ruta)
+                except OSError:
+                    pass
+    
+    def estadisticas(self):
+        """
+        Obtiene las estadísticas de uso de la caché.
+        
+        Returns:
+            dict: Aciertos, fallos, escrituras y desalojos de este proceso, y entradas y
+                bytes ocupados en disco (por todos los procesos)
+        """
+        archivos = self._archivos_disco()
+        
+        with self._lock:
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "escrituras": self.escrituras,
+                "desalojos": self.desalojos,
+                "entradas_disco": len(archivos),
+                "bytes_disco": sum(info.st_size for _, info in archivos)
+            }
+    
+    def _ruta_disco(self, clave):
+        """Devuelve la ruta del archivo de una clave (repartidos en subdirectorios)."""
+        return os.path.join(self.directorio, clave[:2], f"{clave}{EXTENSION}")
+    
+    def _bloqueo(self):
+        """Devuelve el bloqueo entre procesos del directorio de la caché."""
+        os.makedirs(self.directorio, mode=0o700, exist_ok=True)
+        return BloqueoArchivo(os.path.join(self.directorio, ARCHIVO_BLOQUEO))
+    
+    def _archivos_disco(self):
+        """Devuelve pares (ruta, os.stat_result) de las entradas de la caché en disco."""
+        if not self.directorio or not os.path.isdir(self.directorio):
+            return []
+        
+        archivos = []
+        for subdirectorio in os.scandir(self.directorio):
+            if not subdirectorio.is_dir():
+                continue
+            try:
+                entradas = list(os.scandir(subdirectorio.path))
+            except OSError:
+                continue
+            for entrada in entradas:
+                if not entrada.name.endswith(EXTENSION):
+                    continue
+                try:
+                    archivos.append((entrada.path, entrada.stat()))
+                except OSError:
+                    pass  # Desalojada por otro proceso mientras se recorría
+        return archivos
+    
+    def _leer_disco(self, clave):
+        """Lee un resultado del disco y actualiza su fecha de acceso (para el orden LRU)."""
+        if not self.directorio:
+            return None
+        
+        ruta = self._ruta_disco(clave)
+        try:
+            with open(ruta, "rb") as f:
+                contenido = f.read()
+            os.utime(ruta, None)
+        except OSError:
+            return None
+        
+        try:
+            return pickle.loads(contenido)
+        except Exception:
+            # Entrada dañada o de una versión incompatible de las bibliotecas: descartarla
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+            return None
+    
+    def _desalojar_disco(self):
+        """Elimina los resultados menos usados hasta respetar el tamaño máximo en disco."""
+        try:
+            with self._bloqueo():
+                archivos = self._archivos_disco()
+                total = sum(info.st_size for _, info in archivos)
+                if total <= self.max_bytes_disco:
+                    return
+                
+                # Eliminar primero los de acceso más antiguo
+                archivos.sort(key=lambda archivo: archivo[1].st_mtime)
+                for ruta, info in archivos:
+                    if total <= self.max_bytes_disco:
+                        break
+                    try:
+                        os.remove(ruta)
+                        total -= info.st_size
+                        with self._lock:
+                            self.desalojos += 1
+                    except OSError:
+                        pass
+        except OSError:
+            pass  # Sin acceso al archivo de bloqueo: se intentará en la próxima escritura
+
+
+# Instancia compartida por la aplicación
+_cache_compartida = None
+_lock_compartida = threading.Lock()
+
+
+def obtener_cache_resultados():
+    """
+    Obtiene la instancia compartida de la caché de resultados.
+    
+    Returns:
+        CacheResultados: Caché de resultados de la aplicación
+    """
+    global _cache_compartida
+    
+    with _lock_compartida:
+        if _cache_compartida is None:
+            _cache_compartida = CacheResultados()
+        return _cache_compartida
\ No newline at end of file
@@ -5,21 +5,69 @@ from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 import pandas as pd
 import tempfile
 from io import BytesIO
 
+from utils.cache_graficos import obtener_cache_graficos
+from utils.submuestreo import submuestrear, puntos_para_ejes
+from utils.instrumentacion import instrumentar
 
-def exportar_a_pdf(modelo, ruta_archivo=None, incluir_graficos=True):
+
+# Tamaño (pulgadas) y resolución del gráfico incluido en el PDF
+TAMAÑO_GRAFICO_PDF = (8, 5)
+DPI_GRAFICO_PDF = 300
+
+
+class ExportacionCancelada(Exception):
+    """
+    Excepción lanzada cuando se cancela una exportación en curso.
+    """
+    pass
+
+
+def _notificar_progreso(progreso, fraccion, mensaje):
+    """
+    Notifica el avance de una exportación si se proporcionó una función de progreso.
+    
+    La función de progreso puede lanzar ExportacionCancelada para interrumpir la exportación,
+    salvo en la notificación final (fracción 1), que llega con el archivo ya escrito.
+    
+    Args:
+        progreso (callable): Función que recibe la fracción completada y un mensaje, o None
+        fraccion (float): Fracción completada (entre 0 y 1)
+        mensaje (str): Descripción de la etapa actual
+    
+    Raises:
+        ExportacionCancelada: Si la función de progreso cancela antes de terminar
+    """
+    if progreso is None:
+        return
+    
+    try:
+        progreso(fraccion, mensaje)
+    except ExportacionCancelada:
+        # Una cancelación que llega cuando la exportación ya terminó no se aplica
+        if fraccion < 1.0:
+            raise
+
+
+@instrumentar("exportar.pdf")
+def exportar_a_pdf(modelo, ruta_archivo=None, incluir_graficos=True, usar_cache=True, progreso=None):
     """
     Exporta los resultados del análisis a un archivo PDF.
     
     Args:
-        modelo (dict): Diccionario con los datos del modelo
+        modelo (ModeloEquilibrio o dict): Datos del modelo
         ruta_archivo (str, optional): Ruta donde guardar el archivo. Si es None,
                                      se guarda en el directorio actual con un nombre por defecto.
         incluir_graficos (bool, optional): Si se incluyen gráficos en el PDF. Default es True.
+        usar_cache (bool, optional): Si se reutiliza la imagen del gráfico desde la caché
+                                     cuando los parámetros no han cambiado. Default es True.
+        progreso (callable, optional): Función que recibe la fracción completada y un mensaje.
+                                       Puede lanzar ExportacionCancelada para interrumpir.
         
     Returns:
         str: Ruta del archivo generado
@@ -29,6 +77,8 @@ def exportar_a_pdf(modelo, ruta_archivo=None, incluir_graficos=True):
         fecha_hora = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         ruta_archivo = f"punto_equilibrio_{fecha_hora}.pdf"
     
+    _notificar_progreso(progreso, 0.0, "Preparando documento PDF")
+    
     # Crear el documento
     doc = SimpleDocTemplate(
         ruta_archivo,
@@ -141,40 +191,24 @@ def exportar_a_pdf(modelo, ruta_archivo=None, incluir_graficos=True):
         elementos.append(Paragraph("3. Representación Gráfica", estilo_subtitulo))
         elementos.append(Spacer(1, 0.1 * inch))
         
-        # Crear gráfico de punto de equilibrio
-        fig, ax = plt.subplots(figsize=(8, 5))
-        
-        datos = modelo["datos_grafico"]
         pe_unidades = modelo["resultados"]["pe_unidades"]
         pe_valor = modelo["resultados"]["pe_valor"]
         
-        # Graficar costos totales e ingresos
-        ax.plot(datos['unidades'], datos['costos_totales'], 
-                label='Costos Totales', color='red')
-        ax.plot(datos['unidades'], datos['ingresos'], 
-                label='Ingresos', color='blue')
-        
-        # Marcar el punto de equilibrio
-        ax.plot([pe_unidades], [pe_valor], 'ro', markersize=8)
-        
-        # Líneas punteadas para el punto de equilibrio
-        ax.axvline(x=pe_unidades, color='gray', linestyle=':', alpha=0.7)
-        ax.axhline(y=pe_valor, color='gray', linestyle=':', alpha=0.7)
+        _notificar_progreso(progreso, 0.3, "Generando gráfico")
         
-        # Configurar ejes y leyenda
-        ax.set_xlabel('Unidades')
-        ax.set_ylabel('Valor ($)')
-        ax.set_title('Análisis de Punto de Equilibrio')
-        ax.grid(True, linestyle='--', alpha=0.7)
-        ax.legend()
+        # Obtener la imagen del gráfico (de la caché si los parámetros no han cambiado)
+        if usar_cache:
+            imagen = obtener_cache_graficos().obtener_o_renderizar(
+                parametros_grafico(modelo),
+                "pdf_punto_equilibrio",
+                TAMAÑO_GRAFICO_PDF,
+                DPI_GRAFICO_PDF,
+                lambda: renderizar_grafico_equilibrio(modelo)
+            )
+        else:
+            imagen = renderizar_grafico_equilibrio(modelo)
         
-        # Guardar gráfico en memoria en lugar de en un archivo
-        buffer = BytesIO()
-        plt.savefig(buffer, format='png', dpi=300, bbox_inches='tight')
-        plt.close(fig)
-        
-        # Devolver el puntero al inicio del buffer
-        buffer.seek(0)
+        buffer = BytesIO(imagen)
         
         # Usar directamente el buffer como fuente de imagen
         elementos.append(Image(buffer, width=6*inch, height=4*inch))
@@ -242,20 +276,105 @@ def exportar_a_pdf(modelo, ruta_archivo=None, incluir_graficos=True):
         estilo_centrado
     ))
     
+    _notificar_progreso(progreso, 0.8, "Escribiendo archivo PDF")
+    
     # Generar el PDF
     doc.build(elementos)
     
+    _notificar_progreso(progreso, 1.0, "Exportación a PDF completada")
+    
     return ruta_archivo
 
 
-def exportar_a_excel(modelo, ruta_archivo=None):
+def parametros_grafico(modelo):
+    """
+    Obtiene los valores de entrada que determinan el gráfico de punto de equilibrio.
+    
+    Args:
+        modelo (ModeloEquilibrio o dict): Datos del modelo
+        
+    Returns:
+        dict: Parámetros que identifican el gráfico (para la caché de imágenes)
+    """
+    datos = modelo["datos_grafico"]
+    
+    return {
+        "costos_fijos": float(modelo["costos_fijos"]),
+        "precio_venta": float(modelo["precio_venta"]),
+        "costo_variable": float(modelo["costo_variable"]),
+        "unidades_min": float(datos['unidades'].iloc[0]),
+        "unidades_max": float(datos['unidades'].iloc[-1]),
+        "puntos": len(datos)
+    }
+
+
+@instrumentar("exportar.renderizar_grafico")
+def renderizar_grafico_equilibrio(modelo, tamaño=TAMAÑO_GRAFICO_PDF, dpi=DPI_GRAFICO_PDF):
+    """
+    Renderiza el gráfico de punto de equilibrio como imagen PNG.
+    
+    Se usa una Figure independiente de pyplot para no acumular figuras abiertas
+    y poder renderizar fuera del hilo de la interfaz.
+    
+    Args:
+        modelo (ModeloEquilibrio o dict): Datos del modelo
+        tamaño (tuple, optional): Tamaño de la figura en pulgadas (ancho, alto)
+        dpi (int, optional): Resolución de la imagen
+        
+    Returns:
+        bytes: Contenido de la imagen PNG
+    """
+    fig = Figure(figsize=tamaño)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+    
+    datos = modelo["datos_grafico"]
+    pe_unidades = modelo["resultados"]["pe_unidades"]
+    pe_valor = modelo["resultados"]["pe_valor"]
+    
+    # Reducir las series a la resolución de la imagen conservando el punto de equilibrio
+    unidades, (costos_totales, ingresos) = submuestrear(
+        datos['unidades'].values, [datos['costos_totales'].values, datos['ingresos'].values],
+        puntos_para_ejes(ax, dpi), conservar=[pe_unidades])
+    
+    # Graficar costos totales e ingresos
+    ax.plot(unidades, costos_totales, 
+            label='Costos Totales', color='red')
+    ax.plot(unidades, ingresos, 
+            label='Ingresos', color='blue')
+    
+    # Marcar el punto de equilibrio
+    ax.plot([pe_unidades], [pe_valor], 'ro', markersize=8)
+    
+    # Líneas punteadas para el punto de equilibrio
+    ax.axvline(x=pe_unidades, color='gray', linestyle=':', alpha=0.7)
+    ax.axhline(y=pe_valor, color='gray', linestyle=':', alpha=0.7)
+    
+    # Configurar ejes y leyenda
+    ax.set_xlabel('Unidades')
+    ax.set_ylabel('Valor ($)')
+    ax.set_title('Análisis de Punto de Equilibrio')
+    ax.grid(True, linestyle='--', alpha=0.7)
+    ax.legend()
+    
+    # Guardar gráfico en memoria en lugar de en un archivo
+    buffer = BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    
+    return buffer.getvalue()
+
+
+@instrumentar("exportar.excel")
+def exportar_a_excel(modelo, ruta_archivo=None, progreso=None):
     """
     Exporta los resultados del análisis a un archivo Excel.
     
     Args:
-        modelo (dict): Diccionario con los datos del modelo
+        modelo (ModeloEquilibrio o dict): Datos del modelo
         ruta_archivo (str, optional): Ruta donde guardar el archivo. Si es None,
                                      se guarda en el directorio actual con un nombre por defecto.
+        progreso (callable, optional): Función que recibe la fracción completada y un mensaje.
+                                       Puede lanzar ExportacionCancelada para interrumpir.
         
     Returns:
         str: Ruta del archivo generado
@@ -265,6 +384,30 @@ def exportar_a_excel(modelo, ruta_archivo=None):
         fecha_hora = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         ruta_archivo = f"punto_equilibrio_{fecha_hora}.xlsx"
     
+    _notificar_progreso(progreso, 0.0, "Preparando libro de Excel")
+    
+    try:
+        _escribir_libro_excel(modelo, ruta_archivo, progreso)
+    except ExportacionCancelada:
+        # No dejar un libro incompleto en disco
+        if os.path.exists(ruta_archivo):
+            os.remove(ruta_archivo)
+        raise
+    
+    _notificar_progreso(progreso, 1.0, "Exportación a Excel completada")
+    
+    return ruta_archivo
+
+
+def _escribir_libro_excel(modelo, ruta_archivo, progreso):
+    """
+    Escribe las hojas del libro de Excel con los resultados del análisis.
+    
+    Args:
+        modelo (ModeloEquilibrio o dict): Datos del modelo
+        ruta_archivo (str): Ruta donde guardar el archivo
+        progreso (callable): Función de progreso, o None
+    """
     # Crear un escritor de Excel con pandas
     with pd.ExcelWriter(ruta_archivo, engine='openpyxl') as writer:
         # Hoja 1: Parámetros
@@ -287,6 +430,8 @@ def exportar_a_excel(modelo, ruta_archivo=None):
         
         df_parametros.to_excel(writer, sheet_name='Parámetros', index=False)
         
+        _notificar_progreso(progreso, 0.25, "Escribiendo resultados")
+        
         # Hoja 2: Resultados
         if modelo["resultados"]:
             resultados = modelo["resultados"]
@@ -317,6 +462,8 @@ def exportar_a_excel(modelo, ruta_archivo=None):
             
             df_resultados.to_excel(writer, sheet_name='Resultados', index=False)
         
+        _notificar_progreso(progreso, 0.5, "Escribiendo datos del gráfico")
+        
         # Hoja 3: Datos para gráfico
         if modelo["datos_grafico"] is not None:
             # Tomar una muestra de los datos para no sobrecargar el archivo
@@ -327,9 +474,9 @@ def exportar_a_excel(modelo, ruta_archivo=None):
             
             datos_muestra.to_excel(writer, sheet_name='Datos_Gráfico', index=False)
         
+        _notificar_progreso(progreso, 0.75, "Escribiendo análisis de sensibilidad")
+        
         # Hoja 4: Análisis de sensibilidad (si existe)
         if modelo.get("analisis_sensibilidad") is not None:
             df_sensibilidad = pd.DataFrame(modelo["analisis_sensibilidad"])
-            df_sensibilidad.to_excel(writer, sheet_name='Sensibilidad', index=False)
-    
-    return ruta_archivo
\ No newline at end of file
+            df_sensibilidad.to_excel(writer, sheet_name='Sensibilidad', index=False)
\ No newline at end of file
@@ -11,12 +11,14 @@ import datetime
 import pickle
 from tkinter import filedialog, messagebox
 
+from utils.instrumentacion import medir
+
 def guardar_escenario(modelo, nombre=None, directorio=None):
     """
     Guarda el escenario actual en un archivo.
     
     Args:
-        modelo (dict): Diccionario con los datos del modelo
+        modelo (ModeloEquilibrio o dict): Datos del modelo
         nombre (str, optional): Nombre para el escenario. Si es None, se usa la fecha/hora.
         directorio (str, optional): Directorio donde guardar. Si es None, se solicita al usuario.
         
@@ -80,14 +82,15 @@ def guardar_escenario(modelo, nombre=None, directorio=None):
             datos_a_guardar["analisis_sensibilidad"] = modelo["analisis_sensibilidad"]
         
         # Guardar en formato JSON o pickle según complejidad
-        try:
-            # Intentar guardar como JSON (más portable)
-            with open(ruta_completa, 'w', encoding='utf-8') as f:
-                json.dump(datos_a_guardar, f, indent=4, default=str)
-        except:
-            # Si falla (por objetos no serializables), usar pickle
-            with open(ruta_completa, 'wb') as f:
-                pickle.dump(datos_a_guardar, f)
+        with medir("escenario.guardar"):
+            try:
+                # Intentar guardar como JSON (más portable)
+                with open(ruta_completa, 'w', encoding='utf-8') as f:
+                    json.dump(datos_a_guardar, f, indent=4, default=str)
+            except:
+                # Si falla (por objetos no serializables), usar pickle
+                with open(ruta_completa, 'wb') as f:
+                    pickle.dump(datos_a_guardar, f)
         
         return ruta_completa
     
@@ -116,13 +119,14 @@ def cargar_escenario(ruta=None):
     
     try:
         # Intentar cargar como JSON primero (más seguro)
-        try:
-            with open(ruta, 'r', encoding='utf-8') as f:
-                datos_cargados = json.load(f)
-        except:
-            # Si falla, intentar cargar como pickle
-            with open(ruta, 'rb') as f:
-                datos_cargados = pickle.load(f)
+        with medir("escenario.cargar"):
+            try:
+                with open(ruta, 'r', encoding='utf-8') as f:
+                    datos_cargados = json.load(f)
+            except:
+                # Si falla, intentar cargar como pickle
+                with open(ruta, 'rb') as f:
+                    datos_cargados = pickle.load(f)
         
         # Extraer parámetros principales
         modelo = {
@@ -158,7 +162,7 @@ def crear_respaldo_automatico(modelo, directorio="respaldos"):
     Crea un respaldo automático del escenario actual.
     
     Args:
-        modelo (dict): Diccionario con los datos del modelo
+        modelo (ModeloEquilibrio o dict): Datos del modelo
         directorio (str, optional): Directorio donde guardar los respaldos. Default es "respaldos".
         
     Returns:
@@ -0,0 +1,285 @@
+"""
+Módulo para medir la duración de las operaciones de la aplicación durante una sesión real.
+
+Las operaciones se marcan con el decorador 'instrumentar' o con el administrador de
+contexto 'medir'. Mientras la instrumentación está desactivada (por defecto) ambos se
+reducen a una comprobación de un atributo, por lo que pueden dejarse en el código sin
+coste apreciable. La instrumentación se activa desde Ayuda > Diagnóstico o con la
+variable de entorno PUNTO_EQUILIBRIO_INSTRUMENTACION=1, y también al grabar una traza
+(utils.trazas), que recibe cada medición como un evento de la línea de tiempo.
+"""
+
+import os
+import time
+import datetime
+import threading
+import functools
+from collections import defaultdict, deque, Counter
+
+import numpy as np
+
+from utils.trazas import obtener_trazador
+
+
+# Variable de entorno que activa la instrumentación al iniciar
+VARIABLE_ENTORNO = "PUNTO_EQUILIBRIO_INSTRUMENTACION"
+
+# Duraciones guardadas por operación para calcular percentiles
+MAX_MUESTRAS = 1000
+
+# Operaciones lentas guardadas y duración a partir de la cual se consideran lentas (segundos)
+MAX_OPERACIONES_LENTAS = 50
+UMBRAL_LENTO = 0.1
+
+
+class RegistroInstrumentacion:
+    """
+    Registro de duraciones y contadores de las operaciones instrumentadas.
+    
+    Es seguro usarlo desde varios hilos (los cálculos y exportaciones se ejecutan
+    en hilos de trabajo).
+    """
+    
+    def __init__(self, max_muestras=MAX_MUESTRAS, max_lentas=MAX_OPERACIONES_LENTAS,
+                 umbral_lento=UMBRAL_LENTO):
+        """
+        Inicializa el registro (desactivado).
+        
+        Args:
+            max_muestras (int, optional): Duraciones guardadas por operación
+            max_lentas (int, optional): Número de operaciones lentas recientes guardadas
+            umbral_lento (float, optional): Duración mínima de una operación lenta en segundos
+        """
+        self.activo = False
+        self.umbral_lento = umbral_lento
+        
+        self._lock = threading.Lock()
+        self._max_muestras = max_muestras
+        self._muestras = defaultdict(lambda: deque(maxlen=self._max_muestras))
+        self._llamadas = Counter()
+        self._totales = defaultdict(float)
+        self._maximos = defaultdict(float)
+        self._contadores = Counter()
+        self._lentas = deque(maxlen=max_lentas)
+    
+    def activar(self, activo=True):
+        """
+        Activa o desactiva la instrumentación.
+        
+        Args:
+            activo (bool, optional): True para activar. Default es True.
+        """
+        self.activo = activo
+    
+    def registrar(self, nombre, duracion, inicio=None):
+        """
+        Registra la duración de una llamada a una operación.
+        
+        Args:
+            nombre (str): Nombre de la operación (p. ej. "graficos.actualizar_grafico")
+            duracion (float): Duración en segundos
+            inicio (float, optional): Instante de inicio (time.perf_counter()); si se indica
+                y hay una traza en grabación, la llamada se añade a la traza
+        """
+        trazador = obtener_trazador()
+        if inicio is not None and trazador.activo:
+            trazador.evento(nombre, inicio, duracion)
+        
+        with self._lock:
+            self._muestras[nombre].append(duracion)
+            self._llamadas[nombre] += 1
+            self._totales[nombre] += duracion
+            if duracion > self._maximos[nombre]:
+                self._maximos[nombre] = duracion
+            
+            if duracion >= self.umbral_lento:
+                self._lentas.append({
+                    "hora": datetime.datetime.now().strftime("%H:%M:%S"),
+                    "nombre": nombre,
+                    "duracion": duracion,
+                    "hilo": threading.current_thread().name
+                })
+    
+    def contar(self, nombre, cantidad=1):
+        """
+        Incrementa un contador si la instrumentación está activa.
+        
+        Args:
+            nombre (str): Nombre del contador
+            cantidad (int, optional): Incremento. Default es 1.
+        """
+        if not self.activo:
+            return
+        
+        with self._lock:
+            self._contadores[nombre] += cantidad
+    
+    def estadisticas(self):
+        """
+        Obtiene las estadísticas de cada operación registrada.
+        
+        Returns:
+            list: Diccionarios con nombre, llamadas, p50, p95, máximo y total (segundos),
+                ordenados por tiempo total descendente
+        """
+        with self._lock:
+            copia = {nombre: list(muestras) for nombre, muestras in self._muestras.items()}
+            llamadas = dict(self._llamadas)
+            totales = dict(self._totales)
+            maximos = dict(self._maximos)
+        
+        filas = []
+        for nombre, muestras in copia.items():
+            p50, p95 = np.percentile(muestras, [50, 95])
+            filas.append({
+                "nombre": nombre,
+                "llamadas": llamadas[nombre],
+                "p50": float(p50),
+                "p95": float(p95),
+                "maximo": maximos[nombre],
+                "total": totales[nombre]
+            })
+        
+        filas.sort(key=lambda fila: fila["total"], reverse=True)
+        return filas
+    
+    def contadores(self):
+        """
+        Obtiene los valores de los contadores.
+        
+        Returns:
+            dict: Valor de cada contador
+        """
+        with self._lock:
+            return dict(self._contadores)
+    
+    def operaciones_lentas(self):
+        """
+        Obtiene las últimas operaciones que superaron el umbral de lentitud.
+        
+        Returns:
+            list: Operaciones lentas (hora, nombre, duración e hilo), la más reciente primero
+        """
+        with self._lock:
+            return list(reversed(self._lentas))
+    
+    def reiniciar(self):
+        """Borra todas las mediciones y contadores."""
+        with self._lock:
+            self._muestras.clear()
+            self._llamadas.clear()
+            self._totales.clear()
+            self._maximos.clear()
+            self._contadores.clear()
+            self._lentas.clear()
+
+
+class _Medicion:
+    """Administrador de contexto que registra la duración del bloque que envuelve."""
+    
+    __slots__ = ("registro", "nombre", "inicio")
+    
+    def __init__(self, registro, nombre):
+        self.registro = registro
+        self.nombre = nombre
+    
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+    
+    def __exit__(self, tipo, valor, traza):
+        self.registro.registrar(self.nombre, time.perf_counter() - self.inicio, self.inicio)
+        return False
+
+
+class _MedicionNula:
+    """Administrador de contexto que no hace nada (instrumentación desactivada)."""
+    
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, tipo, valor, traza):
+        return False
+
+
+_MEDICION_NULA = _MedicionNula()
+
+# Registro compartido por la aplicación
+_registro = RegistroInstrumentacion()
+_registro.activar(os.environ.get(VARIABLE_ENTORNO, "") not in ("", "0") or obtener_trazador().activo)
+
+
+def obtener_registro():
+    """
+    Obtiene el registro de instrumentación compartido por la aplicación.
+    
+    Returns:
+        RegistroInstrumentacion: Registro de la aplicación
+    """
+    return _registro
+
+
+def medir(nombre):
+    """
+    Crea un administrador de contexto que mide la duración de un bloque.
+    
+    Ejemplo:
+        with medir("escenario.guardar"):
+            ...
+    
+    Args:
+        nombre (str): Nombre de la operación
+    
+    Returns:
+        Administrador de contexto (uno nulo compartido si la instrumentación está desactivada)
+    """
+    if not _registro.activo:
+        return _MEDICION_NULA
+    
+    return _Medicion(_registro, nombre)
+
+
+def instrumentar(nombre):
+    """
+    Decorador que mide la duración de cada llamada a una función o método.
+    
+    Args:
+        nombre (str): Nombre de la operación
+    
+    Returns:
+        callable: Decorador
+    """
+    def decorador(funcion):
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if not _registro.activo:
+                return funcion(*args, **kwargs)
+            
+            inicio = time.perf_counter()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                _registro.registrar(nombre, time.perf_counter() - inicio, inicio)
+        
+        return envoltura
+    
+    return decorador
+
+
+def formatear_bytes(cantidad):
+    """
+    Formatea una cantidad de memoria con la unidad más legible.
+    
+    Args:
+        cantidad (int): Cantidad en bytes
+    
+    Returns:
+        str: Cantidad formateada (B, KiB, MiB o GiB)
+    """
+    for unidad, escala in (("GiB", 1024 ** 3), ("MiB", 1024 ** 2), ("KiB", 1024)):
+        if cantidad >= escala:
+            return f"{cantidad / escala:.1f} {unidad}"
+    
+    return f"{cantidad} B"
\ No newline at end of file
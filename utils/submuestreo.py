@@ -0,0 +1,178 @@
+"""
+Módulo para reducir el número de puntos de las series antes de graficarlas.
+
+Dibujar con matplotlib más puntos que píxeles tienen los ejes no mejora el gráfico y lo
+vuelve lento. Las funciones de este módulo seleccionan un subconjunto representativo de
+puntos con Largest-Triangle-Three-Buckets (LTTB), que conserva la forma visual de la
+serie, o con decimación mín-máx, que conserva los extremos de cada intervalo (útil para
+series con ruido). Ninguna función depende de la interfaz gráfica.
+"""
+
+import numpy as np
+
+
+# Métodos de submuestreo disponibles
+METODOS_SUBMUESTREO = ("lttb", "min_max")
+
+# Puntos por píxel de ancho de los ejes
+PUNTOS_POR_PIXEL = 1.0
+
+# Número mínimo de puntos que se conservan aunque los ejes sean muy pequeños
+MIN_PUNTOS = 50
+
+
+def indices_lttb(x, y, n_salida):
+    """
+    Selecciona los índices de una serie con el algoritmo Largest-Triangle-Three-Buckets.
+    
+    El primer y el último punto se conservan siempre. El resto de la serie se divide en
+    n_salida - 2 intervalos y de cada uno se elige el punto que forma el triángulo de
+    mayor área con el punto elegido antes y el promedio del intervalo siguiente.
+    
+    Args:
+        x (array): Valores del eje X (ordenados de forma creciente)
+        y (array): Valores del eje Y
+        n_salida (int): Número de puntos a conservar
+    
+    Returns:
+        numpy.ndarray: Índices seleccionados en orden creciente
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    
+    if n_salida >= n or n_salida < 3:
+        return np.arange(n)
+    
+    # Límites de los intervalos; el punto final forma su propio intervalo
+    bordes = np.linspace(1, n - 1, n_salida - 1).astype(int)
+    bordes = np.append(bordes, n)
+    
+    # Promedio de cada intervalo (incluido el del punto final)
+    tamaños = np.diff(bordes)
+    promedios_x = np.add.reduceat(x, bordes[:-1]) / tamaños
+    promedios_y = np.add.reduceat(y, bordes[:-1]) / tamaños
+    
+    indices = np.empty(n_salida, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+    
+    # Cada elección depende de la anterior, por lo que se recorre intervalo a intervalo
+    a = 0
+    for i in range(n_salida - 2):
+        inicio, fin = bordes[i], bordes[i + 1]
+        
+        # Área (doble) del triángulo formado con el punto anterior y el promedio siguiente
+        areas = np.abs(
+            (x[a] - promedios_x[i + 1]) * (y[inicio:fin] - y[a]) -
+            (x[a] - x[inicio:fin]) * (promedios_y[i + 1] - y[a])
+        )
+        
+        a = inicio + int(np.argmax(areas))
+        indices[i + 1] = a
+    
+    return indices
+
+
+def indices_min_max(x, y, n_salida):
+    """
+    Selecciona los índices de una serie conservando el mínimo y el máximo de cada intervalo.
+    
+    Args:
+        x (array): Valores del eje X (ordenados de forma creciente)
+        y (array): Valores del eje Y
+        n_salida (int): Número aproximado de puntos a conservar
+    
+    Returns:
+        numpy.ndarray: Índices seleccionados en orden creciente
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    
+    if n_salida >= n or n_salida < 4:
+        return np.arange(n)
+    
+    # Dos puntos (mínimo y máximo) por intervalo
+    n_intervalos = n_salida // 2
+    bordes = np.linspace(0, n, n_intervalos + 1).astype(int)
+    inicios = bordes[:-1]
+    tamaños = np.diff(bordes)
+    
+    # Valores extremos de cada intervalo
+    minimos = np.repeat(np.minimum.reduceat(y, inicios), tamaños)
+    maximos = np.repeat(np.maximum.reduceat(y, inicios), tamaños)
+    
+    # Primera posición de cada intervalo donde se alcanza el extremo
+    posiciones = np.arange(n)
+    indices_min = np.minimum.reduceat(np.where(y == minimos, posiciones, n - 1), inicios)
+    indices_max = np.minimum.reduceat(np.where(y == maximos, posiciones, n - 1), inicios)
+    
+    indices = np.concatenate(([0, n - 1], indices_min, indices_max))
+    return np.unique(indices)
+
+
+def submuestrear(x, series, max_puntos, metodo="lttb", conservar=()):
+    """
+    Reduce varias series que comparten el eje X a un número de puntos cercano a max_puntos.
+    
+    Se toma la unión de los índices elegidos para cada serie, de modo que todas conservan
+    su forma y siguen compartiendo el mismo eje X. Los valores de X indicados en
+    'conservar' (por ejemplo, el punto de equilibrio) mantienen sus puntos vecinos
+    exactos, para que las líneas pasen por las marcas dibujadas sobre ellas.
+    
+    Args:
+        x (array): Valores del eje X (ordenados de forma creciente)
+        series (list): Series de valores del eje Y, del mismo largo que x
+        max_puntos (int): Número de puntos deseado por serie
+        metodo (str, optional): "lttb" o "min_max". Default es "lttb".
+        conservar (iterable, optional): Valores de X cuyos puntos vecinos se conservan
+    
+    Returns:
+        tuple: (x reducido, lista de series reducidas)
+    
+    Raises:
+        ValueError: Si el método no es válido
+    """
+    if metodo not in METODOS_SUBMUESTREO:
+        raise ValueError(f"Método de submuestreo no válido: {metodo}")
+    
+    x = np.asarray(x)
+    series = [np.asarray(serie) for serie in series]
+    
+    # Las series cortas se dibujan completas
+    if len(x) <= max_puntos:
+        return x, series
+    
+    seleccionar = indices_lttb if metodo == "lttb" else indices_min_max
+    indices = [seleccionar(x, serie, max_puntos) for serie in series]
+    
+    # Conservar los puntos a ambos lados de cada marca
+    marcas = np.asarray([v for v in conservar if v is not None and np.isfinite(v)], dtype=float)
+    if len(marcas):
+        posiciones = np.searchsorted(x, marcas)
+        indices.append(np.clip(posiciones, 0, len(x) - 1))
+        indices.append(np.clip(posiciones - 1, 0, len(x) - 1))
+    
+    seleccion = np.unique(np.concatenate(indices))
+    
+    return x[seleccion], [serie[seleccion] for serie in series]
+
+
+def puntos_para_ejes(ax, dpi=None):
+    """
+    Calcula cuántos puntos conviene dibujar según el ancho en píxeles de unos ejes.
+    
+    Args:
+        ax (Axes): Ejes donde se dibujarán las series
+        dpi (float, optional): Resolución final de la imagen. Si es None, se usa la de la figura.
+    
+    Returns:
+        int: Número de puntos a dibujar por serie
+    """
+    figura = ax.get_figure()
+    if dpi is None:
+        dpi = figura.dpi
+    
+    ancho_pixeles = ax.get_position().width * figura.get_figwidth() * dpi
+    
+    return max(MIN_PUNTOS, int(ancho_pixeles * PUNTOS_POR_PIXEL))
\ No newline at end of file
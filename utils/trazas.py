@@ -0,0 +1,168 @@
+"""
+Módulo para grabar una traza temporal de la sesión en formato Chrome trace-event.
+
+Cada operación instrumentada (ver utils.instrumentacion) se guarda como un evento con su
+inicio, duración e hilo, de modo que la sesión se puede ver como una línea de tiempo en
+chrome://tracing o en Perfetto (https://ui.perfetto.dev). Los eventos se guardan en un
+búfer circular, por lo que una sesión larga no hace crecer la memoria sin límite: al
+llenarse se descartan los más antiguos.
+
+La grabación se inicia desde Ayuda > Diagnóstico o con la variable de entorno
+PUNTO_EQUILIBRIO_TRAZA=<archivo.json>, en cuyo caso la traza se guarda al salir.
+"""
+
+import os
+import json
+import time
+import threading
+from collections import deque
+
+
+# Variable de entorno con el archivo donde guardar la traza de toda la sesión
+VARIABLE_ENTORNO = "PUNTO_EQUILIBRIO_TRAZA"
+
+# Número máximo de eventos guardados (búfer circular)
+MAX_EVENTOS = 100000
+
+
+class Trazador:
+    """
+    Grabador de eventos temporales con búfer circular.
+    
+    Es seguro usarlo desde varios hilos.
+    """
+    
+    def __init__(self, max_eventos=MAX_EVENTOS):
+        """
+        Inicializa el trazador (detenido).
+        
+        Args:
+            max_eventos (int, optional): Capacidad del búfer circular
+        """
+        self.activo = False
+        self.ruta_salida = None
+        self.descartados = 0
+        
+        self._lock = threading.Lock()
+        self._eventos = deque(maxlen=max_eventos)
+        self._hilos = {}
+        self._origen = time.perf_counter()
+    
+    def iniciar(self):
+        """Inicia una grabación nueva, descartando los eventos anteriores."""
+        with self._lock:
+            self._eventos.clear()
+            self._hilos.clear()
+            self.descartados = 0
+            self._origen = time.perf_counter()
+        self.activo = True
+    
+    def detener(self):
+        """Detiene la grabación (los eventos se conservan hasta guardarlos o reiniciar)."""
+        self.activo = False
+    
+    def evento(self, nombre, inicio, duracion):
+        """
+        Registra una operación terminada.
+        
+        Args:
+            nombre (str): Nombre de la operación; la parte anterior al primer punto
+                se usa como categoría (p. ej. "exportar" en "exportar.pdf")
+            inicio (float): Instante de inicio según time.perf_counter()
+            duracion (float): Duración en segundos
+        """
+        hilo = threading.current_thread()
+        
+        with self._lock:
+            if len(self._eventos) == self._eventos.maxlen:
+                self.descartados += 1
+            
+            # Evento completo ("X"): inicio y fin en un solo registro, en microsegundos
+            self._eventos.append((nombre, (inicio - self._origen) * 1e6, duracion * 1e6, hilo.ident))
+            self._hilos[hilo.ident] = hilo.name
+    
+    def cantidad_eventos(self):
+        """
+        Obtiene el número de eventos guardados.
+        
+        Returns:
+            int: Eventos en el búfer
+        """
+        with self._lock:
+            return len(self._eventos)
+    
+    def exportar(self):
+        """
+        Compone la traza en formato Chrome trace-event.
+        
+        Returns:
+            dict: Traza con la lista 'traceEvents' y los metadatos de la grabación
+        """
+        with self._lock:
+            eventos = list(self._eventos)
+            hilos = dict(self._hilos)
+            descartados = self.descartados
+        
+        pid = os.getpid()
+        
+        # Nombres del proceso y de los hilos para la vista de la línea de tiempo
+        traza = [{
+            "name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+            "args": {"name": "Analizador de Punto de Equilibrio"}
+        }]
+        for tid, nombre in hilos.items():
+            traza.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                "args": {"name": nombre}
+            })
+        
+        for nombre, inicio, duracion, tid in eventos:
+            traza.append({
+                "name": nombre,
+                "cat": nombre.split(".", 1)[0],
+                "ph": "X",
+                "ts": round(inicio, 3),
+                "dur": round(duracion, 3),
+                "pid": pid,
+                "tid": tid
+            })
+        
+        return {
+            "traceEvents": traza,
+            "displayTimeUnit": "ms",
+            "otherData": {"eventos_descartados": descartados}
+        }
+    
+    def guardar(self, ruta):
+        """
+        Guarda la traza en un archivo JSON.
+        
+        Args:
+            ruta (str): Ruta del archivo
+        
+        Returns:
+            int: Número de eventos guardados
+        """
+        traza = self.exportar()
+        
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(traza, f, ensure_ascii=False)
+        
+        return sum(1 for evento in traza["traceEvents"] if evento["ph"] == "X")
+
+
+# Trazador compartido por la aplicación
+_trazador = Trazador()
+if os.environ.get(VARIABLE_ENTORNO):
+    _trazador.ruta_salida = os.environ[VARIABLE_ENTORNO]
+    _trazador.iniciar()
+
+
+def obtener_trazador():
+    """
+    Obtiene el trazador compartido por la aplicación.
+    
+    Returns:
+        Trazador: Trazador de la aplicación
+    """
+    return _trazador
\ No newline at end of file